@@ -14,6 +14,7 @@
 __all__ = [
     "create_research_graph",
     "create_checkpointer",
+    "create_pooled_checkpointer",
     "AgentState",
     "QueryState",
     "ResearchPlan",
@@ -39,6 +40,7 @@
     # Graph/state
     "create_research_graph": "agent.core.graph",
     "create_checkpointer": "agent.core.graph",
+    "create_pooled_checkpointer": "agent.core.graph",
     "AgentState": "agent.core.state",
     "QueryState": "agent.core.state",
     "ResearchPlan": "agent.core.state",
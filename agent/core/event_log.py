@@ -0,0 +1,369 @@
+"""
+Event replay storage for `EventEmitter`.
+
+- `EventRing`: fixed-capacity in-memory ring. Event seqs are contiguous, so an
+  event's slot is `seq % capacity` and resuming from any retained seq is O(1).
+- `DurableEventLog`: optional append-only JSONL segments per thread
+  (`<first_seq>.jsonl`), bounded by total bytes and age. Each segment keeps a
+  sparse (seq -> byte offset) index, so reads from any seq are a bisect over
+  segments plus a bisect inside one segment, then a short scan.
+
+The ring serves recent reconnects; the durable log serves clients that fall
+further behind than the ring (or reconnect after a process restart).
+
+`DurableEventLog.append_nowait` hands writes to one shared writer thread, so
+emitters on the event loop never block on file I/O; `read_since` waits for a
+log's queued writes before reading.
+"""
+
+from __future__ import annotations
+
+import atexit
+import bisect
+import json
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_SEGMENT_SUFFIX = ".jsonl"
+
+
+class EventRing:
+    """Ring buffer of objects with a contiguous integer `seq`."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(1, int(capacity))
+        self._slots: List[Any] = [None] * self.capacity
+        self._first = 0
+        self._last = 0
+
+    def __len__(self) -> int:
+        return self._last - self._first + 1 if self._last else 0
+
+    @property
+    def first_seq(self) -> int:
+        """Oldest retained seq (0 when empty)."""
+        return self._first if self._last else 0
+
+    @property
+    def last_seq(self) -> int:
+        return self._last
+
+    def append(self, item: Any) -> None:
+        seq = int(item.seq)
+        if not self._last or seq != self._last + 1:
+            # First item, or a gap (seq reset): restart the window at this seq.
+            self._first = seq
+            self._slots = [None] * self.capacity
+        self._slots[seq % self.capacity] = item
+        self._last = seq
+        if self._last - self._first + 1 > self.capacity:
+            self._first = self._last - self.capacity + 1
+
+    def since(self, seq: Optional[int] = None) -> List[Any]:
+        """Items with `seq` greater than the given one (all retained items for None)."""
+        if not self._last:
+            return []
+        start = self._first if seq is None else max(int(seq) + 1, self._first)
+        return [self._slots[s % self.capacity] for s in range(start, self._last + 1)]
+
+    def clear(self) -> None:
+        self._slots = [None] * self.capacity
+        self._first = 0
+        self._last = 0
+
+
+@dataclass
+class _Segment:
+    path: Path
+    first_seq: int
+    last_seq: int = 0
+    size: int = 0
+    # Sparse index: parallel lists of seq and byte offset of that record.
+    index_seqs: List[int] = field(default_factory=list)
+    index_offsets: List[int] = field(default_factory=list)
+    indexed: bool = False
+
+
+class _AppendWriter:
+    """Daemon thread that performs queued `DurableEventLog` appends in order."""
+
+    _CLOSE = object()
+
+    def __init__(self) -> None:
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._cond = threading.Condition()
+        # Queued, not yet written operations per log directory.
+        self._pending: Dict[Path, int] = {}
+
+    def submit(self, log: "DurableEventLog", record: Any, encoded: Optional[str]) -> None:
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="event-log-writer", daemon=True
+                )
+                self._thread.start()
+            self._pending[log.directory] = self._pending.get(log.directory, 0) + 1
+        self._queue.put((log, record, encoded))
+
+    def pending(self, directory: Path) -> int:
+        with self._cond:
+            return self._pending.get(directory, 0)
+
+    def wait(self, directory: Optional[Path] = None, timeout: Optional[float] = None) -> bool:
+        """Block until queued writes for `directory` (or all) are done; False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not (self._pending.get(directory) if directory else self._pending),
+                timeout=timeout,
+            )
+
+    def on_writer_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def _run(self) -> None:
+        while True:
+            log, record, encoded = self._queue.get()
+            try:
+                if record is self._CLOSE:
+                    log.close()
+                else:
+                    log.append(record, encoded=encoded)
+            except Exception as e:
+                log.failed = e
+                logger.warning(f"[event_log] append failed for {log.directory}: {e}")
+            finally:
+                with self._cond:
+                    left = self._pending.get(log.directory, 1) - 1
+                    if left > 0:
+                        self._pending[log.directory] = left
+                    else:
+                        self._pending.pop(log.directory, None)
+                    self._cond.notify_all()
+
+
+_writer = _AppendWriter()
+# Give queued appends a moment to land at interpreter exit.
+atexit.register(_writer.wait, None, 2.0)
+
+
+class DurableEventLog:
+    """Append-only, size/time-bounded JSONL event log for one thread."""
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        segment_bytes: int = 4 * 1024 * 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        retention_s: float = 86400.0,
+        index_every: int = 64,
+    ) -> None:
+        self.directory = Path(directory)
+        self.segment_bytes = max(1024, int(segment_bytes))
+        self.max_bytes = max(self.segment_bytes, int(max_bytes))
+        self.retention_s = float(retention_s)
+        self.index_every = max(1, int(index_every))
+
+        self._lock = threading.RLock()
+        self._segments: List[_Segment] = []
+        self._handle = None
+        # Set by the writer thread when a queued append fails.
+        self.failed: Optional[Exception] = None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # A previous instance for this directory may still have queued appends.
+        _writer.wait(self.directory, timeout=5.0)
+        self._open()
+
+    # ------------------------------------------------------------------ #
+
+    def _open(self) -> None:
+        for path in sorted(self.directory.glob(f"*{_SEGMENT_SUFFIX}")):
+            try:
+                first = int(path.stem)
+            except ValueError:
+                continue
+            self._segments.append(_Segment(path=path, first_seq=first, size=path.stat().st_size))
+        self._segments.sort(key=lambda s: s.first_seq)
+        self._prune()
+        if self._segments:
+            # Only the active segment is scanned eagerly (to learn the last seq).
+            active = self._segments[-1]
+            self._build_index(active)
+            if active.path.stat().st_size > active.size:
+                with open(active.path, "r+b") as fh:
+                    fh.truncate(active.size)
+
+    def _build_index(self, segment: _Segment) -> None:
+        seqs: List[int] = []
+        offsets: List[int] = []
+        last = 0
+        count = 0
+        offset = 0
+        with open(segment.path, "rb") as fh:
+            for line in fh:
+                try:
+                    seq = int(json.loads(line)["seq"])
+                except Exception:
+                    # A torn final line (crash mid-write) ends the segment.
+                    break
+                if count % self.index_every == 0:
+                    seqs.append(seq)
+                    offsets.append(offset)
+                last = seq
+                count += 1
+                offset += len(line)
+        segment.index_seqs = seqs
+        segment.index_offsets = offsets
+        segment.last_seq = last
+        segment.size = offset
+        segment.indexed = True
+
+    def _prune(self) -> None:
+        """Drop segments beyond the byte budget or older than the retention window."""
+        now = time.time()
+        while len(self._segments) > 1:
+            oldest = self._segments[0]
+            total = sum(s.size for s in self._segments)
+            expired = False
+            if self.retention_s > 0:
+                try:
+                    expired = now - oldest.path.stat().st_mtime > self.retention_s
+                except OSError:
+                    expired = True
+            if total <= self.max_bytes and not expired:
+                break
+            self._segments.pop(0)
+            try:
+                oldest.path.unlink()
+            except OSError:
+                pass
+
+    @property
+    def last_seq(self) -> int:
+        with self._lock:
+            return self._segments[-1].last_seq if self._segments else 0
+
+    @property
+    def first_seq(self) -> int:
+        with self._lock:
+            return self._segments[0].first_seq if self._segments else 0
+
+    # ------------------------------------------------------------------ #
+
+    def append(self, record: Dict[str, Any], *, encoded: Optional[str] = None) -> None:
+        """Append `record`; `encoded` is its JSON text when the caller already has it."""
+        seq = int(record["seq"])
+        if encoded is None:
+            encoded = json.dumps(record, ensure_ascii=False, default=str)
+        line = (encoded + "\n").encode("utf-8")
+        with self._lock:
+            segment = self._segments[-1] if self._segments else None
+            if segment is None or segment.size >= self.segment_bytes or (segment.last_seq and seq <= segment.last_seq):
+                segment = self._roll(seq)
+            if self._handle is None:
+                self._handle = open(segment.path, "ab")
+            offset = segment.size
+            self._handle.write(line)
+            self._handle.flush()
+            if not segment.index_seqs or seq - segment.index_seqs[-1] >= self.index_every:
+                segment.index_seqs.append(seq)
+                segment.index_offsets.append(offset)
+            segment.size += len(line)
+            segment.last_seq = seq
+
+    def append_nowait(self, record: Dict[str, Any], *, encoded: Optional[str] = None) -> None:
+        """Queue `record` for the shared writer thread; appends keep their order."""
+        _writer.submit(self, record, encoded)
+
+    def wait_written(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued append is on disk; False on timeout."""
+        if _writer.on_writer_thread():
+            return True
+        return _writer.wait(self.directory, timeout=timeout)
+
+    def _roll(self, first_seq: int) -> _Segment:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        if self._segments and first_seq <= self._segments[-1].last_seq:
+            # Seq went backwards (emitter reset without the log): start over.
+            for old in self._segments:
+                try:
+                    old.path.unlink()
+                except OSError:
+                    pass
+            self._segments = []
+        segment = _Segment(
+            path=self.directory / f"{first_seq:012d}{_SEGMENT_SUFFIX}",
+            first_seq=first_seq,
+            indexed=True,
+        )
+        self._segments.append(segment)
+        self._prune()
+        return segment
+
+    def read_since(self, seq: int, until_seq: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Records with seq > `seq` (and <= `until_seq` when given), in order.
+
+        Blocks on file reads (and on queued appends); async callers use a thread.
+        """
+        self.wait_written(timeout=5.0)
+        with self._lock:
+            if self._handle is not None:
+                self._handle.flush()
+            segments = list(self._segments)
+            firsts = [s.first_seq for s in segments]
+        want = int(seq) + 1
+        position = max(0, bisect.bisect_right(firsts, want) - 1)
+        for segment in segments[position:]:
+            if until_seq is not None and segment.first_seq > until_seq:
+                return
+            with self._lock:
+                if not segment.indexed:
+                    self._build_index(segment)
+                point = bisect.bisect_right(segment.index_seqs, want) - 1
+                offset = segment.index_offsets[point] if point >= 0 else 0
+            try:
+                fh = open(segment.path, "rb")
+            except OSError:
+                continue  # pruned meanwhile
+            with fh:
+                fh.seek(offset)
+                for line in fh:
+                    try:
+                        record = json.loads(line)
+                    except Exception:
+                        break
+                    record_seq = int(record.get("seq") or 0)
+                    if record_seq < want:
+                        continue
+                    if until_seq is not None and record_seq > until_seq:
+                        return
+                    yield record
+
+    def close(self) -> None:
+        """Close the file handle, after any queued appends when some are pending."""
+        if not _writer.on_writer_thread() and _writer.pending(self.directory):
+            _writer.submit(self, _AppendWriter._CLOSE, None)
+            return
+        with self._lock:
+            if self._handle is not None:
+                try:
+                    self._handle.close()
+                finally:
+                    self._handle = None
+
+
+def thread_log_dir(root: str | Path, thread_id: str) -> Path:
+    safe = "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in str(thread_id)) or "default"
+    return Path(root) / safe
+
@@ -30,7 +30,6 @@ async def my_listener(event):
 """
 
 import asyncio
-import json
 import logging
 import threading
 import time
@@ -39,6 +38,10 @@ async def my_listener(event):
 from enum import Enum
 from typing import Any, Callable, Dict, List, Optional, Union
 
+from agent.core.event_log import DurableEventLog, EventRing, thread_log_dir
+from common.config import settings
+from common.stream_frames import dumps, sse_message_frame, sse_typed_frame
+
 logger = logging.getLogger(__name__)
 
 
@@ -104,12 +107,40 @@ def to_dict(self) -> Dict[str, Any]:
             "thread_id": self.thread_id,
         }
 
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "Event":
+        """Rebuild an event from `to_dict()` output (e.g. the durable event log)."""
+        raw_type = payload.get("type")
+        try:
+            event_type: Any = ToolEventType(raw_type)
+        except ValueError:
+            event_type = raw_type
+        return cls(
+            type=event_type,
+            data=payload.get("data") or {},
+            event_id=str(payload.get("event_id") or ""),
+            seq=int(payload.get("seq") or 0),
+            timestamp=float(payload.get("timestamp") or 0.0),
+            thread_id=payload.get("thread_id"),
+        )
+
+    def to_json(self) -> str:
+        """`to_dict()` as JSON, encoded once and shared by every subscriber and the durable log."""
+        encoded = self.__dict__.get("_json")
+        if encoded is None:
+            encoded = dumps(self.to_dict(), default=str)
+            self.__dict__["_json"] = encoded
+        return encoded
+
     def to_sse(self) -> str:
         """Convert event to SSE format string."""
-        data = json.dumps(self.to_dict(), ensure_ascii=False)
         event_name = self.type.value if isinstance(self.type, Enum) else str(self.type)
         # Include SSE id and event name for browser resume + typed listeners.
-        return f"id: {self.seq}\nevent: {event_name}\ndata: {data}\n\n"
+        return sse_typed_frame(event_name, self.to_json(), self.seq)
+
+    def to_sse_message(self) -> str:
+        """SSE frame without an `event:` line, delivered to `EventSource.onmessage`."""
+        return sse_message_frame(self.to_json(), self.seq)
 
 
 # Type alias for event listeners
@@ -127,25 +158,45 @@ class EventEmitter:
     def __init__(
         self,
         thread_id: Optional[str] = None,
-        buffer_size: int = 100,
+        buffer_size: Optional[int] = None,
+        log_dir: Optional[str] = None,
     ):
         """
         Initialize the event emitter.
 
         Args:
             thread_id: Optional thread/conversation ID to tag all events
-            buffer_size: Maximum number of events to buffer for replay
+            buffer_size: Events kept in the in-memory replay ring
+                (default: settings.event_buffer_size)
+            log_dir: Root directory for the durable per-thread event log
+                (default: settings.event_log_dir; empty disables it)
         """
         self.thread_id = thread_id
-        self.buffer_size = buffer_size
+        self.buffer_size = int(buffer_size or getattr(settings, "event_buffer_size", 1000) or 1000)
         self._listeners: List[EventListener] = []
         self._async_listeners: List[EventListener] = []
-        self._event_buffer: List[Event] = []
+        self._event_buffer = EventRing(self.buffer_size)
         self._seq: int = 0
         self._lock = asyncio.Lock()
         self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._buffer_lock = threading.Lock()
 
+        self._log: Optional[DurableEventLog] = None
+        root = log_dir if log_dir is not None else str(getattr(settings, "event_log_dir", "") or "")
+        if root and thread_id:
+            try:
+                self._log = DurableEventLog(
+                    thread_log_dir(root, thread_id),
+                    segment_bytes=int(getattr(settings, "event_log_segment_bytes", 4 * 1024 * 1024)),
+                    max_bytes=int(getattr(settings, "event_log_max_bytes", 64 * 1024 * 1024)),
+                    retention_s=float(getattr(settings, "event_log_retention_s", 86400)),
+                )
+                # Continue numbering after a restart so Last-Event-ID stays meaningful.
+                self._seq = self._log.last_seq
+            except Exception as e:
+                logger.warning(f"[events] durable event log disabled for {thread_id}: {e}")
+                self._log = None
+
     def _bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
         """Bind an asyncio loop used for cross-thread safe emits."""
         if self._loop is None:
@@ -211,8 +262,15 @@ async def emit(
                 thread_id=self.thread_id,
             )
             self._event_buffer.append(event)
-            if len(self._event_buffer) > self.buffer_size:
-                self._event_buffer.pop(0)
+            if self._log is not None:
+                if self._log.failed is not None:
+                    logger.warning(
+                        f"[events] durable event log write failed, disabling: {self._log.failed}"
+                    )
+                    self._log = None
+                else:
+                    # Written by the event-log thread; emit never waits on disk.
+                    self._log.append_nowait(event.to_dict(), encoded=event.to_json())
 
         # Notify sync listeners
         for listener in self._listeners:
@@ -421,13 +479,46 @@ async def emit_quality_update(self, quality: Dict[str, Any]) -> Event:
     def get_buffered_events(self) -> List[Event]:
         """Get all buffered events for replay."""
         with self._buffer_lock:
-            return list(self._event_buffer)
+            return self._event_buffer.since(None)
+
+    def get_events_since(self, seq: Optional[int]) -> List[Event]:
+        """
+        Events after `seq` for a resuming client (the in-memory ring for None).
+
+        Events older than the ring are read from the durable log when enabled.
+        """
+        with self._buffer_lock:
+            recent = self._event_buffer.since(seq)
+            ring_first = self._event_buffer.first_seq
+            log = self._log
+        if seq is None or log is None or not ring_first or seq + 1 >= ring_first:
+            return recent
+        older = [Event.from_dict(r) for r in log.read_since(seq, until_seq=ring_first - 1)]
+        return older + recent
+
+    async def aget_events_since(self, seq: Optional[int]) -> List[Event]:
+        """`get_events_since` with durable-log reads done in a worker thread."""
+        with self._buffer_lock:
+            recent = self._event_buffer.since(seq)
+            ring_first = self._event_buffer.first_seq
+            log = self._log
+        if seq is None or log is None or not ring_first or seq + 1 >= ring_first:
+            return recent
+        records = await asyncio.to_thread(
+            lambda: list(log.read_since(seq, until_seq=ring_first - 1))
+        )
+        return [Event.from_dict(r) for r in records] + recent
 
     def clear_buffer(self) -> None:
         """Clear the event buffer."""
         with self._buffer_lock:
             self._event_buffer.clear()
 
+    def close(self) -> None:
+        """Release the durable log file handle (the log itself is kept for replay)."""
+        if self._log is not None:
+            self._log.close()
+
 
 # Global event emitter registry by thread_id
 _emitters: Dict[str, EventEmitter] = {}
@@ -462,8 +553,9 @@ async def remove_emitter(thread_id: str) -> None:
         thread_id: The thread/conversation ID
     """
     async with _emitters_lock:
-        if thread_id in _emitters:
-            del _emitters[thread_id]
+        emitter = _emitters.pop(thread_id, None)
+    if emitter is not None:
+        emitter.close()
     # Best-effort cleanup for thread-scoped resources (e.g., Daytona sandboxes)
     try:
         from tools.sandbox.daytona_client import daytona_stop_all
@@ -497,6 +589,7 @@ async def event_stream_generator(
     thread_id: str,
     timeout: float = 300.0,
     last_event_id: Optional[str] = None,
+    message_only: bool = False,
 ) -> Any:
     """
     Async generator that yields SSE events for a thread.
@@ -509,6 +602,8 @@ async def event_stream_generator(
         thread_id: The thread/conversation ID
         timeout: Maximum time to wait for events (seconds)
         last_event_id: Optional SSE resume cursor (from `Last-Event-ID` header).
+        message_only: Omit the `event:` line so browsers dispatch every frame to
+            `EventSource.onmessage`.
 
     Yields:
         SSE formatted event strings
@@ -527,13 +622,19 @@ async def queue_listener(event: Event):
         await queue.put(event)
 
     emitter.on_event(queue_listener)
+    to_frame = Event.to_sse_message if message_only else Event.to_sse
 
     try:
-        # First, yield any buffered events
-        for event in emitter.get_buffered_events():
-            if last_seq is not None and event.seq <= last_seq:
+        # First, replay what the client missed (ring, then durable log if needed).
+        # The listener is already registered, so skip queued duplicates below.
+        # Only replayed events move the cursor: an emitter recreated without a
+        # durable log numbers from 1 again, below the client's Last-Event-ID.
+        sent_seq = 0
+        for event in await emitter.aget_events_since(last_seq):
+            if event.seq <= sent_seq:
                 continue
-            yield event.to_sse()
+            sent_seq = event.seq
+            yield to_frame(event)
 
         # Then, yield new events as they arrive
         start_time = time.time()
@@ -545,7 +646,10 @@ async def queue_listener(event: Event):
                     break
 
                 event = await asyncio.wait_for(queue.get(), timeout=min(10, remaining))
-                yield event.to_sse()
+                if event.seq <= sent_seq:
+                    continue
+                sent_seq = event.seq
+                yield to_frame(event)
 
                 # Check if this is the done event
                 if event.type == ToolEvent.DONE:
@@ -1,5 +1,7 @@
+import asyncio
 import logging
 from pathlib import Path
+from typing import Any, Dict, Optional
 
 import psycopg
 from langgraph.checkpoint.postgres import PostgresSaver
@@ -257,11 +259,12 @@ def export_graph_mermaid(output_path: str = "graph_mermaid.md", xray: bool = Tru
     return path
 
 
-def create_checkpointer(database_url: str):
+def create_checkpointer(database_url: str, serde: Any = None):
     """
     Create a PostgreSQL checkpointer for state persistence.
 
     This allows long-running agents to pause/resume and handle failures.
+    `serde` overrides the checkpoint serializer (e.g. blob offloading).
     """
     if not database_url:
         raise ValueError("database_url is required to initialize the Postgres checkpointer.")
@@ -273,10 +276,127 @@ def create_checkpointer(database_url: str):
         raise RuntimeError(f"Failed to connect to Postgres for checkpointer: {e}") from e
 
     # Create checkpointer
-    checkpointer = PostgresSaver(conn)
+    checkpointer = PostgresSaver(conn, serde=serde)
 
     # Setup tables
     checkpointer.setup()
 
     logger.info("PostgreSQL checkpointer initialized")
     return checkpointer
+
+
+try:
+    from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+    from psycopg.rows import dict_row
+    from psycopg_pool import AsyncConnectionPool
+
+    PSYCOPG_POOL_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    AsyncPostgresSaver = object  # type: ignore[assignment,misc]
+    AsyncConnectionPool = None  # type: ignore[assignment,misc]
+    dict_row = None  # type: ignore[assignment]
+    PSYCOPG_POOL_AVAILABLE = False
+
+
+class PooledPostgresSaver(AsyncPostgresSaver):  # type: ignore[misc,valid-type]
+    """
+    Async Postgres checkpointer backed by a psycopg connection pool.
+
+    `AsyncPostgresSaver` binds to the running event loop when constructed,
+    but graphs are compiled at import time. This saver is built without a
+    loop and bound by `aopen()` from the app lifespan, which also opens the
+    pool and runs the migrations. Concurrent graph runs each borrow their
+    own connection instead of sharing one.
+
+    Sync methods (`get_tuple`, `list`, ...) still work from worker threads
+    (e.g. `run_in_threadpool`); from the event loop use the `a*` methods.
+    """
+
+    def __init__(self, pool: Any, serde: Any = None):
+        # Skip AsyncPostgresSaver.__init__: it requires a running loop.
+        super(AsyncPostgresSaver, self).__init__(serde=serde)
+        self.conn = pool
+        self.pipe = None
+        self.lock = asyncio.Lock()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.supports_pipeline = psycopg.Capabilities().has_pipeline()
+
+    @property
+    def pool(self) -> Any:
+        return self.conn
+
+    async def aopen(self, *, timeout: float = 30.0) -> None:
+        """Bind to the running loop, open the pool and set up tables."""
+        self.loop = asyncio.get_running_loop()
+        await self.conn.open(wait=True, timeout=timeout)
+        await self.setup()
+        logger.info(f"PostgreSQL pooled checkpointer ready: {self.pool_stats()}")
+
+    async def aclose(self) -> None:
+        await self.conn.close()
+
+    def pool_stats(self) -> Dict[str, int]:
+        """psycopg pool counters (pool_size, pool_available, requests_waiting, ...)."""
+        try:
+            return dict(self.conn.get_stats())
+        except Exception:
+            return {}
+
+
+def create_pooled_checkpointer(
+    database_url: str,
+    *,
+    min_size: int = 1,
+    max_size: int = 10,
+    timeout: float = 30.0,
+    statement_timeout_ms: int = 30000,
+    check_connections: bool = True,
+    max_idle: float = 600.0,
+    serde: Any = None,
+) -> PooledPostgresSaver:
+    """
+    Create a connection-pooled async PostgreSQL checkpointer.
+
+    The pool is created closed; call `await checkpointer.aopen()` once an
+    event loop is running (the FastAPI lifespan does this).
+
+    Args:
+        database_url: Postgres connection string
+        min_size: Connections kept open
+        max_size: Upper bound on concurrent connections
+        timeout: Seconds to wait for a free connection before failing
+        statement_timeout_ms: Server-side statement timeout (0 disables)
+        check_connections: Check each connection before handing it out
+        max_idle: Seconds before an idle connection above min_size is closed
+        serde: Checkpoint serializer override (e.g. blob offloading)
+    """
+    if not database_url:
+        raise ValueError("database_url is required to initialize the Postgres checkpointer.")
+    if not PSYCOPG_POOL_AVAILABLE:
+        raise RuntimeError(
+            "Pooled checkpointer requires psycopg_pool. Install with: pip install 'psycopg[pool]'"
+        )
+
+    min_size = max(1, int(min_size))
+    max_size = max(min_size, int(max_size))
+    kwargs: Dict[str, Any] = {
+        "autocommit": True,
+        "prepare_threshold": 0,
+        "row_factory": dict_row,
+    }
+    if int(statement_timeout_ms) > 0:
+        kwargs["options"] = f"-c statement_timeout={int(statement_timeout_ms)}"
+
+    pool = AsyncConnectionPool(
+        database_url,
+        kwargs=kwargs,
+        min_size=min_size,
+        max_size=max_size,
+        timeout=float(timeout),
+        max_idle=float(max_idle),
+        check=AsyncConnectionPool.check_connection if check_connections else None,
+        name="weaver-checkpointer",
+        open=False,
+    )
+    logger.info(f"PostgreSQL pooled checkpointer configured (min={min_size}, max={max_size})")
+    return PooledPostgresSaver(pool, serde=serde)
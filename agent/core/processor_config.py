@@ -260,6 +260,7 @@ def from_settings(cls) -> "AgentProcessorConfig":
             tool_execution_strategy=getattr(
                 settings, "agent_tool_execution_strategy", "sequential"
             ),
+            execute_on_stream=getattr(settings, "agent_execute_on_stream", False),
             max_tool_calls_per_turn=getattr(settings, "tool_call_limit", 10),
             retry_on_tool_error=getattr(settings, "tool_retry", False),
             max_retries=getattr(settings, "tool_retry_max_attempts", 3),
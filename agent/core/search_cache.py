@@ -1,19 +1,33 @@
 """
-Search Cache - LRU cache for search results with TTL support.
+Search Cache - tiered cache for search results with TTL support.
 
-Prevents redundant API calls for similar/duplicate queries within a session.
+Prevents redundant API calls for similar/duplicate queries. This is the one
+search cache used by `MultiSearchOrchestrator`, deepsearch and the web_plan
+graph nodes.
+
+- L1: in-process LRU with TTL, byte budget and fuzzy (near-duplicate) lookup
+- L2 (optional): exact-key tier shared by every worker (SQLite file or Redis)
+- single-flight per key so concurrent misses trigger one upstream search
 """
 
 from __future__ import annotations
 
+import copy
 import hashlib
+import json
 import logging
+import random
+import sqlite3
 import threading
 import time
-from collections import OrderedDict
-from dataclasses import dataclass, field
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
 from difflib import SequenceMatcher
-from typing import Any, Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from common.single_flight import SingleFlight, get_single_flight
 
 logger = logging.getLogger(__name__)
 
@@ -26,16 +40,280 @@ class CacheEntry:
     results: List[Dict[str, Any]]
     timestamp: float
     hit_count: int = 0
+    size_bytes: int = 0
+
+
+def _encode_results(results: List[Dict[str, Any]]) -> bytes:
+    return json.dumps(results, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _split_namespace(normalized: str) -> Tuple[str, str]:
+    """Split a key into its prefix and query text, e.g. (`multi_search::parallel::10::`, `q`)."""
+    namespace, _sep, text = normalized.rpartition("::")
+    return namespace, text
+
+
+def _char_ngrams(text: str, n: int = 3) -> set[str]:
+    padded = f" {text} "
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i : i + n] for i in range(len(padded) - n + 1)}
+
+
+class _QueryIndex:
+    """
+    MinHash-LSH index over the character trigrams of normalized cached queries.
+
+    Each query gets a `bands * rows` MinHash signature; queries sharing any
+    band land in the same bucket. A lookup hashes the query once and probes
+    `bands` buckets, so its cost does not grow with the number of cached
+    entries. With 16 bands of 3 rows, pairs with trigram Jaccard >= 0.55
+    (a few typos in a typical query) collide with ~95% probability, while
+    unrelated queries almost never do.
+
+    Only the query text after the key prefix is hashed, and buckets are keyed
+    by (prefix, band hash). Hashing the shared prefix trigrams would pull
+    every key with that prefix into the same buckets.
+    """
+
+    _MASK = (1 << 61) - 1
+
+    def __init__(self, *, bands: int = 16, rows: int = 3, seed: int = 1) -> None:
+        self.bands = max(1, int(bands))
+        self.rows = max(1, int(rows))
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.getrandbits(61) | 1, rng.getrandbits(61)) for _ in range(self.bands * self.rows)
+        ]
+        self._buckets: List[Dict[Tuple[str, int], Set[str]]] = [{} for _ in range(self.bands)]
+        self._band_keys: Dict[str, Tuple[str, Tuple[int, ...]]] = {}
+        self._lengths: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._band_keys)
+
+    def _band_hashes(self, normalized: str) -> Tuple[int, ...]:
+        hashes = [hash(gram) for gram in _char_ngrams(normalized)]
+        mask = self._MASK
+        signature = [min((a * h + b) & mask for h in hashes) for a, b in self._perms]
+        rows = self.rows
+        return tuple(
+            hash(tuple(signature[i * rows : (i + 1) * rows])) for i in range(self.bands)
+        )
+
+    def add(self, key: str, normalized: str) -> None:
+        self.discard(key)
+        namespace, text = _split_namespace(normalized)
+        band_keys = self._band_hashes(text)
+        self._band_keys[key] = (namespace, band_keys)
+        self._lengths[key] = len(normalized)
+        for buckets, band_key in zip(self._buckets, band_keys, strict=True):
+            buckets.setdefault((namespace, band_key), set()).add(key)
+
+    def discard(self, key: str) -> None:
+        indexed = self._band_keys.pop(key, None)
+        self._lengths.pop(key, None)
+        if indexed is None:
+            return
+        namespace, band_keys = indexed
+        for buckets, band_key in zip(self._buckets, band_keys, strict=True):
+            bucket = buckets.get((namespace, band_key))
+            if bucket is None:
+                continue
+            bucket.discard(key)
+            if not bucket:
+                del buckets[(namespace, band_key)]
+
+    def clear(self) -> None:
+        for buckets in self._buckets:
+            buckets.clear()
+        self._band_keys.clear()
+        self._lengths.clear()
+
+    def candidates(self, normalized: str, threshold: float, limit: int) -> List[str]:
+        """Return up to `limit` keys in the same namespace sharing a band with `normalized`, most bands first."""
+        t = min(1.0, max(0.0, threshold))
+        length = len(normalized)
+        # ratio = 2M / (|a| + |b|) <= 2 * min / (|a| + |b|) bounds the candidate length.
+        min_len = length * t / (2.0 - t)
+        max_len = length * (2.0 - t) / t if t > 0.0 else float("inf")
+
+        namespace, text = _split_namespace(normalized)
+        shared: Counter[str] = Counter()
+        for buckets, band_key in zip(self._buckets, self._band_hashes(text), strict=True):
+            for key in buckets.get((namespace, band_key), ()):
+                if min_len <= self._lengths.get(key, 0) <= max_len:
+                    shared[key] += 1
+        return [key for key, _ in shared.most_common(max(1, limit))]
+
+
+class SearchCacheBackend(ABC):
+    """Shared (L2) tier: exact-key lookups, values are JSON-encoded result lists."""
+
+    name = "base"
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return cached results for `key`, or None if missing/expired."""
+
+    @abstractmethod
+    def set(self, key: str, query: str, payload: bytes, ttl_seconds: float) -> None:
+        """Store an encoded result list for `ttl_seconds`."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every entry owned by this cache."""
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+    def close(self) -> None:
+        return None
+
+
+class SQLiteSearchCacheBackend(SearchCacheBackend):
+    """L2 tier in a local SQLite file; shared by all workers on the host."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str | Path, *, max_bytes: int = 0) -> None:
+        self.path = Path(path)
+        self.max_bytes = max(0, int(max_bytes))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=10.0, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS search_cache (
+                    key TEXT PRIMARY KEY,
+                    query TEXT NOT NULL,
+                    payload BLOB NOT NULL,
+                    expires_at REAL NOT NULL,
+                    size_bytes INTEGER NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_search_cache_expires ON search_cache(expires_at)"
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM search_cache WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        if row is None:
+            return None
+        value = json.loads(bytes(row[0]).decode("utf-8"))
+        return value if isinstance(value, list) else None
+
+    def set(self, key: str, query: str, payload: bytes, ttl_seconds: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache VALUES (?, ?, ?, ?, ?)",
+                (key, query, payload, now + max(0.0, ttl_seconds), len(payload)),
+            )
+            self._conn.execute("DELETE FROM search_cache WHERE expires_at <= ?", (now,))
+            if self.max_bytes:
+                self._evict_locked()
+            self._conn.commit()
+
+    def _evict_locked(self) -> None:
+        row = self._conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM search_cache").fetchone()
+        total = int(row[0])
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        # Entries closest to expiry go first.
+        for key, size in self._conn.execute(
+            "SELECT key, size_bytes FROM search_cache ORDER BY expires_at ASC"
+        ):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= int(size)
+        self._conn.executemany("DELETE FROM search_cache WHERE key = ?", doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM search_cache")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM search_cache"
+            ).fetchone()
+        return {"entries": int(count), "bytes": int(size)}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RedisSearchCacheBackend(SearchCacheBackend):
+    """
+    L2 tier in Redis (or any server speaking the Redis protocol).
+
+    Pass `client` to use an existing connection; otherwise one is created from
+    `url` with the optional `redis` package. Redis handles TTL expiry.
+    """
+
+    name = "redis"
+
+    def __init__(
+        self,
+        url: str = "",
+        *,
+        client: Any = None,
+        prefix: str = "weaver:search_cache:",
+    ) -> None:
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url)
+        self._client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        raw = self._client.get(self.prefix + key)
+        if raw is None:
+            return None
+        if isinstance(raw, str):
+            raw = raw.encode("utf-8")
+        value = json.loads(bytes(raw).decode("utf-8"))
+        return value if isinstance(value, list) else None
+
+    def set(self, key: str, query: str, payload: bytes, ttl_seconds: float) -> None:
+        self._client.set(self.prefix + key, payload, ex=max(1, int(ttl_seconds)))
+
+    def clear(self) -> None:
+        keys = list(self._client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self._client.delete(*keys)
+
+    def close(self) -> None:
+        closer = getattr(self._client, "close", None)
+        if callable(closer):
+            closer()
 
 
 class SearchCache:
     """
-    Thread-safe LRU cache for search results.
+    Thread-safe tiered cache for search results.
 
     Features:
     - TTL-based expiration
-    - Semantic similarity matching (finds similar queries)
-    - LRU eviction when capacity reached
+    - Semantic similarity matching (finds similar queries) in L1
+    - LRU eviction by entry count and encoded byte size
+    - Optional shared L2 backend (exact matches, promoted into L1 on hit)
+    - Single-flight `get_or_compute` so concurrent misses search once
     - Thread-safe operations
     """
 
@@ -44,17 +322,30 @@ def __init__(
         max_size: int = 100,
         ttl_seconds: float = 3600,  # 1 hour default
         similarity_threshold: float = 0.85,
+        max_similar_candidates: int = 16,
+        max_bytes: int = 0,  # 0 = no byte budget
+        l2: Optional[SearchCacheBackend] = None,
+        flight: Optional[SingleFlight] = None,
     ):
         self.max_size = max_size
         self.ttl_seconds = ttl_seconds
         self.similarity_threshold = similarity_threshold
+        self.max_similar_candidates = max(1, int(max_similar_candidates))
+        self.max_bytes = max(0, int(max_bytes))
+        self.l2 = l2
+        self.flight = flight or SingleFlight()
         self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._index = _QueryIndex()
+        self._bytes = 0
         self._lock = threading.RLock()
 
         # Stats
         self.hits = 0
         self.misses = 0
         self.similar_hits = 0
+        self.l2_hits = 0
+        self.l2_errors = 0
+        self.evictions = 0
 
     def _normalize_query(self, query: str) -> str:
         """Normalize query for consistent caching."""
@@ -70,46 +361,104 @@ def _is_expired(self, entry: CacheEntry) -> bool:
         return (time.time() - entry.timestamp) > self.ttl_seconds
 
     def _find_similar(self, query: str) -> Optional[CacheEntry]:
-        """Find a similar query in cache using fuzzy matching."""
+        """
+        Find a similar query in cache using the trigram index + fuzzy matching.
+
+        Only entries in the same key namespace are considered (the index
+        buckets by prefix): callers store different result shapes under
+        different prefixes, and a long query would otherwise outweigh the
+        prefix in the similarity ratio.
+        """
         normalized = self._normalize_query(query)
+        candidates = self._index.candidates(
+            normalized, self.similarity_threshold, self.max_similar_candidates
+        )
+
+        best: Optional[CacheEntry] = None
+        best_score = 0.0
+        for key in candidates:
+            entry = self._cache.get(key)
+            if entry is None or self._is_expired(entry):
+                continue
 
-        for key, entry in self._cache.items():
-            if self._is_expired(entry):
+            other = self._normalize_query(entry.query)
+            matcher = SequenceMatcher(None, normalized, other)
+            if matcher.quick_ratio() < self.similarity_threshold:
                 continue
+            similarity = matcher.ratio()
+            if similarity >= self.similarity_threshold and similarity > best_score:
+                best, best_score = entry, similarity
 
-            cached_normalized = self._normalize_query(entry.query)
-            similarity = SequenceMatcher(None, normalized, cached_normalized).ratio()
+        return best
 
-            if similarity >= self.similarity_threshold:
-                return entry
+    def _remove(self, key: str) -> None:
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size_bytes
+        self._index.discard(key)
 
-        return None
+    def _exact_locked(self, query_hash: str) -> Optional[CacheEntry]:
+        entry = self._cache.get(query_hash)
+        if entry is None:
+            return None
+        if self._is_expired(entry):
+            self._remove(query_hash)
+            return None
+        return entry
+
+    def _store_locked(
+        self,
+        query_hash: str,
+        query: str,
+        results: List[Dict[str, Any]],
+        size_bytes: int,
+        timestamp: float,
+    ) -> None:
+        self._remove(query_hash)
+        # Evict least recently used entries while over either budget
+        while self._cache and (
+            len(self._cache) >= self.max_size
+            or (self.max_bytes and self._bytes + size_bytes > self.max_bytes)
+        ):
+            oldest = next(iter(self._cache))
+            self._remove(oldest)
+            self.evictions += 1
+
+        self._cache[query_hash] = CacheEntry(
+            query=query,
+            results=results,
+            timestamp=timestamp,
+            size_bytes=size_bytes,
+        )
+        self._bytes += size_bytes
+        self._index.add(query_hash, self._normalize_query(query))
+
+    def peek(self, query: str) -> Optional[List[Dict[str, Any]]]:
+        """Exact, L1-only lookup that does not touch stats or LRU order."""
+        with self._lock:
+            entry = self._exact_locked(self._query_hash(query))
+            return entry.results if entry is not None else None
 
     def get(self, query: str) -> Optional[List[Dict[str, Any]]]:
         """
         Get cached results for a query.
 
-        Checks exact match first, then similar queries.
+        Checks exact match first, then similar queries, then the shared L2 tier.
 
         Returns:
             Cached results if found and not expired, None otherwise
         """
+        query_hash = self._query_hash(query)
         with self._lock:
-            query_hash = self._query_hash(query)
-
             # Try exact match first
-            if query_hash in self._cache:
-                entry = self._cache[query_hash]
-                if not self._is_expired(entry):
-                    # Move to end (most recently used)
-                    self._cache.move_to_end(query_hash)
-                    entry.hit_count += 1
-                    self.hits += 1
-                    logger.debug(f"[search_cache] Exact hit for: {query[:50]}")
-                    return entry.results
-                else:
-                    # Remove expired entry
-                    del self._cache[query_hash]
+            entry = self._exact_locked(query_hash)
+            if entry is not None:
+                # Move to end (most recently used)
+                self._cache.move_to_end(query_hash)
+                entry.hit_count += 1
+                self.hits += 1
+                logger.debug(f"[search_cache] Exact hit for: {query[:50]}")
+                return entry.results
 
             # Try similar query match
             similar_entry = self._find_similar(query)
@@ -119,67 +468,167 @@ def get(self, query: str) -> Optional[List[Dict[str, Any]]]:
                 logger.debug(f"[search_cache] Similar hit for: {query[:50]}")
                 return similar_entry.results
 
-            self.misses += 1
+        # L2 I/O happens outside the lock so a slow backend never blocks L1 readers.
+        results = self._l2_get(query_hash)
+        with self._lock:
+            if results is None:
+                self.misses += 1
+                return None
+            self.l2_hits += 1
+            size_bytes = len(_encode_results(results))
+            self._store_locked(query_hash, query, results, size_bytes, time.time())
+        logger.debug(f"[search_cache] L2 hit for: {query[:50]}")
+        return results
+
+    def _l2_get(self, query_hash: str) -> Optional[List[Dict[str, Any]]]:
+        if self.l2 is None:
+            return None
+        try:
+            return self.l2.get(query_hash)
+        except Exception as e:
+            with self._lock:
+                self.l2_errors += 1
+            logger.debug(f"[search_cache] L2 get failed: {e}")
             return None
 
     def set(self, query: str, results: List[Dict[str, Any]]) -> None:
-        """Cache search results for a query."""
+        """Cache search results for a query (L1 and, if configured, L2)."""
+        query_hash = self._query_hash(query)
+        payload = _encode_results(results)
         with self._lock:
-            query_hash = self._query_hash(query)
+            self._store_locked(query_hash, query, results, len(payload), time.time())
 
-            # Evict oldest if at capacity
-            while len(self._cache) >= self.max_size:
-                self._cache.popitem(last=False)
+        if self.l2 is None:
+            return
+        try:
+            self.l2.set(query_hash, query, payload, float(self.ttl_seconds))
+        except Exception as e:
+            with self._lock:
+                self.l2_errors += 1
+            logger.debug(f"[search_cache] L2 set failed: {e}")
 
-            self._cache[query_hash] = CacheEntry(
-                query=query,
-                results=results,
-                timestamp=time.time(),
-            )
+    def get_or_compute(
+        self,
+        query: str,
+        compute: Callable[[], Optional[List[Dict[str, Any]]]],
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return cached results, or run `compute` once for all concurrent callers.
+
+        Non-empty results are cached. Callers that waited on another thread's
+        computation receive a deep copy.
+        """
+        cached = self.get(query)
+        if cached is not None:
+            return cached
+
+        def _load() -> Optional[List[Dict[str, Any]]]:
+            # A previous leader may have filled the entry between our miss and now.
+            filled = self.peek(query)
+            if filled is not None:
+                return filled
+            results = compute()
+            if results:
+                self.set(query, results)
+            return results
+
+        results, shared = self.flight.do(self._query_hash(query), _load)
+        return copy.deepcopy(results) if shared else results
 
     def clear(self) -> None:
-        """Clear all cached entries."""
+        """Clear all cached entries (including the shared tier)."""
         with self._lock:
             self._cache.clear()
+            self._index.clear()
+            self._bytes = 0
             self.hits = 0
             self.misses = 0
             self.similar_hits = 0
+            self.l2_hits = 0
+            self.l2_errors = 0
+            self.evictions = 0
+            self.flight.reset_stats()
+        if self.l2 is not None:
+            try:
+                self.l2.clear()
+            except Exception as e:
+                logger.debug(f"[search_cache] L2 clear failed: {e}")
 
     def cleanup_expired(self) -> int:
         """Remove all expired entries. Returns count of removed entries."""
         with self._lock:
             expired_keys = [k for k, v in self._cache.items() if self._is_expired(v)]
             for k in expired_keys:
-                del self._cache[k]
+                self._remove(k)
             return len(expired_keys)
 
     def stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
         with self._lock:
-            total_requests = self.hits + self.similar_hits + self.misses
-            hit_rate = (self.hits + self.similar_hits) / max(total_requests, 1)
+            total_requests = self.hits + self.similar_hits + self.l2_hits + self.misses
+            hit_rate = (self.hits + self.similar_hits + self.l2_hits) / max(total_requests, 1)
 
-            return {
+            stats: Dict[str, Any] = {
                 "size": len(self._cache),
                 "max_size": self.max_size,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
                 "hits": self.hits,
                 "similar_hits": self.similar_hits,
+                "l2_hits": self.l2_hits,
                 "misses": self.misses,
+                "evictions": self.evictions,
+                "coalesced": self.flight.coalesced,
                 "hit_rate": round(hit_rate, 3),
+                "backend": self.l2.name if self.l2 is not None else "memory",
+                "l2_errors": self.l2_errors,
+                "l2_entries": None,
             }
 
+        if self.l2 is not None:
+            try:
+                stats["l2_entries"] = self.l2.stats().get("entries")
+            except Exception:
+                pass
+        return stats
+
+
+def _build_l2_backend(settings: Any) -> Optional[SearchCacheBackend]:
+    backend = str(getattr(settings, "search_cache_backend", "memory") or "memory").strip().lower()
+    url = str(getattr(settings, "search_cache_url", "") or "").strip()
+    if backend == "sqlite":
+        path = url or "data/search_cache.sqlite3"
+        max_bytes = int(getattr(settings, "search_cache_l2_max_bytes", 0) or 0)
+        return SQLiteSearchCacheBackend(path, max_bytes=max_bytes)
+    if backend == "redis":
+        if not url:
+            raise ValueError("search_cache_url is required when search_cache_backend=redis")
+        return RedisSearchCacheBackend(url)
+    return None
+
 
 # Global cache instance
 _search_cache: Optional[SearchCache] = None
+_search_cache_lock = threading.Lock()
 
 
 def get_search_cache() -> SearchCache:
     """Get the global search cache instance."""
     global _search_cache
-    if _search_cache is None:
+    if _search_cache is not None:
+        return _search_cache
+    with _search_cache_lock:
+        if _search_cache is not None:
+            return _search_cache
         try:
             from common.config import settings
 
+            l2: Optional[SearchCacheBackend] = None
+            try:
+                l2 = _build_l2_backend(settings)
+            except Exception as e:
+                logger.warning(f"[search_cache] shared tier unavailable, using L1 only: {e}")
+
             _search_cache = SearchCache(
                 max_size=max(1, int(getattr(settings, "search_cache_max_size", 200))),
                 ttl_seconds=max(
@@ -189,6 +638,9 @@ def get_search_cache() -> SearchCache:
                     1.0,
                     max(0.0, float(getattr(settings, "search_cache_similarity_threshold", 0.9))),
                 ),
+                max_bytes=max(0, int(getattr(settings, "search_cache_max_bytes", 0) or 0)),
+                l2=l2,
+                flight=get_single_flight("search"),
             )
         except Exception:
             _search_cache = SearchCache()
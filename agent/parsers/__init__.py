@@ -1,3 +1,3 @@
-from .xml_parser import XMLToolCall, XMLToolParser
+from .xml_parser import StreamingXMLToolParser, XMLToolCall, XMLToolParser
 
-__all__ = ["XMLToolCall", "XMLToolParser"]
+__all__ = ["StreamingXMLToolParser", "XMLToolCall", "XMLToolParser"]
@@ -136,35 +136,35 @@ def parse_content(self, content: str) -> List[XMLToolCall]:
                 invoke_matches = self.INVOKE_PATTERN.findall(fc_content)
 
                 for function_name, invoke_content in invoke_matches:
-                    parameters = {}
+                    tool_calls.append(self._build_call(function_name, invoke_content))
 
-                    # Layer 3: Extract parameters
-                    param_matches = self.PARAMETER_PATTERN.findall(invoke_content)
+        except Exception as e:
+            logger.error(f"Error parsing XML tool calls: {e}", exc_info=True)
+            self.parse_errors += 1
 
-                    for param_name, param_value in param_matches:
-                        # Parse parameter value with type inference
-                        parsed_value = self._parse_parameter_value(param_value.strip())
-                        parameters[param_name] = parsed_value
+        return tool_calls
 
-                    # Create tool call
-                    tool_call = XMLToolCall(
-                        function_name=function_name.strip(),
-                        parameters=parameters,
-                        raw_xml=f'<invoke name="{function_name}">{invoke_content}</invoke>',
-                    )
+    def _build_call(self, function_name: str, invoke_content: str) -> XMLToolCall:
+        """Build a tool call from one `<invoke>` match (layer 3: parameters)."""
+        parameters = {}
 
-                    tool_calls.append(tool_call)
-                    self.parsed_calls += 1
+        # Layer 3: Extract parameters
+        param_matches = self.PARAMETER_PATTERN.findall(invoke_content)
 
-                    logger.debug(
-                        f"Parsed XML tool call: {function_name} with {len(parameters)} parameters"
-                    )
+        for param_name, param_value in param_matches:
+            # Parse parameter value with type inference
+            parsed_value = self._parse_parameter_value(param_value.strip())
+            parameters[param_name] = parsed_value
 
-        except Exception as e:
-            logger.error(f"Error parsing XML tool calls: {e}", exc_info=True)
-            self.parse_errors += 1
+        tool_call = XMLToolCall(
+            function_name=function_name.strip(),
+            parameters=parameters,
+            raw_xml=f'<invoke name="{function_name}">{invoke_content}</invoke>',
+        )
+        self.parsed_calls += 1
 
-        return tool_calls
+        logger.debug(f"Parsed XML tool call: {function_name} with {len(parameters)} parameters")
+        return tool_call
 
     def _parse_parameter_value(self, value: str) -> Any:
         """
@@ -222,9 +222,10 @@ def parse_streaming_content(
         """
         Parse tool calls from streaming content.
 
-        This method is optimized for streaming scenarios where content
-        is received incrementally. It only returns new tool calls that
-        weren't in the previous parse.
+        Re-parses the whole buffer on every call, so it is quadratic over a
+        stream; prefer `StreamingXMLToolParser`, which consumes only new
+        chunks. It only returns new tool calls that weren't in the previous
+        parse.
 
         Args:
             accumulated_content: Accumulated content so far
@@ -309,6 +310,103 @@ def get_statistics(self) -> Dict[str, int]:
         return {"parsed_calls": self.parsed_calls, "parse_errors": self.parse_errors}
 
 
+class StreamingXMLToolParser:
+    """
+    Incremental XML tool-call parser for streamed responses.
+
+    `feed()` consumes only the new chunk and returns each `<invoke>` as soon
+    as its `</invoke>` arrives inside an open `<function_calls>` block, so
+    callers can start a tool while the model is still writing the rest.
+    Chunks without a tag boundary are only scanned together with a short
+    tail of the previous chunk (a tag may be split across chunks); text of
+    the open block is joined once, when a closing tag arrives.
+
+    Calls match what `XMLToolParser.parse_content` returns for the same
+    text once the `<function_calls>` block is closed (same patterns, same
+    parameter typing).
+    """
+
+    OPEN_BLOCK = re.compile(r"<function_calls>", re.IGNORECASE)
+    CLOSE_BLOCK = re.compile(r"</function_calls>", re.IGNORECASE)
+    CLOSE_INVOKE = re.compile(r"</invoke>", re.IGNORECASE)
+    OPEN_INVOKE = re.compile(r"<invoke[\s>]", re.IGNORECASE)
+    ANY_TAG = re.compile(r"</?function_calls>|</invoke>", re.IGNORECASE)
+
+    # Longest tag we look for, minus one.
+    _TAIL = len("</function_calls>") - 1
+
+    def __init__(self, parser: Optional[XMLToolParser] = None):
+        self.parser = parser or XMLToolParser()
+        self._parts: List[str] = []  # unconsumed text of the open block
+        self._tail = ""  # last few chars seen, to catch tags split across chunks
+        self.in_function_calls = False
+        self.calls: List[XMLToolCall] = []
+
+    @property
+    def open_invoke(self) -> bool:
+        """Whether an `<invoke>` has started in the open block but not closed yet."""
+        return self.in_function_calls and bool(self.OPEN_INVOKE.search("".join(self._parts)))
+
+    def feed(self, chunk: str) -> List[XMLToolCall]:
+        """Consume a chunk; returns tool calls completed by it (in order)."""
+        if not chunk:
+            return []
+        window = self._tail + chunk
+        if not self.ANY_TAG.search(window):
+            if self.in_function_calls:
+                self._parts.append(chunk)
+            self._tail = window[-self._TAIL :]
+            return []
+
+        text = "".join(self._parts) + chunk if self.in_function_calls else window
+        new_calls = self._consume(text)
+        return new_calls
+
+    def _consume(self, text: str) -> List[XMLToolCall]:
+        new_calls: List[XMLToolCall] = []
+        while True:
+            if not self.in_function_calls:
+                match = self.OPEN_BLOCK.search(text)
+                if match is None:
+                    break
+                self.in_function_calls = True
+                text = text[match.end() :]
+                continue
+
+            close_invoke = self.CLOSE_INVOKE.search(text)
+            close_block = self.CLOSE_BLOCK.search(text)
+            if close_invoke is not None and (close_block is None or close_invoke.start() < close_block.start()):
+                # Same rule as batch parsing: non-greedy invoke up to the first </invoke>.
+                invoke = XMLToolParser.INVOKE_PATTERN.search(text, 0, close_invoke.end())
+                if invoke is not None:
+                    try:
+                        call = self.parser._build_call(invoke.group(1), invoke.group(2))
+                    except Exception as e:
+                        logger.error(f"Error parsing streamed XML tool call: {e}", exc_info=True)
+                        self.parser.parse_errors += 1
+                    else:
+                        self.calls.append(call)
+                        new_calls.append(call)
+                text = text[close_invoke.end() :]
+                continue
+            if close_block is not None:
+                self.in_function_calls = False
+                text = text[close_block.end() :]
+                continue
+            break
+
+        # Outside a block only a possibly split opening tag needs keeping.
+        self._parts = [text] if self.in_function_calls and text else []
+        self._tail = text[-self._TAIL :]
+        return new_calls
+
+    def reset(self) -> None:
+        self._parts = []
+        self._tail = ""
+        self.in_function_calls = False
+        self.calls = []
+
+
 # Utility functions
 
 
@@ -52,10 +52,10 @@
     "ContinuationHandler": "agent.workflows.continuation",
     "ContinuationState": "agent.workflows.continuation",
     "ToolResultInjector": "agent.workflows.continuation",
-    # Search cache (workflow-local)
+    # Search cache (shared tiered cache) + workflow query dedup
     "QueryDeduplicator": "agent.workflows.search_cache",
-    "SearchCache": "agent.workflows.search_cache",
-    "get_search_cache": "agent.workflows.search_cache",
+    "SearchCache": "agent.core.search_cache",
+    "get_search_cache": "agent.core.search_cache",
 }
 
 
@@ -7,7 +7,7 @@
 import re
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Sequence, Set, Union
 
 from agent.workflows.source_registry import SourceRegistry
 
@@ -90,6 +90,66 @@ class ClaimCheck:
     notes: str = ""
 
 
+@dataclass
+class _PreparedEvidence:
+    url: str
+    tokens: Set[str]
+    negated: bool
+    trend: int
+    payload: Dict[str, Any]
+
+
+class EvidenceIndex:
+    """
+    Evidence tokenized once, with a token -> evidence inverted index.
+
+    `verify_report` checks every claim against the same evidence, so tokens and
+    negation/trend flags are computed once per item instead of once per
+    (claim, item) pair, and a claim only visits items sharing one of its tokens.
+    """
+
+    def __init__(self, verifier: "ClaimVerifier", evidence: Sequence[Dict[str, Any]]):
+        self.items: List[_PreparedEvidence] = []
+        self.postings: Dict[str, List[int]] = {}
+        for item in evidence:
+            text = str(item.get("text") or "").strip()
+            prepared = _PreparedEvidence(
+                url=str(item.get("url") or "").strip() or "unknown",
+                tokens=verifier._tokenize(text),
+                negated=verifier._has_negation(text),
+                trend=verifier._trend_direction(text),
+                payload=_passage_payload(item),
+            )
+            idx = len(self.items)
+            self.items.append(prepared)
+            for token in prepared.tokens:
+                self.postings.setdefault(token, []).append(idx)
+
+    def candidates(self, claim_tokens: Set[str], min_overlap: int) -> List[tuple[int, int]]:
+        """(item index, overlap) for items sharing at least `min_overlap` tokens, in input order."""
+        counts: Dict[int, int] = {}
+        for token in claim_tokens:
+            for idx in self.postings.get(token, ()):
+                counts[idx] = counts.get(idx, 0) + 1
+        return sorted((idx, n) for idx, n in counts.items() if n >= min_overlap)
+
+
+def _passage_payload(item: Dict[str, Any]) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {
+        "url": str(item.get("url") or "").strip() or "unknown",
+    }
+    snippet_hash = str(item.get("snippet_hash") or "").strip()
+    if snippet_hash:
+        payload["snippet_hash"] = snippet_hash
+    quote = str(item.get("quote") or "").strip()
+    if quote:
+        payload["quote"] = quote
+    heading_path = item.get("heading_path")
+    if isinstance(heading_path, list) and all(isinstance(p, str) for p in heading_path):
+        payload["heading_path"] = heading_path
+    return payload
+
+
 class ClaimVerifier:
     """Deterministic claim-to-evidence matcher."""
 
@@ -135,44 +195,37 @@ def verify_report(
         claims = self.extract_claims(report, max_claims=max_claims)
         if not claims:
             return []
-        evidence = self._extract_evidence(scraped_content, passages=passages)
-        return [self.verify_claim(claim, evidence) for claim in claims]
+        index = self.build_index(self._extract_evidence(scraped_content, passages=passages))
+        return [self.verify_claim(claim, index) for claim in claims]
+
+    def build_index(self, evidence: Sequence[Dict[str, Any]]) -> EvidenceIndex:
+        return EvidenceIndex(self, evidence)
 
-    def verify_claim(self, claim: str, evidence: List[Dict[str, Any]]) -> ClaimCheck:
+    def verify_claim(
+        self,
+        claim: str,
+        evidence: Union[EvidenceIndex, Sequence[Dict[str, Any]]],
+    ) -> ClaimCheck:
         claim_tokens = self._tokenize(claim)
         if not claim_tokens:
             return ClaimCheck(claim=claim, status=ClaimStatus.UNSUPPORTED)
 
+        index = evidence if isinstance(evidence, EvidenceIndex) else self.build_index(evidence)
+        claim_negated = self._has_negation(claim)
+        claim_trend = self._trend_direction(claim)
+
         supported: List[tuple[int, str, Dict[str, Any]]] = []
         contradicted: List[tuple[int, str, Dict[str, Any]]] = []
         best_overlap = 0
 
-        for item in evidence:
-            url = str(item.get("url") or "").strip() or "unknown"
-            text = str(item.get("text") or "").strip()
-            evidence_tokens = self._tokenize(text)
-            overlap = len(claim_tokens & evidence_tokens)
-            if overlap < self.min_overlap_tokens:
-                continue
-
+        for idx, overlap in index.candidates(claim_tokens, self.min_overlap_tokens):
+            item = index.items[idx]
             best_overlap = max(best_overlap, overlap)
-            passage_payload: Dict[str, Any] = {
-                "url": url,
-            }
-            snippet_hash = str(item.get("snippet_hash") or "").strip()
-            if snippet_hash:
-                passage_payload["snippet_hash"] = snippet_hash
-            quote = str(item.get("quote") or "").strip()
-            if quote:
-                passage_payload["quote"] = quote
-            heading_path = item.get("heading_path")
-            if isinstance(heading_path, list) and all(isinstance(p, str) for p in heading_path):
-                passage_payload["heading_path"] = heading_path
-
-            if self._is_contradiction(claim, text):
-                contradicted.append((overlap, url, passage_payload))
+            row = (overlap, item.url, dict(item.payload))
+            if self._flags_conflict(claim_negated, claim_trend, item.negated, item.trend):
+                contradicted.append(row)
             else:
-                supported.append((overlap, url, passage_payload))
+                supported.append(row)
 
         contradicted.sort(key=lambda row: -row[0])
         supported.sort(key=lambda row: -row[0])
@@ -280,14 +333,15 @@ def _trend_direction(self, text: str) -> int:
         return 0
 
     def _is_contradiction(self, claim: str, evidence: str) -> bool:
-        claim_neg = self._has_negation(claim)
-        evidence_neg = self._has_negation(evidence)
-        if claim_neg != evidence_neg:
-            return True
+        return self._flags_conflict(
+            self._has_negation(claim),
+            self._trend_direction(claim),
+            self._has_negation(evidence),
+            self._trend_direction(evidence),
+        )
 
-        claim_dir = self._trend_direction(claim)
-        evidence_dir = self._trend_direction(evidence)
-        if claim_dir != 0 and evidence_dir != 0 and claim_dir != evidence_dir:
+    @staticmethod
+    def _flags_conflict(claim_neg: bool, claim_dir: int, evidence_neg: bool, evidence_dir: int) -> bool:
+        if claim_neg != evidence_neg:
             return True
-
-        return False
+        return claim_dir != 0 and evidence_dir != 0 and claim_dir != evidence_dir
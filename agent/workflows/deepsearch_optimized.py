@@ -32,9 +32,11 @@
 from agent.core.llm_factory import create_chat_model
 from agent.core.search_cache import get_search_cache
 from agent.workflows.domain_router import ResearchDomain, build_provider_profile
+from agent.workflows.epoch_pipeline import EpochFetchPipeline
 from agent.workflows.evidence_passages import split_into_passages
 from agent.workflows.knowledge_gap import KnowledgeGapAnalyzer
 from agent.workflows.parsing_utils import format_search_results, parse_list_output
+from agent.workflows.passage_ranker import select_top_passages
 from agent.workflows.query_strategy import (
     analyze_query_coverage,
     backfill_diverse_queries,
@@ -45,6 +47,7 @@
 from agent.workflows.source_url_utils import canonicalize_source_url, compact_unique_sources
 from common.cancellation import check_cancellation as _check_cancel_token
 from common.config import settings
+from common.http_client import run_on_http_loop
 from prompts.templates.deepsearch import (
     final_summary_prompt,
     formulate_query_prompt,
@@ -301,11 +304,19 @@ def _budget_stop_reason(
     return None
 
 
+def _remaining_seconds(start_ts: float, max_seconds: float) -> Optional[float]:
+    """Time left in the deepsearch budget, or None when it is unbounded."""
+    if max_seconds <= 0:
+        return None
+    return max(0.0, max_seconds - (time.time() - start_ts))
+
+
 def _search_query(
     query: str,
     max_results: int,
     config: Dict[str, Any],
     provider_profile: Optional[List[str]] = None,
+    deadline_s: Optional[float] = None,
 ) -> List[Dict[str, Any]]:
     """Search with multi-provider orchestration first, then Tavily fallback."""
     strategy = _resolve_search_strategy()
@@ -324,6 +335,8 @@ def _search_query(
         }
         if provider_profile:
             kwargs["provider_profile"] = provider_profile
+        if deadline_s is not None:
+            kwargs["deadline_s"] = deadline_s
         multi_results = multi_search(**kwargs)
         normalized = _normalize_multi_search_results(multi_results)
         if normalized:
@@ -758,95 +771,144 @@ def _hydrate_with_crawler(results: List[Dict[str, Any]]) -> None:
                 r["summary"] = content[:400]
 
 
-def _build_fetcher_evidence(urls: List[str]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
-    if not bool(getattr(settings, "deepsearch_enable_research_fetcher", False)):
-        return [], []
+def _evidence_looks_like_cookie_banner(text: str) -> bool:
+    if not text:
+        return False
+    lowered = str(text).lower()
+    if "cookie" not in lowered:
+        return False
+    return bool(
+        "accept" in lowered
+        or "consent" in lowered
+        or "preferences" in lowered
+        or "manage cookies" in lowered
+        or "cookie settings" in lowered
+        or "reject" in lowered
+    )
 
-    def _looks_like_cookie_banner(text: str) -> bool:
-        if not text:
-            return False
-        lowered = str(text).lower()
-        if "cookie" not in lowered:
-            return False
-        return bool(
-            "accept" in lowered
-            or "consent" in lowered
-            or "preferences" in lowered
-            or "manage cookies" in lowered
-            or "cookie settings" in lowered
-            or "reject" in lowered
-        )
 
-    def _looks_like_interstitial(text: str) -> bool:
-        if not text:
-            return False
-        lowered = str(text).lower()
-        if "please enable javascript" in lowered:
-            return True
-        if "enable javascript" in lowered and ("cookies" in lowered or "continue" in lowered):
-            return True
-        if "checking your browser" in lowered:
-            return True
-        if "verify you are human" in lowered:
-            return True
-        if "just a moment" in lowered and "checking your browser" in lowered:
-            return True
+def _evidence_looks_like_interstitial(text: str) -> bool:
+    if not text:
         return False
+    lowered = str(text).lower()
+    if "please enable javascript" in lowered:
+        return True
+    if "enable javascript" in lowered and ("cookies" in lowered or "continue" in lowered):
+        return True
+    if "checking your browser" in lowered:
+        return True
+    if "verify you are human" in lowered:
+        return True
+    if "just a moment" in lowered and "checking your browser" in lowered:
+        return True
+    return False
 
-    def _passage_quality_score(passage: Dict[str, Any]) -> float:
-        text = passage.get("text") or ""
-        if not isinstance(text, str):
-            text = str(text)
-        stripped = text.strip()
-        if not stripped:
-            return -1e9
-        if _looks_like_interstitial(stripped) or _looks_like_cookie_banner(stripped):
-            return -1e9
-
-        length = len(stripped)
-        sentence_marks = sum(stripped.count(ch) for ch in (".", "?", "!", "。", "？", "！"))
-        pipes = stripped.count("|")
-        score = min(length, 800) / 800.0
-        score += min(sentence_marks, 12) / 12.0
-        if pipes >= 10:
-            score -= 0.5
-        return float(score)
-
-    def _select_passages(passages: List[Dict[str, Any]], *, max_count: int) -> List[Dict[str, Any]]:
-        if not passages:
-            return []
-        scored: List[tuple[float, Dict[str, Any]]] = [(_passage_quality_score(p), p) for p in passages]
-        candidates = [(s, p) for s, p in scored if s > -1e8]
-        if not candidates:
-            return passages[:max(1, max_count)]
-        candidates.sort(
-            key=lambda pair: (
-                -pair[0],
-                int((pair[1].get("start_char") or 0) if isinstance(pair[1], dict) else 0),
-            )
+
+def _evidence_passage_quality_score(passage: Dict[str, Any]) -> float:
+    text = passage.get("text") or ""
+    if not isinstance(text, str):
+        text = str(text)
+    stripped = text.strip()
+    if not stripped:
+        return -1e9
+    if _evidence_looks_like_interstitial(stripped) or _evidence_looks_like_cookie_banner(stripped):
+        return -1e9
+
+    length = len(stripped)
+    sentence_marks = sum(stripped.count(ch) for ch in (".", "?", "!", "。", "？", "！"))
+    pipes = stripped.count("|")
+    score = min(length, 800) / 800.0
+    score += min(sentence_marks, 12) / 12.0
+    if pipes >= 10:
+        score -= 0.5
+    return float(score)
+
+
+def _select_evidence_passages(passages: List[Dict[str, Any]], *, max_count: int) -> List[Dict[str, Any]]:
+    if not passages:
+        return []
+    scored: List[tuple[float, Dict[str, Any]]] = [(_evidence_passage_quality_score(p), p) for p in passages]
+    candidates = [(s, p) for s, p in scored if s > -1e8]
+    if not candidates:
+        return passages[:max(1, max_count)]
+    candidates.sort(
+        key=lambda pair: (
+            -pair[0],
+            int((pair[1].get("start_char") or 0) if isinstance(pair[1], dict) else 0),
         )
-        best = [p for _s, p in candidates[: max(1, max_count)]]
-        best.sort(key=lambda p: int((p.get("start_char") or 0) if isinstance(p, dict) else 0))
-        return best
+    )
+    best = [p for _s, p in candidates[: max(1, max_count)]]
+    best.sort(key=lambda p: int((p.get("start_char") or 0) if isinstance(p, dict) else 0))
+    return best
 
-    def _collapse_whitespace(text: str) -> str:
-        return re.sub(r"\s+", " ", str(text or "")).strip()
 
-    def _quote_for_passage(text: str, *, max_chars: int = 240) -> str:
-        normalized = _collapse_whitespace(text)
-        if not normalized:
-            return ""
-        return normalized[: max(1, int(max_chars))]
+def _evidence_collapse_whitespace(text: str) -> str:
+    return re.sub(r"\s+", " ", str(text or "")).strip()
 
-    def _snippet_hash_for_passage(text: str) -> str:
-        normalized = _collapse_whitespace(text)
-        if not normalized:
-            return ""
-        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
 
-    fetcher = ContentFetcher()
-    fetched_pages: List[Dict[str, Any]] = []
+def _evidence_quote_for_passage(text: str, *, max_chars: int = 240) -> str:
+    normalized = _evidence_collapse_whitespace(text)
+    if not normalized:
+        return ""
+    return normalized[: max(1, int(max_chars))]
+
+
+def _evidence_snippet_hash(text: str) -> str:
+    normalized = _evidence_collapse_whitespace(text)
+    if not normalized:
+        return ""
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _evidence_passages_for_page(page: Any) -> List[Dict[str, Any]]:
+    text = page.markdown or page.text or ""
+    if not isinstance(text, str) or not text.strip():
+        return []
+
     passages: List[Dict[str, Any]] = []
+    page_passages = split_into_passages(text, max_chars=800)
+    per_page = max(1, int(getattr(settings, "deepsearch_evidence_passages_per_page", 30) or 30))
+    for passage in _select_evidence_passages(page_passages, max_count=per_page):
+        enriched = {"url": page.url, **passage}
+        page_title = getattr(page, "title", None)
+        if page_title:
+            enriched["page_title"] = page_title
+        retrieved_at = getattr(page, "retrieved_at", None)
+        if retrieved_at:
+            enriched["retrieved_at"] = retrieved_at
+        method = getattr(page, "method", None)
+        if method:
+            enriched["method"] = method
+
+        quote = _evidence_quote_for_passage(enriched.get("text") or "")
+        if quote:
+            enriched["quote"] = quote
+        snippet_hash = _evidence_snippet_hash(enriched.get("text") or "")
+        if snippet_hash:
+            enriched["snippet_hash"] = snippet_hash
+        passages.append(enriched)
+    return passages
+
+
+def _rank_evidence_passages(
+    passages: List[Dict[str, Any]],
+    queries: List[str],
+) -> List[Dict[str, Any]]:
+    """Keep the run-wide top-K passages by BM25 relevance to the research queries."""
+    top_k = int(getattr(settings, "deepsearch_evidence_passages_top_k", 40) or 0)
+    if top_k <= 0 or len(passages) <= top_k:
+        return passages
+    ranked = select_top_passages(
+        passages,
+        queries,
+        top_k=top_k,
+        tiebreak=_evidence_passage_quality_score,
+    )
+    logger.info(f"[deepsearch] evidence passages: {len(passages)} -> {len(ranked)} (BM25 top-{top_k})")
+    return ranked
+
+
+def _canonical_fetch_targets(urls: List[str]) -> List[str]:
     canonical_urls: List[str] = []
     seen: set = set()
     for url in urls or []:
@@ -855,36 +917,124 @@ def _snippet_hash_for_passage(text: str) -> str:
             continue
         seen.add(canonical_url)
         canonical_urls.append(canonical_url)
+    return canonical_urls
+
+
+async def _abuild_fetcher_evidence(
+    urls: List[str],
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Streaming variant: split passages for each page as soon as it arrives.
+
+    Pages arrive in completion order; results are returned in input order so
+    evidence does not depend on network timing.
+    """
+    if not bool(getattr(settings, "deepsearch_enable_research_fetcher", False)):
+        return [], []
 
-    for page in fetcher.fetch_many(canonical_urls):
+    fetcher = ContentFetcher()
+    targets = _canonical_fetch_targets(urls)
+    position = {url: i for i, url in enumerate(targets)}
+    arrived: List[Tuple[int, int, Dict[str, Any], List[Dict[str, Any]]]] = []
+    async for page in fetcher.afetch_many(targets):
+        rank = position.get(page.raw_url, position.get(page.url, len(targets)))
+        arrived.append((rank, len(arrived), page.to_dict(), _evidence_passages_for_page(page)))
+
+    arrived.sort(key=lambda item: (item[0], item[1]))
+    fetched_pages = [page for _rank, _seq, page, _passages in arrived]
+    passages = [p for _rank, _seq, _page, page_passages in arrived for p in page_passages]
+    return fetched_pages, passages
+
+
+def _has_running_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _build_fetcher_evidence(urls: List[str]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    if not bool(getattr(settings, "deepsearch_enable_research_fetcher", False)):
+        return [], []
+
+    if bool(getattr(settings, "research_fetch_async", True)) and not _has_running_loop():
+        # The shared background loop keeps its AsyncClient (and keep-alive pool) between calls.
+        return run_on_http_loop(_abuild_fetcher_evidence(urls))
+
+    fetcher = ContentFetcher()
+    fetched_pages: List[Dict[str, Any]] = []
+    passages: List[Dict[str, Any]] = []
+    for page in fetcher.fetch_many(_canonical_fetch_targets(urls)):
         fetched_pages.append(page.to_dict())
+        passages.extend(_evidence_passages_for_page(page))
+
+    return fetched_pages, passages
+
+
+def _start_epoch_pipeline() -> Optional[EpochFetchPipeline]:
+    """Start background fetch/passage stages for one epoch, or None when not enabled."""
+    if not bool(getattr(settings, "deepsearch_enable_research_fetcher", False)):
+        return None
+    if not bool(getattr(settings, "deepsearch_pipeline_enabled", True)):
+        return None
+
+    fetcher = ContentFetcher()
+    use_async = bool(getattr(settings, "research_fetch_async", True))
+    return EpochFetchPipeline(
+        fetcher.afetch if use_async else fetcher.fetch,
+        _evidence_passages_for_page,
+        workers=max(1, int(getattr(settings, "research_fetch_concurrency", 6) or 6)),
+        per_domain=int(getattr(settings, "research_fetch_concurrency_per_domain", 2) or 0),
+        queue_size=max(1, int(getattr(settings, "deepsearch_pipeline_queue_size", 16) or 16)),
+    )
+
 
-        text = page.markdown or page.text or ""
-        if not isinstance(text, str) or not text.strip():
+def _promising_urls(
+    results: List[Dict[str, Any]],
+    selected_urls_set: set,
+    limit: int,
+) -> List[str]:
+    """Highest-scored unselected URLs of one search, fetched before the LLM pick finishes."""
+    if limit <= 0:
+        return []
+    ranked = sorted(
+        (r for r in results or [] if isinstance(r, dict)),
+        key=lambda r: r.get("score", 0) or 0,
+        reverse=True,
+    )
+    urls: List[str] = []
+    for r in ranked:
+        url = canonicalize_source_url(r.get("url"))
+        if not url or url in selected_urls_set or url in urls:
             continue
+        urls.append(url)
+        if len(urls) >= limit:
+            break
+    return urls
 
-        page_passages = split_into_passages(text, max_chars=800)
-        for passage in _select_passages(page_passages, max_count=10):
-            enriched = {"url": page.url, **passage}
-            page_title = getattr(page, "title", None)
-            if page_title:
-                enriched["page_title"] = page_title
-            retrieved_at = getattr(page, "retrieved_at", None)
-            if retrieved_at:
-                enriched["retrieved_at"] = retrieved_at
-            method = getattr(page, "method", None)
-            if method:
-                enriched["method"] = method
-
-            quote = _quote_for_passage(enriched.get("text") or "")
-            if quote:
-                enriched["quote"] = quote
-            snippet_hash = _snippet_hash_for_passage(enriched.get("text") or "")
-            if snippet_hash:
-                enriched["snippet_hash"] = snippet_hash
-            passages.append(enriched)
 
-    return fetched_pages, passages
+def _log_epoch_stage_timings(
+    epoch: int,
+    stage_seconds: Dict[str, float],
+    pipeline: Optional[EpochFetchPipeline],
+) -> None:
+    """One-line per-stage breakdown; with the pipeline, also how much fetch time was hidden."""
+    parts = [f"{name}={seconds:.2f}s" for name, seconds in stage_seconds.items()]
+    line = f"[deepsearch] Epoch {epoch}: 阶段耗时 " + " ".join(parts)
+    if pipeline is not None:
+        fetch = pipeline.fetch_timing
+        split = pipeline.passage_timing
+        # A barrier epoch pays the whole fetch span plus passage splitting on the critical path.
+        barrier_cost = fetch.span_s + split.busy_s
+        saved = max(0.0, barrier_cost - pipeline.collect_wait_s)
+        line += (
+            f" | fetch={fetch.span_s:.2f}s (提交 {pipeline.submitted_count} / 完成 {fetch.items})"
+            f" passages={split.busy_s:.2f}s"
+            f" | 等待抓取 {pipeline.collect_wait_s:.2f}s"
+            f" | 重叠节省≈{saved:.2f}s"
+        )
+    logger.info(line)
 
 
 def _safe_filename(name: str) -> str:
@@ -1085,12 +1235,17 @@ def run_deepsearch_optimized(state: Dict[str, Any], config: Dict[str, Any]) -> D
     budget_stop_reason = ""
     emitter = _resolve_event_emitter(state, config)
     visualize_browser = _browser_visualization_enabled(config)
+    prefetch_per_query = max(
+        0, int(getattr(settings, "deepsearch_pipeline_prefetch_per_query", 2) or 0)
+    )
 
     try:
         for epoch in range(max_epochs):
+            pipeline: Optional[EpochFetchPipeline] = None
             try:
                 _check_cancel(state)
                 epoch_start = time.time()
+                stage_seconds: Dict[str, float] = {}
                 budget_stop_reason = _budget_stop_reason(
                     start_ts=start_ts,
                     tokens_used=tokens_used,
@@ -1128,13 +1283,15 @@ def run_deepsearch_optimized(state: Dict[str, Any], config: Dict[str, Any]) -> D
                 queries = queries[: max(1, query_num)]
                 tokens_used += sum(_estimate_tokens_from_text(q) for q in queries)
                 have_query.extend(q for q in queries if q not in have_query)
+                stage_seconds["query"] = time.time() - query_start
                 logger.info(
                     f"[deepsearch] Epoch {epoch + 1}: 生成 {len(queries)} 个查询"
-                    f" | 耗时 {time.time() - query_start:.2f}s"
+                    f" | 耗时 {stage_seconds['query']:.2f}s"
                 )
                 logger.debug(f"[deepsearch] 查询列表: {queries}")
 
-                # ⏱️ Step 2: 并行搜索
+                # ⏱️ Step 2: 搜索；每个搜索返回后立即预取最有希望的 URL
+                pipeline = _start_epoch_pipeline()
                 search_start = time.time()
                 combined_results: List[Dict[str, Any]] = []
                 for q in queries:
@@ -1169,6 +1326,7 @@ def run_deepsearch_optimized(state: Dict[str, Any], config: Dict[str, Any]) -> D
                         per_query_results,
                         config,
                         provider_profile=provider_profile,
+                        deadline_s=_remaining_seconds(start_ts, max_seconds),
                     )
                     tokens_used += _estimate_tokens_from_results(results)
                     combined_results.extend(results)
@@ -1221,13 +1379,19 @@ def run_deepsearch_optimized(state: Dict[str, Any], config: Dict[str, Any]) -> D
                             all_searched_urls.append(url)
                             all_searched_urls_set.add(url)
 
+                    if pipeline is not None:
+                        pipeline.prefetch(
+                            _promising_urls(results, selected_urls_set, prefetch_per_query)
+                        )
+
                 if budget_stop_reason:
                     break
 
+                stage_seconds["search"] = time.time() - search_start
                 logger.info(
                     f"[deepsearch] Epoch {epoch + 1}: 搜索到 {len(combined_results)} 个结果"
                     f" | 累计 URL: {len(all_searched_urls)}"
-                    f" | 耗时 {time.time() - search_start:.2f}s"
+                    f" | 耗时 {stage_seconds['search']:.2f}s"
                 )
 
                 if not combined_results:
@@ -1326,9 +1490,16 @@ def run_deepsearch_optimized(state: Dict[str, Any], config: Dict[str, Any]) -> D
                     except Exception:
                         pass
 
-                new_pages, new_passages = _build_fetcher_evidence(chosen_urls)
-                fetched_pages.extend(new_pages)
-                passages.extend(new_passages)
+                stage_seconds["pick"] = time.time() - pick_start
+                if pipeline is not None:
+                    # Fetch the rest in the background while the LLM summarizes.
+                    pipeline.prefetch(chosen_urls, speculative=False)
+                else:
+                    fetch_start = time.time()
+                    new_pages, new_passages = _build_fetcher_evidence(chosen_urls)
+                    fetched_pages.extend(new_pages)
+                    passages.extend(new_passages)
+                    stage_seconds["fetch"] = time.time() - fetch_start
 
                 chosen_urls_set = set(chosen_urls)
                 chosen_results = [
@@ -1344,16 +1515,17 @@ def run_deepsearch_optimized(state: Dict[str, Any], config: Dict[str, Any]) -> D
                 logger.info(
                     f"[deepsearch] Epoch {epoch + 1}: 选择 {len(chosen_urls)} 个 URL"
                     f" | 已选总数: {len(selected_urls)}"
-                    f" | 耗时 {time.time() - pick_start:.2f}s"
+                    f" | 耗时 {stage_seconds['pick']:.2f}s"
                 )
 
                 # ⏱️ Step 4: 爬虫补充内容（可选）
                 if settings.deepsearch_enable_crawler:
                     crawl_start = time.time()
                     _hydrate_with_crawler(chosen_results)
+                    stage_seconds["crawl"] = time.time() - crawl_start
                     logger.info(
                         f"[deepsearch] Epoch {epoch + 1}: 爬虫增强完成"
-                        f" | 耗时 {time.time() - crawl_start:.2f}s"
+                        f" | 耗时 {stage_seconds['crawl']:.2f}s"
                     )
 
                 # ⏱️ Step 5: 摘要新知识 + 判断是否足够
@@ -1365,11 +1537,12 @@ def run_deepsearch_optimized(state: Dict[str, Any], config: Dict[str, Any]) -> D
                     summary_notes.append(summary_text)
                     tokens_used += _estimate_tokens_from_text(summary_text)
 
+                stage_seconds["summary"] = time.time() - summary_start
                 logger.info(
                     f"[deepsearch] Epoch {epoch + 1}: 摘要完成"
                     f" | 足够: {enough}"
                     f" | 摘要长度: {len(summary_text)}"
-                    f" | 耗时 {time.time() - summary_start:.2f}s"
+                    f" | 耗时 {stage_seconds['summary']:.2f}s"
                 )
                 budget_stop_reason = _budget_stop_reason(
                     start_ts=start_ts,
@@ -1379,6 +1552,10 @@ def run_deepsearch_optimized(state: Dict[str, Any], config: Dict[str, Any]) -> D
                 )
                 if budget_stop_reason:
                     logger.info(f"[deepsearch] 摘要后触发预算停止: {budget_stop_reason}")
+                    if pipeline is not None:
+                        new_pages, new_passages = pipeline.collect(chosen_urls)
+                        fetched_pages.extend(new_pages)
+                        passages.extend(new_passages)
                     break
 
                 # ⏱️ Step 5.5: 知识空白分析 (可选)
@@ -1417,9 +1594,16 @@ def run_deepsearch_optimized(state: Dict[str, Any], config: Dict[str, Any]) -> D
 
                     except Exception as e:
                         logger.warning(f"[deepsearch] 知识空白分析失败，继续常规流程: {e}")
+                    stage_seconds["gap"] = time.time() - gap_start
+
+                if pipeline is not None:
+                    new_pages, new_passages = pipeline.collect(chosen_urls)
+                    fetched_pages.extend(new_pages)
+                    passages.extend(new_passages)
 
                 epoch_duration = time.time() - epoch_start
                 logger.info(f"[deepsearch] Epoch {epoch + 1}: 总耗时 {epoch_duration:.2f}s")
+                _log_epoch_stage_timings(epoch + 1, stage_seconds, pipeline)
                 epoch_diagnostics = _build_quality_diagnostics(topic, have_query, search_runs)
                 _emit_event(
                     emitter,
@@ -1457,6 +1641,11 @@ def run_deepsearch_optimized(state: Dict[str, Any], config: Dict[str, Any]) -> D
                 logger.error(traceback.format_exc())
                 logger.info("[deepsearch] 继续下一轮搜索...")
                 continue  # 单轮失败不影响整体流程
+            finally:
+                if pipeline is not None:
+                    pipeline.close()
+
+        passages = _rank_evidence_passages(passages, [topic, *have_query])
 
         # Prefer sources we actually summarized when assigning citation numbers.
         # This helps the report and the frontend agree on `[n]` semantics.
@@ -1794,6 +1983,7 @@ def _tree_search(payload, config_payload=None, **kwargs):
                 max_results,
                 effective_config,
                 provider_profile=provider_profile,
+                deadline_s=_remaining_seconds(start_ts, max_seconds),
             )
             searches_used += 1
             if isinstance(results, list):
@@ -2028,6 +2218,7 @@ def _tree_search(payload, config_payload=None, **kwargs):
             **diagnostics,
         }
         fetched_pages, passages = _build_fetcher_evidence(all_sources[:10])
+        passages = _rank_evidence_passages(passages, [topic, *have_query])
 
         claims = []
         try:
@@ -0,0 +1,239 @@
+"""
+Pipelined fetch stages for a deepsearch epoch.
+
+A linear deepsearch epoch used to be a strict barrier: run every search, ask
+the LLM which URLs matter, fetch them all, then summarize. The network sat idle
+during LLM calls and the LLM sat idle during fetches.
+
+`EpochFetchPipeline` runs each URL as one task on the shared HTTP loop
+(`common.http_client.get_http_loop`):
+
+    search (caller) --prefetch--> fetch (async, bounded) --> passage split (worker thread)
+
+The caller `prefetch`es promising URLs as soon as each search returns, keeps
+running searches / LLM steps, and finally `collect`s the URLs it selected.
+Selected URLs that were never prefetched are fetched at that point. `collect`
+waits only for the selected URLs; speculative fetches the LLM did not pick are
+cancelled (ones that already finished still warm the page cache). Speculative
+prefetches are capped per epoch, which bounds memory and in-flight requests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from common.http_client import submit_to_http_loop
+
+logger = logging.getLogger(__name__)
+
+_PageResult = Tuple[Dict[str, Any], List[Dict[str, Any]]]
+
+
+@dataclass
+class StageTiming:
+    """Busy time and wall-clock span of one pipeline stage."""
+
+    busy_s: float = 0.0
+    first_start: Optional[float] = None
+    last_end: Optional[float] = None
+    items: int = 0
+
+    def record(self, start: float, end: float) -> None:
+        self.busy_s += max(0.0, end - start)
+        self.items += 1
+        if self.first_start is None or start < self.first_start:
+            self.first_start = start
+        if self.last_end is None or end > self.last_end:
+            self.last_end = end
+
+    @property
+    def span_s(self) -> float:
+        if self.first_start is None or self.last_end is None:
+            return 0.0
+        return max(0.0, self.last_end - self.first_start)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "items": self.items,
+            "busy_s": round(self.busy_s, 3),
+            "span_s": round(self.span_s, 3),
+        }
+
+
+class EpochFetchPipeline:
+    """
+    Background fetch → passage stages fed by the deepsearch epoch loop.
+
+    `fetch_page` is normally `ContentFetcher.afetch`; a plain callable such as
+    `ContentFetcher.fetch` also works and runs in a worker thread.
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[str], Any],
+        passages_for_page: Callable[[Any], List[Dict[str, Any]]],
+        *,
+        workers: int = 6,
+        per_domain: int = 2,
+        queue_size: int = 16,
+    ) -> None:
+        self._fetch_page = fetch_page
+        self._fetch_is_async = asyncio.iscoroutinefunction(fetch_page)
+        self._passages_for_page = passages_for_page
+        self._per_domain = int(per_domain)
+        self._max_speculative = max(1, int(queue_size))
+
+        self._lock = threading.Lock()
+        # Only touched from the HTTP loop thread.
+        self._fetch_sem = asyncio.Semaphore(max(1, int(workers)))
+        self._domain_sems: Dict[str, asyncio.Semaphore] = {}
+        self._futures: Dict[str, concurrent.futures.Future] = {}
+        self._speculative = 0
+        self._stopped = False
+
+        self.fetch_timing = StageTiming()
+        self.passage_timing = StageTiming()
+        self.collect_wait_s = 0.0
+
+    # ------------------------------------------------------------------ #
+    # Producer side
+    # ------------------------------------------------------------------ #
+
+    def prefetch(self, urls: List[str], *, speculative: bool = True) -> int:
+        """
+        Start fetching URLs in the background; returns how many were new.
+
+        Speculative prefetches stop being accepted once `queue_size` of them were
+        started this epoch. Pass `speculative=False` for URLs the caller already
+        selected so they are never dropped by that cap.
+        """
+        queued = 0
+        with self._lock:
+            if self._stopped:
+                return 0
+            for url in urls or []:
+                if not url or url in self._futures:
+                    continue
+                if speculative:
+                    if self._speculative >= self._max_speculative:
+                        break
+                    self._speculative += 1
+                self._futures[url] = submit_to_http_loop(self._run(url))
+                queued += 1
+        return queued
+
+    def collect(self, urls: List[str]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Wait for `urls` and return their pages and passages in the order of `urls`.
+
+        Prefetches that are not in `urls` are cancelled rather than awaited.
+        After `collect` the pipeline is stopped.
+        """
+        wait_start = time.perf_counter()
+        wanted = [url for url in dict.fromkeys(urls or []) if url]
+        self.prefetch(wanted, speculative=False)
+        with self._lock:
+            self._stopped = True
+            futures = {url: self._futures[url] for url in wanted if url in self._futures}
+            abandoned = [f for url, f in self._futures.items() if url not in futures]
+        for future in abandoned:
+            future.cancel()
+
+        pages: List[Dict[str, Any]] = []
+        passages: List[Dict[str, Any]] = []
+        for url in wanted:
+            future = futures.get(url)
+            if future is None:
+                continue
+            try:
+                result = future.result()
+            except concurrent.futures.CancelledError:
+                continue
+            if result is None:
+                continue
+            page_dict, page_passages = result
+            pages.append(page_dict)
+            passages.extend(page_passages)
+        self.collect_wait_s = time.perf_counter() - wait_start
+        return pages, passages
+
+    def close(self) -> None:
+        """Cancel outstanding fetches without waiting for them. Safe to call more than once."""
+        with self._lock:
+            self._stopped = True
+            pending = [f for f in self._futures.values() if not f.done()]
+        for future in pending:
+            future.cancel()
+
+    @property
+    def submitted_count(self) -> int:
+        with self._lock:
+            return len(self._futures)
+
+    def stage_timings(self) -> Dict[str, Any]:
+        return {
+            "fetch": self.fetch_timing.to_dict(),
+            "passages": self.passage_timing.to_dict(),
+            "collect_wait_s": round(self.collect_wait_s, 3),
+        }
+
+    # ------------------------------------------------------------------ #
+    # Stages (run on the HTTP loop)
+    # ------------------------------------------------------------------ #
+
+    def _domain_semaphore(self, url: str) -> Optional[asyncio.Semaphore]:
+        if self._per_domain <= 0:
+            return None
+        domain = urlsplit(url).netloc.lower()
+        sem = self._domain_sems.get(domain)
+        if sem is None:
+            sem = asyncio.Semaphore(self._per_domain)
+            self._domain_sems[domain] = sem
+        return sem
+
+    async def _fetch(self, url: str) -> Any:
+        domain_sem = self._domain_semaphore(url)
+        if domain_sem is not None:
+            await domain_sem.acquire()
+        try:
+            async with self._fetch_sem:
+                start = time.perf_counter()
+                try:
+                    if self._fetch_is_async:
+                        return await self._fetch_page(url)
+                    return await asyncio.to_thread(self._fetch_page, url)
+                finally:
+                    end = time.perf_counter()
+                    with self._lock:
+                        self.fetch_timing.record(start, end)
+        finally:
+            if domain_sem is not None:
+                domain_sem.release()
+
+    def _split(self, page: Any) -> _PageResult:
+        start = time.perf_counter()
+        try:
+            return page.to_dict(), self._passages_for_page(page)
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.passage_timing.record(start, end)
+
+    async def _run(self, url: str) -> Optional[_PageResult]:
+        try:
+            page = await self._fetch(url)
+        except Exception as e:
+            logger.warning(f"[epoch_pipeline] fetch failed for {url}: {e}")
+            return None
+        try:
+            return await asyncio.to_thread(self._split, page)
+        except Exception as e:
+            logger.warning(f"[epoch_pipeline] passage split failed for {url}: {e}")
+            return None
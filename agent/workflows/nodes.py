@@ -731,7 +731,7 @@ def perform_parallel_search(state: QueryState, config: RunnableConfig) -> Dict[s
     - Cancellation check for graceful termination
     - Retry support for transient failures
     """
-    from .search_cache import get_search_cache
+    from agent.core.search_cache import get_search_cache
 
     query = state["query"]
     logger.info(f"Executing parallel search for: {query}")
@@ -761,7 +761,8 @@ def perform_parallel_search(state: QueryState, config: RunnableConfig) -> Dict[s
 
         # Check cache first
         cache = get_search_cache()
-        cached_results = cache.get(query)
+        cache_key = f"web_plan::{query}"
+        cached_results = cache.get(cache_key)
         if cached_results is not None:
             logger.info(f"[search] Cache hit for: {query[:50]}")
             # Best-effort: preview a cached top result so the browser viewer still shows activity.
@@ -811,7 +812,7 @@ def perform_parallel_search(state: QueryState, config: RunnableConfig) -> Dict[s
 
         # Cache the results
         if results:
-            cache.set(query, results)
+            cache.set(cache_key, results)
             # Best-effort: preview a top result in the sandbox browser so Live view keeps moving.
             try:
                 import threading
@@ -0,0 +1,166 @@
+"""
+Query-aware BM25 ranking for fetched evidence passages.
+
+Deepsearch splits every fetched page into passages. Keeping a fixed number of
+passages per page (picked only by length/punctuation) ignores what the run is
+actually researching. `BM25PassageIndex` is built once per run over all
+passages and scores them against the run's queries, so `select_top_passages`
+can spend one global top-K budget on the passages that match.
+
+Tokenization handles mixed Chinese/English text: latin words are kept whole,
+CJK runs are split into character bigrams.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+|[\u4e00-\u9fff]+")
+
+_STOPWORDS = {
+    "a",
+    "an",
+    "and",
+    "are",
+    "as",
+    "at",
+    "be",
+    "by",
+    "for",
+    "from",
+    "has",
+    "have",
+    "in",
+    "is",
+    "it",
+    "of",
+    "on",
+    "or",
+    "that",
+    "the",
+    "this",
+    "to",
+    "was",
+    "were",
+    "will",
+    "with",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased latin words plus CJK character bigrams."""
+    tokens: List[str] = []
+    for run in _TOKEN_RE.findall(str(text or "").lower()):
+        if "\u4e00" <= run[0] <= "\u9fff":
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i : i + 2] for i in range(len(run) - 1))
+        elif len(run) > 1 and run not in _STOPWORDS:
+            tokens.append(run)
+    return tokens
+
+
+class BM25PassageIndex:
+    """Okapi BM25 over a fixed list of passages (tokenized once)."""
+
+    def __init__(self, passages: Sequence[Dict[str, Any]], *, k1: float = 1.5, b: float = 0.75):
+        self.k1 = float(k1)
+        self.b = float(b)
+        self._term_freqs: List[Counter] = []
+        self._lengths: List[int] = []
+        doc_freq: Counter = Counter()
+        for passage in passages:
+            tf = Counter(tokenize(passage.get("text") if isinstance(passage, dict) else ""))
+            self._term_freqs.append(tf)
+            self._lengths.append(sum(tf.values()))
+            doc_freq.update(tf.keys())
+
+        n = len(self._term_freqs)
+        self._avg_len = (sum(self._lengths) / n) if n else 0.0
+        # Lucene-style idf stays positive for terms that appear in most passages.
+        self._idf = {
+            term: math.log(1.0 + (n - df + 0.5) / (df + 0.5)) for term, df in doc_freq.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self._term_freqs)
+
+    def score(self, query: str) -> List[float]:
+        """BM25 score of every passage for one query."""
+        terms = [t for t in dict.fromkeys(tokenize(query)) if t in self._idf]
+        scores = [0.0] * len(self._term_freqs)
+        if not terms or not self._avg_len:
+            return scores
+
+        k1, b, avg_len = self.k1, self.b, self._avg_len
+        for i, tf in enumerate(self._term_freqs):
+            norm = k1 * (1.0 - b + b * self._lengths[i] / avg_len)
+            total = 0.0
+            for term in terms:
+                freq = tf.get(term)
+                if freq:
+                    total += self._idf[term] * freq * (k1 + 1.0) / (freq + norm)
+            scores[i] = total
+        return scores
+
+    def score_queries(self, queries: Sequence[str]) -> List[float]:
+        """Best score of each passage over several queries (a passage only has to serve one)."""
+        best = [0.0] * len(self._term_freqs)
+        for query in dict.fromkeys(q for q in queries if q and str(q).strip()):
+            for i, s in enumerate(self.score(query)):
+                if s > best[i]:
+                    best[i] = s
+        return best
+
+
+def select_top_passages(
+    passages: List[Dict[str, Any]],
+    queries: Sequence[str],
+    *,
+    top_k: int,
+    tiebreak: Optional[Callable[[Dict[str, Any]], float]] = None,
+    per_url_floor: int = 1,
+) -> List[Dict[str, Any]]:
+    """
+    Keep the `top_k` passages that best match `queries`, in their original order.
+
+    Every URL with at least one matching passage first gets up to `per_url_floor`
+    of its best passages, so a single long page cannot crowd out the others;
+    the remaining budget goes to the highest scores overall. `tiebreak` (e.g. a
+    readability score) orders passages with equal relevance.
+    """
+    if top_k <= 0 or len(passages) <= top_k:
+        return list(passages)
+
+    relevance = BM25PassageIndex(passages).score_queries(queries)
+    secondary = [float(tiebreak(p)) if tiebreak else 0.0 for p in passages]
+    order = sorted(range(len(passages)), key=lambda i: (-relevance[i], -secondary[i], i))
+
+    chosen: List[int] = []
+    chosen_set: set = set()
+    if per_url_floor > 0:
+        per_url: Dict[str, int] = {}
+        for i in order:
+            if len(chosen) >= top_k:
+                break
+            if relevance[i] <= 0:
+                break
+            url = str(passages[i].get("url") or "")
+            if per_url.get(url, 0) >= per_url_floor:
+                continue
+            per_url[url] = per_url.get(url, 0) + 1
+            chosen.append(i)
+            chosen_set.add(i)
+
+    for i in order:
+        if len(chosen) >= top_k:
+            break
+        if i not in chosen_set:
+            chosen.append(i)
+            chosen_set.add(i)
+
+    return [passages[i] for i in sorted(chosen)]
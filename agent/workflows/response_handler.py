@@ -24,7 +24,7 @@
 from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
 
 from agent.core.processor_config import AgentProcessorConfig
-from agent.parsers.xml_parser import XMLToolCall, XMLToolParser
+from agent.parsers.xml_parser import StreamingXMLToolParser, XMLToolCall, XMLToolParser
 from agent.workflows.continuation import (
     ContinuationDecider,
     ContinuationHandler,
@@ -82,6 +82,10 @@ async def process_streaming_response(
         """
         Process streaming LLM response with tool call detection and execution.
 
+        XML tool calls are parsed incrementally: each `<invoke>` is detected as
+        soon as it closes. With `execute_on_stream` and the parallel strategy,
+        each detected tool starts right away, while the model keeps generating.
+
         Args:
             response_stream: Async generator yielding response chunks
             session_id: Session identifier for logging
@@ -89,9 +93,14 @@ async def process_streaming_response(
         Yields:
             Event dictionaries with type and data
         """
-        accumulated_content = ""
+        xml_stream = StreamingXMLToolParser(self.xml_parser)
         detected_xml_calls: List[XMLToolCall] = []
-        thinking_sent = False
+        early_tasks: List[asyncio.Task] = []
+        start_early = (
+            self.config.execute_on_stream
+            and self.config.execute_tools
+            and self.config.tool_execution_strategy == "parallel"
+        )
 
         try:
             async for chunk in response_stream:
@@ -99,8 +108,6 @@ async def process_streaming_response(
                 content = self._extract_content(chunk)
 
                 if content:
-                    accumulated_content += content
-
                     # Yield text delta for streaming
                     yield {
                         "type": "text_delta",
@@ -110,14 +117,11 @@ async def process_streaming_response(
                     }
 
                     # Check for XML tool calls if enabled
-                    if self.config.xml_tool_calling and "<function_calls>" in accumulated_content:
-                        # Try to parse XML calls
-                        new_calls = self.xml_parser.parse_streaming_content(
-                            accumulated_content, detected_xml_calls
-                        )
-
-                        for call in new_calls:
+                    if self.config.xml_tool_calling:
+                        for call in xml_stream.feed(content):
                             detected_xml_calls.append(call)
+                            if start_early:
+                                early_tasks.append(self._start_tool(call, session_id))
 
                             # Yield tool call detected event
                             yield {
@@ -154,7 +158,9 @@ async def process_streaming_response(
                 logger.info(f"[{session_id}] Executing {len(detected_xml_calls)} XML tool calls")
 
                 # Execute based on strategy
-                if self.config.tool_execution_strategy == "parallel":
+                if early_tasks:
+                    results = await self._collect_parallel_results(early_tasks, session_id)
+                elif self.config.tool_execution_strategy == "parallel":
                     results = await self._execute_tools_parallel(detected_xml_calls, session_id)
                 else:
                     results = await self._execute_tools_sequential(detected_xml_calls, session_id)
@@ -189,6 +195,12 @@ async def process_streaming_response(
                 "timestamp": datetime.now().isoformat(),
             }
 
+        finally:
+            # Tools started early must not outlive an aborted response.
+            for task in early_tasks:
+                if not task.done():
+                    task.cancel()
+
     async def _execute_tools_sequential(
         self, tool_calls: List[XMLToolCall], session_id: str
     ) -> List[ToolResult]:
@@ -243,8 +255,26 @@ async def _execute_tools_parallel(
         """
         logger.info(f"[{session_id}] Executing {len(tool_calls)} tools in parallel")
 
-        tasks = [self._execute_single_tool(call, session_id) for call in tool_calls]
+        tasks = [self._start_tool(call, session_id) for call in tool_calls]
+        return await self._collect_parallel_results(tasks, session_id)
+
+    def _start_tool(self, tool_call: XMLToolCall, session_id: str) -> asyncio.Task:
+        """Start executing a tool call in the background."""
+        return asyncio.ensure_future(self._execute_single_tool(tool_call, session_id))
 
+    async def _collect_parallel_results(
+        self, tasks: List[asyncio.Task], session_id: str
+    ) -> List[ToolResult]:
+        """
+        Await started tool tasks.
+
+        Args:
+            tasks: Tasks from `_start_tool`, in call order
+            session_id: Session ID for logging
+
+        Returns:
+            List of ToolResult objects (same order as tasks)
+        """
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
         # Convert exceptions to ToolResult
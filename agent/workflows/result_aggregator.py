@@ -11,11 +11,11 @@
 import logging
 import re
 from dataclasses import dataclass, field
-from difflib import SequenceMatcher
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Tuple
 from urllib.parse import urlparse
 
 from agent.workflows.source_registry import SourceRegistry
+from common.near_duplicates import NearDuplicateIndex
 
 logger = logging.getLogger(__name__)
 
@@ -297,43 +297,23 @@ def _dedupe_by_similarity(self, results: List[SearchResult]) -> List[SearchResul
             best = max(group, key=lambda x: len(x.content))
             candidates.append(best)
 
-        # Optimized similarity check using set-based tracking
-        # Avoid O(N) list.remove() by tracking kept indices
-        kept_indices: List[int] = []
-        similarity_cache: Dict[tuple, float] = {}
-
-        for i, res in enumerate(candidates):
-            is_duplicate = False
-            replace_idx = -1
-
-            for j in kept_indices:
-                existing = candidates[j]
-                # Use cache key based on truncated content hash
-                cache_key = (id(res), id(existing))
-                if cache_key not in similarity_cache:
-                    similarity_cache[cache_key] = self._text_similarity(res.content, existing.content)
-                similarity = similarity_cache[cache_key]
-
-                if similarity >= self.similarity_threshold:
-                    is_duplicate = True
-                    # Keep the longer/better one
-                    if len(res.content) > len(existing.content):
-                        replace_idx = kept_indices.index(j)
-                    break
-
-            if not is_duplicate:
-                kept_indices.append(i)
-            elif replace_idx >= 0:
-                kept_indices[replace_idx] = i
-
-        return [candidates[i] for i in kept_indices]
-
-    def _text_similarity(self, text1: str, text2: str) -> float:
-        """Calculate similarity ratio between two texts."""
-        # Normalize for comparison
-        t1 = text1.lower()[:1000]
-        t2 = text2.lower()[:1000]
-        return SequenceMatcher(None, t1, t2).ratio()
+        # MinHash signatures are computed once per candidate; each one is then
+        # compared against every kept signature in a single vectorized pass.
+        index = NearDuplicateIndex(self.similarity_threshold, max_chars=1000)
+        kept: List[SearchResult] = []
+
+        for res in candidates:
+            sig = index.signature(res.content)
+            slot = index.find(sig)
+            if slot is None:
+                index.add(sig)
+                kept.append(res)
+            elif len(res.content) > len(kept[slot].content):
+                # Keep the longer/better one
+                kept[slot] = res
+                index.replace(slot, sig)
+
+        return kept
 
     def _score_relevance(
         self,
@@ -1,38 +1,13 @@
 """
-Lightweight in-memory search cache and query deduplicator.
+Search cache and query deduplicator for web_plan and deepsearch flows.
 
-Used by web_plan and deepsearch flows to avoid repeat searches in a single
-process. No persistence; safe for multi-threaded asyncio because operations
-are simple and fast.
+The cache itself lives in `agent.core.search_cache` (one tiered cache for the
+whole process); this module re-exports it so existing imports keep working.
 """
 
-from collections import OrderedDict
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import Iterable, List, Tuple
 
-
-class SearchCache:
-    """Simple LRU cache for search results."""
-
-    def __init__(self, max_items: int = 256):
-        self.max_items = max_items
-        self._data: OrderedDict[str, Any] = OrderedDict()
-
-    def get(self, key: str):
-        if key in self._data:
-            value = self._data.pop(key)
-            self._data[key] = value
-            return value
-        return None
-
-    def set(self, key: str, value: Any) -> None:
-        if key in self._data:
-            self._data.pop(key)
-        self._data[key] = value
-        if len(self._data) > self.max_items:
-            self._data.popitem(last=False)
-
-    def clear(self) -> None:
-        self._data.clear()
+from agent.core.search_cache import SearchCache, get_search_cache
 
 
 class QueryDeduplicator:
@@ -63,12 +38,4 @@ def deduplicate(self, queries: Iterable[str]) -> Tuple[List[str], List[str]]:
         return uniques, dupes
 
 
-# Global process-local cache
-_cache = SearchCache()
-
-
-def get_search_cache() -> SearchCache:
-    return _cache
-
-
 __all__ = ["SearchCache", "QueryDeduplicator", "get_search_cache"]
@@ -3,6 +3,11 @@
 
 Provides FuFanmanus-like agent run management with status tracking,
 metrics collection, and lifecycle management.
+
+Detached runs (e.g. `/api/chat/sse`) keep their SSE frames in a per-run
+`RunReplayBuffer`, so a client can drop and reattach with `Last-Event-ID`
+without re-running the agent. The registry caps the frames retained across
+all runs and drops a run's replay shortly after it finishes.
 """
 
 from __future__ import annotations
@@ -11,11 +16,11 @@
 import logging
 import threading
 import uuid
-from collections import OrderedDict
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Awaitable, Callable, Dict, List, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +36,108 @@ class AgentRunStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+class RunReplayBuffer:
+    """
+    Bounded, seq-indexed log of a run's SSE frames.
+
+    Seqs are contiguous from 1, so the frame for `seq` sits at
+    `seq - first_seq` and resuming from any retained seq is O(1). Subscribers
+    wait on an event that is swapped on every append; a subscriber going away
+    never affects the producer.
+    """
+
+    def __init__(self, capacity: int = 10000, on_grow: Optional[Callable[[int], None]] = None):
+        self.capacity = max(1, int(capacity))
+        self._frames: Deque[Tuple[int, str]] = deque(maxlen=self.capacity)
+        self._on_grow = on_grow  # told how many frames were added to the retained window
+        self._last_seq = 0
+        self._closed = False
+        self._changed = asyncio.Event()
+        self._cursors: Dict[int, int] = {}  # live subscriber -> last seq it took
+        self._next_subscriber = 0
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    @property
+    def last_seq(self) -> int:
+        return self._last_seq
+
+    @property
+    def first_seq(self) -> int:
+        """Oldest retained seq (0 when empty)."""
+        return self._frames[0][0] if self._frames else 0
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def backlog(self) -> int:
+        """Frames the slowest live subscriber has not taken yet (0 with no subscribers)."""
+        if not self._cursors:
+            return 0
+        return self._last_seq - min(self._cursors.values())
+
+    def next_seq(self) -> int:
+        return self._last_seq + 1
+
+    def append(self, frame: str) -> int:
+        """Append a frame rendered with `next_seq()`; returns its seq."""
+        if self._closed:
+            raise RuntimeError("replay buffer is closed")
+        grew = len(self._frames) < self.capacity
+        self._last_seq += 1
+        self._frames.append((self._last_seq, frame))
+        self._notify()
+        if grew and self._on_grow is not None:
+            self._on_grow(1)
+        return self._last_seq
+
+    def trim(self, count: int) -> int:
+        """Drop up to `count` oldest frames, always keeping the newest; returns how many were dropped."""
+        dropped = 0
+        while dropped < count and len(self._frames) > 1:
+            self._frames.popleft()
+            dropped += 1
+        return dropped
+
+    def close(self) -> None:
+        """Mark the run's output complete; subscribers drain and stop."""
+        self._closed = True
+        self._notify()
+
+    def _notify(self) -> None:
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def since(self, seq: int = 0) -> List[Tuple[int, str]]:
+        """Frames with seq greater than `seq` (older-than-retained cursors get the whole window)."""
+        if not self._frames:
+            return []
+        start = max(int(seq) + 1, self.first_seq) - self.first_seq
+        return [self._frames[i] for i in range(start, len(self._frames))]
+
+    async def subscribe(self, after_seq: int = 0) -> AsyncIterator[str]:
+        """Yield frames after `after_seq`, then live frames until the buffer is closed."""
+        cursor = max(0, int(after_seq))
+        token = self._next_subscriber
+        self._next_subscriber += 1
+        self._cursors[token] = cursor
+        try:
+            while True:
+                changed = self._changed
+                for seq, frame in self.since(cursor):
+                    cursor = seq
+                    yield frame
+                    self._cursors[token] = cursor
+                if self._closed and cursor >= self._last_seq:
+                    return
+                if cursor >= self._last_seq:
+                    await changed.wait()
+        finally:
+            self._cursors.pop(token, None)
+
+
 @dataclass
 class AgentRun:
     """
@@ -67,6 +174,10 @@ class AgentRun:
     _event_queue: Optional[asyncio.Queue] = field(default=None, repr=False)
     _listeners: List[Callable] = field(default_factory=list, repr=False)
 
+    # Detached execution: SSE frame replay and the background task driving it
+    replay: Optional[RunReplayBuffer] = field(default=None, repr=False)
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
     def __post_init__(self):
         self._event_queue = asyncio.Queue()
         self._listeners = []
@@ -189,6 +300,7 @@ def to_dict(self) -> Dict[str, Any]:
             "event_count": self.event_count,
             "token_count": self.token_count,
             "tool_calls": self.tool_calls,
+            "last_event_id": self.replay.last_seq if self.replay else None,
         }
 
 
@@ -196,14 +308,30 @@ class AgentRunRegistry:
     """
     Thread-safe registry for tracking agent runs.
 
-    Provides run creation, lookup, and cleanup with LRU eviction.
+    Provides run creation, lookup, and cleanup with LRU eviction. Only
+    terminal runs are evicted; running runs stay registered even past
+    `max_runs`.
+
+    Replay buffers created with `attach_replay` share a budget of
+    `max_replay_frames`. Over budget, finished runs' replays are dropped
+    oldest first, then running runs lose their oldest frames. A finished
+    run's replay is dropped `replay_ttl_seconds` after `release_replay_later`.
     """
 
-    def __init__(self, max_runs: int = 1000, ttl_seconds: float = 3600):
+    def __init__(
+        self,
+        max_runs: int = 1000,
+        ttl_seconds: float = 3600,
+        replay_ttl_seconds: float = 120,
+        max_replay_frames: int = 200000,
+    ):
         self.max_runs = max_runs
         self.ttl_seconds = ttl_seconds
+        self.replay_ttl_seconds = max(0.0, float(replay_ttl_seconds))
+        self.max_replay_frames = max(1, int(max_replay_frames))
         self._runs: OrderedDict[str, AgentRun] = OrderedDict()
         self._thread_index: Dict[str, str] = {}  # thread_id -> run_id
+        self._replay_frames = 0  # frames retained across attached replay buffers
         self._lock = threading.RLock()
 
     def create(
@@ -232,13 +360,12 @@ def create(
         )
 
         with self._lock:
-            # Evict oldest if at capacity
-            while len(self._runs) >= self.max_runs:
-                oldest_id, _ = self._runs.popitem(last=False)
-                # Clean up thread index
-                for tid, rid in list(self._thread_index.items()):
-                    if rid == oldest_id:
-                        del self._thread_index[tid]
+            # Evict oldest finished runs if at capacity; running runs are never evicted
+            excess = len(self._runs) - self.max_runs + 1
+            if excess > 0:
+                finished = [rid for rid, r in self._runs.items() if r.is_terminal]
+                for oldest_id in finished[:excess]:
+                    self._forget_locked(oldest_id)
 
             self._runs[run_id] = run
             self._thread_index[thread_id] = run_id
@@ -246,6 +373,70 @@ def create(
         logger.debug(f"Created agent run {run_id} for thread {thread_id}")
         return run
 
+    def _forget_locked(self, run_id: str) -> None:
+        run = self._runs.pop(run_id, None)
+        if run is not None and run.replay is not None:
+            self._drop_replay_locked(run)
+        # Clean up thread index
+        for tid, rid in list(self._thread_index.items()):
+            if rid == run_id:
+                del self._thread_index[tid]
+
+    def attach_replay(self, run: AgentRun, capacity: int = 10000) -> RunReplayBuffer:
+        """Give `run` a replay buffer counted against the registry's frame budget."""
+        replay = RunReplayBuffer(capacity, on_grow=self._replay_grew)
+        with self._lock:
+            if run.replay is not None:
+                self._drop_replay_locked(run)
+            run.replay = replay
+        return replay
+
+    def release_replay(self, run: AgentRun) -> None:
+        """Drop `run`'s replay now; attached subscribers keep draining their copy."""
+        with self._lock:
+            if run.replay is not None:
+                self._drop_replay_locked(run)
+
+    def release_replay_later(self, run: AgentRun) -> None:
+        """Drop a finished run's replay after the reattach window (`replay_ttl_seconds`)."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is None or self.replay_ttl_seconds <= 0:
+            self.release_replay(run)
+        else:
+            loop.call_later(self.replay_ttl_seconds, self.release_replay, run)
+
+    def replay_frames(self) -> int:
+        """Frames currently retained across all attached replay buffers."""
+        with self._lock:
+            return self._replay_frames
+
+    def _drop_replay_locked(self, run: AgentRun) -> None:
+        replay, run.replay = run.replay, None
+        if replay is not None and replay._on_grow == self._replay_grew:
+            self._replay_frames -= len(replay)
+
+    def _replay_grew(self, count: int) -> None:
+        with self._lock:
+            self._replay_frames += count
+            if self._replay_frames > self.max_replay_frames:
+                self._shed_replay_frames_locked()
+
+    def _shed_replay_frames_locked(self) -> None:
+        for run in list(self._runs.values()):
+            if self._replay_frames <= self.max_replay_frames:
+                return
+            if run.is_terminal and run.replay is not None:
+                self._drop_replay_locked(run)
+        for run in self._runs.values():
+            excess = self._replay_frames - self.max_replay_frames
+            if excess <= 0:
+                return
+            if run.replay is not None and run.replay._on_grow == self._replay_grew:
+                self._replay_frames -= run.replay.trim(excess)
+
     def get(self, run_id: str) -> Optional[AgentRun]:
         """Get a run by ID."""
         with self._lock:
@@ -292,7 +483,7 @@ def list_runs(
         return runs[:limit]
 
     def cleanup_expired(self) -> int:
-        """Remove expired runs. Returns count of removed runs."""
+        """Remove expired runs (and stale finished replays). Returns count of removed runs."""
         now = datetime.now()
         expired_ids = []
 
@@ -302,19 +493,25 @@ def cleanup_expired(self) -> int:
                     age = (now - (run.completed_at or run.created_at)).total_seconds()
                     if age > self.ttl_seconds:
                         expired_ids.append(run_id)
+                    elif age > self.replay_ttl_seconds and run.replay is not None:
+                        self._drop_replay_locked(run)
 
             for run_id in expired_ids:
-                del self._runs[run_id]
-                # Clean up thread index
-                for tid, rid in list(self._thread_index.items()):
-                    if rid == run_id:
-                        del self._thread_index[tid]
+                self._forget_locked(run_id)
 
         if expired_ids:
             logger.info(f"Cleaned up {len(expired_ids)} expired agent runs")
 
         return len(expired_ids)
 
+    def cancel_detached(self) -> int:
+        """Cancel background tasks of non-terminal detached runs. Returns count cancelled."""
+        with self._lock:
+            tasks = [r.task for r in self._runs.values() if r.task is not None and not r.task.done()]
+        for task in tasks:
+            task.cancel()
+        return len(tasks)
+
     def stats(self) -> Dict[str, Any]:
         """Get registry statistics."""
         with self._lock:
@@ -328,6 +525,8 @@ def stats(self) -> Dict[str, Any]:
                 "max_runs": self.max_runs,
                 "active_threads": len(self._thread_index),
                 "status_counts": status_counts,
+                "replay_frames": self._replay_frames,
+                "max_replay_frames": self.max_replay_frames,
             }
 
 
@@ -339,7 +538,12 @@ def get_agent_run_registry() -> AgentRunRegistry:
     """Get the global agent run registry."""
     global _agent_run_registry
     if _agent_run_registry is None:
-        _agent_run_registry = AgentRunRegistry()
+        from common.config import settings
+
+        _agent_run_registry = AgentRunRegistry(
+            replay_ttl_seconds=float(getattr(settings, "chat_run_replay_ttl_s", 120)),
+            max_replay_frames=int(getattr(settings, "chat_run_replay_max_frames", 200000) or 200000),
+        )
     return _agent_run_registry
 
 
@@ -4,6 +4,7 @@
 from typing import Any
 
 from common.sse import format_sse_event
+from common.stream_frames import StreamFrame, sse_typed_frame
 
 
 def translate_legacy_line_to_sse(line: str, *, seq: int) -> str:
@@ -12,7 +13,15 @@ def translate_legacy_line_to_sse(line: str, *, seq: int) -> str:
 
     Legacy format: `0:{"type": "...", "data": {...}}\n`
     SSE format:    `id: <seq>\\nevent: <type>\\ndata: <json>\\n\\n`
+
+    Lines produced by `format_stream_event` are `StreamFrame`s: their payload
+    is already encoded, so it is wrapped as-is instead of parsed and re-dumped.
     """
+    if isinstance(line, StreamFrame):
+        if not line.event_type:
+            return ""
+        return sse_typed_frame(line.event_type, line.payload, seq)
+
     if not isinstance(line, str) or not line.startswith("0:"):
         return ""
 
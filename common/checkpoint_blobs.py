@@ -0,0 +1,343 @@
+"""
+Content-addressed blob offloading for LangGraph checkpoints.
+
+Savers serialize each channel value through their `serde`. `OffloadingSerializer`
+wraps the default serializer. A serialized value of at least `min_bytes` is
+zlib-compressed into a `FileBlobStore` under its SHA-256. The checkpoint keeps
+only a small reference (`weaver_blob` type). Identical values (e.g. an
+unchanged `scraped_content` list rewritten every super-step, or the same pages
+in several threads) are stored once.
+
+Reads resolve references eagerly, so graphs see plain values. Inside
+`lazy_blob_loading()`, references load as `LazyBlob` placeholders instead.
+`LazyChannelValues` resolves them on first access. `SessionManager` reads
+session state this way, so an ownership check or a summary never
+decompresses channels it does not touch. The context is per thread/task: a
+saver that deserializes on another thread (`AsyncPostgresSaver` sync calls)
+loads eagerly.
+
+Blobs are not deleted while the app runs. `prune_unreferenced_blobs` is a
+mark-and-sweep for an offline job (`scripts/prune_checkpoint_blobs.py`). It
+collects the digests still referenced by stored checkpoints and deletes other
+blobs whose mtime is older than a grace period. Writers refresh a reused blob's
+mtime at least every `BLOB_TOUCH_INTERVAL_S`. A blob that a checkpoint being written
+right now refers to is therefore never older than the grace period.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import copy
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+logger = logging.getLogger(__name__)
+
+BLOB_REF_TYPE = "weaver_blob"
+
+_LAZY_BLOBS: contextvars.ContextVar[bool] = contextvars.ContextVar("weaver_lazy_blobs", default=False)
+
+# How often a reused blob's mtime is refreshed; pruning grace periods must be longer.
+BLOB_TOUCH_INTERVAL_S = 600.0
+
+
+class FileBlobStore:
+    """Blobs as files under `root/<digest[:2]>/<digest>`, written atomically."""
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def has(self, digest: str) -> bool:
+        return self._path(digest).exists()
+
+    def put(self, digest: str, data: bytes) -> None:
+        path = self._path(digest)
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def get(self, digest: str) -> bytes:
+        try:
+            return self._path(digest).read_bytes()
+        except FileNotFoundError as e:
+            raise KeyError(f"Checkpoint blob not found: {digest}") from e
+
+    def touch(self, digest: str) -> bool:
+        """Refresh the blob's mtime; False if it does not exist."""
+        try:
+            os.utime(self._path(digest))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def delete(self, digest: str) -> bool:
+        try:
+            self._path(digest).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def iter_blobs(self) -> Iterator[Tuple[str, float, int]]:
+        """Yield (digest, mtime, size) for every stored blob."""
+        for bucket in self.root.iterdir():
+            if not bucket.is_dir() or len(bucket.name) != 2:
+                continue
+            for path in bucket.iterdir():
+                if path.name.startswith(".tmp-"):
+                    continue
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    continue
+                yield path.name, st.st_mtime, st.st_size
+
+
+class OffloadingSerializer:
+    """`SerializerProtocol` that moves large serialized values into a blob store."""
+
+    def __init__(
+        self,
+        store: FileBlobStore,
+        *,
+        serde: Any = None,
+        min_bytes: int = 32 * 1024,
+        compression_level: int = 6,
+        known_digests: int = 4096,
+    ) -> None:
+        self.store = store
+        self.serde = serde or JsonPlusSerializer()
+        self.min_bytes = max(1, int(min_bytes))
+        self.compression_level = int(compression_level)
+        # digest -> monotonic time its blob was last written or touched.
+        self._known: "OrderedDict[str, float]" = OrderedDict()
+        self._known_max = max(0, int(known_digests))
+        self._lock = threading.Lock()
+
+        self.inline_values = 0
+        self.offloaded_values = 0
+        self.deduplicated_values = 0
+        self.bytes_offloaded = 0
+        self.bytes_stored = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "inline_values": self.inline_values,
+            "offloaded_values": self.offloaded_values,
+            "deduplicated_values": self.deduplicated_values,
+            "bytes_offloaded": self.bytes_offloaded,
+            "bytes_stored": self.bytes_stored,
+        }
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        type_, data = self.serde.dumps_typed(obj)
+        if len(data) < self.min_bytes:
+            self.inline_values += 1
+            return type_, data
+
+        digest = hashlib.sha256(type_.encode("utf-8") + b"\0" + data).hexdigest()
+        self.offloaded_values += 1
+        self.bytes_offloaded += len(data)
+        now = time.monotonic()
+        # Reusing a blob refreshes its mtime (at most every BLOB_TOUCH_INTERVAL_S), so
+        # pruning never sweeps a blob a new checkpoint is about to reference.
+        if self._recently_touched(digest, now):
+            self.deduplicated_values += 1
+        elif self.store.touch(digest):
+            self.deduplicated_values += 1
+            self._remember(digest, now)
+        else:
+            compressed = zlib.compress(data, self.compression_level)
+            self.store.put(digest, compressed)
+            self.bytes_stored += len(compressed)
+            # Only after the blob is known to be in the store: a failed put must be retried.
+            self._remember(digest, now)
+
+        ref = {"digest": digest, "type": type_, "size": len(data)}
+        return BLOB_REF_TYPE, json.dumps(ref, separators=(",", ":")).encode("utf-8")
+
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        type_, payload = data
+        if type_ != BLOB_REF_TYPE:
+            return self.serde.loads_typed(data)
+        ref = json.loads(payload)
+        if _LAZY_BLOBS.get():
+            return LazyBlob(self, ref)
+        return self.load_ref(ref)
+
+    def load_ref(self, ref: Dict[str, Any]) -> Any:
+        raw = zlib.decompress(self.store.get(ref["digest"]))
+        return self.serde.loads_typed((ref["type"], raw))
+
+    def _recently_touched(self, digest: str, now: float) -> bool:
+        """True if this serializer wrote or touched `digest` within `BLOB_TOUCH_INTERVAL_S`."""
+        if not self._known_max:
+            return False
+        with self._lock:
+            touched = self._known.get(digest)
+            if touched is None or now - touched >= BLOB_TOUCH_INTERVAL_S:
+                return False
+            self._known.move_to_end(digest)
+            return True
+
+    def _remember(self, digest: str, now: float) -> None:
+        """Record `digest` as stored (and its mtime as fresh) at `now`."""
+        if not self._known_max:
+            return
+        with self._lock:
+            self._known[digest] = now
+            self._known.move_to_end(digest)
+            if len(self._known) > self._known_max:
+                self._known.popitem(last=False)
+
+
+class LazyBlob:
+    """Placeholder for an offloaded value; `resolve()` loads it once."""
+
+    __slots__ = ("_serde", "ref", "_value", "_loaded")
+
+    def __init__(self, serde: OffloadingSerializer, ref: Dict[str, Any]) -> None:
+        self._serde = serde
+        self.ref = ref
+        self._value: Any = None
+        self._loaded = False
+
+    @property
+    def size(self) -> int:
+        return int(self.ref.get("size", 0))
+
+    def resolve(self) -> Any:
+        if not self._loaded:
+            self._value = self._serde.load_ref(self.ref)
+            self._loaded = True
+        return self._value
+
+    def __repr__(self) -> str:
+        return f"LazyBlob({self.ref.get('digest', '')[:12]}, {self.size} bytes)"
+
+
+@contextmanager
+def lazy_blob_loading() -> Iterator[None]:
+    """Deserialize blob references as `LazyBlob` placeholders in this context."""
+    token = _LAZY_BLOBS.set(True)
+    try:
+        yield
+    finally:
+        _LAZY_BLOBS.reset(token)
+
+
+def _resolved(value: Any) -> Any:
+    return value.resolve() if isinstance(value, LazyBlob) else value
+
+
+class LazyChannelValues(dict):
+    """Channel values dict that loads `LazyBlob` entries on first access."""
+
+    def __getitem__(self, key: Any) -> Any:
+        value = dict.__getitem__(self, key)
+        if isinstance(value, LazyBlob):
+            value = value.resolve()
+            dict.__setitem__(self, key, value)
+        return value
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def pop(self, key: Any, *default: Any) -> Any:
+        return _resolved(dict.pop(self, key, *default))
+
+    def values(self):  # type: ignore[override]
+        return [self[k] for k in self]
+
+    def items(self):  # type: ignore[override]
+        return [(k, self[k]) for k in self]
+
+    def materialize(self) -> Dict[str, Any]:
+        return {k: self[k] for k in self}
+
+    def copy(self) -> Dict[str, Any]:  # type: ignore[override]
+        return self.materialize()
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[str, Any]:
+        return copy.deepcopy(self.materialize(), memo)
+
+
+def referenced_digests(payloads: Iterable[bytes]) -> Set[str]:
+    """Digests named by serialized `weaver_blob` references (as stored by a saver)."""
+    digests: Set[str] = set()
+    for payload in payloads:
+        try:
+            digest = json.loads(payload)["digest"]
+        except (ValueError, KeyError, TypeError):
+            continue
+        if isinstance(digest, str):
+            digests.add(digest)
+    return digests
+
+
+def prune_unreferenced_blobs(
+    store: FileBlobStore,
+    referenced: Set[str],
+    *,
+    older_than: float,
+    dry_run: bool = False,
+) -> Dict[str, int]:
+    """
+    Delete blobs not in `referenced` whose mtime is before `older_than` (epoch seconds).
+
+    Take `older_than` before collecting `referenced`, and keep it at least
+    `BLOB_TOUCH_INTERVAL_S` in the past, so blobs of checkpoints written during the
+    scan survive.
+    """
+    stats = {"blobs": 0, "referenced": 0, "recent": 0, "deleted": 0, "bytes_freed": 0}
+    for digest, mtime, size in store.iter_blobs():
+        stats["blobs"] += 1
+        if digest in referenced:
+            stats["referenced"] += 1
+            continue
+        if mtime >= older_than:
+            stats["recent"] += 1
+            continue
+        if dry_run or store.delete(digest):
+            stats["deleted"] += 1
+            stats["bytes_freed"] += size
+    return stats
+
+
+def create_offloading_serializer(
+    blob_dir: str, *, min_bytes: int = 32 * 1024, compression_level: int = 6
+) -> Optional[OffloadingSerializer]:
+    """Build the checkpoint serializer, or None if the blob dir is unusable."""
+    try:
+        store = FileBlobStore(blob_dir)
+    except OSError as e:
+        logger.warning(f"Checkpoint blob offloading disabled ({blob_dir}): {e}")
+        return None
+    logger.info(f"Checkpoint blob offloading enabled: dir={blob_dir} min_bytes={min_bytes}")
+    return OffloadingSerializer(store, min_bytes=min_bytes, compression_level=compression_level)
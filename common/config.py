@@ -205,6 +205,10 @@ def settings_customise_sources(
     # Environment
     app_env: str = "dev"  # dev | test | prod
     enable_prometheus: bool = False  # expose /metrics in Prometheus format
+    loop_monitor_enabled: bool = True  # 采样事件循环延迟
+    loop_monitor_interval_seconds: float = 0.25
+    loop_debug_enabled: bool = False  # 阻塞超过阈值时抓取事件循环线程的调用栈
+    loop_slow_callback_ms: int = 100
     port: int = Field(
         default=8001,
         ge=1,
@@ -243,6 +247,16 @@ def settings_customise_sources(
 
     # Database
     database_url: str = ""
+    checkpointer_pool_enabled: bool = False  # 连接池 + 异步 checkpointer（并发运行时推荐）
+    checkpointer_pool_min_size: int = 1
+    checkpointer_pool_max_size: int = 10
+    checkpointer_pool_timeout: float = 30.0  # 等待空闲连接的秒数
+    checkpointer_pool_check: bool = True  # 借出连接前做健康检查
+    checkpointer_statement_timeout_ms: int = 30000  # 0 = 不限制
+    checkpoint_blob_offload_enabled: bool = False  # 大通道值压缩后按内容哈希存到 blob 目录
+    checkpoint_blob_dir: str = "data/checkpoint_blobs"
+    checkpoint_blob_min_bytes: int = 32768  # 序列化后达到该大小才外置
+    session_index_backend: str = "auto"  # auto | memory | postgres（会话列表摘要索引）
 
     # App Config
     debug: bool = False
@@ -268,6 +282,22 @@ def settings_customise_sources(
     trace_buffer_size: int = 1000  # Max traces to keep in memory
     otlp_endpoint: str = ""  # Optional OTLP exporter endpoint
 
+    # Event replay (/api/events/{thread_id} resume via Last-Event-ID)
+    event_buffer_size: int = 1000  # in-memory ring per thread
+    event_log_dir: str = ""  # durable per-thread event log root (empty = disabled), e.g. data/event_log
+    event_log_segment_bytes: int = 4194304  # roll a new segment after 4MB
+    event_log_max_bytes: int = 67108864  # per-thread budget; oldest segments dropped first
+    event_log_retention_s: int = 86400  # drop segments older than this
+    chat_run_replay_frames: int = 10000  # SSE frames kept per detached /api/chat/sse run for reattach
+    chat_run_replay_ttl_s: int = 120  # keep a finished run's frames this long for reattach
+    chat_run_replay_max_frames: int = 200000  # frames kept across all runs; finished runs shed first
+
+    # Token-delta coalescing for chat streams (merge consecutive text deltas into one frame)
+    stream_coalesce_enabled: bool = True
+    stream_coalesce_min_ms: int = 16  # window when the client keeps up
+    stream_coalesce_max_ms: int = 50  # window ceiling under client backpressure
+    stream_coalesce_max_bytes: int = 4096  # flush early once this much text is buffered
+
     # Model Config
     primary_model: str = "deepseek-chat"
     reasoning_model: str = "o1-mini"  # For planning
@@ -289,7 +319,25 @@ def settings_customise_sources(
     rag_enabled: bool = False  # Enable local document RAG
     rag_store_path: Optional[str] = None  # Path for persistent vector storage
     rag_collection_name: str = "weaver_documents"  # ChromaDB collection name
+    rag_vector_backend: str = "auto"  # auto | chroma | local (auto: chroma if installed, else local)
+    rag_local_compact_segments: int = 8  # local backend: merge segments beyond this count
+    rag_local_ivf_threshold: int = 50000  # local backend: build an IVF index for segments this large
+    rag_local_ivf_nprobe: int = 16  # local backend: IVF lists scanned per query
+    rag_hybrid_enabled: bool = True  # fuse BM25 (lexical index) and vector results with RRF
+    rag_hybrid_candidates: int = 20  # candidates taken from each retriever before fusion
+    rag_rrf_k: int = 60  # reciprocal-rank fusion constant
+    rag_ingest_spool_dir: str = "data/ingest_spool"  # uploads wait here until a worker ingests them
+    rag_ingest_workers: int = 2  # concurrent ingestion jobs
+    rag_ingest_parse_processes: int = 2  # process pool for PDF page parsing (0 = parse in the worker thread)
+    rag_ingest_pages_per_task: int = 8  # PDF pages per parse task
+    rag_ingest_max_jobs: int = 500  # finished jobs kept for status queries
     rag_embedding_model: str = "text-embedding-3-small"  # OpenAI embedding model
+    rag_embedding_cache_enabled: bool = True  # persistent (endpoint, model, dims, sha256(text)) embedding cache
+    rag_embedding_cache_path: str = "data/embedding_cache.sqlite3"
+    rag_embedding_cache_max_entries: int = 200000  # LRU bound on cached vectors (0 = unbounded)
+    rag_embedding_batch_size: int = 100  # texts per embeddings API call
+    rag_embedding_concurrency: int = 4  # concurrent embeddings API calls per document
+    rag_embedding_max_retries: int = 3  # retries per batch before the upload fails
     rag_chunk_size: int = 1000  # Document chunk size
     rag_chunk_overlap: int = 200  # Overlap between chunks
 
@@ -322,6 +370,7 @@ def settings_customise_sources(
     agent_auto_continue: bool = False  # 自动续写机制 (finish_reason=tool_calls 时继续)
     agent_max_auto_continues: int = 25  # 最大自动续写次数
     agent_tool_execution_strategy: str = "sequential"  # sequential | parallel
+    agent_execute_on_stream: bool = False  # parallel 策略下，<invoke> 闭合即开始执行工具
 
     # LangGraph Store (long-term memory)
     memory_store_backend: str = "memory"  # memory | postgres | redis
@@ -348,6 +397,11 @@ def settings_customise_sources(
     deepsearch_results_per_query: int = 5
     deepsearch_enable_crawler: bool = False  # enable simple fallback crawler
     deepsearch_enable_research_fetcher: bool = False  # fetch page bodies for evidence passages
+    deepsearch_pipeline_enabled: bool = True  # overlap page fetching with search/LLM steps per epoch
+    deepsearch_pipeline_prefetch_per_query: int = 2  # top URLs fetched per search before the LLM pick (0 = off)
+    deepsearch_pipeline_queue_size: int = 16  # max speculative prefetches per epoch (selected URLs are not capped)
+    deepsearch_evidence_passages_per_page: int = 30  # readability pre-filter per fetched page
+    deepsearch_evidence_passages_top_k: int = 40  # run-wide BM25 budget across all pages (0 = keep all)
     deepsearch_save_data: bool = False  # save deepsearch run data to disk
     deepsearch_save_dir: str = "eval/deepsearch_data"
     deepsearch_use_gap_analysis: bool = True  # use knowledge gap analysis for targeted queries
@@ -371,27 +425,45 @@ def settings_customise_sources(
     research_fetch_max_bytes: int = 2_000_000
     research_fetch_concurrency: int = 6
     research_fetch_concurrency_per_domain: int = 2
+    research_fetch_async: bool = True  # deepsearch evidence uses the asyncio fetch pipeline
     research_fetch_cache_ttl_s: float = 0.0  # 0 disables in-memory fetch cache
     research_fetch_cache_max_entries: int = 256
     research_fetch_cache_store_errors: bool = False
+    research_fetch_disk_cache_enabled: bool = False  # persistent SQLite page cache (shared across workers)
+    research_fetch_disk_cache_path: str = "data/page_cache.sqlite3"
+    research_fetch_disk_cache_ttl_s: float = 86400.0  # fresh window; stale entries revalidate via ETag/Last-Modified
+    research_fetch_disk_cache_max_bytes: int = 512_000_000  # compressed size budget before LRU eviction
     research_fetch_render_mode: str = "off"  # off | auto | always
     research_fetch_render_min_chars: int = 200
     research_fetch_extract_markdown: bool = True
 
+    # Shared HTTP client (keep-alive pools for research fetches + search provider APIs)
+    http_pool_connections: int = 32  # number of per-host pools kept alive
+    http_pool_maxsize: int = 16  # max keep-alive connections per host
+    http_pool_block: bool = False  # block instead of opening overflow connections
+    http_client_http2: bool = False  # experimental urllib3 HTTP/2 (requires `h2`)
+
     # Multi-Search Engine Config
-    search_strategy: str = "fallback"  # fallback | parallel | round_robin | best_first
+    search_strategy: str = "fallback"  # fallback | parallel | round_robin | best_first | hedged
     search_enable_freshness_ranking: bool = True  # Apply freshness boost for time-sensitive queries
     search_freshness_half_life_days: float = 30.0  # Decay half-life for recency score
     search_freshness_weight: float = 0.35  # Blend weight between relevance and freshness
     search_cache_max_size: int = 200  # session-level search cache capacity
     search_cache_ttl_seconds: float = 1800.0  # search cache TTL in seconds
     search_cache_similarity_threshold: float = 0.9  # fuzzy query match threshold
+    search_cache_max_bytes: int = 64_000_000  # L1 byte budget (encoded results); 0 = unlimited
+    search_cache_backend: str = "memory"  # memory | sqlite | redis (shared L2 tier)
+    search_cache_url: str = ""  # sqlite file path (default data/search_cache.sqlite3) or redis URL
+    search_cache_l2_max_bytes: int = 256_000_000  # sqlite L2 byte budget; 0 = unlimited
     search_reliability_max_retries: int = 2  # retries per provider call (in addition to first attempt)
     search_reliability_retry_backoff_seconds: float = 0.5  # exponential backoff base seconds
     search_reliability_circuit_breaker_failures: int = 3  # open circuit after N consecutive failures
     search_reliability_circuit_breaker_reset_seconds: float = 60.0  # reset circuit after N seconds
     search_parallel_max_workers: int = 8  # cap threads for parallel provider fan-out
     search_parallel_timeout_seconds: float = 30.0  # best-effort timeout for parallel fan-out
+    search_hedge_default_delay_ms: float = 1500.0  # hedge delay until a provider has p90 samples
+    search_hedge_min_delay_ms: float = 100.0  # floor for the p90-based hedge delay
+    search_hedge_max_inflight: int = 2  # concurrent provider requests per hedged search
     brave_api_key: str = ""  # Brave Search API key
     serper_api_key: str = ""  # Serper.dev API key
     exa_api_key: str = ""  # Exa.ai API key
@@ -0,0 +1,362 @@
+"""
+Process-wide pooled HTTP client.
+
+Research page fetches and API search providers share one `requests.Session`
+so repeated calls to the same host reuse keep-alive connections instead of
+paying a fresh TCP+TLS handshake per request.
+
+- per-host connection pools (urllib3 PoolManager), sized from settings
+- optional HTTP/2 via urllib3's experimental `h2` integration
+- connection reuse counters exported on `/metrics`
+- no cookie storage: one site's cookies must not follow another user's fetch
+
+Async callers (e.g. `ContentFetcher.afetch_many`) get a per-event-loop
+`httpx.AsyncClient` with the same pool sizing; httpx negotiates HTTP/2 when
+enabled and `h2` is installed. Sync code that wants the async path submits
+coroutines to one long-lived background loop (`run_on_http_loop`) instead of
+`asyncio.run`, so its client and keep-alive connections persist across calls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import importlib.util
+import logging
+import threading
+import weakref
+from dataclasses import dataclass
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any, Awaitable, Dict, Iterator, Optional, TypeVar
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from common.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _ConnectionStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_created = 0
+        self.pools_created = 0
+        self.errors = 0
+        self.async_requests = 0
+
+    def incr(self, field_name: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, field_name, getattr(self, field_name) + amount)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.connections_created = 0
+            self.pools_created = 0
+            self.errors = 0
+            self.async_requests = 0
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            reused = max(0, self.requests - self.connections_created)
+            return {
+                "requests": self.requests,
+                "connections_created": self.connections_created,
+                "connections_reused": reused,
+                "pools_created": self.pools_created,
+                "errors": self.errors,
+                "async_requests": self.async_requests,
+            }
+
+
+_stats = _ConnectionStats()
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):  # type: ignore[override]
+        _stats.incr("connections_created")
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):  # type: ignore[override]
+        _stats.incr("connections_created")
+        return super()._new_conn()
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that records request and connection-creation counts."""
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+        original_new_pool = self.poolmanager._new_pool
+
+        def _new_pool(scheme: str, host: str, port: int, request_context=None):
+            _stats.incr("pools_created")
+            return original_new_pool(scheme, host, port, request_context=request_context)
+
+        self.poolmanager._new_pool = _new_pool  # type: ignore[method-assign]
+
+    def send(self, request, *args: Any, **kwargs: Any):  # type: ignore[override]
+        _stats.incr("requests")
+        try:
+            return super().send(request, *args, **kwargs)
+        except Exception:
+            _stats.incr("errors")
+            raise
+
+
+@dataclass(frozen=True, slots=True)
+class HTTPPoolConfig:
+    pool_connections: int
+    pool_maxsize: int
+    pool_block: bool
+    http2: bool
+
+    @classmethod
+    def from_settings(cls) -> "HTTPPoolConfig":
+        try:
+            pool_connections = max(1, int(getattr(settings, "http_pool_connections", 32) or 32))
+        except Exception:
+            pool_connections = 32
+        try:
+            pool_maxsize = max(1, int(getattr(settings, "http_pool_maxsize", 16) or 16))
+        except Exception:
+            pool_maxsize = 16
+        return cls(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=bool(getattr(settings, "http_pool_block", False)),
+            http2=bool(getattr(settings, "http_client_http2", False)),
+        )
+
+
+_http2_enabled = False
+
+
+def _maybe_enable_http2() -> bool:
+    """Best-effort opt-in to urllib3's HTTP/2 support (requires `h2`)."""
+    global _http2_enabled
+    if _http2_enabled:
+        return True
+    try:
+        from urllib3.http2 import inject_into_urllib3
+
+        inject_into_urllib3()
+    except Exception as e:
+        logger.warning(f"[http_client] HTTP/2 unavailable, using HTTP/1.1: {e}")
+        return False
+    _http2_enabled = True
+    return True
+
+
+def _cookieless_jar() -> CookieJar:
+    """A jar that never stores cookies: the shared clients serve every user."""
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+def build_http_session(config: Optional[HTTPPoolConfig] = None) -> requests.Session:
+    """Create a `requests.Session` with pooled, keep-alive adapters mounted."""
+    config = config or HTTPPoolConfig.from_settings()
+    if config.http2:
+        _maybe_enable_http2()
+
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = PooledHTTPAdapter(
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        pool_block=config.pool_block,
+        max_retries=0,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_session: Optional[requests.Session] = None
+_session_config: Optional[HTTPPoolConfig] = None
+_session_lock = threading.RLock()
+
+
+def get_http_session() -> requests.Session:
+    """Return the shared pooled session (rebuilt if pool settings change)."""
+    global _session, _session_config
+    config = HTTPPoolConfig.from_settings()
+    with _session_lock:
+        if _session is None or _session_config != config:
+            previous = _session
+            _session = build_http_session(config)
+            _session_config = config
+            if previous is not None:
+                try:
+                    previous.close()
+                except Exception:
+                    pass
+        return _session
+
+
+def close_http_session() -> None:
+    global _session, _session_config
+    with _session_lock:
+        session = _session
+        _session = None
+        _session_config = None
+    if session is not None:
+        try:
+            session.close()
+        except Exception:
+            pass
+
+
+# Keyed by event loop; entries disappear with their loop.
+_async_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, tuple[httpx.AsyncClient, HTTPPoolConfig]
+] = weakref.WeakKeyDictionary()
+
+
+async def _count_async_request(_request: httpx.Request) -> None:
+    _stats.incr("async_requests")
+
+
+def build_async_http_client(config: Optional[HTTPPoolConfig] = None) -> httpx.AsyncClient:
+    config = config or HTTPPoolConfig.from_settings()
+    http2 = bool(config.http2 and importlib.util.find_spec("h2") is not None)
+    limits = httpx.Limits(
+        max_connections=config.pool_connections * config.pool_maxsize,
+        max_keepalive_connections=config.pool_connections,
+    )
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=limits,
+        follow_redirects=True,
+        cookies=_cookieless_jar(),
+        event_hooks={"request": [_count_async_request]},
+    )
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared `httpx.AsyncClient` for the running event loop.
+
+    httpx clients are bound to the loop that opened their connections, so
+    callers running `asyncio.run` in worker threads each get their own client.
+    """
+    loop = asyncio.get_running_loop()
+    config = HTTPPoolConfig.from_settings()
+    with _session_lock:
+        entry = _async_clients.get(loop)
+        if entry is not None and entry[1] == config and not entry[0].is_closed:
+            return entry[0]
+        client = build_async_http_client(config)
+        _async_clients[loop] = (client, config)
+    if entry is not None and not entry[0].is_closed:
+        loop.create_task(entry[0].aclose())
+    return client
+
+
+async def aclose_async_http_client() -> None:
+    """Close the async client bound to the running loop (if any)."""
+    loop = asyncio.get_running_loop()
+    with _session_lock:
+        entry = _async_clients.pop(loop, None)
+    if entry is not None:
+        await entry[0].aclose()
+
+
+_T = TypeVar("_T")
+
+_http_loop: Optional[asyncio.AbstractEventLoop] = None
+_http_loop_thread: Optional[threading.Thread] = None
+
+
+def get_http_loop() -> asyncio.AbstractEventLoop:
+    """Return the background event loop used by `submit_to_http_loop` (started on first use)."""
+    global _http_loop, _http_loop_thread
+    with _session_lock:
+        if _http_loop is None or _http_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="weaver-http-loop", daemon=True)
+            thread.start()
+            _http_loop, _http_loop_thread = loop, thread
+        return _http_loop
+
+
+def submit_to_http_loop(coro: Awaitable[_T]) -> "concurrent.futures.Future[_T]":
+    """Schedule `coro` on the background HTTP loop; cancel the future to cancel the task."""
+    return asyncio.run_coroutine_threadsafe(coro, get_http_loop())
+
+
+def run_on_http_loop(coro: Awaitable[_T], timeout: Optional[float] = None) -> _T:
+    """Run `coro` on the background HTTP loop and wait for its result (from sync code only)."""
+    loop = get_http_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        raise RuntimeError("run_on_http_loop called from the HTTP loop itself; await instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+
+def close_http_loop(timeout: float = 5.0) -> None:
+    """Close the background loop's AsyncClient and stop the loop."""
+    global _http_loop, _http_loop_thread
+    with _session_lock:
+        loop, thread = _http_loop, _http_loop_thread
+        _http_loop, _http_loop_thread = None, None
+    if loop is None or loop.is_closed():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(aclose_async_http_client(), loop).result(timeout)
+    except Exception as e:
+        logger.debug(f"Closing background HTTP client failed: {e}")
+    loop.call_soon_threadsafe(loop.stop)
+    if thread is not None:
+        thread.join(timeout)
+    if not loop.is_running():
+        loop.close()
+
+
+def get_http_client_stats() -> Dict[str, Any]:
+    stats: Dict[str, Any] = dict(_stats.snapshot())
+    total = stats["requests"]
+    stats["reuse_ratio"] = round(stats["connections_reused"] / total, 4) if total else 0.0
+    with _session_lock:
+        config = _session_config
+    stats["http2"] = bool(config.http2 and _http2_enabled) if config else False
+    return stats
+
+
+def reset_http_client_stats() -> None:
+    _stats.reset()
+
+
+class HTTPClientMetricsCollector:
+    """Prometheus collector exposing pooled HTTP client counters."""
+
+    def collect(self) -> Iterator[Any]:
+        from prometheus_client.core import CounterMetricFamily
+
+        snapshot = _stats.snapshot()
+        for key, help_text in (
+            ("requests", "Outbound HTTP requests sent via the shared client"),
+            ("connections_created", "New TCP/TLS connections opened by the shared client"),
+            ("connections_reused", "Requests served on a pooled keep-alive connection"),
+            ("pools_created", "Per-host connection pools created"),
+            ("errors", "Outbound HTTP requests that raised a transport error"),
+            ("async_requests", "Outbound HTTP requests sent via the shared async client"),
+        ):
+            yield CounterMetricFamily(
+                f"weaver_http_client_{key}",
+                help_text,
+                value=snapshot[key],
+            )
@@ -0,0 +1,216 @@
+"""
+Latency histograms for HTTP routes, graph nodes, tools and search providers.
+
+Label values are bounded. HTTP requests use the matched route template
+(`/api/sessions/{thread_id}`), never the raw URL path. Nodes, tools and
+providers use their registered names. The run an observation came from is
+attached as an exemplar (`{"thread_id": ...}`) instead of a label.
+Exemplars are only exposed in the OpenMetrics format, which `/metrics`
+serves when the scraper asks for it in its Accept header.
+
+The thread id comes from an explicit argument or from `bind_thread_id()`,
+which request handlers call before running a graph. Work submitted to
+plain thread pools must copy the context to keep it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langgraph.errors import GraphBubbleUp
+from prometheus_client import REGISTRY, Histogram
+
+logger = logging.getLogger(__name__)
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+RUN_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+PROVIDER_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+_current_thread_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "weaver_metrics_thread_id", default=None
+)
+
+
+def _get_or_create_histogram(name: str, *args: Any, **kwargs: Any) -> Histogram:
+    existing = REGISTRY._names_to_collectors.get(name)  # type: ignore[attr-defined]
+    if existing:
+        return existing
+    return Histogram(name, *args, **kwargs)
+
+
+http_request_duration_seconds = _get_or_create_histogram(
+    "weaver_http_request_duration_seconds",
+    "HTTP request latency by route template (time to response headers for streams)",
+    ["method", "path"],
+    buckets=HTTP_BUCKETS,
+)
+graph_node_duration_seconds = _get_or_create_histogram(
+    "weaver_graph_node_duration_seconds",
+    "LangGraph node execution time",
+    ["node", "status"],
+    buckets=RUN_BUCKETS,
+)
+tool_duration_seconds = _get_or_create_histogram(
+    "weaver_tool_duration_seconds",
+    "Tool call execution time",
+    ["tool", "status"],
+    buckets=RUN_BUCKETS,
+)
+search_provider_duration_seconds = _get_or_create_histogram(
+    "weaver_search_provider_duration_seconds",
+    "Search provider call latency",
+    ["provider", "status"],
+    buckets=PROVIDER_BUCKETS,
+)
+
+
+def bind_thread_id(thread_id: Optional[str]) -> None:
+    """Attach `thread_id` as the exemplar for observations in this context."""
+    _current_thread_id.set(str(thread_id) if thread_id else None)
+
+
+def current_thread_id() -> Optional[str]:
+    return _current_thread_id.get()
+
+
+def observe(
+    histogram: Histogram,
+    labels: Sequence[str],
+    seconds: float,
+    *,
+    thread_id: Optional[str] = None,
+) -> None:
+    """Observe `seconds`, with a thread_id exemplar when one is known."""
+    thread_id = thread_id or _current_thread_id.get()
+    # OpenMetrics caps exemplar label sets at 128 characters.
+    exemplar = {"thread_id": str(thread_id)[:100]} if thread_id else None
+    try:
+        histogram.labels(*labels).observe(max(0.0, float(seconds)), exemplar=exemplar)
+    except Exception as e:  # metrics must never break a request
+        logger.debug(f"Latency observation failed: {e}")
+
+
+def route_template(app: Any, scope: Dict[str, Any]) -> str:
+    """
+    Route template for a request scope, e.g. `/api/sessions/{thread_id}`.
+
+    Routed requests carry the matched route in `scope["route"]`. Requests
+    answered before routing (auth, rate limit) are matched against the app
+    routes here. Anything else is `UNMATCHED_ROUTE`.
+    """
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path:
+        return path
+    from starlette.routing import Match
+
+    for candidate in getattr(app, "routes", []):
+        try:
+            match, _ = candidate.matches(scope)
+        except Exception:
+            continue
+        if match != Match.NONE:
+            return getattr(candidate, "path", "") or UNMATCHED_ROUTE
+    return UNMATCHED_ROUTE
+
+
+def _status_for(error: BaseException) -> str:
+    if isinstance(error, GraphBubbleUp):
+        return "interrupted"
+    if isinstance(error, asyncio.CancelledError):
+        return "cancelled"
+    return "error"
+
+
+def record_tool_call(
+    name: str, success: bool, duration_ms: float, *, thread_id: Optional[str] = None
+) -> None:
+    """Record a tool call on its registry metadata, or directly if unregistered."""
+    from tools.core.registry import get_global_registry
+
+    metadata = get_global_registry().get_metadata(name)
+    if metadata is not None:
+        metadata.increment_call(success, duration_ms, thread_id=thread_id)
+    else:
+        observe(
+            tool_duration_seconds,
+            [name, "ok" if success else "error"],
+            duration_ms / 1000,
+            thread_id=thread_id,
+        )
+
+
+class GraphMetricsCallback(BaseCallbackHandler):
+    """Times LangGraph nodes and tool calls; pass it in the run config's `callbacks`."""
+
+    run_inline = True
+
+    def __init__(self) -> None:
+        # run_id -> (kind, name, started, thread_id)
+        self._runs: Dict[UUID, Tuple[str, str, float, Optional[str]]] = {}
+
+    @staticmethod
+    def _thread_id(metadata: Optional[Dict[str, Any]]) -> Optional[str]:
+        bound = _current_thread_id.get()
+        if bound:
+            return bound
+        value = (metadata or {}).get("thread_id")
+        return str(value) if value else None
+
+    def on_chain_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        inputs: Any,
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        # Runnables nested inside a node inherit its metadata; time the node itself only.
+        if not node or kwargs.get("name") != node:
+            return
+        self._runs[run_id] = ("node", str(node), time.perf_counter(), self._thread_id(metadata))
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, "ok")
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, _status_for(error))
+
+    def on_tool_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        input_str: str,
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name") or "unknown"
+        self._runs[run_id] = ("tool", str(name), time.perf_counter(), self._thread_id(metadata))
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, "ok")
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, _status_for(error))
+
+    def _finish(self, run_id: UUID, status: str) -> None:
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        kind, name, started, thread_id = run
+        elapsed = time.perf_counter() - started
+        if kind == "node":
+            observe(graph_node_duration_seconds, [name, status], elapsed, thread_id=thread_id)
+        else:
+            record_tool_call(name, status == "ok", elapsed * 1000, thread_id=thread_id)
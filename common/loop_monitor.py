@@ -0,0 +1,323 @@
+"""
+Event-loop lag sampling and blocking-call detection.
+
+One slow synchronous call inside an async handler stalls every SSE stream
+served by the worker. `LoopMonitor` makes that visible:
+
+- Lag sampler: a task on the loop sleeps `interval` seconds and records how
+  late it woke up. Samples feed a Prometheus histogram
+  (`weaver_event_loop_lag_seconds`, via `LoopMonitorMetricsCollector`).
+- Blocking detector (debug mode): a watchdog thread posts a no-op to the loop
+  and waits `slow_threshold` seconds for it to run. If it does not, the loop
+  is stuck in a callback. The watchdog captures the loop thread's stack
+  (`sys._current_frames()`), waits for the loop to recover, and records the
+  stall under the route whose endpoint is on that stack. Stalls outside a
+  registered endpoint (SSE generators, background tasks) are labelled with
+  the outermost project function on the stack.
+
+Stall durations are measured from the probe, so they are lower bounds, and a
+stall shorter than `slow_threshold` plus the probe spacing can be missed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from types import CodeType, FrameType
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LAG_BUCKETS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_STDLIB_DIR = os.path.dirname(os.__file__)
+_ASYNCIO_DIR = os.path.dirname(asyncio.__file__)
+
+
+@dataclass
+class StallStats:
+    """Blocking time attributed to one route (or function)."""
+
+    route: str
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    last_seen: float = 0.0
+    stack: List[str] = field(default_factory=list)
+
+    def add(self, duration: float, stack: List[str]) -> None:
+        self.count += 1
+        self.total_seconds += duration
+        self.last_seen = time.time()
+        if duration >= self.max_seconds:
+            self.max_seconds = duration
+            self.stack = stack
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "route": self.route,
+            "count": self.count,
+            "total_ms": round(self.total_seconds * 1000, 2),
+            "max_ms": round(self.max_seconds * 1000, 2),
+            "last_seen": self.last_seen,
+            "stack": self.stack,
+        }
+
+
+class LoopMonitor:
+    """Samples loop lag and, in debug mode, captures stacks of blocking callbacks."""
+
+    def __init__(
+        self,
+        *,
+        interval: float = 0.25,
+        slow_threshold: float = 0.1,
+        debug: bool = False,
+        max_stack_frames: int = 30,
+    ) -> None:
+        self.interval = max(0.01, float(interval))
+        self.slow_threshold = max(0.005, float(slow_threshold))
+        self.debug = bool(debug)
+        self.max_stack_frames = max(1, int(max_stack_frames))
+
+        self._lock = threading.Lock()
+        self._bucket_counts = [0] * len(LAG_BUCKETS)
+        self._lag_count = 0
+        self._lag_sum = 0.0
+        self._lag_max = 0.0
+        self._lag_last = 0.0
+        self._stalls: Dict[str, StallStats] = {}
+
+        self._routes: Dict[CodeType, str] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._sampler: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # ------------------------------------------------------------------ setup
+
+    def attach_routes(self, routes: Iterable[Any]) -> None:
+        """Map endpoint code objects to route templates (objects with `.endpoint`/`.path`)."""
+        mapping: Dict[CodeType, str] = {}
+        for route in routes:
+            endpoint = getattr(route, "endpoint", None)
+            path = getattr(route, "path", None)
+            code = getattr(inspect.unwrap(endpoint), "__code__", None) if endpoint else None
+            if code is not None and path:
+                mapping[code] = path
+        self._routes = mapping
+
+    @property
+    def running(self) -> bool:
+        return self._sampler is not None and not self._sampler.done()
+
+    def start(self) -> None:
+        """Start sampling on the running loop (and the watchdog in debug mode)."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._sampler = self._loop.create_task(self._sample(), name="weaver-loop-lag-sampler")
+        if self.debug:
+            self._watchdog = threading.Thread(
+                target=self._watch, name="weaver-loop-watchdog", daemon=True
+            )
+            self._watchdog.start()
+        logger.info(
+            f"Loop monitor started: interval={self.interval}s debug={self.debug} "
+            f"slow_threshold={self.slow_threshold}s"
+        )
+
+    async def stop(self) -> None:
+        self._stop.set()
+        sampler, self._sampler = self._sampler, None
+        if sampler and not sampler.done():
+            sampler.cancel()
+            try:
+                await sampler
+            except asyncio.CancelledError:
+                pass
+        watchdog, self._watchdog = self._watchdog, None
+        if watchdog is not None:
+            await asyncio.to_thread(watchdog.join, 2 * self.slow_threshold + 1.0)
+
+    # ---------------------------------------------------------------- sampler
+
+    async def _sample(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.observe_lag(time.perf_counter() - start - self.interval)
+
+    def observe_lag(self, lag: float) -> None:
+        lag = max(0.0, lag)
+        with self._lock:
+            self._lag_count += 1
+            self._lag_sum += lag
+            self._lag_last = lag
+            self._lag_max = max(self._lag_max, lag)
+            for i, bound in enumerate(LAG_BUCKETS):
+                if lag <= bound:
+                    self._bucket_counts[i] += 1
+                    break
+
+    # --------------------------------------------------------------- watchdog
+
+    def _watch(self) -> None:
+        loop = self._loop
+        probe_spacing = self.slow_threshold / 2
+        while not self._stop.wait(probe_spacing):
+            ack = threading.Event()
+            posted = time.perf_counter()
+            try:
+                loop.call_soon_threadsafe(ack.set)
+            except RuntimeError:  # loop closed
+                return
+            if ack.wait(self.slow_threshold):
+                continue
+
+            route, stack = self._capture()
+            while not ack.wait(0.5):
+                if self._stop.is_set() or loop.is_closed():
+                    return
+            self.record_stall(route, time.perf_counter() - posted, stack)
+
+    def _capture(self) -> Tuple[str, List[str]]:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return "<unknown>", []
+        stack = traceback.format_stack(frame, limit=self.max_stack_frames)
+        return self._route_for(frame), [line.rstrip() for line in stack]
+
+    def _route_for(self, frame: Optional[FrameType]) -> str:
+        # Walk outwards until the asyncio machinery that ran the callback.
+        outermost_project: Optional[str] = None
+        while frame is not None:
+            code = frame.f_code
+            route = self._routes.get(code)
+            if route:
+                return route
+            filename = code.co_filename
+            if filename.startswith(_ASYNCIO_DIR):
+                break
+            if (
+                "site-packages" not in filename
+                and not filename.startswith(_STDLIB_DIR)
+                and not filename.startswith("<")
+            ):
+                module = frame.f_globals.get("__name__", "?")
+                outermost_project = f"{module}.{code.co_name}"
+            frame = frame.f_back
+        return outermost_project or "<event-loop>"
+
+    def record_stall(self, route: str, duration: float, stack: List[str]) -> None:
+        with self._lock:
+            stats = self._stalls.get(route)
+            if stats is None:
+                stats = self._stalls[route] = StallStats(route=route)
+            stats.add(duration, stack)
+        logger.warning(
+            f"Event loop blocked for {duration * 1000:.0f}ms in {route}\n"
+            + "\n".join(stack[-8:])
+        )
+
+    # ---------------------------------------------------------------- reports
+
+    def lag_snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "buckets": list(zip(LAG_BUCKETS, self._bucket_counts, strict=True)),
+                "count": self._lag_count,
+                "sum": self._lag_sum,
+                "max": self._lag_max,
+                "last": self._lag_last,
+            }
+
+    def stall_stats(self) -> List[StallStats]:
+        with self._lock:
+            return sorted(
+                self._stalls.values(), key=lambda s: (s.total_seconds, s.max_seconds), reverse=True
+            )
+
+    def report(self, limit: int = 20) -> Dict[str, Any]:
+        lag = self.lag_snapshot()
+        stalls = self.stall_stats()
+        return {
+            "running": self.running,
+            "debug": self.debug,
+            "interval_ms": round(self.interval * 1000, 2),
+            "slow_threshold_ms": round(self.slow_threshold * 1000, 2),
+            "lag": {
+                "samples": lag["count"],
+                "mean_ms": round(lag["sum"] / lag["count"] * 1000, 3) if lag["count"] else 0.0,
+                "max_ms": round(lag["max"] * 1000, 3),
+                "last_ms": round(lag["last"] * 1000, 3),
+            },
+            "stalls": sum(s.count for s in stalls),
+            "offenders": [s.to_dict() for s in stalls[: max(0, int(limit))]],
+        }
+
+
+class LoopMonitorMetricsCollector:
+    """Prometheus collector for the process-wide `LoopMonitor`."""
+
+    def collect(self) -> Iterator[Any]:
+        from prometheus_client.core import CounterMetricFamily, HistogramMetricFamily
+
+        monitor = get_loop_monitor()
+        lag = monitor.lag_snapshot()
+        cumulative, buckets = 0, []
+        for bound, count in lag["buckets"]:
+            cumulative += count
+            buckets.append((str(bound), cumulative))
+        buckets.append(("+Inf", lag["count"]))
+        yield HistogramMetricFamily(
+            "weaver_event_loop_lag_seconds",
+            "Delay between a scheduled event-loop wakeup and when it ran",
+            buckets=buckets,
+            sum_value=lag["sum"],
+        )
+
+        stalls = CounterMetricFamily(
+            "weaver_event_loop_stalls",
+            "Event-loop stalls longer than the slow-callback threshold",
+            labels=["route"],
+        )
+        blocked = CounterMetricFamily(
+            "weaver_event_loop_blocked_seconds",
+            "Time the event loop was blocked, by route",
+            labels=["route"],
+        )
+        for s in monitor.stall_stats():
+            stalls.add_metric([s.route], s.count)
+            blocked.add_metric([s.route], s.total_seconds)
+        yield stalls
+        yield blocked
+
+
+_monitor: Optional[LoopMonitor] = None
+_monitor_lock = threading.Lock()
+
+
+def get_loop_monitor() -> LoopMonitor:
+    """Return the process-wide monitor, configured from settings on first use."""
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            from common.config import settings
+
+            _monitor = LoopMonitor(
+                interval=float(getattr(settings, "loop_monitor_interval_seconds", 0.25)),
+                slow_threshold=float(getattr(settings, "loop_slow_callback_ms", 100)) / 1000,
+                debug=bool(getattr(settings, "loop_debug_enabled", False)),
+            )
+        return _monitor
@@ -18,6 +18,8 @@ class RunMetrics:
     nodes_completed: Dict[str, int] = field(default_factory=dict)
     errors: List[str] = field(default_factory=list)
     cancelled: bool = False
+    text_deltas: int = 0  # LLM text deltas produced
+    text_frames: int = 0  # text frames actually sent after coalescing
 
     def mark_event(self, event_type: str, node_name: str | None = None) -> None:
         self.event_count += 1
@@ -30,6 +32,16 @@ def add_error(self, message: str) -> None:
         if message:
             self.errors.append(message)
 
+    def record_coalescing(self, deltas: int, frames: int) -> None:
+        self.text_deltas += int(deltas)
+        self.text_frames += int(frames)
+
+    @property
+    def frames_saved_ratio(self) -> float:
+        if not self.text_deltas:
+            return 0.0
+        return round(1.0 - self.text_frames / self.text_deltas, 4)
+
     def finish(self, cancelled: bool = False) -> None:
         self.ended_at = datetime.utcnow()
         self.cancelled = cancelled
@@ -48,6 +60,9 @@ def to_dict(self) -> Dict[str, object]:
             "nodes_completed": self.nodes_completed,
             "errors": self.errors,
             "cancelled": self.cancelled,
+            "text_deltas": self.text_deltas,
+            "text_frames": self.text_frames,
+            "frames_saved_ratio": self.frames_saved_ratio,
         }
 
 
@@ -0,0 +1,142 @@
+"""
+Near-duplicate detection with MinHash signatures.
+
+Search results merged from several providers often carry the same article
+under different URLs (syndication, AMP pages, mirrors). Comparing every
+result's text against every kept result with `SequenceMatcher` is quadratic
+in both the number of results and the text length. Instead, each text gets
+a fixed-size MinHash signature over its character shingles, computed once,
+and a new result is compared against all kept signatures in one vectorized
+operation.
+
+The MinHash agreement rate estimates the Jaccard similarity J of the shingle
+sets; it is reported as the Dice coefficient 2J / (1 + J), the same
+"2 * matches / total" form as `SequenceMatcher.ratio()`, so existing
+similarity thresholds keep roughly their meaning.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import zlib
+from typing import Any, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+DEFAULT_NUM_PERM = 64
+DEFAULT_SHINGLE_SIZE = 5
+
+_MASK64 = (1 << 64) - 1
+_WS_RE = re.compile(r"\s+")
+
+
+def _shingle_hashes(text: str, size: int) -> List[int]:
+    normalized = _WS_RE.sub(" ", (text or "").lower()).strip()
+    if len(normalized) <= size:
+        shingles = {normalized}
+    else:
+        shingles = {normalized[i : i + size] for i in range(len(normalized) - size + 1)}
+    return [zlib.crc32(s.encode("utf-8")) for s in shingles]
+
+
+class NearDuplicateIndex:
+    """
+    Incremental near-duplicate finder over MinHash signatures.
+
+    Usage mirrors the greedy "keep unless similar to something kept" loops:
+    `signature()` once per text, `find()` against the kept set, then `add()`
+    or `replace()` the matched slot.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        *,
+        num_perm: int = DEFAULT_NUM_PERM,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE,
+        max_chars: Optional[int] = None,
+        seed: int = 1,
+    ) -> None:
+        self.threshold = float(threshold)
+        self.num_perm = int(num_perm)
+        self.shingle_size = max(1, int(shingle_size))
+        self.max_chars = max_chars
+        # Multiply-shift hashing: (a * x + b) mod 2**64 >> 32, one (a, b) per permutation.
+        rng = random.Random(seed)
+        self._a = [rng.getrandbits(64) | 1 for _ in range(self.num_perm)]
+        self._b = [rng.getrandbits(64) for _ in range(self.num_perm)]
+        self._count = 0
+        if NUMPY_AVAILABLE:
+            self._np_a = np.array(self._a, dtype=np.uint64)[:, None]
+            self._np_b = np.array(self._b, dtype=np.uint64)[:, None]
+            self._sigs = np.empty((0, self.num_perm), dtype=np.uint64)
+        else:
+            self._sigs: List[Tuple[int, ...]] = []  # type: ignore[no-redef]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def signature(self, text: str) -> Any:
+        """MinHash signature of `text` (truncated to `max_chars`)."""
+        if self.max_chars is not None:
+            text = (text or "")[: self.max_chars]
+        hashes = _shingle_hashes(text, self.shingle_size)
+        if NUMPY_AVAILABLE:
+            h = np.array(hashes, dtype=np.uint64)[None, :]
+            return ((h * self._np_a + self._np_b) >> np.uint64(32)).min(axis=1)
+        return tuple(
+            min(((a * x + b) & _MASK64) >> 32 for x in hashes)
+            for a, b in zip(self._a, self._b, strict=True)
+        )
+
+    def similarities(self, sig: Any) -> Sequence[float]:
+        """Estimated similarity of `sig` to every kept signature, in slot order."""
+        if self._count == 0:
+            return []
+        if NUMPY_AVAILABLE:
+            jaccard = (
+                np.count_nonzero(self._sigs[: self._count] == sig, axis=1) / self.num_perm
+            )
+            return (2.0 * jaccard) / (1.0 + jaccard)
+        out: List[float] = []
+        for kept in self._sigs:
+            jaccard = sum(1 for x, y in zip(kept, sig, strict=True) if x == y) / self.num_perm
+            out.append((2.0 * jaccard) / (1.0 + jaccard))
+        return out
+
+    def find(self, sig: Any) -> Optional[int]:
+        """First kept slot whose similarity to `sig` is at least the threshold."""
+        if self._count == 0:
+            return None
+        sims = self.similarities(sig)
+        if NUMPY_AVAILABLE:
+            hits = np.flatnonzero(sims >= self.threshold)
+            return int(hits[0]) if hits.size else None
+        for slot, sim in enumerate(sims):
+            if sim >= self.threshold:
+                return slot
+        return None
+
+    def add(self, sig: Any) -> int:
+        """Keep `sig`; returns its slot."""
+        slot = self._count
+        if NUMPY_AVAILABLE:
+            if slot >= len(self._sigs):
+                grown = np.empty((max(16, slot * 2), self.num_perm), dtype=np.uint64)
+                grown[:slot] = self._sigs[:slot]
+                self._sigs = grown
+            self._sigs[slot] = sig
+        else:
+            self._sigs.append(sig)
+        self._count += 1
+        return slot
+
+    def replace(self, slot: int, sig: Any) -> None:
+        self._sigs[slot] = sig
+
@@ -0,0 +1,417 @@
+"""
+Materialized session index.
+
+`GET /api/sessions` used to list every checkpoint of every thread and
+de-duplicate threads in Python. The index keeps one compact row per thread
+(owner, status, topic, timestamps, route, report flag, counts). It is
+updated when a run starts and finishes, and it is read with keyset
+pagination: newest activity first, with `(sort_ts, thread_id)` as the key.
+
+Backends:
+
+- `SessionIndex`: in-process. It keeps sorted key lists for all rows, per
+  owner and per status, so a filtered page is a bisect plus `limit` steps.
+- `PostgresSessionIndex`: a `weaver_session_index` table with matching
+  composite indexes. Used when a database is configured, so the index
+  survives restarts and is shared by workers. A completed backfill is
+  recorded in `weaver_session_index_meta`, so later processes skip it.
+
+Cursors are opaque, URL-safe strings. A page is `(entries, next_cursor)`;
+`next_cursor` is None on the last page.
+"""
+
+from __future__ import annotations
+
+import base64
+import bisect
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import psycopg
+    from psycopg.rows import dict_row
+
+    PSYCOPG_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    psycopg = None  # type: ignore[assignment]
+    dict_row = None  # type: ignore[assignment]
+    PSYCOPG_AVAILABLE = False
+
+try:
+    from psycopg_pool import ConnectionPool
+
+    PSYCOPG_POOL_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    ConnectionPool = None  # type: ignore[assignment,misc]
+    PSYCOPG_POOL_AVAILABLE = False
+
+_Key = Tuple[float, str]
+
+
+@dataclass(frozen=True)
+class SessionIndexEntry:
+    """One thread's summary row."""
+
+    thread_id: str
+    status: str
+    topic: str
+    created_at: str
+    updated_at: str
+    route: str
+    has_report: bool
+    revision_count: int
+    message_count: int
+    user_id: Optional[str] = None
+    sort_ts: float = 0.0
+
+    @property
+    def key(self) -> _Key:
+        return (self.sort_ts, self.thread_id)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def activity_ts(*timestamps: str) -> float:
+    """Epoch seconds of the first parseable ISO timestamp, else now."""
+    for value in timestamps:
+        if not value:
+            continue
+        try:
+            parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            continue
+        return parsed.timestamp()
+    return time.time()
+
+
+def encode_cursor(key: _Key) -> str:
+    raw = f"{key[0]!r}|{key[1]}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[_Key]:
+    """Decode a cursor from `encode_cursor`; raises ValueError if malformed."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        ts, thread_id = base64.urlsafe_b64decode(padded).decode("utf-8").split("|", 1)
+        return (float(ts), thread_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+class SessionIndex:
+    """In-process session index with keyset pagination."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[str, SessionIndexEntry] = {}
+        self._keys: List[_Key] = []
+        self._by_user: Dict[str, List[_Key]] = {}
+        self._by_status: Dict[str, List[_Key]] = {}
+        self.backfilled = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, thread_id: str) -> Optional[SessionIndexEntry]:
+        return self._entries.get(thread_id)
+
+    def upsert(self, entry: SessionIndexEntry) -> None:
+        with self._lock:
+            self._remove_locked(entry.thread_id)
+            self._entries[entry.thread_id] = entry
+            bisect.insort(self._keys, entry.key)
+            if entry.user_id:
+                bisect.insort(self._by_user.setdefault(entry.user_id, []), entry.key)
+            bisect.insort(self._by_status.setdefault(entry.status, []), entry.key)
+
+    def upsert_many(self, entries: Iterable[SessionIndexEntry]) -> int:
+        """Upsert a batch of rows; returns how many were written."""
+        count = 0
+        for entry in entries:
+            self.upsert(entry)
+            count += 1
+        return count
+
+    def mark_backfilled(self) -> None:
+        """Record that every existing thread has been indexed."""
+        self.backfilled = True
+
+    def close(self) -> None:
+        """Release backend resources (nothing to do in-process)."""
+
+    def remove(self, thread_id: str) -> None:
+        with self._lock:
+            self._remove_locked(thread_id)
+
+    def _remove_locked(self, thread_id: str) -> None:
+        old = self._entries.pop(thread_id, None)
+        if old is None:
+            return
+        _discard(self._keys, old.key)
+        if old.user_id:
+            _discard(self._by_user.get(old.user_id, []), old.key)
+        _discard(self._by_status.get(old.status, []), old.key)
+
+    def page(
+        self,
+        *,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> Tuple[List[SessionIndexEntry], Optional[str]]:
+        limit = max(1, int(limit))
+        after = decode_cursor(cursor)
+        with self._lock:
+            # Walk the smaller candidate list; check the other filter per row.
+            candidates = self._keys
+            if user_id is not None:
+                candidates = self._by_user.get(user_id, [])
+            if status is not None:
+                by_status = self._by_status.get(status, [])
+                if len(by_status) < len(candidates):
+                    candidates = by_status
+
+            end = bisect.bisect_left(candidates, after) if after else len(candidates)
+            out: List[SessionIndexEntry] = []
+            for i in range(end - 1, -1, -1):
+                entry = self._entries[candidates[i][1]]
+                if (status is None or entry.status == status) and (
+                    user_id is None or entry.user_id == user_id
+                ):
+                    out.append(entry)
+                    if len(out) > limit:
+                        break
+        has_more = len(out) > limit
+        out = out[:limit]
+        return out, (encode_cursor(out[-1].key) if out and has_more else None)
+
+
+def _discard(keys: List[_Key], key: _Key) -> None:
+    i = bisect.bisect_left(keys, key)
+    if i < len(keys) and keys[i] == key:
+        del keys[i]
+
+
+_COLUMNS = (
+    "thread_id",
+    "status",
+    "topic",
+    "created_at",
+    "updated_at",
+    "route",
+    "has_report",
+    "revision_count",
+    "message_count",
+    "user_id",
+    "sort_ts",
+)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS weaver_session_index (
+        thread_id TEXT PRIMARY KEY,
+        status TEXT NOT NULL,
+        topic TEXT NOT NULL DEFAULT '',
+        created_at TEXT NOT NULL DEFAULT '',
+        updated_at TEXT NOT NULL DEFAULT '',
+        route TEXT NOT NULL DEFAULT '',
+        has_report BOOLEAN NOT NULL DEFAULT FALSE,
+        revision_count INTEGER NOT NULL DEFAULT 0,
+        message_count INTEGER NOT NULL DEFAULT 0,
+        user_id TEXT,
+        sort_ts DOUBLE PRECISION NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS weaver_session_index_recent "
+    "ON weaver_session_index (sort_ts DESC, thread_id DESC)",
+    "CREATE INDEX IF NOT EXISTS weaver_session_index_user "
+    "ON weaver_session_index (user_id, sort_ts DESC, thread_id DESC)",
+    "CREATE INDEX IF NOT EXISTS weaver_session_index_status "
+    "ON weaver_session_index (status, sort_ts DESC, thread_id DESC)",
+    """
+    CREATE TABLE IF NOT EXISTS weaver_session_index_meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )
+    """,
+)
+
+_UPSERT_SQL = (
+    f"INSERT INTO weaver_session_index ({', '.join(_COLUMNS)}) "
+    f"VALUES ({', '.join('%(' + c + ')s' for c in _COLUMNS)}) "
+    f"ON CONFLICT (thread_id) DO UPDATE SET "
+    + ", ".join(f"{c} = EXCLUDED.{c}" for c in _COLUMNS if c != "thread_id")
+)
+
+_BACKFILL_MARKER = "backfill_completed_at"
+
+
+class PostgresSessionIndex(SessionIndex):
+    """
+    Session index stored in Postgres.
+
+    Calls borrow connections from a small `psycopg_pool.ConnectionPool`
+    (short-lived connections when psycopg_pool is not installed).
+    """
+
+    def __init__(
+        self,
+        database_url: str,
+        *,
+        connect_timeout: int = 10,
+        pool_min_size: int = 1,
+        pool_max_size: int = 4,
+    ) -> None:
+        if not PSYCOPG_AVAILABLE:
+            raise RuntimeError("PostgresSessionIndex requires psycopg")
+        super().__init__()
+        self.database_url = database_url
+        self.connect_timeout = int(connect_timeout)
+        self._pool: Optional[Any] = None
+        if PSYCOPG_POOL_AVAILABLE:
+            min_size = max(1, int(pool_min_size))
+            self._pool = ConnectionPool(
+                database_url,
+                kwargs={
+                    "autocommit": True,
+                    "row_factory": dict_row,
+                    "connect_timeout": self.connect_timeout,
+                },
+                min_size=min_size,
+                max_size=max(min_size, int(pool_max_size)),
+                timeout=float(self.connect_timeout),
+                name="weaver-session-index",
+                open=False,
+            )
+        try:
+            if self._pool is not None:
+                self._pool.open(wait=True, timeout=float(self.connect_timeout))
+            with self._connect() as conn:
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+                row = conn.execute(
+                    "SELECT 1 FROM weaver_session_index_meta WHERE key = %s", (_BACKFILL_MARKER,)
+                ).fetchone()
+        except Exception:
+            self.close()
+            raise
+        # Only a backfill that ran to the end (here or in another process) counts.
+        self.backfilled = row is not None
+
+    def _connect(self):
+        if self._pool is not None:
+            return self._pool.connection()
+        return psycopg.connect(
+            self.database_url,
+            autocommit=True,
+            row_factory=dict_row,
+            connect_timeout=self.connect_timeout,
+        )
+
+    def close(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+
+    def mark_backfilled(self) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO weaver_session_index_meta (key, value) VALUES (%s, %s) "
+                "ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value",
+                (_BACKFILL_MARKER, datetime.now(timezone.utc).isoformat()),
+            )
+        self.backfilled = True
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return int(conn.execute("SELECT count(*) AS n FROM weaver_session_index").fetchone()["n"])
+
+    def get(self, thread_id: str) -> Optional[SessionIndexEntry]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM weaver_session_index WHERE thread_id = %s", (thread_id,)
+            ).fetchone()
+        return _entry_from_row(row) if row else None
+
+    def upsert(self, entry: SessionIndexEntry) -> None:
+        with self._connect() as conn:
+            conn.execute(_UPSERT_SQL, entry.to_dict())
+
+    def upsert_many(self, entries: Iterable[SessionIndexEntry]) -> int:
+        rows = [entry.to_dict() for entry in entries]
+        if not rows:
+            return 0
+        with self._connect() as conn:
+            with conn.cursor() as cur:
+                cur.executemany(_UPSERT_SQL, rows)
+        return len(rows)
+
+    def remove(self, thread_id: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM weaver_session_index WHERE thread_id = %s", (thread_id,))
+
+    def page(
+        self,
+        *,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> Tuple[List[SessionIndexEntry], Optional[str]]:
+        limit = max(1, int(limit))
+        after = decode_cursor(cursor)
+        where: List[str] = []
+        params: List[Any] = []
+        if user_id is not None:
+            where.append("user_id = %s")
+            params.append(user_id)
+        if status is not None:
+            where.append("status = %s")
+            params.append(status)
+        if after:
+            where.append("(sort_ts, thread_id) < (%s, %s)")
+            params.extend(after)
+        sql = "SELECT * FROM weaver_session_index"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY sort_ts DESC, thread_id DESC LIMIT %s"
+        params.append(limit + 1)
+
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        entries = [_entry_from_row(r) for r in rows[:limit]]
+        has_more = len(rows) > limit
+        return entries, (encode_cursor(entries[-1].key) if entries and has_more else None)
+
+
+def _entry_from_row(row: Dict[str, Any]) -> SessionIndexEntry:
+    return SessionIndexEntry(**{c: row[c] for c in _COLUMNS})
+
+
+def create_session_index(database_url: str = "", backend: str = "auto") -> SessionIndex:
+    """
+    Build the configured session index.
+
+    `backend`: "memory", "postgres", or "auto" (Postgres when `database_url`
+    is set). Falls back to the in-process index if Postgres is unavailable.
+    """
+    backend = (backend or "auto").strip().lower()
+    use_postgres = backend == "postgres" or (backend == "auto" and bool(database_url))
+    if use_postgres and database_url:
+        try:
+            return PostgresSessionIndex(database_url)
+        except Exception as e:
+            logger.warning(f"Postgres session index unavailable, using in-memory index: {e}")
+    return SessionIndex()
+
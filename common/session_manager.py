@@ -6,10 +6,14 @@
 """
 
 import logging
+import threading
 from copy import deepcopy
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from common.checkpoint_blobs import LazyChannelValues, lazy_blob_loading
+from common.session_index import SessionIndex, SessionIndexEntry, activity_ts
 
 logger = logging.getLogger(__name__)
 
@@ -99,16 +103,23 @@ class SessionManager:
     - Get session state
     - Resume session
     - Delete session
+
+    Listing reads a `SessionIndex` (one summary row per thread) rather than
+    the checkpoints. The index is backfilled from the checkpointer once,
+    then kept current through `index_session()` / `refresh_session()`.
     """
 
-    def __init__(self, checkpointer):
+    def __init__(self, checkpointer, index: Optional[SessionIndex] = None):
         """
         Initialize the session manager.
 
         Args:
             checkpointer: LangGraph checkpointer instance
+            index: Session summary index (defaults to an in-process index)
         """
         self.checkpointer = checkpointer
+        self.index = index if index is not None else SessionIndex()
+        self._backfill_lock = threading.Lock()
 
     def list_sessions(
         self,
@@ -117,84 +128,181 @@ def list_sessions(
         user_id_filter: Optional[str] = None,
     ) -> List[SessionInfo]:
         """
-        List all sessions.
+        List sessions, most recently active first.
 
         Args:
             limit: Maximum sessions to return
             status_filter: Filter by status (optional)
+            user_id_filter: Only sessions owned by this user (optional)
 
         Returns:
             List of SessionInfo objects
         """
-        sessions = []
-
         try:
-            # Get all thread IDs from checkpointer
-            # Note: This implementation depends on the checkpointer type
-            if hasattr(self.checkpointer, "list"):
-                # Postgres checkpointer with list method
-                checkpoints = list(self.checkpointer.list({"configurable": {}}))
-            elif hasattr(self.checkpointer, "storage"):
-                # Memory checkpointer
-                checkpoints = []
-                for config, checkpoint in self.checkpointer.storage.items():
-                    checkpoints.append({"config": config, "checkpoint": checkpoint})
-            else:
-                logger.warning("Checkpointer does not support listing")
-                return []
-
-            seen_threads = set()
+            sessions, _ = self.list_sessions_page(
+                limit=limit, status_filter=status_filter, user_id_filter=user_id_filter
+            )
+            return sessions
+        except Exception as e:
+            logger.error(f"Error listing sessions: {e}")
+            return []
 
-            for cp_info in checkpoints[:limit * 2]:  # Get extra to account for duplicates
-                try:
-                    if isinstance(cp_info, tuple):
-                        config, checkpoint = cp_info
-                    else:
-                        config = cp_info.get("config", {})
-                        checkpoint = cp_info.get("checkpoint", cp_info)
+    def list_sessions_page(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        status_filter: Optional[str] = None,
+        user_id_filter: Optional[str] = None,
+    ) -> Tuple[List[SessionInfo], Optional[str]]:
+        """
+        One keyset page of sessions from the session index.
 
-                    thread_id = None
-                    if isinstance(config, dict):
-                        thread_id = config.get("configurable", {}).get("thread_id")
-                    elif hasattr(config, "configurable"):
-                        thread_id = config.configurable.get("thread_id")
+        Args:
+            limit: Page size
+            cursor: `next_cursor` from the previous page (None for the first page)
+            status_filter: Filter by status (optional)
+            user_id_filter: Only sessions owned by this user (optional)
 
-                    if not thread_id or thread_id in seen_threads:
-                        continue
+        Returns:
+            (sessions, next_cursor); next_cursor is None on the last page
 
-                    seen_threads.add(thread_id)
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        self._ensure_index()
+        entries, next_cursor = self.index.page(
+            limit=limit, cursor=cursor, status=status_filter, user_id=user_id_filter
+        )
+        return [self._info_from_entry(e) for e in entries], next_cursor
 
-                    # Extract state from checkpoint
-                    state = {}
-                    if hasattr(checkpoint, "checkpoint"):
-                        state = checkpoint.checkpoint.get("channel_values", {})
-                    elif isinstance(checkpoint, dict):
-                        state = checkpoint.get("channel_values", {})
+    def index_session(
+        self,
+        thread_id: str,
+        state: Dict[str, Any],
+        checkpoint_tuple: Any = None,
+    ) -> SessionInfo:
+        """Upsert a thread's summary row from a state snapshot."""
+        info, entry = self._index_entry(thread_id, state, checkpoint_tuple)
+        self.index.upsert(entry)
+        return info
 
-                    if user_id_filter:
-                        owner = state.get("user_id")
-                        if not isinstance(owner, str) or owner.strip() != user_id_filter:
-                            continue
+    def _index_entry(
+        self,
+        thread_id: str,
+        state: Dict[str, Any],
+        checkpoint_tuple: Any = None,
+    ) -> Tuple[SessionInfo, SessionIndexEntry]:
+        info = self._build_session_info(thread_id, state, checkpoint_tuple)
+        owner = state.get("user_id") if isinstance(state, dict) else None
+        owner = owner.strip() if isinstance(owner, str) and owner.strip() else None
+        entry = SessionIndexEntry(
+            **info.to_dict(),
+            user_id=owner,
+            sort_ts=activity_ts(info.updated_at, info.created_at),
+        )
+        return info, entry
 
-                    session_info = self._build_session_info(thread_id, state, checkpoint)
+    def refresh_session(self, thread_id: str) -> Optional[SessionInfo]:
+        """Re-index a thread from its latest checkpoint (e.g. when a run finishes)."""
+        try:
+            checkpoint_tuple, state = self._get_lazy_tuple(thread_id)
+            if not checkpoint_tuple:
+                return None
+            return self.index_session(thread_id, state, checkpoint_tuple)
+        except Exception as e:
+            logger.warning(f"Error indexing session {thread_id}: {e}")
+            return None
 
-                    # Apply status filter
-                    if status_filter and session_info.status != status_filter:
-                        continue
+    def backfill_index(self, batch_size: int = 500) -> int:
+        """Index the latest checkpoint of every thread; returns threads indexed."""
+        count = 0
+        batch: List[SessionIndexEntry] = []
+        for thread_id, state, checkpoint in self._iter_latest_checkpoints():
+            try:
+                batch.append(self._index_entry(thread_id, state, checkpoint)[1])
+            except Exception as e:
+                logger.debug(f"Error indexing checkpoint for {thread_id}: {e}")
+                continue
+            if len(batch) >= batch_size:
+                count += self.index.upsert_many(batch)
+                batch = []
+        if batch:
+            count += self.index.upsert_many(batch)
+        # Marked only after the full pass; an interrupted backfill reruns.
+        self.index.mark_backfilled()
+        logger.info(f"Session index backfilled with {count} threads")
+        return count
+
+    def _ensure_index(self) -> None:
+        if self.index.backfilled:
+            return
+        with self._backfill_lock:
+            if not self.index.backfilled:
+                self.backfill_index()
+
+    def _iter_latest_checkpoints(self) -> Iterator[Tuple[str, Dict[str, Any], Any]]:
+        """Stream (thread_id, state, checkpoint) for the first checkpoint seen per thread."""
+        # Note: This implementation depends on the checkpointer type
+        if hasattr(self.checkpointer, "list"):
+            # Savers yield each thread's newest checkpoint first.
+            checkpoints = self.checkpointer.list(None)
+        elif hasattr(self.checkpointer, "storage"):
+            # Memory checkpointer
+            checkpoints = (
+                {"config": config, "checkpoint": checkpoint}
+                for config, checkpoint in self.checkpointer.storage.items()
+            )
+        else:
+            logger.warning("Checkpointer does not support listing")
+            return
 
-                    sessions.append(session_info)
+        seen_threads = set()
+        for cp_info in checkpoints:
+            try:
+                if hasattr(cp_info, "config") and hasattr(cp_info, "checkpoint"):
+                    # CheckpointTuple
+                    config, checkpoint = cp_info.config, cp_info
+                elif isinstance(cp_info, tuple):
+                    config, checkpoint = cp_info
+                else:
+                    config = cp_info.get("config", {})
+                    checkpoint = cp_info.get("checkpoint", cp_info)
+
+                thread_id = None
+                if isinstance(config, dict):
+                    thread_id = config.get("configurable", {}).get("thread_id")
+                elif hasattr(config, "configurable"):
+                    thread_id = config.configurable.get("thread_id")
+
+                if not thread_id or thread_id in seen_threads:
+                    continue
+                seen_threads.add(thread_id)
 
-                    if len(sessions) >= limit:
-                        break
+                state = {}
+                if hasattr(checkpoint, "checkpoint"):
+                    state = checkpoint.checkpoint.get("channel_values", {})
+                elif isinstance(checkpoint, dict):
+                    state = checkpoint.get("channel_values", {})
 
-                except Exception as e:
-                    logger.debug(f"Error processing checkpoint: {e}")
-                    continue
+                yield thread_id, state, checkpoint
 
-        except Exception as e:
-            logger.error(f"Error listing sessions: {e}")
+            except Exception as e:
+                logger.debug(f"Error processing checkpoint: {e}")
+                continue
 
-        return sessions
+    @staticmethod
+    def _info_from_entry(entry: SessionIndexEntry) -> SessionInfo:
+        return SessionInfo(
+            thread_id=entry.thread_id,
+            status=entry.status,
+            topic=entry.topic,
+            created_at=entry.created_at,
+            updated_at=entry.updated_at,
+            route=entry.route,
+            has_report=entry.has_report,
+            revision_count=entry.revision_count,
+            message_count=entry.message_count,
+        )
 
     def get_session(self, thread_id: str) -> Optional[SessionInfo]:
         """
@@ -220,10 +328,29 @@ def get_session(self, thread_id: str) -> Optional[SessionInfo]:
             logger.error(f"Error getting session {thread_id}: {e}")
             return None
 
+    def _get_lazy_tuple(self, thread_id: str) -> Tuple[Any, Dict[str, Any]]:
+        """Latest checkpoint and its channel values; offloaded blobs load on access."""
+        config = {"configurable": {"thread_id": thread_id}}
+        with lazy_blob_loading():
+            checkpoint_tuple = self.checkpointer.get_tuple(config)
+        if not checkpoint_tuple:
+            return None, {}
+        values = checkpoint_tuple.checkpoint.get("channel_values", {})
+        return checkpoint_tuple, LazyChannelValues(values) if isinstance(values, dict) else values
+
+    def get_session_owner(self, thread_id: str) -> Optional[str]:
+        """Persisted `user_id` of a session (reads no offloaded channel values)."""
+        _, state = self._get_lazy_tuple(thread_id)
+        owner = state.get("user_id") if isinstance(state, dict) else None
+        return owner.strip() if isinstance(owner, str) and owner.strip() else None
+
     def get_session_state(self, thread_id: str) -> Optional[SessionState]:
         """
         Get full session state.
 
+        Channel values offloaded to the checkpoint blob store are loaded
+        lazily, on first access.
+
         Args:
             thread_id: Thread identifier
 
@@ -231,13 +358,11 @@ def get_session_state(self, thread_id: str) -> Optional[SessionState]:
             SessionState or None if not found
         """
         try:
-            config = {"configurable": {"thread_id": thread_id}}
-            checkpoint_tuple = self.checkpointer.get_tuple(config)
+            checkpoint_tuple, state = self._get_lazy_tuple(thread_id)
 
             if not checkpoint_tuple:
                 return None
 
-            state = checkpoint_tuple.checkpoint.get("channel_values", {})
             checkpoint_ts = ""
             parent_id = None
 
@@ -280,6 +405,7 @@ def delete_session(self, thread_id: str) -> bool:
             # Check if checkpointer supports deletion
             if hasattr(self.checkpointer, "delete"):
                 self.checkpointer.delete(config)
+                self.index.remove(thread_id)
                 logger.info(f"Deleted session: {thread_id}")
                 return True
             elif hasattr(self.checkpointer, "put"):
@@ -290,6 +416,7 @@ def delete_session(self, thread_id: str) -> bool:
                     state["status"] = "deleted"
                     state["is_complete"] = True
                     # Note: Can't actually delete, just mark
+                    self.index.remove(thread_id)
                     logger.info(f"Marked session as deleted: {thread_id}")
                     return True
 
@@ -547,11 +674,40 @@ def _maybe_extract_claims() -> List[Dict[str, Any]]:
 
 # Global session manager instance
 _session_manager: Optional[SessionManager] = None
+_session_manager_lock = threading.Lock()
 
 
 def get_session_manager(checkpointer) -> SessionManager:
-    """Get or create the global session manager."""
+    """
+    Get or create the global session manager.
+
+    Creating it opens the session index (for Postgres: pool open and DDL), so
+    the app builds it once at startup in a worker thread; the lock keeps
+    concurrent first callers from opening two indexes.
+    """
+    global _session_manager
+    manager = _session_manager
+    if manager is not None and manager.checkpointer == checkpointer:
+        return manager
+    with _session_manager_lock:
+        if _session_manager is None or _session_manager.checkpointer != checkpointer:
+            from common.config import settings
+            from common.session_index import create_session_index
+
+            if _session_manager is not None:
+                _session_manager.index.close()
+            index = create_session_index(
+                getattr(settings, "database_url", "") or "",
+                getattr(settings, "session_index_backend", "auto"),
+            )
+            _session_manager = SessionManager(checkpointer, index=index)
+        return _session_manager
+
+
+def close_session_manager() -> None:
+    """Release the global session manager's index (e.g. its connection pool)."""
     global _session_manager
-    if _session_manager is None or _session_manager.checkpointer != checkpointer:
-        _session_manager = SessionManager(checkpointer)
-    return _session_manager
+    with _session_manager_lock:
+        manager, _session_manager = _session_manager, None
+    if manager is not None:
+        manager.index.close()
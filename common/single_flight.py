@@ -0,0 +1,207 @@
+"""
+Single-flight call coalescing.
+
+Concurrent callers asking for the same key share one execution of the
+underlying function instead of each hitting the upstream (cache stampede
+protection). The first caller runs it; everyone arriving while it is in
+flight waits and receives the same result or exception.
+
+Works across threads and asyncio tasks: a coroutine can wait on a call led
+by a worker thread and vice versa. Named instances (`get_single_flight`)
+are exported on `/metrics` with their coalesced-call counters.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class _LeaderCancelled(Exception):
+    """The leading caller was cancelled; waiters should retry instead of failing."""
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "_futures")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self._futures: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def add_future(self, loop: asyncio.AbstractEventLoop) -> asyncio.Future:
+        fut = loop.create_future()
+        self._futures.append((loop, fut))
+        return fut
+
+    def finish(self) -> None:
+        """Wake every waiter; must be called with the owning SingleFlight lock held."""
+        self.done.set()
+        for loop, fut in self._futures:
+            try:
+                loop.call_soon_threadsafe(_resolve, fut)
+            except RuntimeError:
+                # Loop already closed; nobody is left to wake.
+                pass
+        self._futures.clear()
+
+
+def _resolve(fut: asyncio.Future) -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+
+class SingleFlight:
+    """Thread- and asyncio-safe per-key call coalescing."""
+
+    def __init__(self, name: str = "") -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def _join(self, key: str) -> Tuple[_Call, bool]:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                return call, False
+            call = _Call()
+            self._calls[key] = call
+            self.executions += 1
+            return call, True
+
+    def _complete(self, key: str, call: _Call) -> None:
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+            call.finish()
+
+    def do(self, key: str, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """
+        Run `fn` once per in-flight `key`.
+
+        Returns:
+            (result, shared) where `shared` is True when this caller waited on
+            another caller's execution. Shared results are the same object the
+            leader got; copy before mutating.
+        """
+        while True:
+            call, leader = self._join(key)
+            if leader:
+                try:
+                    call.result = fn()
+                except BaseException as e:
+                    call.error = e
+                    raise
+                finally:
+                    self._complete(key, call)
+                return call.result, False
+
+            call.done.wait()
+            if isinstance(call.error, _LeaderCancelled):
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """Async `do`: await `fn()` once per in-flight `key` (shared with sync callers)."""
+        loop = asyncio.get_running_loop()
+        while True:
+            call, leader = self._join(key)
+            if leader:
+                try:
+                    call.result = await fn()
+                except asyncio.CancelledError:
+                    call.error = _LeaderCancelled()
+                    raise
+                except BaseException as e:
+                    call.error = e
+                    raise
+                finally:
+                    self._complete(key, call)
+                return call.result, False
+
+            with self._lock:
+                fut = None if call.done.is_set() else call.add_future(loop)
+            if fut is not None:
+                await fut
+            if isinstance(call.error, _LeaderCancelled):
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.executions = 0
+            self.coalesced = 0
+
+
+_registry: Dict[str, SingleFlight] = {}
+_registry_lock = threading.Lock()
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Return the process-wide SingleFlight for `name` (e.g. "search", "fetch")."""
+    with _registry_lock:
+        flight = _registry.get(name)
+        if flight is None:
+            flight = SingleFlight(name)
+            _registry[name] = flight
+        return flight
+
+
+def get_single_flight_stats() -> Dict[str, Dict[str, int]]:
+    with _registry_lock:
+        flights = dict(_registry)
+    return {name: flight.stats() for name, flight in sorted(flights.items())}
+
+
+class SingleFlightMetricsCollector:
+    """Prometheus collector exposing per-name execution/coalesced counters."""
+
+    def collect(self) -> Iterator[Any]:
+        from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+        stats = get_single_flight_stats()
+        executions = CounterMetricFamily(
+            "weaver_single_flight_executions",
+            "Upstream calls executed by a single-flight leader",
+            labels=["name"],
+        )
+        coalesced = CounterMetricFamily(
+            "weaver_single_flight_coalesced",
+            "Calls that waited on an identical in-flight call instead of running it",
+            labels=["name"],
+        )
+        in_flight = GaugeMetricFamily(
+            "weaver_single_flight_in_flight",
+            "Distinct keys currently in flight",
+            labels=["name"],
+        )
+        for name, snapshot in stats.items():
+            executions.add_metric([name], snapshot["executions"])
+            coalesced.add_metric([name], snapshot["coalesced"])
+            in_flight.add_metric([name], snapshot["in_flight"])
+        yield executions
+        yield coalesced
+        yield in_flight
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import asyncio
-import json
 from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable
 from typing import Any
 
+from common.stream_frames import dumps, sse_typed_frame
+
 
 def format_sse_event(*, event: str, data: Any, event_id: int | None = None) -> str:
     """
@@ -13,12 +14,7 @@ def format_sse_event(*, event: str, data: Any, event_id: int | None = None) -> s
     We intentionally emit a single `data:` line containing JSON to keep client
     parsing simple and predictable.
     """
-    lines: list[str] = []
-    if event_id is not None:
-        lines.append(f"id: {event_id}")
-    lines.append(f"event: {event}")
-    lines.append(f"data: {json.dumps(data, ensure_ascii=False)}")
-    return "\n".join(lines) + "\n\n"
+    return sse_typed_frame(event, dumps(data), event_id)
 
 
 def format_sse_comment(comment: str = "keepalive") -> str:
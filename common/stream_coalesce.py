@@ -0,0 +1,147 @@
+"""
+Token-delta coalescing for agent streams.
+
+LLM token chunks arrive as one `text` event each. `TextDeltaCoalescer` merges
+consecutive text deltas into one frame and flushes when:
+
+- a non-text event arrives (it is yielded right after the merged text),
+- the buffered text reaches `max_bytes`,
+- the current window has elapsed since the first buffered delta,
+- the source ends.
+
+The window adapts between `min_window_ms` and `max_window_ms`. It doubles
+when the consumer is slow and decays back otherwise. "Slow" means one of:
+
+- downstream took longer than the window to take the last frame,
+- or the `backlog()` callback reports more than `backlog_threshold`
+  unsent frames.
+
+Only `StreamFrame`s built by `encode_stream_event("text", {"content": ...})`
+are merged; anything else passes through untouched and in order.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import suppress
+from typing import AsyncIterable, AsyncIterator, Callable, List, Optional
+
+from common.stream_frames import StreamFrame, encode_stream_event
+
+
+def _text_delta(item: object) -> Optional[str]:
+    """Content of a mergeable text delta, else None."""
+    if not isinstance(item, StreamFrame) or item.event_type != "text":
+        return None
+    data = item.data
+    if not isinstance(data, dict) or len(data) != 1:
+        return None
+    content = data.get("content")
+    return content if isinstance(content, str) else None
+
+
+class TextDeltaCoalescer:
+    """Adaptive merge stage for consecutive `text` stream frames."""
+
+    def __init__(
+        self,
+        *,
+        min_window_ms: float = 16.0,
+        max_window_ms: float = 50.0,
+        max_bytes: int = 4096,
+        backlog: Optional[Callable[[], int]] = None,
+        backlog_threshold: int = 32,
+    ) -> None:
+        self.min_window_s = max(0.0, float(min_window_ms)) / 1000.0
+        self.max_window_s = max(self.min_window_s, float(max_window_ms) / 1000.0)
+        self.max_bytes = max(1, int(max_bytes))
+        self.backlog = backlog
+        self.backlog_threshold = max(0, int(backlog_threshold))
+
+        self.window_s = self.min_window_s
+        self.deltas_in = 0
+        self.frames_out = 0
+
+    @property
+    def frames_saved_ratio(self) -> float:
+        """Share of text deltas that did not need a frame of their own."""
+        if not self.deltas_in:
+            return 0.0
+        return round(1.0 - self.frames_out / self.deltas_in, 4)
+
+    def _adapt(self, downstream_s: float) -> None:
+        slow = downstream_s > self.window_s
+        if not slow and self.backlog is not None:
+            try:
+                slow = self.backlog() > self.backlog_threshold
+            except Exception:
+                slow = False
+        if slow:
+            self.window_s = min(self.max_window_s, max(self.window_s, 0.001) * 2)
+        else:
+            self.window_s = max(self.min_window_s, self.window_s * 0.75)
+
+    async def run(self, source: AsyncIterable[str]) -> AsyncIterator[str]:
+        """Yield `source` with consecutive text deltas merged."""
+        iterator = source.__aiter__()
+        parts: List[str] = []
+        size = 0
+        deadline = 0.0
+        pending: Optional[asyncio.Task] = None
+
+        try:
+            while True:
+                if pending is None and not parts:
+                    # Nothing buffered: await the source directly (no task, no timer).
+                    try:
+                        item = await iterator.__anext__()
+                    except StopAsyncIteration:
+                        break
+                else:
+                    if pending is None:
+                        pending = asyncio.ensure_future(iterator.__anext__())
+                    timeout = max(0.0, deadline - time.monotonic()) if parts else None
+                    done, _ = await asyncio.wait({pending}, timeout=timeout)
+                    if not done:
+                        item = None  # window elapsed; flush below and keep waiting
+                    else:
+                        task, pending = pending, None
+                        try:
+                            item = task.result()
+                        except StopAsyncIteration:
+                            break
+
+                delta = _text_delta(item) if item is not None else None
+                if delta is not None:
+                    self.deltas_in += 1
+                    if not parts:
+                        deadline = time.monotonic() + self.window_s
+                    parts.append(delta)
+                    size += len(delta.encode("utf-8"))
+                    if size < self.max_bytes and time.monotonic() < deadline:
+                        continue
+                    item = None
+
+                if parts:
+                    merged = encode_stream_event("text", {"content": "".join(parts)})
+                    parts, size = [], 0
+                    self.frames_out += 1
+                    started = time.monotonic()
+                    yield merged
+                    self._adapt(time.monotonic() - started)
+                if item is not None:
+                    yield item
+
+            if parts:
+                self.frames_out += 1
+                yield encode_stream_event("text", {"content": "".join(parts)})
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
+                with suppress(asyncio.CancelledError, Exception):
+                    await pending
+            aclose = getattr(iterator, "aclose", None)
+            if callable(aclose):
+                with suppress(Exception):
+                    await aclose()
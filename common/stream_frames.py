@@ -0,0 +1,80 @@
+"""
+Pre-encoded stream frames.
+
+A stream event is JSON-encoded exactly once (with orjson when installed) and
+the protocol adapters only wrap that text, never re-parse it:
+
+- legacy line:      `0:{payload}\\n`            (`/api/chat`, `/api/research`)
+- typed SSE:        `id:` / `event:` / `data:`  (`/api/chat/sse`, `/api/research/sse`)
+- message-only SSE: `id:` / `data:`             (`/api/events/{thread_id}`, `EventSource.onmessage`)
+
+`StreamFrame` is a `str` (the legacy line), so every existing consumer of the
+legacy protocol keeps working; the SSE adapters pick up the pre-encoded
+payload from its attributes.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def dumps(obj: Any, *, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """
+    Compact JSON text (UTF-8, non-ASCII kept as-is).
+
+    Falls back to the stdlib encoder for values orjson rejects (non-str dict
+    keys, integers beyond 64 bits), so both paths accept the same inputs.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=default).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=default)
+
+
+class StreamFrame(str):
+    """
+    A legacy `0:{json}\\n` line carrying its event type and pre-encoded JSON payload.
+
+    `data` keeps a reference to the unencoded event data so stream stages
+    (e.g. text-delta coalescing) can inspect it without parsing.
+    """
+
+    event_type: str
+    payload: str
+    data: Any
+
+    def __new__(cls, event_type: str, payload: str, data: Any = None) -> "StreamFrame":
+        frame = super().__new__(cls, f"0:{payload}\n")
+        frame.event_type = event_type
+        frame.payload = payload
+        frame.data = data
+        return frame
+
+
+def encode_stream_event(event_type: str, data: Any) -> StreamFrame:
+    """Encode a `{"type", "data"}` stream event once."""
+    return StreamFrame(event_type, dumps({"type": event_type, "data": data}), data)
+
+
+def sse_typed_frame(event: str, payload: str, event_id: Optional[int] = None) -> str:
+    """Typed SSE frame around an already-encoded JSON payload."""
+    if event_id is None:
+        return f"event: {event}\ndata: {payload}\n\n"
+    return f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n"
+
+
+def sse_message_frame(payload: str, event_id: Optional[int] = None) -> str:
+    """Default-type ("message") SSE frame around an already-encoded JSON payload."""
+    if event_id is None:
+        return f"data: {payload}\n\n"
+    return f"id: {event_id}\ndata: {payload}\n\n"
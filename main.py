@@ -13,7 +13,7 @@
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
 
 from fastapi import (
     FastAPI,
@@ -30,12 +30,11 @@
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.types import Command
 from prometheus_client import (
-    CONTENT_TYPE_LATEST,
     REGISTRY,
     Counter,
     Gauge,
-    generate_latest,
 )
+from prometheus_client.exposition import choose_encoder
 from pydantic import BaseModel, Field, field_validator
 from starlette.concurrency import run_in_threadpool
 
@@ -51,7 +50,9 @@
     initialize_enhanced_tools,
     remove_emitter,
 )
+from agent.core.graph import PooledPostgresSaver, create_pooled_checkpointer
 from agent.workflows.evidence_extractor import extract_message_sources
+from common.agent_runs import AgentRun, get_agent_run_registry
 from common.agents_store import (
     AgentProfile,
     ensure_default_agent,
@@ -68,16 +69,35 @@
 )
 from common.cancellation import TaskStatus, cancellation_manager
 from common.chat_stream_translate import translate_legacy_line_to_sse
+from common.checkpoint_blobs import create_offloading_serializer
 from common.config import settings
+from common.http_client import (
+    HTTPClientMetricsCollector,
+    aclose_async_http_client,
+    close_http_loop,
+    close_http_session,
+)
+from common.latency_metrics import (
+    GraphMetricsCallback,
+    bind_thread_id,
+    http_request_duration_seconds,
+    observe,
+    route_template,
+)
 from common.logger import get_logger, setup_logging
+from common.loop_monitor import LoopMonitorMetricsCollector, get_loop_monitor
 from common.metrics import metrics_registry
 from common.proxy_env import normalize_socks_proxy_env
+from common.single_flight import SingleFlightMetricsCollector, get_single_flight_stats
 from common.sse import (
+    format_sse_comment,
     format_sse_event,
     format_sse_retry,
     iter_abort_on_disconnect,
     iter_with_sse_keepalive,
 )
+from common.stream_coalesce import TextDeltaCoalescer
+from common.stream_frames import StreamFrame, encode_stream_event
 from common.thread_ownership import get_thread_owner, set_thread_owner
 from support_agent import create_support_graph
 from tools.browser.browser_session import browser_sessions
@@ -144,7 +164,9 @@ def _get_or_create_gauge(name: str, *args, **kwargs):
 
 http_requests_total = (
     _get_or_create_counter(
-        "weaver_http_requests_total", "Total HTTP requests", ["method", "path", "status"]
+        "weaver_http_requests_total",
+        "Total HTTP requests (path is the route template)",
+        ["method", "path", "status"],
     )
     if settings.enable_prometheus
     else None
@@ -155,6 +177,9 @@ def _get_or_create_gauge(name: str, *args, **kwargs):
     else None
 )
 
+# Graph node / tool latency histograms (see common.latency_metrics).
+graph_metrics_callback = GraphMetricsCallback()
+
 # Streaming connection gauges (always registered; cheap + useful for debugging).
 sse_active_connections = _get_or_create_gauge(
     "weaver_sse_active_connections",
@@ -179,6 +204,18 @@ def _get_or_create_gauge(name: str, *args, **kwargs):
     ["endpoint"],
 )
 
+# Shared outbound HTTP client pool counters (fetcher + search providers).
+if "weaver_http_client_requests" not in REGISTRY._names_to_collectors:  # type: ignore[attr-defined]
+    REGISTRY.register(HTTPClientMetricsCollector())
+
+# Single-flight coalescing counters (identical concurrent searches / fetches).
+if "weaver_single_flight_coalesced" not in REGISTRY._names_to_collectors:  # type: ignore[attr-defined]
+    REGISTRY.register(SingleFlightMetricsCollector())
+
+# Event-loop lag histogram and per-route stall counters.
+if "weaver_event_loop_lag_seconds" not in REGISTRY._names_to_collectors:  # type: ignore[attr-defined]
+    REGISTRY.register(LoopMonitorMetricsCollector())
+
 
 # Request logging middleware
 @app.middleware("http")
@@ -186,6 +223,7 @@ async def log_requests(request: Request, call_next):
     """Log all HTTP requests, enforce internal auth, and apply basic rate limiting."""
     request_id = (request.headers.get("X-Request-ID") or "").strip() or str(uuid.uuid4())[:8]
     start_time = time.time()
+    started = time.perf_counter()
 
     if http_inprogress:
         http_inprogress.inc()
@@ -305,8 +343,16 @@ async def log_requests(request: Request, call_next):
             f"ID: {request_id} | Status: {response.status_code} | "
             f"Duration: {duration:.3f}s"
         )
+        route = route_template(app, request.scope)
         if http_requests_total:
-            http_requests_total.labels(request.method, request.url.path, response.status_code).inc()
+            http_requests_total.labels(request.method, route, response.status_code).inc()
+        observe(
+            http_request_duration_seconds,
+            [request.method, route],
+            time.perf_counter() - started,
+            thread_id=response.headers.get("X-Thread-ID")
+            or request.scope.get("path_params", {}).get("thread_id"),
+        )
 
         return response
     except Exception as e:
@@ -316,8 +362,14 @@ async def log_requests(request: Request, call_next):
             f"ID: {request_id} | Duration: {duration:.3f}s | Error: {str(e)}",
             exc_info=True,
         )
+        route = route_template(app, request.scope)
         if http_requests_total:
-            http_requests_total.labels(request.method, request.url.path, 500).inc()
+            http_requests_total.labels(request.method, route, 500).inc()
+        observe(
+            http_request_duration_seconds,
+            [request.method, route],
+            time.perf_counter() - started,
+        )
         raise
     finally:
         if http_inprogress:
@@ -341,7 +393,7 @@ async def log_requests(request: Request, call_next):
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-Thread-ID", "X-Request-ID"],  # Allow frontend to read these headers
+    expose_headers=["X-Thread-ID", "X-Run-ID", "X-Request-ID"],  # Allow frontend to read these headers
 )
 
 
@@ -369,7 +421,7 @@ def _apply_rate_limit_headers(response: Any, *, limit: int, remaining: int, rese
     response.headers["X-RateLimit-Reset"] = str(reset_ts)
 
 
-def _require_thread_owner(request: Request, thread_id: str) -> None:
+async def _require_thread_owner(request: Request, thread_id: str) -> None:
     """
     Enforce per-user thread isolation when internal auth is enabled.
 
@@ -396,11 +448,8 @@ def _require_thread_owner(request: Request, thread_id: str) -> None:
         from common.session_manager import get_session_manager
 
         manager = get_session_manager(checkpointer)
-        session_state = manager.get_session_state(thread_id)
-        if not session_state or not isinstance(session_state.state, dict):
-            return
-        persisted_owner = session_state.state.get("user_id")
-        if isinstance(persisted_owner, str) and persisted_owner.strip() and persisted_owner.strip() != principal_id:
+        persisted_owner = await run_in_threadpool(manager.get_session_owner, thread_id)
+        if persisted_owner and persisted_owner != principal_id:
             raise HTTPException(status_code=403, detail="Forbidden")
     except HTTPException:
         raise
@@ -409,6 +458,54 @@ def _require_thread_owner(request: Request, thread_id: str) -> None:
         return
 
 
+_session_index_tasks: set[asyncio.Task] = set()
+# Latest scheduled index update per thread; each update waits for the previous one.
+_session_index_tails: Dict[str, asyncio.Task] = {}
+
+
+def _index_session_sync(thread_id: str, state: Optional[Dict[str, Any]]) -> None:
+    try:
+        from common.session_manager import get_session_manager
+
+        manager = get_session_manager(checkpointer)
+        if state is None:
+            manager.refresh_session(thread_id)
+        else:
+            manager.index_session(thread_id, state)
+    except Exception as e:
+        logger.warning(f"Session index update failed for {thread_id}: {e}")
+
+
+def _schedule_session_index(thread_id: str, state: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Update the session index in the background.
+
+    With `state`, index that snapshot (run start). Without it, re-read the
+    thread's latest checkpoint (run end).
+    """
+    if not checkpointer or not thread_id:
+        return
+    previous = _session_index_tails.get(thread_id)
+
+    async def _run() -> None:
+        # Updates for one thread land in schedule order, so a slow run-start
+        # upsert cannot overwrite the run-end refresh.
+        if previous is not None:
+            await asyncio.wait([previous])
+        await run_in_threadpool(_index_session_sync, thread_id, state)
+
+    task = asyncio.create_task(_run())
+    _session_index_tails[thread_id] = task
+    _session_index_tasks.add(task)
+
+    def _done(finished: asyncio.Task) -> None:
+        _session_index_tasks.discard(finished)
+        if _session_index_tails.get(thread_id) is finished:
+            del _session_index_tails[thread_id]
+
+    task.add_done_callback(_done)
+
+
 # Periodic cleanup of stale rate-limit buckets (runs every 5 minutes)
 async def _cleanup_rate_limit_buckets():
     try:
@@ -427,11 +524,29 @@ async def _cleanup_rate_limit_buckets():
 
 
 # Initialize agent graphs with short-term memory (checkpointer)
-if settings.database_url:
-    checkpointer = create_checkpointer(settings.database_url)
+checkpoint_serde = None
+if getattr(settings, "checkpoint_blob_offload_enabled", False):
+    checkpoint_serde = create_offloading_serializer(
+        getattr(settings, "checkpoint_blob_dir", "data/checkpoint_blobs"),
+        min_bytes=int(getattr(settings, "checkpoint_blob_min_bytes", 32768)),
+    )
+
+if settings.database_url and getattr(settings, "checkpointer_pool_enabled", False):
+    # Pool is opened in startup_event (needs a running loop).
+    checkpointer = create_pooled_checkpointer(
+        settings.database_url,
+        min_size=int(getattr(settings, "checkpointer_pool_min_size", 1)),
+        max_size=int(getattr(settings, "checkpointer_pool_max_size", 10)),
+        timeout=float(getattr(settings, "checkpointer_pool_timeout", 30.0)),
+        statement_timeout_ms=int(getattr(settings, "checkpointer_statement_timeout_ms", 30000)),
+        check_connections=bool(getattr(settings, "checkpointer_pool_check", True)),
+        serde=checkpoint_serde,
+    )
+elif settings.database_url:
+    checkpointer = create_checkpointer(settings.database_url, serde=checkpoint_serde)
 else:
     # Fallback to in-memory checkpointer for short-term memory
-    checkpointer = MemorySaver()
+    checkpointer = MemorySaver(serde=checkpoint_serde)
 
 
 def _init_store():
@@ -524,6 +639,23 @@ async def startup_event():
             name="weaver-rate-limit-cleanup",
         )
 
+    if getattr(settings, "loop_monitor_enabled", True):
+        loop_monitor = get_loop_monitor()
+        loop_monitor.attach_routes(app.routes)
+        loop_monitor.start()
+
+    if isinstance(checkpointer, PooledPostgresSaver):
+        await checkpointer.aopen(timeout=float(getattr(settings, "checkpointer_pool_timeout", 30.0)))
+
+    if checkpointer:
+        # Opening the session index may connect and run DDL; keep it off the event loop.
+        try:
+            from common.session_manager import get_session_manager
+
+            await run_in_threadpool(get_session_manager, checkpointer)
+        except Exception as e:
+            logger.warning(f"Session index unavailable at startup: {e}")
+
     # Log configuration
     logger.info(f"Environment: {'DEBUG' if settings.debug else 'PRODUCTION'}")
     logger.info(f"Primary Model: {settings.primary_model}")
@@ -672,6 +804,11 @@ async def shutdown_event():
             pass
     _rate_limit_cleanup_task = None
 
+    try:
+        await get_loop_monitor().stop()
+    except Exception as e:
+        logger.warning(f"Error stopping loop monitor: {e}")
+
     try:
         logger.info("Closing MCP tools...")
         await close_mcp_tools()
@@ -687,6 +824,41 @@ async def shutdown_event():
     except Exception as e:
         logger.warning(f"Error stopping Daytona sandboxes: {e}")
 
+    try:
+        cancelled_runs = get_agent_run_registry().cancel_detached()
+        if cancelled_runs:
+            logger.info(f"Cancelled {cancelled_runs} detached chat runs")
+    except Exception as e:
+        logger.warning(f"Error cancelling detached chat runs: {e}")
+
+    if isinstance(checkpointer, PooledPostgresSaver):
+        try:
+            await checkpointer.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing checkpointer pool: {e}")
+
+    try:
+        from common.session_manager import close_session_manager
+
+        await run_in_threadpool(close_session_manager)
+    except Exception as e:
+        logger.warning(f"Error closing session index: {e}")
+
+    try:
+        from tools.rag.ingestion import shutdown_ingestion_queue
+
+        shutdown_ingestion_queue()
+    except Exception as e:
+        logger.warning(f"Error stopping document ingestion: {e}")
+
+    # Release pooled outbound HTTP connections
+    try:
+        close_http_session()
+        await aclose_async_http_client()
+        await asyncio.to_thread(close_http_loop)
+    except Exception as e:
+        logger.warning(f"Error closing shared HTTP session: {e}")
+
     # Shutdown trigger system
     try:
         logger.info("Shutting down trigger system...")
@@ -780,6 +952,7 @@ class SearchProviderSnapshot(BaseModel):
     error_count: int
     success_rate: float
     avg_latency_ms: float
+    p90_latency_ms: Optional[float] = None
     avg_result_quality: float
     last_error: Optional[str] = None
     last_error_time: Optional[str] = None
@@ -919,14 +1092,44 @@ class SandboxBrowserDiagnoseResponse(BaseModel):
 class SearchCacheStats(BaseModel):
     size: int
     max_size: int
+    bytes: int = 0
+    max_bytes: int = 0
     hits: int
     similar_hits: int
+    l2_hits: int = 0
+    misses: int
+    evictions: int = 0
+    coalesced: int = 0
+    hit_rate: float
+    backend: str = "memory"
+    l2_errors: int = 0
+    l2_entries: Optional[int] = None
+
+
+class PageCacheStats(BaseModel):
+    entries: int
+    size_bytes: int
+    max_bytes: int
+    hits: int
     misses: int
+    stale: int
+    revalidated: int
+    revalidate_modified: int
+    stores: int
+    evictions: int
     hit_rate: float
 
 
+class SingleFlightStats(BaseModel):
+    executions: int
+    coalesced: int
+    in_flight: int
+
+
 class SearchCacheStatsResponse(BaseModel):
     stats: SearchCacheStats
+    page_cache: Optional[PageCacheStats] = None
+    single_flight: Dict[str, SingleFlightStats] = {}
 
 
 class SearchCacheClearResponse(BaseModel):
@@ -1204,13 +1407,18 @@ async def root():
 @app.get("/health")
 async def health():
     """Detailed health check."""
-    return {
+    payload = {
         "status": "healthy",
         "database": "configured" if settings.database_url else "not configured",
         "version": app.version,
         "uptime_seconds": time.monotonic() - APP_STARTED_AT,
         "timestamp": datetime.now().isoformat(),
     }
+    if isinstance(checkpointer, PooledPostgresSaver):
+        payload["checkpointer_pool"] = checkpointer.pool_stats()
+    if checkpoint_serde is not None:
+        payload["checkpoint_blobs"] = checkpoint_serde.stats()
+    return payload
 
 
 @app.get("/api/health/agent", response_model=AgentHealthResponse)
@@ -1218,7 +1426,7 @@ async def agent_health():
     """Lightweight agent subsystem health snapshot (no sandbox side effects)."""
     from tools.core.registry import get_global_registry
 
-    profiles = load_agents()
+    profiles = await run_in_threadpool(load_agents)
     agent_ids = []
     try:
         agent_ids = [str(p.id) for p in profiles if getattr(p, "id", None)]
@@ -1259,7 +1467,7 @@ async def cancel_chat(thread_id: str, request: Request, payload: CancelRequest |
         thread_id: 浠诲姟绾跨▼ ID
         request: 鍙€夌殑鍙栨秷鍘熷洜
     """
-    _require_thread_owner(request, thread_id)
+    await _require_thread_owner(request, thread_id)
 
     reason = payload.reason if payload else "User requested cancellation"
     logger.info(f"Cancel request received for thread: {thread_id}, reason: {reason}")
@@ -1388,14 +1596,16 @@ async def get_active_tasks(request: Request):
 # ==================== 娴佸紡浜嬩欢鏍煎紡鍖?====================
 
 
-async def format_stream_event(event_type: str, data: Any) -> str:
+async def format_stream_event(event_type: str, data: Any) -> StreamFrame:
     """
     Format events in Vercel AI SDK Data Stream Protocol format.
 
     Format: {type}:{json_data}\n
+
+    The returned line is a `StreamFrame`, so the SSE endpoints reuse its
+    encoded payload instead of parsing the line again.
     """
-    payload = {"type": event_type, "data": data}
-    return f"0:{json.dumps(payload)}\n"
+    return encode_stream_event(event_type, data)
 
 
 def _should_emit_main_text_for_node(node_name: str) -> bool:
@@ -1706,7 +1916,8 @@ async def support_chat(request: Request, payload: SupportChatRequest):
                 ),
             )
 
-        result = support_graph.invoke(state, config=config)
+        # Off the loop: a sync graph run blocks on checkpointer I/O.
+        result = await run_in_threadpool(support_graph.invoke, state, config=config)
         messages = result.get("messages", [])
         reply = ""
         for msg in reversed(messages):
@@ -1799,6 +2010,7 @@ async def tool_event_listener(event):
 
         mode_info = _normalize_search_mode(search_mode)
         metrics = metrics_registry.start(thread_id, model=model, route=mode_info.get("mode", ""))
+        bind_thread_id(thread_id)
 
         # Initialize state with cancellation support
         initial_state: AgentState = {
@@ -1861,6 +2073,7 @@ async def tool_event_listener(event):
                 "max_revisions": settings.max_revisions,
             },
             "recursion_limit": 50,
+            "callbacks": [graph_metrics_callback],
         }
 
         async def _drain_pending_tool_events() -> None:
@@ -1901,6 +2114,17 @@ async def _drain_pending_tool_events() -> None:
             {"text": "Initializing research agent...", "step": "init", "thread_id": thread_id},
         )
 
+        _schedule_session_index(
+            thread_id,
+            {
+                "input": input_text,
+                "user_id": user_id,
+                "route": mode_info.get("mode", ""),
+                "status": "running",
+                "started_at": datetime.now().isoformat(),
+            },
+        )
+
         # Stream graph execution
         graph_events = research_graph.astream_events(initial_state, config=config)
         graph_iter = graph_events.__aiter__()
@@ -2238,6 +2462,7 @@ async def _drain_pending_tool_events() -> None:
         # ???????
         if thread_id in active_streams:
             del active_streams[thread_id]
+        _schedule_session_index(thread_id)
         if thread_handler:
             try:
                 root_logger.removeHandler(thread_handler)
@@ -2269,39 +2494,109 @@ async def _drain_pending_tool_events() -> None:
                         pass
 
 
-@app.post("/api/chat/sse")
-async def chat_sse(request: Request, payload: ChatRequest):
+def _coalesce_text_deltas(
+    source: AsyncIterator[str],
+    *,
+    thread_id: str,
+    backlog: Optional[Callable[[], int]] = None,
+) -> AsyncIterator[str]:
     """
-    Standard SSE chat endpoint.
+    Merge consecutive LLM text deltas of an agent stream (see `TextDeltaCoalescer`).
 
-    This endpoint translates the existing legacy `0:{json}\\n` stream protocol
-    into standard SSE frames (`event:` / `data:`) so the frontend can use an
-    off-the-shelf SSE parser.
+    Delta and frame counts are added to the thread's run metrics when the
+    stream ends.
     """
-    # Get the last user message (same rule as /api/chat).
-    user_messages = [msg for msg in payload.messages if msg.role == "user"]
-    if not user_messages:
-        raise HTTPException(status_code=400, detail="No user message found")
+    if not getattr(settings, "stream_coalesce_enabled", True):
+        return source
+
+    coalescer = TextDeltaCoalescer(
+        min_window_ms=float(getattr(settings, "stream_coalesce_min_ms", 16) or 0),
+        max_window_ms=float(getattr(settings, "stream_coalesce_max_ms", 50) or 0),
+        max_bytes=int(getattr(settings, "stream_coalesce_max_bytes", 4096) or 4096),
+        backlog=backlog,
+    )
 
-    last_message = user_messages[-1].content
-    internal_key = (getattr(settings, "internal_api_key", "") or "").strip()
-    principal_id = (getattr(request.state, "principal_id", "") or "").strip()
-    user_id = principal_id if internal_key and principal_id else (payload.user_id or settings.memory_user_id)
-    mode_info = _normalize_search_mode(payload.search_mode)
-    model = (payload.model or settings.primary_model).strip()
-    thread_id = f"thread_{uuid.uuid4().hex}"
-    set_thread_owner(thread_id, getattr(request.state, "principal_id", "") or "anonymous")
+    async def _stream():
+        try:
+            async for item in coalescer.run(source):
+                yield item
+        finally:
+            metrics = metrics_registry.get(thread_id)
+            if metrics is not None and coalescer.deltas_in:
+                metrics.record_coalescing(coalescer.deltas_in, coalescer.frames_out)
+
+    return _stream()
+
+
+def _sse_frame_event(frame: str) -> str:
+    """Event name of a frame produced by `format_sse_event` (`id:` line first)."""
+    lines = frame.split("\n", 2)
+    for line in lines[:2]:
+        if line.startswith("event: "):
+            return line[7:]
+    return ""
+
+
+async def _drive_chat_run(run: AgentRun, source: AsyncIterator[str]) -> None:
+    """Run the agent stream to completion, writing SSE frames to the run's replay buffer."""
+    replay = run.replay
+    last_event = ""
+    run.start()
+    try:
+        async for line in source:
+            frame = translate_legacy_line_to_sse(line, seq=replay.next_seq())
+            if frame:
+                replay.append(frame)
+                last_event = _sse_frame_event(frame)
+        if last_event == "error":
+            run.fail("agent stream reported an error")
+        elif last_event == "cancelled":
+            run.cancel("Task was cancelled")
+        else:
+            run.complete()
+    except asyncio.CancelledError:
+        # Cancelled before the agent stream could report it (e.g. shutdown).
+        replay.append(
+            format_sse_event(
+                event="cancelled",
+                data={"message": "Task was cancelled", "thread_id": run.thread_id},
+                event_id=replay.next_seq(),
+            )
+        )
+        run.cancel("Task was cancelled")
+        raise
+    except Exception as e:
+        logger.error(f"Detached chat run {run.id} failed: {e}", exc_info=True)
+        replay.append(
+            format_sse_event(
+                event="error",
+                data={"message": str(e), "thread_id": run.thread_id},
+                event_id=replay.next_seq(),
+            )
+        )
+        run.fail(str(e))
+    finally:
+        run.event_count = replay.last_seq
+        replay.close()
+        get_agent_run_registry().release_replay_later(run)
+        if active_streams.get(run.thread_id) is run.task:
+            active_streams.pop(run.thread_id, None)
+
+
+def _tail_chat_run(request: Request, run: AgentRun, after_seq: int, *, gauge_label: str):
+    """SSE generator over a detached run's frames after `after_seq`; never cancels the run."""
+    # Hold the buffer itself: the registry may release `run.replay` before the stream starts.
+    replay = run.replay
 
     async def _sse_generator():
         gauge = None
         try:
-            gauge = sse_active_connections.labels("chat_sse")
+            gauge = sse_active_connections.labels(gauge_label)
             gauge.inc()
         except Exception:
             gauge = None
 
         try:
-            seq = 0
             # Hint clients (EventSource) how long to wait before attempting reconnects.
             try:
                 if await request.is_disconnected():
@@ -2310,46 +2605,13 @@ async def _sse_generator():
                 pass
             yield format_sse_retry(2000)
 
-            # Deterministic failure mode when no API key is configured.
-            # We keep this fast and side-effect free (no graph compilation/run).
-            if not (settings.openai_api_key or "").strip():
-                seq += 1
-                yield format_sse_event(
-                    event="error",
-                    data={"message": "OPENAI_API_KEY is not configured", "thread_id": thread_id},
-                    event_id=seq,
-                )
-                seq += 1
-                yield format_sse_event(event="done", data={"thread_id": thread_id}, event_id=seq)
-                return
-
-            source = iter_with_sse_keepalive(
-                stream_agent_events(
-                    last_message,
-                    thread_id=thread_id,
-                    model=model,
-                    search_mode=mode_info,
-                    agent_id=payload.agent_id,
-                    images=_normalize_images_payload(payload.images),
-                    user_id=user_id,
-                ),
-                interval_s=15.0,
-            )
-
-            async for maybe_line in iter_abort_on_disconnect(
+            source = iter_with_sse_keepalive(replay.subscribe(after_seq), interval_s=15.0)
+            async for frame in iter_abort_on_disconnect(
                 source,
                 is_disconnected=request.is_disconnected,
                 check_interval_s=0.25,
             ):
-                # Keepalive comments are already SSE frames.
-                if maybe_line.startswith(":"):
-                    yield maybe_line
-                    continue
-
-                seq += 1
-                sse = translate_legacy_line_to_sse(maybe_line, seq=seq)
-                if sse:
-                    yield sse
+                yield frame
         finally:
             try:
                 if gauge is not None:
@@ -2364,11 +2626,116 @@ async def _sse_generator():
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
             "X-Accel-Buffering": "no",
-            "X-Thread-ID": thread_id,
+            "X-Thread-ID": run.thread_id,
+            "X-Run-ID": run.id,
         },
     )
 
 
+@app.post("/api/chat/sse")
+async def chat_sse(request: Request, payload: ChatRequest):
+    """
+    Standard SSE chat endpoint.
+
+    This endpoint translates the existing legacy `0:{json}\\n` stream protocol
+    into standard SSE frames (`event:` / `data:`) so the frontend can use an
+    off-the-shelf SSE parser.
+
+    The agent runs as a detached background task registered in the agent run
+    registry; its frames go to a per-run replay buffer and this response only
+    tails it. A dropped connection does not stop the run: reattach with
+    `GET /api/chat/sse/{run_id}` and `Last-Event-ID` to get just the missed frames.
+    """
+    # Get the last user message (same rule as /api/chat).
+    user_messages = [msg for msg in payload.messages if msg.role == "user"]
+    if not user_messages:
+        raise HTTPException(status_code=400, detail="No user message found")
+
+    last_message = user_messages[-1].content
+    internal_key = (getattr(settings, "internal_api_key", "") or "").strip()
+    principal_id = (getattr(request.state, "principal_id", "") or "").strip()
+    user_id = principal_id if internal_key and principal_id else (payload.user_id or settings.memory_user_id)
+    mode_info = _normalize_search_mode(payload.search_mode)
+    model = (payload.model or settings.primary_model).strip()
+    thread_id = f"thread_{uuid.uuid4().hex}"
+    set_thread_owner(thread_id, getattr(request.state, "principal_id", "") or "anonymous")
+
+    registry = get_agent_run_registry()
+    registry.cleanup_expired()
+    run = registry.create(
+        thread_id=thread_id,
+        model=model,
+        route="chat_sse",
+        agent_id=payload.agent_id or "default",
+        user_id=user_id,
+    )
+    registry.attach_replay(run, int(getattr(settings, "chat_run_replay_frames", 10000) or 10000))
+
+    # Deterministic failure mode when no API key is configured.
+    # We keep this fast and side-effect free (no graph compilation/run).
+    if not (settings.openai_api_key or "").strip():
+        run.replay.append(
+            format_sse_event(
+                event="error",
+                data={"message": "OPENAI_API_KEY is not configured", "thread_id": thread_id},
+                event_id=run.replay.next_seq(),
+            )
+        )
+        run.replay.append(
+            format_sse_event(event="done", data={"thread_id": thread_id}, event_id=run.replay.next_seq())
+        )
+        run.replay.close()
+        run.fail("OPENAI_API_KEY is not configured")
+        registry.release_replay_later(run)
+    else:
+        run.task = asyncio.create_task(
+            _drive_chat_run(
+                run,
+                _coalesce_text_deltas(
+                    stream_agent_events(
+                        last_message,
+                        thread_id=thread_id,
+                        model=model,
+                        search_mode=mode_info,
+                        agent_id=payload.agent_id,
+                        images=_normalize_images_payload(payload.images),
+                        user_id=user_id,
+                    ),
+                    thread_id=thread_id,
+                    backlog=run.replay.backlog,
+                ),
+            ),
+            name=f"chat-run-{run.id}",
+        )
+        active_streams[thread_id] = run.task
+
+    return _tail_chat_run(request, run, 0, gauge_label="chat_sse")
+
+
+@app.get("/api/chat/sse/{run_id}")
+async def chat_sse_reattach(run_id: str, request: Request, last_event_id: Optional[str] = None):
+    """
+    Reattach to a detached `/api/chat/sse` run.
+
+    Replays only frames after `Last-Event-ID` (header, or `last_event_id`
+    query parameter for clients that cannot set headers), then follows the
+    run live until it finishes. Finished runs stay replayable for
+    CHAT_RUN_REPLAY_TTL_S seconds.
+    """
+    run = get_agent_run_registry().get(run_id)
+    if run is None or run.replay is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    await _require_thread_owner(request, run.thread_id)
+
+    cursor = last_event_id or request.headers.get("last-event-id") or "0"
+    try:
+        after_seq = max(0, int(str(cursor).strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Last-Event-ID must be an integer")
+
+    return _tail_chat_run(request, run, after_seq, gauge_label="chat_sse")
+
+
 @app.post("/api/chat")
 async def chat(request: Request, payload: ChatRequest):
     """
@@ -2409,14 +2776,17 @@ async def chat(request: Request, payload: ChatRequest):
 
             # Return streaming response with thread_id in header for cancellation
             return StreamingResponse(
-                stream_agent_events(
-                    last_message,
+                _coalesce_text_deltas(
+                    stream_agent_events(
+                        last_message,
+                        thread_id=thread_id,
+                        model=model,
+                        search_mode=mode_info,
+                        agent_id=payload.agent_id,
+                        images=_normalize_images_payload(payload.images),
+                        user_id=user_id,
+                    ),
                     thread_id=thread_id,
-                    model=model,
-                    search_mode=mode_info,
-                    agent_id=payload.agent_id,
-                    images=_normalize_images_payload(payload.images),
-                    user_id=user_id,
                 ),
                 media_type="text/event-stream",
                 headers={
@@ -2485,12 +2855,15 @@ async def chat(request: Request, payload: ChatRequest):
                     "max_revisions": settings.max_revisions,
                 },
                 "recursion_limit": 50,
+                "callbacks": [graph_metrics_callback],
             }
             thread_id = thread_id or f"thread_{uuid.uuid4().hex}"
             metrics = metrics_registry.start(
                 thread_id, model=model, route=mode_info.get("mode", "direct")
             )
+            bind_thread_id(thread_id)
             result = await research_graph.ainvoke(initial_state, config=config)
+            _schedule_session_index(thread_id)
             final_report = result.get("final_report", "No response generated")
             add_memory_entry(final_report)
             store_interaction(last_message, final_report)
@@ -2528,8 +2901,10 @@ async def resume_interrupt(request: Request, payload: GraphInterruptResumeReques
     # Fast path: avoid invoking the graph when no checkpoint exists for this thread.
     if not payload.thread_id or not str(payload.thread_id).strip():
         raise HTTPException(status_code=400, detail="thread_id is required")
-    _require_thread_owner(request, payload.thread_id)
-    existing = checkpointer.get_tuple({"configurable": {"thread_id": payload.thread_id}})
+    await _require_thread_owner(request, payload.thread_id)
+    existing = await run_in_threadpool(
+        checkpointer.get_tuple, {"configurable": {"thread_id": payload.thread_id}}
+    )
     if not existing:
         raise HTTPException(status_code=404, detail="No checkpoint found for this thread_id")
     config = {
@@ -2544,6 +2919,7 @@ async def resume_interrupt(request: Request, payload: GraphInterruptResumeReques
             "max_revisions": settings.max_revisions,
         },
         "recursion_limit": 50,
+        "callbacks": [graph_metrics_callback],
     }
 
     try:
@@ -2551,7 +2927,9 @@ async def resume_interrupt(request: Request, payload: GraphInterruptResumeReques
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    bind_thread_id(payload.thread_id)
     result = await research_graph.ainvoke(Command(resume=resume_payload), config=config)
+    _schedule_session_index(payload.thread_id)
     interrupts = _serialize_interrupts(result.get("__interrupt__"))
     if interrupts:
         return {"status": "interrupted", "interrupts": interrupts}
@@ -2665,6 +3043,7 @@ async def get_search_providers():
                 error_count=int(provider.stats.error_count),
                 success_rate=float(provider.stats.success_rate),
                 avg_latency_ms=float(provider.stats.avg_latency_ms),
+                p90_latency_ms=provider.stats.p90_latency_ms,
                 avg_result_quality=float(provider.stats.avg_result_quality),
                 last_error=last_error,
                 last_error_time=provider.stats.last_error_time,
@@ -2691,16 +3070,22 @@ async def reset_search_providers():
 
 @app.get("/api/search/cache/stats", response_model=SearchCacheStatsResponse)
 async def get_search_cache_stats():
-    """Return in-memory search cache statistics (LRU + TTL)."""
+    """Return search cache statistics (L1 + shared tier) and the persistent page cache."""
     from agent.core.search_cache import get_search_cache
+    from tools.research.page_cache import get_persistent_page_cache
 
     cache = get_search_cache()
-    return {"stats": cache.stats()}
+    page_cache = get_persistent_page_cache()
+    return {
+        "stats": cache.stats(),
+        "page_cache": page_cache.stats() if page_cache is not None else None,
+        "single_flight": get_single_flight_stats(),
+    }
 
 
 @app.post("/api/search/cache/clear", response_model=SearchCacheClearResponse)
 async def clear_search_cache_endpoint():
-    """Clear the in-memory search cache (best-effort)."""
+    """Clear the search cache, including the shared tier if configured (best-effort)."""
     from agent.core.search_cache import clear_search_cache
 
     clear_search_cache()
@@ -2712,13 +3097,13 @@ async def clear_search_cache_endpoint():
 
 @app.get("/api/agents", response_model=AgentsListResponse)
 async def list_agents():
-    profiles = load_agents()
+    profiles = await run_in_threadpool(load_agents)
     return {"agents": profiles}
 
 
 @app.get("/api/agents/{agent_id}")
 async def get_agent(agent_id: str):
-    profile = get_agent_profile(agent_id)
+    profile = await run_in_threadpool(get_agent_profile, agent_id)
     if not profile:
         raise HTTPException(status_code=404, detail="Agent not found")
     return profile.model_dump(mode="json")
@@ -2846,6 +3231,9 @@ class RunMetricsResponse(BaseModel):
     nodes_completed: Dict[str, int]
     errors: List[str]
     cancelled: bool
+    text_deltas: int = 0
+    text_frames: int = 0
+    frames_saved_ratio: float = 0.0
     evidence_summary: RunEvidenceSummary
 
 
@@ -2984,15 +3372,30 @@ async def get_run_metrics(thread_id: str, request: Request):
     payload = metrics.to_dict()
     return RunMetricsResponse(
         **payload,
-        evidence_summary=_build_run_evidence_summary(thread_id),
+        evidence_summary=await run_in_threadpool(_build_run_evidence_summary, thread_id),
     )
 
 
 @app.get("/metrics")
-async def metrics():
-    """Prometheus metrics endpoint."""
-    data = generate_latest()
-    return StreamingResponse(iter([data]), media_type=CONTENT_TYPE_LATEST)
+async def metrics(request: Request):
+    """Prometheus metrics endpoint (OpenMetrics, with exemplars, when the scraper asks for it)."""
+    encoder, content_type = choose_encoder(request.headers.get("accept", ""))
+    data = encoder(REGISTRY)
+    return StreamingResponse(iter([data]), media_type=content_type)
+
+
+@app.get("/api/debug/loop")
+async def debug_loop(limit: int = 20):
+    """
+    Event-loop health: lag samples and the routes that blocked the loop longest.
+
+    Offenders (with the stack captured during the worst stall) are only
+    collected when LOOP_DEBUG_ENABLED is set.
+    """
+    limit = max(1, min(int(limit), 200))
+    report = get_loop_monitor().report(limit=limit)
+    report["enabled"] = bool(getattr(settings, "loop_monitor_enabled", True))
+    return report
 
 
 @app.get("/api/memory/status")
@@ -3236,7 +3639,7 @@ async def get_traces(thread_id: str, request: Request):
     if not settings.enable_tracing:
         raise HTTPException(status_code=400, detail="Tracing is not enabled")
 
-    _require_thread_owner(request, thread_id)
+    await _require_thread_owner(request, thread_id)
 
     trace = get_trace(thread_id)
     if not trace:
@@ -3257,7 +3660,7 @@ async def get_trace_summary(thread_id: str, request: Request):
     if not settings.enable_tracing:
         raise HTTPException(status_code=400, detail="Tracing is not enabled")
 
-    _require_thread_owner(request, thread_id)
+    await _require_thread_owner(request, thread_id)
 
     summary = _get_summary(thread_id)
     if not summary:
@@ -3278,7 +3681,7 @@ async def get_all_traces(thread_id: str, request: Request):
     if not settings.enable_tracing:
         raise HTTPException(status_code=400, detail="Tracing is not enabled")
 
-    _require_thread_owner(request, thread_id)
+    await _require_thread_owner(request, thread_id)
 
     traces = _get_all(thread_id)
     return {"thread_id": thread_id, "count": len(traces), "traces": traces}
@@ -3349,9 +3752,9 @@ async def export_report_endpoint(
         raise HTTPException(status_code=400, detail="No checkpointer configured")
 
     try:
-        _require_thread_owner(request, thread_id)
+        await _require_thread_owner(request, thread_id)
         config = {"configurable": {"thread_id": thread_id}}
-        checkpoint = checkpointer.get_tuple(config)
+        checkpoint = await run_in_threadpool(checkpointer.get_tuple, config)
         if not checkpoint:
             raise HTTPException(status_code=404, detail=f"No checkpoint found for thread {thread_id}")
 
@@ -3514,21 +3917,18 @@ def _rag_collection_for_request(request: Request) -> str:
 
 
 @app.post("/api/documents/upload")
-async def upload_document(request: Request, file: UploadFile = File(...)):
+async def upload_document(request: Request, file: UploadFile = File(...), wait: bool = False):
     """
     Upload a document to the RAG knowledge base.
 
-    Supports PDF, DOCX, TXT, MD files.
+    Supports PDF, DOCX, TXT, MD files. The upload is spooled to disk and
+    ingested by a background job; the response carries the job id right away.
+    Track it via `GET /api/documents/jobs/{job_id}` (or `/events` for SSE).
+    With `wait=true` the request waits for the job and returns its result.
     """
     if not settings.rag_enabled:
         raise HTTPException(status_code=400, detail="RAG is not enabled. Set rag_enabled=True in settings.")
 
-    # Validate file size (max 50MB)
-    MAX_FILE_SIZE = 50 * 1024 * 1024
-    content = await file.read()
-    if len(content) > MAX_FILE_SIZE:
-        raise HTTPException(status_code=413, detail=f"File too large. Maximum size is {MAX_FILE_SIZE // (1024*1024)}MB.")
-
     # Validate file extension
     ALLOWED_EXTENSIONS = {"pdf", "docx", "doc", "txt", "md", "csv"}
     filename = file.filename or ""
@@ -3537,22 +3937,56 @@ async def upload_document(request: Request, file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail=f"Unsupported file type '.{ext}'. Allowed: {', '.join(ALLOWED_EXTENSIONS)}")
 
     try:
+        from tools.rag.ingestion import IngestionJobStatus, UploadTooLargeError, get_ingestion_queue
         from tools.rag.rag_tool import get_rag_tool
 
-        rag = get_rag_tool(collection_name=_rag_collection_for_request(request))
+        collection = _rag_collection_for_request(request)
+        rag = get_rag_tool(collection_name=collection)
         if rag is None:
             raise HTTPException(status_code=500, detail="Failed to initialize RAG tool")
 
-        result = rag.add_document(content=content, filename=file.filename)
+        # Validate file size (max 50MB) while spooling, without holding the file in memory
+        MAX_FILE_SIZE = 50 * 1024 * 1024
+        ingestion = get_ingestion_queue()
+        try:
+            spool_path, size = await asyncio.to_thread(
+                ingestion.spool, file.file, filename, max_bytes=MAX_FILE_SIZE
+            )
+        except UploadTooLargeError:
+            raise HTTPException(status_code=413, detail=f"File too large. Maximum size is {MAX_FILE_SIZE // (1024*1024)}MB.")
+
+        job = ingestion.submit(
+            rag=rag,
+            collection=collection,
+            filename=filename,
+            spool_path=spool_path,
+            size_bytes=size,
+        )
 
-        if not result.get("success"):
-            raise HTTPException(status_code=400, detail=result.get("error", "Upload failed"))
+        if not wait:
+            return {
+                "success": True,
+                "job_id": job.id,
+                "status": job.status.value,
+                "filename": filename,
+                "status_url": f"/api/documents/jobs/{job.id}",
+                "events_url": f"/api/documents/jobs/{job.id}/events",
+                "message": f"Document '{filename}' queued for ingestion",
+            }
+
+        while not job.is_terminal:
+            await asyncio.sleep(0.2)
+        snapshot = job.to_dict()
+        if job.status != IngestionJobStatus.COMPLETED:
+            raise HTTPException(status_code=400, detail=job.error or "Upload failed")
 
         return {
             "success": True,
-            "filename": file.filename,
-            "chunks": result.get("chunks", 0),
-            "message": f"Document '{file.filename}' uploaded successfully with {result.get('chunks', 0)} chunks",
+            "job_id": job.id,
+            "filename": filename,
+            "chunks": snapshot["chunks"],
+            "embedding": snapshot["embedding"],
+            "message": f"Document '{filename}' uploaded successfully with {snapshot['chunks']} chunks",
         }
 
     except HTTPException:
@@ -3562,6 +3996,76 @@ async def upload_document(request: Request, file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _ingestion_job_for_request(request: Request, job_id: str):
+    from tools.rag.ingestion import get_ingestion_queue
+
+    job = get_ingestion_queue().get(job_id)
+    # Jobs are only visible to the principal whose collection they write to.
+    if job is None or job.collection != _rag_collection_for_request(request):
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+    return job
+
+
+@app.get("/api/documents/jobs/{job_id}")
+async def get_document_job(request: Request, job_id: str):
+    """
+    Status and progress of a document ingestion job.
+    """
+    job = _ingestion_job_for_request(request, job_id)
+    return job.to_dict()
+
+
+@app.get("/api/documents/jobs/{job_id}/events")
+async def document_job_events(request: Request, job_id: str):
+    """
+    SSE stream of ingestion job progress.
+
+    Emits `progress` whenever the job changes, then `completed` or `failed`,
+    then `done`.
+    """
+    from tools.rag.ingestion import IngestionJobStatus, get_ingestion_queue
+
+    job = _ingestion_job_for_request(request, job_id)
+    queue = get_ingestion_queue()
+    terminal = {IngestionJobStatus.COMPLETED.value, IngestionJobStatus.FAILED.value}
+
+    async def _sse_generator():
+        seq = 0
+        version = -1
+        last_sent = time.monotonic()
+        yield format_sse_retry(2000)
+        while True:
+            if await request.is_disconnected():
+                return
+            if job.version != version:
+                # One locked copy, so the event name and payload always agree.
+                snapshot = queue.snapshot(job.id) or job.to_dict()
+                version = snapshot["version"]
+                seq += 1
+                is_terminal = snapshot["status"] in terminal
+                event = snapshot["status"] if is_terminal else "progress"
+                yield format_sse_event(event=event, data=snapshot, event_id=seq)
+                last_sent = time.monotonic()
+                if is_terminal:
+                    seq += 1
+                    yield format_sse_event(event="done", data={"job_id": job.id}, event_id=seq)
+                    return
+            elif time.monotonic() - last_sent >= 15.0:
+                yield format_sse_comment()
+                last_sent = time.monotonic()
+            await asyncio.sleep(0.25)
+
+    return StreamingResponse(
+        _sse_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
 @app.get("/api/documents/list")
 async def list_documents(request: Request, limit: int = 100):
     """
@@ -3663,6 +4167,7 @@ class SessionSummary(BaseModel):
 class SessionsListResponse(BaseModel):
     count: int
     sessions: List[SessionSummary]
+    next_cursor: Optional[str] = None
 
 
 class EvidenceSource(BaseModel):
@@ -3731,13 +4236,15 @@ async def list_sessions(
     request: Request,
     limit: int = 50,
     status: Optional[str] = None,
+    cursor: Optional[str] = None,
 ):
     """
-    List all research sessions.
+    List research sessions, most recently active first.
 
     Args:
         limit: Maximum sessions to return
         status: Filter by status (pending, running, completed, cancelled)
+        cursor: `next_cursor` from the previous page
     """
     if not checkpointer:
         raise HTTPException(status_code=400, detail="No checkpointer configured")
@@ -3750,13 +4257,22 @@ async def list_sessions(
         user_filter = None
         if internal_key:
             user_filter = (getattr(request.state, "principal_id", "") or "").strip() or "internal"
-        sessions = manager.list_sessions(limit=limit, status_filter=status, user_id_filter=user_filter)
+        sessions, next_cursor = await run_in_threadpool(
+            manager.list_sessions_page,
+            limit=max(1, min(int(limit), 500)),
+            cursor=cursor,
+            status_filter=status,
+            user_id_filter=user_filter,
+        )
 
         return {
             "count": len(sessions),
             "sessions": [s.to_dict() for s in sessions],
+            "next_cursor": next_cursor,
         }
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"List sessions error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -3778,13 +4294,13 @@ async def get_session(thread_id: str, request: Request):
         internal_key = (getattr(settings, "internal_api_key", "") or "").strip()
         if internal_key:
             principal_id = (getattr(request.state, "principal_id", "") or "").strip()
-            session_state = manager.get_session_state(thread_id)
+            session_state = await run_in_threadpool(manager.get_session_state, thread_id)
             if session_state and isinstance(session_state.state, dict):
                 owner = session_state.state.get("user_id")
                 if isinstance(owner, str) and owner.strip() and owner.strip() != principal_id:
                     raise HTTPException(status_code=403, detail="Forbidden")
 
-        session = manager.get_session(thread_id)
+        session = await run_in_threadpool(manager.get_session, thread_id)
 
         if not session:
             raise HTTPException(status_code=404, detail=f"Session not found: {thread_id}")
@@ -3810,7 +4326,7 @@ async def get_session_state(thread_id: str, request: Request):
         from common.session_manager import get_session_manager
 
         manager = get_session_manager(checkpointer)
-        state = manager.get_session_state(thread_id)
+        state = await run_in_threadpool(manager.get_session_state, thread_id)
 
         if not state:
             raise HTTPException(status_code=404, detail=f"Session not found: {thread_id}")
@@ -3843,7 +4359,7 @@ async def get_session_evidence(thread_id: str, request: Request):
         from common.session_manager import get_session_manager
 
         manager = get_session_manager(checkpointer)
-        session_state = manager.get_session_state(thread_id)
+        session_state = await run_in_threadpool(manager.get_session_state, thread_id)
         if not session_state:
             raise HTTPException(status_code=404, detail=f"Session not found: {thread_id}")
 
@@ -3900,21 +4416,22 @@ async def resume_session(
     try:
         from common.session_manager import get_session_manager
 
-        _require_thread_owner(request, thread_id)
+        await _require_thread_owner(request, thread_id)
 
         manager = get_session_manager(checkpointer)
 
         # Check if session can be resumed
-        can_resume, reason = manager.can_resume(thread_id)
+        can_resume, reason = await run_in_threadpool(manager.can_resume, thread_id)
         if not can_resume:
             raise HTTPException(status_code=400, detail=reason)
 
         # Get current state
-        state = manager.get_session_state(thread_id)
+        state = await run_in_threadpool(manager.get_session_state, thread_id)
         if not state:
             raise HTTPException(status_code=404, detail=f"Session not found: {thread_id}")
 
-        restored_state = manager.build_resume_state(
+        restored_state = await run_in_threadpool(
+            manager.build_resume_state,
             thread_id=thread_id,
             additional_input=payload.additional_input if payload else None,
             update_state=payload.update_state if payload else None,
@@ -4009,10 +4526,10 @@ async def delete_session(thread_id: str, request: Request):
     try:
         from common.session_manager import get_session_manager
 
-        _require_thread_owner(request, thread_id)
+        await _require_thread_owner(request, thread_id)
 
         manager = get_session_manager(checkpointer)
-        success = manager.delete_session(thread_id)
+        success = await run_in_threadpool(manager.delete_session, thread_id)
 
         if not success:
             raise HTTPException(status_code=400, detail=f"Failed to delete session: {thread_id}")
@@ -4078,7 +4595,7 @@ class VersionsResponse(BaseModel):
 async def create_share(thread_id: str, request: Request, req: ShareRequest):
     """Create a share link for a session."""
     try:
-        _require_thread_owner(request, thread_id)
+        await _require_thread_owner(request, thread_id)
         from common.collaboration import create_share_link
 
         link = create_share_link(
@@ -4112,7 +4629,7 @@ async def get_share(share_id: str):
             from common.session_manager import get_session_manager
 
             manager = get_session_manager(checkpointer)
-            session_state = manager.get_session_state(link["thread_id"])
+            session_state = await run_in_threadpool(manager.get_session_state, link["thread_id"])
             if session_state and isinstance(session_state.state, dict):
                 state = session_state.state
                 raw_messages = state.get("messages", [])
@@ -4194,7 +4711,7 @@ async def delete_share(share_id: str):
 async def add_comment(thread_id: str, request: Request, req: CommentRequest):
     """Add a comment to a session."""
     try:
-        _require_thread_owner(request, thread_id)
+        await _require_thread_owner(request, thread_id)
         from common.collaboration import add_comment
 
         comment = add_comment(
@@ -4213,10 +4730,10 @@ async def add_comment(thread_id: str, request: Request, req: CommentRequest):
 async def get_comments(thread_id: str, request: Request, message_id: Optional[str] = None):
     """Get comments for a session."""
     try:
-        _require_thread_owner(request, thread_id)
+        await _require_thread_owner(request, thread_id)
         from common.collaboration import get_comments
 
-        comments = get_comments(thread_id, message_id)
+        comments = await run_in_threadpool(get_comments, thread_id, message_id)
         return {"comments": comments, "count": len(comments)}
     except Exception as e:
         logger.error(f"Get comments error: {e}", exc_info=True)
@@ -4227,10 +4744,10 @@ async def get_comments(thread_id: str, request: Request, message_id: Optional[st
 async def get_versions(thread_id: str, request: Request):
     """Get version history for a session."""
     try:
-        _require_thread_owner(request, thread_id)
+        await _require_thread_owner(request, thread_id)
         from common.collaboration import list_versions
 
-        versions = list_versions(thread_id)
+        versions = await run_in_threadpool(list_versions, thread_id)
         return {"versions": versions, "count": len(versions)}
     except Exception as e:
         logger.error(f"Get versions error: {e}", exc_info=True)
@@ -4244,13 +4761,13 @@ async def create_version(thread_id: str, request: Request, label: Optional[str]
         if not checkpointer:
             raise HTTPException(status_code=400, detail="No checkpointer configured")
 
-        _require_thread_owner(request, thread_id)
+        await _require_thread_owner(request, thread_id)
 
         from common.collaboration import save_version
         from common.session_manager import get_session_manager
 
         manager = get_session_manager(checkpointer)
-        session = manager.get_session(thread_id)
+        session = await run_in_threadpool(manager.get_session, thread_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
 
@@ -4275,10 +4792,10 @@ async def create_version(thread_id: str, request: Request, label: Optional[str]
 async def restore_version(thread_id: str, version_id: str, request: Request):
     """Restore a session from a version snapshot."""
     try:
-        _require_thread_owner(request, thread_id)
+        await _require_thread_owner(request, thread_id)
         from common.collaboration import get_version_snapshot
 
-        snapshot = get_version_snapshot(version_id)
+        snapshot = await run_in_threadpool(get_version_snapshot, version_id)
         if not snapshot:
             raise HTTPException(status_code=404, detail="Version snapshot not found")
 
@@ -4325,9 +4842,9 @@ async def get_interrupt_status(thread_id: str, request: Request):
         raise HTTPException(status_code=400, detail="No checkpointer configured")
 
     try:
-        _require_thread_owner(request, thread_id)
+        await _require_thread_owner(request, thread_id)
         config = {"configurable": {"thread_id": thread_id}}
-        checkpoint_tuple = checkpointer.get_tuple(config)
+        checkpoint_tuple = await run_in_threadpool(checkpointer.get_tuple, config)
 
         if not checkpoint_tuple:
             raise HTTPException(status_code=404, detail=f"Session not found: {thread_id}")
@@ -4406,9 +4923,9 @@ async def resume_from_interrupt(thread_id: str, request: Request, payload: Inter
         raise HTTPException(status_code=400, detail="No checkpointer configured")
 
     try:
-        _require_thread_owner(request, thread_id)
+        await _require_thread_owner(request, thread_id)
         config = {"configurable": {"thread_id": thread_id}}
-        checkpoint_tuple = checkpointer.get_tuple(config)
+        checkpoint_tuple = await run_in_threadpool(checkpointer.get_tuple, config)
 
         if not checkpoint_tuple:
             raise HTTPException(status_code=404, detail=f"Session not found: {thread_id}")
@@ -4822,7 +5339,7 @@ async def list_screenshots(request: Request, thread_id: Optional[str] = None, li
     if internal_key:
         if not thread_id or not str(thread_id).strip():
             raise HTTPException(status_code=400, detail="thread_id is required")
-        _require_thread_owner(request, str(thread_id))
+        await _require_thread_owner(request, str(thread_id))
 
     service = get_screenshot_service()
     screenshots = service.list_screenshots(thread_id=thread_id, limit=limit)
@@ -4864,36 +5381,12 @@ async def stream_tool_events(thread_id: str, request: Request, last_event_id: Op
             console.log(data.type, data.data);
         };
     """
-    _require_thread_owner(request, thread_id)
+    await _require_thread_owner(request, thread_id)
 
     async def event_generator():
-        def _as_message_event(frame: str) -> str:
-            """
-            Frontend compatibility: emit *message* events only.
-
-            The v0.4 frontend uses `EventSource.onmessage`, which only receives
-            events with the default type ("message"). If we include an explicit
-            `event:` field (e.g. `event: tool_start`), the browser will dispatch
-            it as a *named* event and `onmessage` will not fire.
-
-            Our internal emitter uses typed SSE events; this endpoint strips the
-            `event:` line while keeping `id:` + `data:` so the client still gets
-            resume cursors via `lastEventId`.
-            """
-            if not frame:
-                return frame
-            # Keep comments/keepalives unchanged.
-            if frame.lstrip().startswith(":"):
-                return frame
-
-            lines: list[str] = []
-            for line in frame.splitlines():
-                if line.startswith("event:"):
-                    continue
-                lines.append(line)
-
-            return "\n".join(lines).rstrip("\n") + "\n\n"
-
+        # Frontend compatibility: emit *message* events only. The v0.4 frontend
+        # uses `EventSource.onmessage`, which only receives default-type events;
+        # frames keep `id:` + `data:` so the client still gets resume cursors.
         gauge = None
         try:
             gauge = sse_active_connections.labels("tool_events")
@@ -4904,9 +5397,9 @@ def _as_message_event(frame: str) -> str:
         cursor = last_event_id or request.headers.get("last-event-id")
         try:
             async for event_sse in event_stream_generator(
-                thread_id, timeout=300.0, last_event_id=cursor
+                thread_id, timeout=300.0, last_event_id=cursor, message_only=True
             ):
-                yield _as_message_event(event_sse)
+                yield event_sse
         finally:
             try:
                 if gauge is not None:
@@ -4949,7 +5442,7 @@ async def get_browser_session_info(thread_id: str, request: Request):
 
     Returns browser session status and capabilities for real-time viewing.
     """
-    _require_thread_owner(request, thread_id)
+    await _require_thread_owner(request, thread_id)
 
     result = {
         "active": False,
@@ -4995,7 +5488,7 @@ async def trigger_browser_screenshot(thread_id: str, request: Request):
     """
     Trigger a manual screenshot capture for the browser session.
     """
-    _require_thread_owner(request, thread_id)
+    await _require_thread_owner(request, thread_id)
 
     # Avoid cold-starting a sandbox here: manual screenshots should only be
     # available once a live session already exists (e.g. via the WS viewer or
@@ -5120,16 +5613,10 @@ async def browser_stream_websocket(websocket: WebSocket, thread_id: str):
                 from common.session_manager import get_session_manager
 
                 manager = get_session_manager(checkpointer)
-                session_state = manager.get_session_state(thread_id)
-                if session_state and isinstance(session_state.state, dict):
-                    persisted_owner = session_state.state.get("user_id")
-                    if (
-                        isinstance(persisted_owner, str)
-                        and persisted_owner.strip()
-                        and persisted_owner.strip() != principal_id
-                    ):
-                        await websocket.close(code=4403)
-                        return
+                persisted_owner = await run_in_threadpool(manager.get_session_owner, thread_id)
+                if persisted_owner and persisted_owner != principal_id:
+                    await websocket.close(code=4403)
+                    return
             except Exception:
                 pass
 
@@ -0,0 +1,208 @@
+"""Measure near-duplicate removal over merged parallel-search results.
+
+Compares the MinHash-based dedupe in `MultiSearchOrchestrator._deduplicate_and_rank`
+and `ResultAggregator._dedupe_by_similarity` with the previous pairwise
+`SequenceMatcher` loops on the same synthetic result set.
+
+Usage:
+    python scripts/benchmark_near_duplicates.py --results 500
+    python scripts/benchmark_near_duplicates.py --skip-legacy  # the old loops take minutes
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import string
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from agent.workflows.result_aggregator import ResultAggregator  # noqa: E402
+from agent.workflows.result_aggregator import SearchResult as AggregatedResult  # noqa: E402
+from common.near_duplicates import NUMPY_AVAILABLE  # noqa: E402
+from tools.search.multi_search import MultiSearchOrchestrator, SearchResult  # noqa: E402
+
+PROVIDERS = ("tavily", "serper", "brave", "exa", "duckduckgo")
+
+
+def _sentence(rng: random.Random, vocab: List[str]) -> str:
+    return " ".join(rng.choices(vocab, k=rng.randint(8, 16))).capitalize() + "."
+
+
+def _variant(rng: random.Random, text: str) -> str:
+    """A syndicated copy: a couple of word edits and maybe a trimmed tail."""
+    words = text.split()
+    for _ in range(rng.randint(0, 2)):
+        words[rng.randrange(len(words))] = rng.choice(words)
+    if rng.random() < 0.3:
+        words = words[: max(10, int(len(words) * 0.9))]
+    return " ".join(words)
+
+
+def _article_count(n: int) -> int:
+    return max(1, (n * 2) // 3)
+
+
+def make_results(n: int, *, seed: int = 11) -> List[SearchResult]:
+    """`n` results from several providers; about a third are near-copies of another."""
+    rng = random.Random(seed)
+    vocab = sorted(
+        {"".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(3000)}
+    )
+    pool = [
+        " ".join(_sentence(rng, vocab) for _ in range(rng.randint(2, 4)))
+        for _ in range(_article_count(n))
+    ]
+    results: List[SearchResult] = []
+    for i in range(n):
+        base = pool[i % len(pool)]
+        provider = PROVIDERS[i % len(PROVIDERS)]
+        results.append(
+            SearchResult(
+                title=f"Result {i}",
+                url=f"https://{provider}.example.com/{i}",
+                snippet=_variant(rng, base) if i >= len(pool) else base,
+                content=base,
+                score=round(rng.random(), 3),
+                provider=provider,
+            )
+        )
+    rng.shuffle(results)
+    return results
+
+
+def _legacy_deduplicate(
+    orchestrator: MultiSearchOrchestrator, results: List[SearchResult], max_results: int, query: str
+) -> List[SearchResult]:
+    """The pre-MinHash snippet loop (scores recomputed inside the inner loop)."""
+    final: List[SearchResult] = []
+    for r in results:
+        is_duplicate = False
+        for existing in final:
+            similarity = SequenceMatcher(
+                None, r.snippet[:200].lower(), existing.snippet[:200].lower()
+            ).ratio()
+            if similarity > orchestrator.similarity_threshold:
+                is_duplicate = True
+                if orchestrator._ranking_score(r, query) > orchestrator._ranking_score(
+                    existing, query
+                ):
+                    final.remove(existing)
+                    final.append(r)
+                break
+        if not is_duplicate:
+            final.append(r)
+        if len(final) >= max_results:
+            break
+    final.sort(key=lambda r: orchestrator._ranking_score(r, query), reverse=True)
+    return final[:max_results]
+
+
+def _legacy_aggregator_dedupe(
+    aggregator: ResultAggregator, candidates: List[AggregatedResult]
+) -> List[AggregatedResult]:
+    kept: List[AggregatedResult] = []
+    for res in candidates:
+        for i, existing in enumerate(kept):
+            ratio = SequenceMatcher(
+                None, res.content.lower()[:1000], existing.content.lower()[:1000]
+            ).ratio()
+            if ratio >= aggregator.similarity_threshold:
+                if len(res.content) > len(existing.content):
+                    kept[i] = res
+                break
+        else:
+            kept.append(res)
+    return kept
+
+
+def _timed(fn: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    best = float("inf")
+    out: Any = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return {"ms": round(best * 1000.0, 2), "kept": len(out)}
+
+
+def run_benchmark(
+    *,
+    n: int = 500,
+    max_results: Optional[int] = None,
+    query: str = "latest ai chip news 2025",
+    repeat: int = 3,
+    include_legacy: bool = True,
+    seed: int = 11,
+) -> Dict[str, Any]:
+    results = make_results(n, seed=seed)
+    # Large enough that the dedupe loop runs over the whole merged set.
+    limit = max_results if max_results is not None else n - 1
+    orchestrator = MultiSearchOrchestrator(providers=[])
+    aggregator = ResultAggregator()
+    agg_items = [
+        AggregatedResult(query=query, title=r.title, url=r.url, content=r.snippet * 3)
+        for r in results
+    ]
+
+    report: Dict[str, Any] = {
+        "results": n,
+        "distinct_articles": _article_count(n),
+        "max_results": limit,
+        "numpy": NUMPY_AVAILABLE,
+        "multi_search": {
+            "minhash": _timed(
+                lambda: orchestrator._deduplicate_and_rank(list(results), limit, query=query),
+                repeat,
+            )
+        },
+        "aggregator": {
+            "minhash": _timed(lambda: aggregator._dedupe_by_similarity(list(agg_items)), repeat)
+        },
+    }
+    if include_legacy:
+        report["multi_search"]["sequence_matcher"] = _timed(
+            lambda: _legacy_deduplicate(orchestrator, list(results), limit, query), 1
+        )
+        report["aggregator"]["sequence_matcher"] = _timed(
+            lambda: _legacy_aggregator_dedupe(aggregator, list(agg_items)), 1
+        )
+        for section in ("multi_search", "aggregator"):
+            new_ms = report[section]["minhash"]["ms"]
+            old_ms = report[section]["sequence_matcher"]["ms"]
+            report[section]["speedup"] = round(old_ms / max(new_ms, 1e-6), 1)
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--results", type=int, default=500)
+    parser.add_argument("--max-results", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-legacy", action="store_true")
+    parser.add_argument("--output", default="")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        n=args.results,
+        max_results=args.max_results,
+        repeat=args.repeat,
+        include_legacy=not args.skip_legacy,
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,163 @@
+"""Measure SearchCache fuzzy-lookup latency as the cache grows.
+
+Keys carry the same `multi_search::<strategy>::<max_results>::<profile>::`
+prefixes the orchestrator uses, so shared prefixes are part of the workload.
+
+Usage:
+    python scripts/benchmark_search_cache.py --sizes 1000,10000,100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import string
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from agent.core.search_cache import SearchCache  # noqa: E402
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+
+def _vocabulary(rng: random.Random, size: int = 5_000) -> List[str]:
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))))
+    return sorted(words)
+
+
+def _make_query(rng: random.Random, vocab: List[str]) -> str:
+    return " ".join(rng.choices(vocab, k=rng.randint(4, 8)))
+
+
+# Same layout as MultiSearchOrchestrator._cache_query_key.
+_PREFIXES = [
+    f"multi_search::{strategy}::{max_results}::{profile}::"
+    for strategy in ("fallback", "parallel", "hedged")
+    for max_results in (5, 10)
+    for profile in ("", "tavily,serper")
+]
+
+
+def _make_key(rng: random.Random, vocab: List[str]) -> str:
+    return rng.choice(_PREFIXES) + _make_query(rng, vocab)
+
+
+def _mutate(rng: random.Random, key: str) -> str:
+    """One-character edit in the query part: should still match at the default 0.9 threshold."""
+    prefix, sep, query = key.rpartition("::")
+    pos = rng.randrange(len(query))
+    return prefix + sep + query[:pos] + rng.choice(string.ascii_lowercase) + query[pos + 1 :]
+
+
+def _linear_find_similar(cache: SearchCache, query: str) -> bool:
+    """The pre-index `_find_similar`: SequenceMatcher against every entry."""
+    normalized = cache._normalize_query(query)
+    for entry in cache._cache.values():
+        other = cache._normalize_query(entry.query)
+        if SequenceMatcher(None, normalized, other).ratio() >= cache.similarity_threshold:
+            return True
+    return False
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def _time_lookups(fn, queries: List[str]) -> Dict[str, float]:
+    samples: List[float] = []
+    for q in queries:
+        start = time.perf_counter()
+        fn(q)
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return {
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "p95_ms": round(_percentile(samples, 0.95), 4),
+    }
+
+
+def run_benchmark(
+    *,
+    sizes: tuple[int, ...] = DEFAULT_SIZES,
+    lookups: int = 200,
+    threshold: float = 0.9,
+    linear_max_size: int = 1_000,
+    seed: int = 7,
+) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    vocab = _vocabulary(rng)
+    rows: List[Dict[str, Any]] = []
+
+    for size in sizes:
+        cache = SearchCache(max_size=size, ttl_seconds=3600.0, similarity_threshold=threshold)
+        stored = [_make_key(rng, vocab) for _ in range(size)]
+        start = time.perf_counter()
+        for q in stored:
+            cache.set(q, [{"url": "https://example.com"}])
+        fill_s = time.perf_counter() - start
+
+        misses = [_make_key(rng, vocab) for _ in range(lookups)]
+        near = [_mutate(rng, rng.choice(stored)) for _ in range(lookups)]
+
+        miss_stats = _time_lookups(cache.get, misses)
+        near_stats = _time_lookups(cache.get, near)
+        found = cache.similar_hits + cache.hits  # misses never hit: queries are fresh
+
+        row: Dict[str, Any] = {
+            "size": size,
+            "fill_s": round(fill_s, 3),
+            "max_bucket": max(
+                (len(bucket) for band in cache._index._buckets for bucket in band.values()),
+                default=0,
+            ),
+            "miss": miss_stats,
+            "near_duplicate": near_stats,
+            "near_duplicate_recall": round(found / max(1, len(near)), 3),
+        }
+        if size <= linear_max_size:
+            linear_queries = misses[: max(1, lookups // 10)]
+            row["linear_scan_miss"] = _time_lookups(
+                lambda q, c=cache: _linear_find_similar(c, q), linear_queries
+            )
+        rows.append(row)
+
+    return {"threshold": threshold, "lookups": lookups, "results": rows}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES))
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument("--linear-max-size", type=int, default=1_000)
+    parser.add_argument("--output", default="")
+    args = parser.parse_args(argv)
+
+    sizes = tuple(int(s) for s in str(args.sizes).split(",") if s.strip())
+    report = run_benchmark(
+        sizes=sizes,
+        lookups=args.lookups,
+        threshold=args.threshold,
+        linear_max_size=args.linear_max_size,
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,138 @@
+"""Measure stream-frame serialization throughput (frames/second on one worker).
+
+Compares the old path (legacy line via `json.dumps`, then `json.loads` and a
+re-dump per SSE frame, plus line splitting for message-only frames) with the
+pre-encoded `StreamFrame` pipeline.
+
+Usage:
+    python scripts/benchmark_stream_frames.py --frames 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import string
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from common.chat_stream_translate import translate_legacy_line_to_sse  # noqa: E402
+from common.stream_frames import (  # noqa: E402
+    ORJSON_AVAILABLE,
+    encode_stream_event,
+    sse_message_frame,
+)
+
+DEFAULT_FRAMES = 10_000
+TARGET_FPS = 10_000
+
+
+def make_events(count: int, seed: int = 7) -> List[Tuple[str, Dict[str, Any]]]:
+    """A chat-like mix: mostly token deltas, some status/tool events, a few source lists."""
+    rng = random.Random(seed)
+
+    def words(n: int) -> str:
+        return " ".join(
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9))) for _ in range(n)
+        )
+
+    events: List[Tuple[str, Dict[str, Any]]] = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.85:
+            events.append(("text", {"content": words(rng.randint(1, 4)) + " 检索"}))
+        elif roll < 0.97:
+            events.append(("tool", {"name": "web_search", "status": "running", "query": words(6), "step": i}))
+        else:
+            events.append(
+                (
+                    "sources",
+                    {
+                        "items": [
+                            {"title": words(8), "url": f"https://example.com/{i}/{j}", "snippet": words(40)}
+                            for j in range(8)
+                        ]
+                    },
+                )
+            )
+    return events
+
+
+def _old_legacy(event_type: str, data: Any) -> str:
+    return f"0:{json.dumps({'type': event_type, 'data': data})}\n"
+
+
+def _old_sse(line: str, seq: int) -> str:
+    payload = json.loads(line[2:].strip())
+    return f"id: {seq}\nevent: {payload['type']}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+def _old_message_only(frame: str) -> str:
+    lines = [line for line in frame.splitlines() if not line.startswith("event:")]
+    return "\n".join(lines).rstrip("\n") + "\n\n"
+
+
+def _fps(count: int, elapsed: float) -> float:
+    return round(count / elapsed, 1) if elapsed > 0 else float("inf")
+
+
+def run_benchmark(*, frames: int = DEFAULT_FRAMES, seed: int = 7) -> Dict[str, Any]:
+    events = make_events(frames, seed=seed)
+
+    start = time.perf_counter()
+    for seq, (event_type, data) in enumerate(events, 1):
+        _old_sse(_old_legacy(event_type, data), seq)
+    old_sse = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for seq, (event_type, data) in enumerate(events, 1):
+        _old_message_only(_old_sse(_old_legacy(event_type, data), seq))
+    old_message = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for seq, (event_type, data) in enumerate(events, 1):
+        translate_legacy_line_to_sse(encode_stream_event(event_type, data), seq=seq)
+    new_sse = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for seq, (event_type, data) in enumerate(events, 1):
+        sse_message_frame(encode_stream_event(event_type, data).payload, seq)
+    new_message = time.perf_counter() - start
+
+    return {
+        "frames": frames,
+        "orjson": ORJSON_AVAILABLE,
+        "target_fps": TARGET_FPS,
+        "sse_typed": {"old_fps": _fps(frames, old_sse), "new_fps": _fps(frames, new_sse)},
+        "sse_message_only": {"old_fps": _fps(frames, old_message), "new_fps": _fps(frames, new_message)},
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES)
+    parser.add_argument("--output", default="")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(frames=args.frames)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    print(text)
+    # Throughput is checked here, not in the unit suite: it depends on the host.
+    slow = [k for k in ("sse_typed", "sse_message_only") if report[k]["new_fps"] < TARGET_FPS]
+    if slow:
+        print(f"below {TARGET_FPS} frames/s: {', '.join(slow)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
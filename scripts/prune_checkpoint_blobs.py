@@ -0,0 +1,101 @@
+"""Delete checkpoint blobs that no stored checkpoint references any more.
+
+Mark-and-sweep over `CHECKPOINT_BLOB_DIR`: collect the blob digests referenced
+by the Postgres checkpointer's `checkpoint_blobs` and `checkpoint_writes`
+tables, then delete every other blob older than the grace period. Safe to run
+while the app is up: writers refresh the mtime of blobs they reuse, so a blob a
+new checkpoint refers to is never older than the grace period.
+
+With the in-memory checkpointer nothing survives a restart, so no blob is
+referenced; pass `--without-database` to sweep in that case, but only while the
+app is stopped.
+
+Usage:
+    python scripts/prune_checkpoint_blobs.py --dry-run
+    python scripts/prune_checkpoint_blobs.py --grace-hours 24
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Iterator, Set
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from common.checkpoint_blobs import (  # noqa: E402
+    BLOB_REF_TYPE,
+    BLOB_TOUCH_INTERVAL_S,
+    FileBlobStore,
+    prune_unreferenced_blobs,
+    referenced_digests,
+)
+from common.config import settings  # noqa: E402
+
+_TABLES = ("checkpoint_blobs", "checkpoint_writes")
+
+
+def _reference_payloads(database_url: str) -> Iterator[bytes]:
+    import psycopg
+
+    with psycopg.connect(database_url) as conn:
+        for table in _TABLES:
+            # Server-side cursor: stream rows instead of loading the table.
+            with conn.cursor(name=f"prune_{table}") as cur:
+                cur.itersize = 1000
+                cur.execute(f"SELECT blob FROM {table} WHERE type = %s", (BLOB_REF_TYPE,))
+                for (blob,) in cur:
+                    if blob is not None:
+                        yield bytes(blob)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--blob-dir", default=getattr(settings, "checkpoint_blob_dir", "data/checkpoint_blobs")
+    )
+    parser.add_argument("--database-url", default=getattr(settings, "database_url", "") or "")
+    parser.add_argument(
+        "--grace-hours", type=float, default=24.0, help="keep unreferenced blobs younger than this"
+    )
+    parser.add_argument(
+        "--without-database", action="store_true", help="treat every blob as unreferenced"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="report what would be deleted")
+    args = parser.parse_args()
+
+    grace_s = args.grace_hours * 3600
+    if grace_s <= BLOB_TOUCH_INTERVAL_S:
+        parser.error(f"--grace-hours must exceed {BLOB_TOUCH_INTERVAL_S / 3600:.2f}h")
+    if not args.database_url and not args.without_database:
+        parser.error(
+            "no database URL: pass --database-url, or --without-database with the app stopped"
+        )
+    if not Path(args.blob_dir).is_dir():
+        print(f"blob dir {args.blob_dir} does not exist; nothing to prune")
+        return 0
+
+    # Fixed before marking: blobs written or reused during the scan are newer than this.
+    older_than = time.time() - grace_s
+    referenced: Set[str] = set()
+    if not args.without_database:
+        referenced = referenced_digests(_reference_payloads(args.database_url))
+
+    stats = prune_unreferenced_blobs(
+        FileBlobStore(args.blob_dir),
+        referenced,
+        older_than=older_than,
+        dry_run=args.dry_run,
+    )
+    report = {"dry_run": args.dry_run, "referenced_digests": len(referenced), **stats}
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
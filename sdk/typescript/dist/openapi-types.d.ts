@@ -2009,6 +2009,31 @@ export interface components {
             /** Role */
             role: string;
         };
+        /** PageCacheStats */
+        PageCacheStats: {
+            /** Entries */
+            entries: number;
+            /** Evictions */
+            evictions: number;
+            /** Hit Rate */
+            hit_rate: number;
+            /** Hits */
+            hits: number;
+            /** Max Bytes */
+            max_bytes: number;
+            /** Misses */
+            misses: number;
+            /** Revalidate Modified */
+            revalidate_modified: number;
+            /** Revalidated */
+            revalidated: number;
+            /** Size Bytes */
+            size_bytes: number;
+            /** Stale */
+            stale: number;
+            /** Stores */
+            stores: number;
+        };
         /** ProviderCircuitSnapshot */
         ProviderCircuitSnapshot: {
             /** Consecutive Failures */
@@ -2174,10 +2199,47 @@ export interface components {
         };
         /** SearchCacheStats */
         SearchCacheStats: {
+            /**
+             * Backend
+             * @default memory
+             */
+            backend: string;
+            /**
+             * Bytes
+             * @default 0
+             */
+            bytes: number;
+            /**
+             * Coalesced
+             * @default 0
+             */
+            coalesced: number;
+            /**
+             * Evictions
+             * @default 0
+             */
+            evictions: number;
             /** Hit Rate */
             hit_rate: number;
             /** Hits */
             hits: number;
+            /** L2 Entries */
+            l2_entries?: number | null;
+            /**
+             * L2 Errors
+             * @default 0
+             */
+            l2_errors: number;
+            /**
+             * L2 Hits
+             * @default 0
+             */
+            l2_hits: number;
+            /**
+             * Max Bytes
+             * @default 0
+             */
+            max_bytes: number;
             /** Max Size */
             max_size: number;
             /** Misses */
@@ -2189,6 +2251,14 @@ export interface components {
         };
         /** SearchCacheStatsResponse */
         SearchCacheStatsResponse: {
+            page_cache?: components["schemas"]["PageCacheStats"] | null;
+            /**
+             * Single Flight
+             * @default {}
+             */
+            single_flight: {
+                [key: string]: components["schemas"]["SingleFlightStats"];
+            };
             stats: components["schemas"]["SearchCacheStats"];
         };
         /** SearchMode */
@@ -2228,6 +2298,8 @@ export interface components {
             last_error_time?: string | null;
             /** Name */
             name: string;
+            /** P90 Latency Ms */
+            p90_latency_ms?: number | null;
             /** Success Count */
             success_count: number;
             /** Success Rate */
@@ -2333,6 +2405,15 @@ export interface components {
              */
             permissions: string;
         };
+        /** SingleFlightStats */
+        SingleFlightStats: {
+            /** Coalesced */
+            coalesced: number;
+            /** Executions */
+            executions: number;
+            /** In Flight */
+            in_flight: number;
+        };
         /** SupportChatRequest */
         SupportChatRequest: {
             /** Message */
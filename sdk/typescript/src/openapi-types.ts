@@ -252,6 +252,31 @@ export interface paths {
         patch?: never;
         trace?: never;
     };
+    "/api/chat/sse/{run_id}": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * Chat Sse Reattach
+         * @description Reattach to a detached `/api/chat/sse` run.
+         *
+         *     Replays only frames after `Last-Event-ID` (header, or `last_event_id`
+         *     query parameter for clients that cannot set headers), then follows the
+         *     run live until it finishes. Finished runs stay replayable for
+         *     CHAT_RUN_REPLAY_TTL_S seconds.
+         */
+        get: operations["chat_sse_reattach_api_chat_sse__run_id__get"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/api/config/public": {
         parameters: {
             query?: never;
@@ -275,6 +300,72 @@ export interface paths {
         patch?: never;
         trace?: never;
     };
+    "/api/debug/loop": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * Debug Loop
+         * @description Event-loop health: lag samples and the routes that blocked the loop longest.
+         *
+         *     Offenders (with the stack captured during the worst stall) are only
+         *     collected when LOOP_DEBUG_ENABLED is set.
+         */
+        get: operations["debug_loop_api_debug_loop_get"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/api/documents/jobs/{job_id}": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * Get Document Job
+         * @description Status and progress of a document ingestion job.
+         */
+        get: operations["get_document_job_api_documents_jobs__job_id__get"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/api/documents/jobs/{job_id}/events": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * Document Job Events
+         * @description SSE stream of ingestion job progress.
+         *
+         *     Emits `progress` whenever the job changes, then `completed` or `failed`,
+         *     then `done`.
+         */
+        get: operations["document_job_events_api_documents_jobs__job_id__events_get"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/api/documents/list": {
         parameters: {
             query?: never;
@@ -328,7 +419,10 @@ export interface paths {
          * Upload Document
          * @description Upload a document to the RAG knowledge base.
          *
-         *     Supports PDF, DOCX, TXT, MD files.
+         *     Supports PDF, DOCX, TXT, MD files. The upload is spooled to disk and
+         *     ingested by a background job; the response carries the job id right away.
+         *     Track it via `GET /api/documents/jobs/{job_id}` (or `/events` for SSE).
+         *     With `wait=true` the request waits for the job and returns its result.
          */
         post: operations["upload_document_api_documents_upload_post"];
         delete?: never;
@@ -2010,6 +2104,31 @@ export interface components {
             /** Role */
             role: string;
         };
+        /** PageCacheStats */
+        PageCacheStats: {
+            /** Entries */
+            entries: number;
+            /** Evictions */
+            evictions: number;
+            /** Hit Rate */
+            hit_rate: number;
+            /** Hits */
+            hits: number;
+            /** Max Bytes */
+            max_bytes: number;
+            /** Misses */
+            misses: number;
+            /** Revalidate Modified */
+            revalidate_modified: number;
+            /** Revalidated */
+            revalidated: number;
+            /** Size Bytes */
+            size_bytes: number;
+            /** Stale */
+            stale: number;
+            /** Stores */
+            stores: number;
+        };
         /** ProviderCircuitSnapshot */
         ProviderCircuitSnapshot: {
             /** Consecutive Failures */
@@ -2113,6 +2232,11 @@ export interface components {
             /** Event Count */
             event_count: number;
             evidence_summary: components["schemas"]["RunEvidenceSummary"];
+            /**
+             * Frames Saved Ratio
+             * @default 0
+             */
+            frames_saved_ratio: number;
             /** Model */
             model: string;
             /** Nodes Completed */
@@ -2132,6 +2256,16 @@ export interface components {
             run_id: string;
             /** Started At */
             started_at: string;
+            /**
+             * Text Deltas
+             * @default 0
+             */
+            text_deltas: number;
+            /**
+             * Text Frames
+             * @default 0
+             */
+            text_frames: number;
         };
         /** SandboxBrowserConfigured */
         SandboxBrowserConfigured: {
@@ -2175,10 +2309,47 @@ export interface components {
         };
         /** SearchCacheStats */
         SearchCacheStats: {
+            /**
+             * Backend
+             * @default memory
+             */
+            backend: string;
+            /**
+             * Bytes
+             * @default 0
+             */
+            bytes: number;
+            /**
+             * Coalesced
+             * @default 0
+             */
+            coalesced: number;
+            /**
+             * Evictions
+             * @default 0
+             */
+            evictions: number;
             /** Hit Rate */
             hit_rate: number;
             /** Hits */
             hits: number;
+            /** L2 Entries */
+            l2_entries?: number | null;
+            /**
+             * L2 Errors
+             * @default 0
+             */
+            l2_errors: number;
+            /**
+             * L2 Hits
+             * @default 0
+             */
+            l2_hits: number;
+            /**
+             * Max Bytes
+             * @default 0
+             */
+            max_bytes: number;
             /** Max Size */
             max_size: number;
             /** Misses */
@@ -2190,6 +2361,14 @@ export interface components {
         };
         /** SearchCacheStatsResponse */
         SearchCacheStatsResponse: {
+            page_cache?: components["schemas"]["PageCacheStats"] | null;
+            /**
+             * Single Flight
+             * @default {}
+             */
+            single_flight: {
+                [key: string]: components["schemas"]["SingleFlightStats"];
+            };
             stats: components["schemas"]["SearchCacheStats"];
         };
         /** SearchMode */
@@ -2229,6 +2408,8 @@ export interface components {
             last_error_time?: string | null;
             /** Name */
             name: string;
+            /** P90 Latency Ms */
+            p90_latency_ms?: number | null;
             /** Success Count */
             success_count: number;
             /** Success Rate */
@@ -2317,6 +2498,8 @@ export interface components {
             count: number;
             /** Sessions */
             sessions: components["schemas"]["SessionSummary"][];
+            /** Next Cursor */
+            next_cursor?: string | null;
         };
         /**
          * ShareRequest
@@ -2334,6 +2517,15 @@ export interface components {
              */
             permissions: string;
         };
+        /** SingleFlightStats */
+        SingleFlightStats: {
+            /** Coalesced */
+            coalesced: number;
+            /** Executions */
+            executions: number;
+            /** In Flight */
+            in_flight: number;
+        };
         /** SupportChatRequest */
         SupportChatRequest: {
             /** Message */
@@ -2957,6 +3149,39 @@ export interface operations {
             };
         };
     };
+    chat_sse_reattach_api_chat_sse__run_id__get: {
+        parameters: {
+            query?: {
+                last_event_id?: string | null;
+            };
+            header?: never;
+            path: {
+                run_id: string;
+            };
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": unknown;
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
     public_config_api_config_public_get: {
         parameters: {
             query?: never;
@@ -3042,7 +3267,9 @@ export interface operations {
     };
     upload_document_api_documents_upload_post: {
         parameters: {
-            query?: never;
+            query?: {
+                wait?: boolean;
+            };
             header?: never;
             path?: never;
             cookie?: never;
@@ -3073,6 +3300,68 @@ export interface operations {
             };
         };
     };
+    get_document_job_api_documents_jobs__job_id__get: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path: {
+                job_id: string;
+            };
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": unknown;
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
+    document_job_events_api_documents_jobs__job_id__events_get: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path: {
+                job_id: string;
+            };
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": unknown;
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
     delete_document_api_documents__source__delete: {
         parameters: {
             query?: never;
@@ -3364,6 +3653,37 @@ export interface operations {
             };
         };
     };
+    debug_loop_api_debug_loop_get: {
+        parameters: {
+            query?: {
+                limit?: number;
+            };
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": unknown;
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
     memory_status_api_memory_status_get: {
         parameters: {
             query?: never;
@@ -3698,6 +4018,7 @@ export interface operations {
             query?: {
                 limit?: number;
                 status?: string | null;
+                cursor?: string | null;
             };
             header?: never;
             path?: never;
@@ -0,0 +1,173 @@
+import asyncio
+import json
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+import main
+from common.agent_runs import (
+    AgentRunRegistry,
+    AgentRunStatus,
+    RunReplayBuffer,
+    get_agent_run_by_thread,
+)
+
+
+def _frames(body: str):
+    out = []
+    for block in body.split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line and not line.startswith(":"))
+        if "id" in lines:
+            out.append((int(lines["id"]), lines["event"], json.loads(lines["data"])))
+    return out
+
+
+def test_replay_buffer_resumes_from_any_retained_seq():
+    replay = RunReplayBuffer(capacity=4)
+    for i in range(1, 11):
+        assert replay.append(f"f{i}") == i
+
+    assert replay.first_seq == 7 and replay.last_seq == 10
+    assert [s for s, _ in replay.since(8)] == [9, 10]
+    assert [s for s, _ in replay.since(0)] == [7, 8, 9, 10]
+    assert replay.since(10) == []
+
+    async def drain():
+        replay.close()
+        return [frame async for frame in replay.subscribe(8)]
+
+    assert asyncio.run(drain()) == ["f9", "f10"]
+
+
+def test_registry_caps_replay_frames_and_never_evicts_running_runs():
+    registry = AgentRunRegistry(max_runs=2, max_replay_frames=10)
+    running = registry.create("t_running")
+    running.start()
+    registry.attach_replay(running, capacity=8)
+    done = registry.create("t_done")
+    done.start()
+    registry.attach_replay(done, capacity=8)
+    for i in range(6):
+        done.replay.append(f"d{i}")
+    done.complete()
+
+    for i in range(6):
+        running.replay.append(f"r{i}")
+    # Over budget: the finished run's replay goes first.
+    assert done.replay is None
+    assert len(running.replay) == 6 and registry.replay_frames() == 6
+
+    for i in range(6, 12):
+        running.replay.append(f"r{i}")
+    # Only running replays left: their oldest frames are trimmed instead.
+    assert registry.replay_frames() == len(running.replay) == 8
+    assert running.replay.last_seq == 12
+
+    third = registry.create("t_third")
+    fourth = registry.create("t_fourth")
+    assert registry.get(running.id) is running
+    assert registry.get(done.id) is None
+    assert registry.get(third.id) is third and registry.get(fourth.id) is fourth
+
+    registry.release_replay(running)
+    assert running.replay is None and registry.replay_frames() == 0
+
+
+@pytest.mark.asyncio
+async def test_finished_run_replay_is_released_after_ttl():
+    registry = AgentRunRegistry(replay_ttl_seconds=0.05)
+    run = registry.create("t_ttl")
+    run.start()
+    replay = registry.attach_replay(run)
+    replay.append("f1")
+    replay.close()
+    run.complete()
+
+    registry.release_replay_later(run)
+    assert run.replay is replay
+    await asyncio.sleep(0.1)
+    assert run.replay is None and registry.replay_frames() == 0
+    assert [frame async for frame in replay.subscribe(0)] == ["f1"]
+
+
+@pytest.mark.asyncio
+async def test_chat_run_survives_disconnect_and_replays_only_missed_frames(monkeypatch):
+    monkeypatch.setattr(main.settings, "openai_api_key", "dummy")
+    gate = asyncio.Event()
+    calls = []
+
+    async def _fake_stream_agent_events(input_text, *, thread_id, model, search_mode, agent_id=None, images=None, user_id):
+        calls.append(thread_id)
+        for i in range(2):
+            yield "0:" + json.dumps({"type": "text", "data": {"content": f"a{i}"}}) + "\n"
+        await gate.wait()
+        for i in range(3):
+            yield "0:" + json.dumps({"type": "text", "data": {"content": f"b{i}"}}) + "\n"
+        yield '0:{"type":"done","data":{}}\n'
+
+    monkeypatch.setattr(main, "stream_agent_events", _fake_stream_agent_events)
+
+    transport = ASGITransport(app=main.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        first = asyncio.create_task(
+            ac.post("/api/chat/sse", json={"messages": [{"role": "user", "content": "hi"}]})
+        )
+        for _ in range(200):
+            run = get_agent_run_by_thread(calls[0]) if calls else None
+            if run is not None and run.replay.last_seq == 2:
+                break
+            await asyncio.sleep(0.01)
+        assert run is not None and run.replay.last_seq == 2
+
+        # Client drops the connection mid-run; the run keeps going.
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        await asyncio.sleep(0.05)
+        assert not run.task.done()
+        assert run.status == AgentRunStatus.RUNNING
+
+        gate.set()
+        await run.task
+        assert run.status == AgentRunStatus.COMPLETED
+
+        resp = await ac.get(f"/api/chat/sse/{run.id}", headers={"Last-Event-ID": "2"})
+        assert resp.status_code == 200
+        assert resp.headers["X-Run-ID"] == run.id
+        assert resp.headers["X-Thread-ID"] == run.thread_id
+        frames = _frames(resp.text)
+        assert [f[0] for f in frames] == [3, 4, 5, 6]
+        assert [f[2]["data"].get("content") for f in frames[:3]] == ["b0", "b1", "b2"]
+        assert frames[-1][1] == "done"
+
+        full = _frames((await ac.get(f"/api/chat/sse/{run.id}?last_event_id=0")).text)
+        assert [f[0] for f in full] == [1, 2, 3, 4, 5, 6]
+
+        missing = await ac.get("/api/chat/sse/run_doesnotexist")
+        assert missing.status_code == 404
+
+    assert len(calls) == 1  # reattaching never re-runs the agent
+
+
+@pytest.mark.asyncio
+async def test_chat_run_reattach_is_owner_scoped(monkeypatch):
+    monkeypatch.setitem(main.settings.__dict__, "internal_api_key", "test-key")
+    monkeypatch.setitem(main.settings.__dict__, "auth_user_header", "X-Weaver-User")
+    monkeypatch.setattr(main.settings, "openai_api_key", "")
+
+    def headers(user):
+        return {"Authorization": "Bearer test-key", "X-Weaver-User": user}
+
+    transport = ASGITransport(app=main.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        resp = await ac.post(
+            "/api/chat/sse",
+            headers=headers("alice"),
+            json={"messages": [{"role": "user", "content": "hi"}]},
+        )
+        run_id = resp.headers["X-Run-ID"]
+        assert [f[1] for f in _frames(resp.text)] == ["error", "done"]
+
+        assert (await ac.get(f"/api/chat/sse/{run_id}", headers=headers("bob"))).status_code == 403
+        again = await ac.get(f"/api/chat/sse/{run_id}", headers={**headers("alice"), "Last-Event-ID": "1"})
+        assert [f[1] for f in _frames(again.text)] == ["done"]
@@ -0,0 +1,103 @@
+import asyncio
+import time
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+import common.session_manager as session_manager_mod
+import main
+from agent.core.graph import PooledPostgresSaver, create_pooled_checkpointer
+
+
+class _CheckpointTuple:
+    def __init__(self, state):
+        self.checkpoint = {"channel_values": state}
+        self.metadata = {"created_at": "2026-02-21T00:00:00Z"}
+        self.parent_config = None
+
+
+class _LoopHostileCheckpointer:
+    """Mimics AsyncPostgresSaver: sync reads are slow and refused on the event loop."""
+
+    def __init__(self, by_thread_id, delay=0.2):
+        self._by_thread_id = by_thread_id
+        self.delay = delay
+        self.storage = {}
+
+    def get_tuple(self, config):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise asyncio.InvalidStateError("sync checkpointer call on the event loop")
+        time.sleep(self.delay)
+        thread_id = (config or {}).get("configurable", {}).get("thread_id")
+        state = self._by_thread_id.get(thread_id)
+        return _CheckpointTuple(state) if state is not None else None
+
+
+def test_pooled_checkpointer_is_configured_closed_and_unbound():
+    saver = create_pooled_checkpointer(
+        "postgresql://user:pw@localhost:1/weaver",
+        min_size=2,
+        max_size=1,
+        statement_timeout_ms=1500,
+        check_connections=True,
+    )
+
+    assert isinstance(saver, PooledPostgresSaver)
+    assert saver.loop is None
+    pool = saver.pool
+    assert pool.closed
+    assert (pool.min_size, pool.max_size) == (2, 2)
+    assert pool.kwargs["autocommit"] is True
+    assert pool.kwargs["options"] == "-c statement_timeout=1500"
+    assert pool._check is not None
+    assert saver.pool_stats()["pool_max"] == 2
+
+    no_timeout = create_pooled_checkpointer("postgresql://localhost:1/x", statement_timeout_ms=0)
+    assert "options" not in no_timeout.pool.kwargs
+
+    with pytest.raises(ValueError):
+        create_pooled_checkpointer("")
+
+
+@pytest.mark.asyncio
+async def test_session_endpoints_read_checkpoints_off_the_event_loop(monkeypatch):
+    monkeypatch.setitem(main.settings.__dict__, "internal_api_key", "test-key")
+    monkeypatch.setitem(main.settings.__dict__, "auth_user_header", "X-Weaver-User")
+    fake = _LoopHostileCheckpointer({"thread_alice": {"user_id": "alice", "input": "hello"}})
+    monkeypatch.setattr(main, "checkpointer", fake)
+    monkeypatch.setattr(session_manager_mod, "_session_manager", None)
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    transport = ASGITransport(app=main.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        tick_task = asyncio.create_task(ticker())
+        try:
+            own = await ac.get(
+                "/api/sessions/thread_alice/state",
+                headers={"Authorization": "Bearer test-key", "X-Weaver-User": "alice"},
+            )
+        finally:
+            tick_task.cancel()
+
+        # The ownership check must still see the persisted owner (not fail open).
+        other = await ac.get(
+            "/api/sessions/thread_alice/state",
+            headers={"Authorization": "Bearer test-key", "X-Weaver-User": "bob"},
+        )
+
+    assert own.status_code == 200
+    assert own.json()["state"]["user_id"] == "alice"
+    # Two 200ms checkpoint reads ran in worker threads while the loop kept ticking.
+    assert ticks >= 10
+    assert other.status_code == 403
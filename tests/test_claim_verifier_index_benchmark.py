@@ -0,0 +1,106 @@
+import random
+from typing import Any, Dict, List
+
+from agent.workflows.claim_verifier import ClaimCheck, ClaimStatus, ClaimVerifier
+
+
+def _legacy_verify_claim(
+    verifier: ClaimVerifier, claim: str, evidence: List[Dict[str, Any]]
+) -> ClaimCheck:
+    """The per-pair scan `verify_claim` used before the evidence index (kept as the oracle)."""
+    claim_tokens = verifier._tokenize(claim)
+    if not claim_tokens:
+        return ClaimCheck(claim=claim, status=ClaimStatus.UNSUPPORTED)
+
+    supported, contradicted = [], []
+    best_overlap = 0
+    for item in evidence:
+        url = str(item.get("url") or "").strip() or "unknown"
+        text = str(item.get("text") or "").strip()
+        overlap = len(claim_tokens & verifier._tokenize(text))
+        if overlap < verifier.min_overlap_tokens:
+            continue
+        best_overlap = max(best_overlap, overlap)
+        payload: Dict[str, Any] = {"url": url}
+        if item.get("snippet_hash"):
+            payload["snippet_hash"] = item["snippet_hash"]
+        if item.get("quote"):
+            payload["quote"] = item["quote"]
+        if verifier._is_contradiction(claim, text):
+            contradicted.append((overlap, url, payload))
+        else:
+            supported.append((overlap, url, payload))
+
+    contradicted.sort(key=lambda row: -row[0])
+    supported.sort(key=lambda row: -row[0])
+    limit = verifier.max_evidence_per_claim
+    if contradicted:
+        urls = list(dict.fromkeys([u for _o, u, _p in contradicted] + [u for _o, u, _p in supported]))
+        return ClaimCheck(
+            claim=claim,
+            status=ClaimStatus.CONTRADICTED,
+            evidence_urls=urls[:limit],
+            evidence_passages=[p for _o, _u, p in (contradicted + supported)][:limit],
+            score=float(best_overlap),
+            notes="conflicting evidence found",
+        )
+    if supported:
+        return ClaimCheck(
+            claim=claim,
+            status=ClaimStatus.VERIFIED,
+            evidence_urls=list(dict.fromkeys([u for _o, u, _p in supported]))[:limit],
+            evidence_passages=[p for _o, _u, p in supported][:limit],
+            score=float(best_overlap),
+            notes="supported by evidence",
+        )
+    return ClaimCheck(
+        claim=claim,
+        status=ClaimStatus.UNSUPPORTED,
+        score=0.0,
+        notes="no matching evidence",
+    )
+
+
+def _make_corpus(n_claims: int, n_passages: int, seed: int = 7):
+    rng = random.Random(seed)
+    vocab = [f"term{i}" for i in range(400)] + ["revenue", "growth", "battery", "market", "增长", "下降"]
+    markers = ["", " increased", " decreased", " did not change", " rose", " fell"]
+
+    def sentence(k: int) -> str:
+        return " ".join(rng.choices(vocab, k=k)) + rng.choice(markers)
+
+    passages = [
+        {
+            "url": f"https://example{i % 40}.com/page{i}",
+            "text": sentence(rng.randint(20, 60)) + ".",
+            "snippet_hash": f"hash{i}",
+            "quote": f"quote {i}",
+        }
+        for i in range(n_passages)
+    ]
+    claims = [f"In 2024 the study found {sentence(rng.randint(6, 14))}." for _ in range(n_claims)]
+    return claims, passages
+
+
+def test_indexed_verification_matches_legacy_scan():
+    verifier = ClaimVerifier(min_overlap_tokens=2, max_evidence_per_claim=3)
+    claims, passages = _make_corpus(n_claims=50, n_passages=500)
+    evidence = verifier._extract_evidence([], passages=passages)
+
+    legacy = [_legacy_verify_claim(verifier, claim, evidence) for claim in claims]
+    index = verifier.build_index(evidence)
+    indexed = [verifier.verify_claim(claim, index) for claim in claims]
+
+    assert indexed == legacy
+    assert sum(len(c.evidence_passages) for c in indexed) > len(claims)
+
+
+def test_verify_report_uses_index_with_same_results():
+    verifier = ClaimVerifier(min_overlap_tokens=2, max_evidence_per_claim=3)
+    claims, passages = _make_corpus(n_claims=10, n_passages=120, seed=3)
+    report = "\n".join(claims)
+
+    checks = verifier.verify_report(report, [], max_claims=10, passages=passages)
+    evidence = verifier._extract_evidence([], passages=passages)
+
+    assert checks == [_legacy_verify_claim(verifier, c.claim, evidence) for c in checks]
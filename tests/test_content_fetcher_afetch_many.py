@@ -0,0 +1,99 @@
+import asyncio
+
+import httpx
+import pytest
+
+from tools.research.content_fetcher import ContentFetcher
+
+
+def _configure(monkeypatch, mod, *, concurrency: int, per_domain: int) -> None:
+    monkeypatch.setattr(mod.settings, "research_fetch_cache_ttl_s", 0.0, raising=False)
+    monkeypatch.setattr(mod.settings, "research_fetch_render_mode", "off", raising=False)
+    monkeypatch.setattr(mod.settings, "research_fetch_concurrency", concurrency, raising=False)
+    monkeypatch.setattr(
+        mod.settings, "research_fetch_concurrency_per_domain", per_domain, raising=False
+    )
+
+
+@pytest.mark.asyncio
+async def test_afetch_many_yields_in_completion_order(monkeypatch):
+    import tools.research.content_fetcher as mod
+
+    _configure(monkeypatch, mod, concurrency=4, per_domain=2)
+    release_slow = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "slow.example.com":
+            await release_slow.wait()
+        return httpx.Response(
+            200,
+            headers={"Content-Type": "text/html"},
+            content=f"<html><title>{request.url.host}</title><body>hi</body></html>".encode(),
+        )
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(mod, "get_async_http_client", lambda: client)
+
+    fetcher = ContentFetcher()
+    seen = []
+    async for page in fetcher.afetch_many(
+        ["https://slow.example.com/a", "https://fast.example.com/b", "https://fast.example.com/b"]
+    ):
+        seen.append(page.title)
+        if len(seen) == 1:
+            # The fast page arrives while the slow host is still "downloading".
+            release_slow.set()
+
+    await client.aclose()
+    assert seen == ["fast.example.com", "slow.example.com"]
+
+
+@pytest.mark.asyncio
+async def test_afetch_many_respects_per_domain_limit(monkeypatch):
+    import tools.research.content_fetcher as mod
+
+    _configure(monkeypatch, mod, concurrency=4, per_domain=1)
+    active = {"example.com": 0}
+    peak = {"example.com": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        active[host] += 1
+        peak[host] = max(peak[host], active[host])
+        await asyncio.sleep(0.01)
+        active[host] -= 1
+        return httpx.Response(200, headers={"Content-Type": "text/plain"}, content=b"ok")
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(mod, "get_async_http_client", lambda: client)
+
+    fetcher = ContentFetcher()
+    pages = [p async for p in fetcher.afetch_many([f"https://example.com/{i}" for i in range(4)])]
+
+    await client.aclose()
+    assert len(pages) == 4
+    assert all(p.http_status == 200 and p.text == "ok" for p in pages)
+    assert peak["example.com"] == 1
+
+
+@pytest.mark.asyncio
+async def test_afetch_falls_back_to_reader_on_error(monkeypatch):
+    import tools.research.content_fetcher as mod
+
+    _configure(monkeypatch, mod, concurrency=2, per_domain=2)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "r.jina.ai":
+            return httpx.Response(200, headers={"Content-Type": "text/plain"}, content=b"reader body")
+        return httpx.Response(403, headers={"Content-Type": "text/plain"}, content=b"denied")
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(mod, "get_async_http_client", lambda: client)
+
+    fetcher = ContentFetcher(reader_mode="public", reader_public_base="https://r.jina.ai")
+    page = await fetcher.afetch("https://example.com/blocked")
+
+    await client.aclose()
+    assert page.method == "reader_public"
+    assert page.text == "reader body"
+    assert page.attempts == 2
@@ -31,7 +31,7 @@ def fake_get(url, timeout=None, headers=None, **kwargs):
         calls["get"] += 1
         return FakeResp()
 
-    monkeypatch.setattr(mod, "requests", types.SimpleNamespace(get=fake_get))
+    monkeypatch.setattr(mod, "get_http_session", lambda: types.SimpleNamespace(get=fake_get))
 
     f = ContentFetcher()
     page1 = f.fetch("https://example.com/?utm_source=a")
@@ -11,7 +11,7 @@ def get(self, key, default=None):
         return self._mapping.get(str(key).lower(), default)
 
 
-def test_content_fetcher_direct_uses_requests_and_strips_html(monkeypatch):
+def test_content_fetcher_direct_uses_http_session_and_strips_html(monkeypatch):
     calls = {"get": 0}
     seen = {"url": None, "timeout": None, "headers": None, "kwargs": None}
 
@@ -34,7 +34,7 @@ def fake_get(url, timeout=None, headers=None, **kwargs):
 
     import tools.research.content_fetcher as mod
 
-    monkeypatch.setattr(mod, "requests", types.SimpleNamespace(get=fake_get))
+    monkeypatch.setattr(mod, "get_http_session", lambda: types.SimpleNamespace(get=fake_get))
 
     f = ContentFetcher()
     page = f.fetch("https://example.com/?utm_source=x")
@@ -76,7 +76,7 @@ def close(self):
     def fake_get(url, timeout=None, headers=None, **kwargs):
         return FakeResp()
 
-    monkeypatch.setattr(mod, "requests", types.SimpleNamespace(get=fake_get))
+    monkeypatch.setattr(mod, "get_http_session", lambda: types.SimpleNamespace(get=fake_get))
 
     page = ContentFetcher().fetch("https://example.com/")
     assert page.text == "aaab"
@@ -89,9 +89,9 @@ def test_content_fetcher_blocks_localhost_without_network(monkeypatch):
 
     def fake_get(*args, **kwargs):
         called["get"] = True
-        raise AssertionError("requests.get should not be called for blocked hosts")
+        raise AssertionError("the HTTP session should not be called for blocked hosts")
 
-    monkeypatch.setattr(mod, "requests", types.SimpleNamespace(get=fake_get))
+    monkeypatch.setattr(mod, "get_http_session", lambda: types.SimpleNamespace(get=fake_get))
 
     f = ContentFetcher()
     page = f.fetch("http://localhost:8000/")
@@ -0,0 +1,203 @@
+import os
+import types
+
+import pytest
+
+from tools.research.content_fetcher import ContentFetcher
+from tools.research.models import FetchedPage
+
+
+@pytest.fixture
+def disk_cache(monkeypatch, tmp_path):
+    import tools.research.content_fetcher as mod
+    import tools.research.page_cache as page_cache
+
+    monkeypatch.setattr(mod.settings, "research_fetch_cache_ttl_s", 0.0, raising=False)
+    monkeypatch.setattr(mod.settings, "research_fetch_render_mode", "off", raising=False)
+    monkeypatch.setattr(mod.settings, "research_fetch_disk_cache_enabled", True, raising=False)
+    cache_path = str(tmp_path / "pages.sqlite3")
+    monkeypatch.setattr(mod.settings, "research_fetch_disk_cache_path", cache_path, raising=False)
+    monkeypatch.setattr(mod.settings, "research_fetch_disk_cache_ttl_s", 3600.0, raising=False)
+    monkeypatch.setattr(
+        mod.settings, "research_fetch_disk_cache_max_bytes", 10_000_000, raising=False
+    )
+    page_cache.close_persistent_page_cache()
+    yield page_cache
+    page_cache.close_persistent_page_cache()
+
+
+class _FakeResp:
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.content = body
+        self.text = body.decode()
+        self.headers = {"content-type": "text/plain", **(headers or {})}
+
+    def iter_content(self, chunk_size=65536):
+        yield self.content
+
+    def close(self):
+        return None
+
+
+def test_fresh_disk_entry_survives_restart_without_network(monkeypatch, disk_cache):
+    import tools.research.content_fetcher as mod
+
+    calls = []
+
+    def fake_get(url, timeout=None, headers=None, **kwargs):
+        calls.append(headers)
+        return _FakeResp(200, b"hello world")
+
+    monkeypatch.setattr(mod, "get_http_session", lambda: types.SimpleNamespace(get=fake_get))
+
+    assert ContentFetcher().fetch("https://example.com/doc").text == "hello world"
+    # A new process/worker opens the same file.
+    disk_cache.close_persistent_page_cache()
+    page = ContentFetcher().fetch("https://example.com/doc?utm_source=x")
+
+    assert page.text == "hello world"
+    assert page.raw_url == "https://example.com/doc?utm_source=x"
+    assert len(calls) == 1
+    stats = disk_cache.get_persistent_page_cache().stats()
+    assert stats["hits"] == 1
+    assert stats["entries"] == 1
+
+
+def test_stale_entry_revalidates_with_conditional_get(monkeypatch, disk_cache):
+    import tools.research.content_fetcher as mod
+
+    monkeypatch.setattr(mod.settings, "research_fetch_disk_cache_ttl_s", 0.0, raising=False)
+    calls = []
+
+    def fake_get(url, timeout=None, headers=None, **kwargs):
+        calls.append(dict(headers or {}))
+        if headers and headers.get("If-None-Match") == '"v1"':
+            return _FakeResp(304)
+        return _FakeResp(
+            200,
+            b"original body",
+            headers={"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"},
+        )
+
+    monkeypatch.setattr(mod, "get_http_session", lambda: types.SimpleNamespace(get=fake_get))
+
+    fetcher = ContentFetcher()
+    first = fetcher.fetch("https://example.com/page")
+    second = fetcher.fetch("https://example.com/page")
+
+    assert first.text == second.text == "original body"
+    assert "If-None-Match" not in calls[0]
+    assert calls[1]["If-None-Match"] == '"v1"'
+    assert calls[1]["If-Modified-Since"] == "Wed, 01 Jan 2025 00:00:00 GMT"
+    stats = disk_cache.get_persistent_page_cache().stats()
+    assert stats["stale"] == 1
+    assert stats["revalidated"] == 1
+    assert stats["revalidate_modified"] == 0
+
+
+def test_persistent_cache_evicts_least_recently_used(tmp_path):
+    from tools.research.page_cache import PersistentPageCache
+
+    cache = PersistentPageCache(tmp_path / "p.sqlite3", ttl_s=60.0, max_bytes=1600)
+    try:
+        for i in range(5):
+            # Incompressible bodies so a couple of entries fill the byte budget.
+            text = os.urandom(400).hex()
+            page = FetchedPage(
+                url=f"https://e.com/{i}", raw_url="", method="direct_http", text=text
+            )
+            cache.store(f"k{i}", page)
+            cache.lookup("k0")  # keep k0 hot
+
+        stats = cache.stats()
+        assert stats["size_bytes"] <= 1600
+        assert stats["evictions"] >= 1
+        assert cache.lookup("k0") is not None
+        assert cache.lookup("k1") is None
+    finally:
+        cache.close()
+
+
+def test_persistent_cache_keeps_a_running_byte_total(tmp_path):
+    from tools.research.page_cache import PersistentPageCache
+
+    path = tmp_path / "p.sqlite3"
+    cache = PersistentPageCache(path, ttl_s=60.0, max_bytes=1600)
+    try:
+        for i in range(6):
+            text = os.urandom(200 + 50 * i).hex()
+            page = FetchedPage(
+                url=f"https://e.com/{i % 3}", raw_url="", method="direct_http", text=text
+            )
+            cache.store(f"k{i % 3}", page)  # later rounds replace earlier rows
+            assert cache._total_bytes == cache.stats()["size_bytes"]
+        assert cache.stats()["evictions"] >= 1
+    finally:
+        cache.close()
+
+    reopened = PersistentPageCache(path, ttl_s=60.0, max_bytes=1600)
+    try:
+        assert reopened._total_bytes == reopened.stats()["size_bytes"]
+    finally:
+        reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_afetch_keeps_disk_cache_work_off_the_event_loop(monkeypatch, disk_cache):
+    import threading
+
+    import httpx
+
+    import tools.research.content_fetcher as mod
+
+    loop_thread = threading.current_thread()
+    cache = disk_cache.get_persistent_page_cache()
+    threads = []
+    for name in ("lookup", "store"):
+        original = getattr(cache, name)
+
+        def wrapped(*args, _original=original, **kwargs):
+            threads.append(threading.current_thread())
+            return _original(*args, **kwargs)
+
+        monkeypatch.setattr(cache, name, wrapped)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"Content-Type": "text/plain"}, content=b"body")
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(mod, "get_async_http_client", lambda: client)
+
+    await ContentFetcher().afetch("https://example.com/off-loop")
+    await client.aclose()
+
+    assert len(threads) == 2
+    assert loop_thread not in threads
+
+
+@pytest.mark.asyncio
+async def test_afetch_revalidates_stale_entry(monkeypatch, disk_cache):
+    import httpx
+
+    import tools.research.content_fetcher as mod
+
+    monkeypatch.setattr(mod.settings, "research_fetch_disk_cache_ttl_s", 0.0, raising=False)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("if-none-match") == '"v2"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200, headers={"Content-Type": "text/plain", "ETag": '"v2"'}, content=b"async body"
+        )
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(mod, "get_async_http_client", lambda: client)
+
+    fetcher = ContentFetcher()
+    first = await fetcher.afetch("https://example.com/async")
+    second = await fetcher.afetch("https://example.com/async")
+    await client.aclose()
+
+    assert first.text == second.text == "async body"
+    assert disk_cache.get_persistent_page_cache().stats()["revalidated"] == 1
@@ -41,7 +41,7 @@ def fake_get(url, timeout=None, headers=None, **kwargs):
             second_started.set()
         return FakeResp()
 
-    monkeypatch.setattr(mod, "requests", types.SimpleNamespace(get=fake_get))
+    monkeypatch.setattr(mod, "get_http_session", lambda: types.SimpleNamespace(get=fake_get))
 
     result: dict = {}
 
@@ -100,7 +100,7 @@ def fake_get(url, timeout=None, headers=None, **kwargs):
             second_started.set()
         return FakeResp()
 
-    monkeypatch.setattr(mod, "requests", types.SimpleNamespace(get=fake_get))
+    monkeypatch.setattr(mod, "get_http_session", lambda: types.SimpleNamespace(get=fake_get))
 
     result: dict = {}
 
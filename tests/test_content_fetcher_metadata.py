@@ -26,7 +26,7 @@ def close(self):
     def fake_get(url, timeout=None, headers=None, **kwargs):
         return FakeResp()
 
-    monkeypatch.setattr(mod, "requests", types.SimpleNamespace(get=fake_get))
+    monkeypatch.setattr(mod, "get_http_session", lambda: types.SimpleNamespace(get=fake_get))
 
     page = ContentFetcher().fetch("https://example.com/")
     assert page.title == "My Page"
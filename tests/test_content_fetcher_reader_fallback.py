@@ -26,7 +26,7 @@ def fake_get(url, timeout=None, headers=None, **kwargs):
 
     import tools.research.content_fetcher as mod
 
-    monkeypatch.setattr(mod, "requests", types.SimpleNamespace(get=fake_get))
+    monkeypatch.setattr(mod, "get_http_session", lambda: types.SimpleNamespace(get=fake_get))
 
     f = ContentFetcher(reader_mode="public", reader_public_base="https://r.jina.ai", reader_self_hosted_base="")
     page = f.fetch("https://example.com/")
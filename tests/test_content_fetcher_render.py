@@ -33,7 +33,7 @@ def fake_get(url, timeout=None, headers=None, **kwargs):
         calls["direct"] += 1
         return FakeResp()
 
-    monkeypatch.setattr(mod, "requests", types.SimpleNamespace(get=fake_get))
+    monkeypatch.setattr(mod, "get_http_session", lambda: types.SimpleNamespace(get=fake_get))
 
     import tools.crawl.crawler as crawler
 
@@ -79,7 +79,7 @@ def close(self):
     def fake_get(url, timeout=None, headers=None, **kwargs):
         return FakeResp()
 
-    monkeypatch.setattr(mod, "requests", types.SimpleNamespace(get=fake_get))
+    monkeypatch.setattr(mod, "get_http_session", lambda: types.SimpleNamespace(get=fake_get))
 
     page = ContentFetcher().fetch("https://example.com/")
     assert expected_text_snippet in (page.text or "")
@@ -35,7 +35,7 @@ def fake_get(url, timeout=None, headers=None, **kwargs):
         calls["direct"] += 1
         return FakeResp()
 
-    monkeypatch.setattr(mod, "requests", types.SimpleNamespace(get=fake_get))
+    monkeypatch.setattr(mod, "get_http_session", lambda: types.SimpleNamespace(get=fake_get))
 
     import tools.crawl.crawler as crawler
 
@@ -86,7 +86,7 @@ def fake_get(url, timeout=None, headers=None, **kwargs):
         calls["direct"] += 1
         return FakeResp()
 
-    monkeypatch.setattr(mod, "requests", types.SimpleNamespace(get=fake_get))
+    monkeypatch.setattr(mod, "get_http_session", lambda: types.SimpleNamespace(get=fake_get))
 
     import tools.crawl.crawler as crawler
 
@@ -0,0 +1,159 @@
+import asyncio
+import threading
+import time
+
+from agent.workflows import deepsearch_optimized
+from agent.workflows.epoch_pipeline import EpochFetchPipeline
+from tools.research.models import FetchedPage
+
+
+def _page(url: str) -> FetchedPage:
+    return FetchedPage(
+        url=url,
+        raw_url=url,
+        method="direct_http",
+        markdown=f"Body for {url}. It has sentences.",
+        http_status=200,
+    )
+
+
+def test_pipeline_returns_only_collected_urls_and_fetches_each_once():
+    calls = []
+    lock = threading.Lock()
+
+    def fetch(url):
+        with lock:
+            calls.append(url)
+        return _page(url)
+
+    pipeline = EpochFetchPipeline(
+        fetch,
+        lambda page: [{"url": page.url, "text": page.markdown}],
+        workers=2,
+    )
+    pipeline.prefetch(["https://a.example.com"])
+    pipeline.prefetch(["https://a.example.com"])
+
+    pages, passages = pipeline.collect(["https://c.example.com", "https://a.example.com"])
+
+    assert sorted(calls) == ["https://a.example.com", "https://c.example.com"]
+    assert [p["url"] for p in pages] == ["https://c.example.com", "https://a.example.com"]
+    assert [p["url"] for p in passages] == ["https://c.example.com", "https://a.example.com"]
+    timings = pipeline.stage_timings()
+    assert timings["fetch"]["items"] == 2
+    assert timings["passages"]["items"] == 2
+
+    pipeline.close()
+    assert pipeline.prefetch(["https://d.example.com"]) == 0
+
+
+def test_pipeline_caps_speculative_prefetches_but_not_selected_urls():
+    pipeline = EpochFetchPipeline(lambda url: _page(url), lambda page: [], queue_size=1)
+
+    assert pipeline.prefetch(["https://a.example.com", "https://b.example.com"]) == 1
+    assert pipeline.prefetch(["https://b.example.com"], speculative=False) == 1
+    pages, _ = pipeline.collect(["https://a.example.com", "https://b.example.com"])
+
+    assert [p["url"] for p in pages] == ["https://a.example.com", "https://b.example.com"]
+
+
+def test_collect_cancels_unselected_prefetches_instead_of_waiting():
+    slow_cancelled = threading.Event()
+
+    async def afetch(url):
+        if "slow" in url:
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                slow_cancelled.set()
+                raise
+        return _page(url)
+
+    pipeline = EpochFetchPipeline(afetch, lambda page: [], workers=4)
+    pipeline.prefetch(["https://slow.example.com", "https://fast.example.com"])
+
+    start = time.perf_counter()
+    pages, _ = pipeline.collect(["https://fast.example.com"])
+
+    assert time.perf_counter() - start < 5
+    assert [p["url"] for p in pages] == ["https://fast.example.com"]
+    assert slow_cancelled.wait(timeout=5)
+    pipeline.close()
+
+
+def test_pipeline_skips_failed_fetches():
+    def fetch(url):
+        if "bad" in url:
+            raise RuntimeError("boom")
+        return _page(url)
+
+    pipeline = EpochFetchPipeline(fetch, lambda page: [], workers=1)
+    pages, passages = pipeline.collect(["https://bad.example.com", "https://ok.example.com"])
+
+    assert [p["url"] for p in pages] == ["https://ok.example.com"]
+    assert passages == []
+
+
+def test_deepsearch_fetches_promising_urls_while_llm_picks(monkeypatch):
+    search_results = [
+        {"title": "A", "url": "https://example.com/a", "summary": "a", "score": 0.9},
+        {"title": "B", "url": "https://example.com/b", "summary": "b", "score": 0.5},
+        {"title": "C", "url": "https://example.com/c", "summary": "c", "score": 0.1},
+    ]
+    monkeypatch.setattr(deepsearch_optimized, "_model_for_task", lambda task, config: "fake-model")
+    monkeypatch.setattr(deepsearch_optimized, "_chat_model", lambda *args, **kwargs: object())
+    monkeypatch.setattr(deepsearch_optimized, "_resolve_provider_profile", lambda state: None)
+    monkeypatch.setattr(deepsearch_optimized, "_generate_queries", lambda *args, **kwargs: [args[1]])
+    monkeypatch.setattr(deepsearch_optimized, "_search_query", lambda *args, **kwargs: search_results)
+    monkeypatch.setattr(
+        deepsearch_optimized,
+        "_summarize_new_knowledge",
+        lambda *args, **kwargs: (True, "summary"),
+    )
+    monkeypatch.setattr(deepsearch_optimized, "_final_report", lambda *args, **kwargs: "final report")
+    monkeypatch.setattr(deepsearch_optimized, "_save_deepsearch_data", lambda *args, **kwargs: "")
+    for name, value in {
+        "deepsearch_enable_crawler": False,
+        "deepsearch_use_gap_analysis": False,
+        "deepsearch_enable_research_fetcher": True,
+        "deepsearch_pipeline_enabled": True,
+        "deepsearch_pipeline_prefetch_per_query": 1,
+        "deepsearch_max_epochs": 1,
+        "deepsearch_query_num": 1,
+        "deepsearch_results_per_query": 3,
+        "deepsearch_max_tokens": 0,
+        "deepsearch_max_seconds": 0.0,
+    }.items():
+        monkeypatch.setattr(deepsearch_optimized.settings, name, value, raising=False)
+
+    fetched = []
+    first_fetch = threading.Event()
+
+    class FakeFetcher:
+        async def afetch(self, url):
+            fetched.append(url)
+            first_fetch.set()
+            return _page(url)
+
+    monkeypatch.setattr(deepsearch_optimized, "ContentFetcher", lambda: FakeFetcher())
+
+    def fake_pick(*args, **kwargs):
+        # The top-scored URL is already being fetched while the LLM "thinks".
+        assert first_fetch.wait(timeout=5)
+        assert fetched == ["https://example.com/a"]
+        return ["https://example.com/a", "https://example.com/b"]
+
+    monkeypatch.setattr(deepsearch_optimized, "_pick_relevant_urls", fake_pick)
+
+    result = deepsearch_optimized.run_deepsearch_optimized({"input": "AI"}, config={})
+
+    artifacts = result["deepsearch_artifacts"]
+    assert sorted(fetched) == ["https://example.com/a", "https://example.com/b"]
+    assert sorted(p["url"] for p in artifacts["fetched_pages"]) == [
+        "https://example.com/a",
+        "https://example.com/b",
+    ]
+    assert {p["url"] for p in artifacts["passages"]} == {
+        "https://example.com/a",
+        "https://example.com/b",
+    }
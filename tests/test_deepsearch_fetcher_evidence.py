@@ -8,6 +8,7 @@ def test_build_fetcher_evidence_uses_fetch_many_and_dedupes(monkeypatch):
         True,
         raising=False,
     )
+    monkeypatch.setattr(deepsearch_optimized.settings, "research_fetch_async", False, raising=False)
 
     calls = {"urls": None}
 
@@ -73,6 +74,7 @@ def test_build_fetcher_evidence_filters_cookie_banner_passages(monkeypatch):
         True,
         raising=False,
     )
+    monkeypatch.setattr(deepsearch_optimized.settings, "research_fetch_async", False, raising=False)
 
     cookie = (
         "We use cookies to improve your experience. Accept all cookies. Cookie preferences. Privacy Policy."
@@ -122,3 +124,70 @@ def fetch_many(self, urls):
     combined = "\n\n".join([p.get("text", "") for p in passages]).lower()
     assert "accept all cookies" not in combined
     assert "actual article body" in combined
+
+
+def test_build_fetcher_evidence_streams_async_pages(monkeypatch):
+    monkeypatch.setattr(
+        deepsearch_optimized.settings,
+        "deepsearch_enable_research_fetcher",
+        True,
+        raising=False,
+    )
+    monkeypatch.setattr(deepsearch_optimized.settings, "research_fetch_async", True, raising=False)
+
+    from tools.research.models import FetchedPage
+
+    class FakeFetcher:
+        def fetch_many(self, urls):
+            raise AssertionError("sync fetch_many should not be used when async is enabled")
+
+        async def afetch_many(self, urls):
+            for url in reversed(list(urls)):
+                yield FetchedPage(
+                    url=url,
+                    raw_url=url,
+                    method="direct_http",
+                    markdown=f"Body for {url}. It has sentences.",
+                    http_status=200,
+                )
+
+    monkeypatch.setattr(deepsearch_optimized, "ContentFetcher", lambda: FakeFetcher())
+
+    fetched_pages, passages = deepsearch_optimized._build_fetcher_evidence(
+        ["https://a.example.com/", "https://b.example.com/"]
+    )
+
+    # Pages arrive b, a but come back in input order.
+    assert [p["url"] for p in fetched_pages] == ["https://a.example.com", "https://b.example.com"]
+    assert [p["url"] for p in passages] == ["https://a.example.com", "https://b.example.com"]
+
+
+def test_sync_evidence_builds_reuse_one_async_client(monkeypatch):
+    monkeypatch.setattr(
+        deepsearch_optimized.settings,
+        "deepsearch_enable_research_fetcher",
+        True,
+        raising=False,
+    )
+    monkeypatch.setattr(deepsearch_optimized.settings, "research_fetch_async", True, raising=False)
+
+    from common.http_client import get_async_http_client
+    from tools.research.models import FetchedPage
+
+    clients = []
+
+    class FakeFetcher:
+        async def afetch_many(self, urls):
+            client = get_async_http_client()
+            clients.append(client)
+            for url in urls:
+                yield FetchedPage(url=url, raw_url=url, method="direct_http", markdown="Body. Text.")
+
+    monkeypatch.setattr(deepsearch_optimized, "ContentFetcher", lambda: FakeFetcher())
+
+    for _ in range(2):
+        deepsearch_optimized._build_fetcher_evidence(["https://a.example.com/"])
+
+    assert len(clients) == 2
+    assert clients[0] is clients[1]
+    assert not clients[0].is_closed
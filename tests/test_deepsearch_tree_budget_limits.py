@@ -16,8 +16,8 @@ def test_deepsearch_tree_stops_after_search_budget(monkeypatch):
 
     search_calls: list[str] = []
 
-    def fake_search_query(query, max_results, config, provider_profile=None):
-        _ = max_results, config, provider_profile
+    def fake_search_query(query, max_results, config, provider_profile=None, deadline_s=None):
+        _ = max_results, config, provider_profile, deadline_s
         search_calls.append(str(query))
         return [
             {
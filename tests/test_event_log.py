@@ -0,0 +1,170 @@
+import asyncio
+import json
+import threading
+import types
+
+from agent.core import events as events_mod
+from agent.core.event_log import DurableEventLog, EventRing
+from agent.core.events import EventEmitter, ToolEventType
+
+
+def _item(seq):
+    return types.SimpleNamespace(seq=seq)
+
+
+def test_ring_keeps_latest_window_and_resumes_by_seq():
+    ring = EventRing(5)
+    for seq in range(1, 13):
+        ring.append(_item(seq))
+
+    assert len(ring) == 5
+    assert [i.seq for i in ring.since(None)] == [8, 9, 10, 11, 12]
+    assert [i.seq for i in ring.since(9)] == [10, 11, 12]
+    assert [i.seq for i in ring.since(2)] == [8, 9, 10, 11, 12]
+    assert ring.since(12) == []
+
+    ring.append(_item(1))  # seq reset restarts the window
+    assert [i.seq for i in ring.since(None)] == [1]
+
+
+def test_durable_log_reads_from_any_seq_across_segments_and_reopens(tmp_path):
+    log = DurableEventLog(tmp_path, segment_bytes=2048, max_bytes=10**9, index_every=8)
+    for seq in range(1, 1001):
+        log.append({"seq": seq, "type": "tool_progress", "data": {"i": seq}})
+    assert len(list(tmp_path.glob("*.jsonl"))) > 10
+
+    for start in (0, 1, 37, 500, 998, 1000):
+        assert [r["seq"] for r in log.read_since(start)] == list(range(start + 1, 1001))
+    assert [r["seq"] for r in log.read_since(100, until_seq=105)] == [101, 102, 103, 104, 105]
+    log.close()
+
+    # A torn last line (crash mid-write) is dropped on reopen.
+    active = sorted(tmp_path.glob("*.jsonl"))[-1]
+    with open(active, "ab") as fh:
+        fh.write(b'{"seq": 1001, "type": "tool_pro')
+    reopened = DurableEventLog(tmp_path, segment_bytes=2048, max_bytes=10**9, index_every=8)
+    assert reopened.last_seq == 1000
+    reopened.append({"seq": 1001, "type": "done", "data": {}})
+    assert [r["seq"] for r in reopened.read_since(995)] == [996, 997, 998, 999, 1000, 1001]
+
+
+def test_durable_log_is_size_bounded(tmp_path):
+    log = DurableEventLog(tmp_path, segment_bytes=1024, max_bytes=4096)
+    for seq in range(1, 501):
+        log.append({"seq": seq, "data": {"pad": "x" * 40}})
+
+    total = sum(p.stat().st_size for p in tmp_path.glob("*.jsonl"))
+    assert total <= 4096 + 1024
+    assert log.first_seq > 1
+    assert [r["seq"] for r in log.read_since(0)][-1] == 500
+
+
+def test_emitter_replays_beyond_ring_from_durable_log(tmp_path):
+    emitter = EventEmitter(thread_id="t/run 1", buffer_size=16, log_dir=str(tmp_path))
+
+    async def run():
+        for i in range(300):
+            await emitter.emit(ToolEventType.SEARCH, {"query": f"q{i}"})
+
+    asyncio.run(run())
+
+    assert [e.seq for e in emitter.get_buffered_events()] == list(range(285, 301))
+    resumed = emitter.get_events_since(10)
+    assert [e.seq for e in resumed] == list(range(11, 301))
+    assert resumed[0].type == ToolEventType.SEARCH and resumed[0].data == {"query": "q10"}
+    emitter.close()
+
+    restarted = EventEmitter(thread_id="t/run 1", buffer_size=16, log_dir=str(tmp_path))
+    event = asyncio.run(restarted.emit(ToolEventType.DONE, {}))
+    assert event.seq == 301
+    assert [e.seq for e in restarted.get_events_since(297)] == [298, 299, 300, 301]
+
+
+def test_event_stream_resumes_from_last_event_id_without_duplicates(tmp_path, monkeypatch):
+    monkeypatch.setattr(events_mod.settings, "event_log_dir", str(tmp_path), raising=False)
+    monkeypatch.setattr(events_mod.settings, "event_buffer_size", 8, raising=False)
+    thread_id = "t_resume_stream"
+    events_mod._emitters.pop(thread_id, None)
+
+    async def run():
+        emitter = await events_mod.get_emitter(thread_id)
+        for i in range(50):
+            await emitter.emit(ToolEventType.TOOL_PROGRESS, {"i": i})
+
+        seqs = []
+        async for frame in events_mod.event_stream_generator(thread_id, timeout=0.05, last_event_id="20"):
+            if frame.startswith("id:"):
+                seqs.append(json.loads(frame.split("data: ", 1)[1])["seq"])
+        await events_mod.remove_emitter(thread_id)
+        return seqs
+
+    assert asyncio.run(run()) == list(range(21, 51))
+
+
+def test_event_stream_follows_new_emitter_after_stale_last_event_id(monkeypatch):
+    monkeypatch.setattr(events_mod.settings, "event_log_dir", "", raising=False)
+    thread_id = "t_resume_restarted"
+    events_mod._emitters.pop(thread_id, None)
+
+    async def run():
+        first = await events_mod.get_emitter(thread_id)
+        for i in range(5):
+            await first.emit(ToolEventType.TOOL_PROGRESS, {"i": i})
+        await events_mod.remove_emitter(thread_id)
+
+        async def next_run():
+            emitter = await events_mod.get_emitter(thread_id)
+            await asyncio.sleep(0.01)
+            for i in range(3):
+                await emitter.emit(ToolEventType.TOOL_PROGRESS, {"i": i})
+            await emitter.emit_done()
+
+        producer = asyncio.create_task(next_run())
+        frames = []
+        async for frame in events_mod.event_stream_generator(thread_id, timeout=1.0, last_event_id="5"):
+            if frame.startswith("id:"):
+                frames.append(json.loads(frame.split("data: ", 1)[1]))
+        await producer
+        await events_mod.remove_emitter(thread_id)
+        return frames
+
+    frames = asyncio.run(run())
+    assert [f["seq"] for f in frames] == [1, 2, 3, 4]
+    assert [f["type"] for f in frames][-1] == "done"
+
+
+def test_large_ring_wraps_and_keeps_the_newest_events():
+    emitter = EventEmitter(thread_id=None, buffer_size=50_000, log_dir="")
+
+    async def run():
+        for i in range(60_000):
+            await emitter.emit(ToolEventType.TOOL_PROGRESS, {"i": i})
+
+    asyncio.run(run())
+    assert [e.seq for e in emitter.get_events_since(59_998)] == [59_999, 60_000]
+    assert emitter.get_events_since(0)[0].seq == 10_001
+
+
+def test_emit_leaves_durable_writes_to_the_writer_thread(tmp_path, monkeypatch):
+    emitter = EventEmitter(thread_id="t-writer", buffer_size=4, log_dir=str(tmp_path))
+    log = emitter._log
+    writer_threads = set()
+    original_append = log.append
+
+    def recording_append(record, *, encoded=None):
+        writer_threads.add(threading.current_thread().name)
+        return original_append(record, encoded=encoded)
+
+    monkeypatch.setattr(log, "append", recording_append)
+
+    async def run():
+        for i in range(20):
+            await emitter.emit(ToolEventType.TOOL_PROGRESS, {"i": i})
+        # Older than the ring: served from the durable log in a worker thread.
+        return await emitter.aget_events_since(2)
+
+    events = asyncio.run(run())
+    emitter.close()
+
+    assert writer_threads == {"event-log-writer"}
+    assert [e.seq for e in events] == list(range(3, 21))
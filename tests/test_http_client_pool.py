@@ -0,0 +1,106 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from common import http_client
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args, **kwargs):
+        return None
+
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def _reset_client():
+    http_client.close_http_session()
+    http_client.reset_http_client_stats()
+    yield
+    http_client.close_http_session()
+    http_client.reset_http_client_stats()
+
+
+def test_shared_session_reuses_keepalive_connections(local_server):
+    session = http_client.get_http_session()
+    assert http_client.get_http_session() is session
+
+    for _ in range(3):
+        resp = session.get(f"{local_server}/page", timeout=5)
+        assert resp.status_code == 200
+        assert resp.text == "ok"
+
+    stats = http_client.get_http_client_stats()
+    assert stats["requests"] == 3
+    assert stats["connections_created"] == 1
+    assert stats["connections_reused"] == 2
+    assert stats["pools_created"] == 1
+
+
+def test_session_rebuilt_when_pool_settings_change(monkeypatch):
+    first = http_client.get_http_session()
+    monkeypatch.setattr(http_client.settings, "http_pool_maxsize", 3, raising=False)
+    second = http_client.get_http_session()
+
+    assert second is not first
+    adapter = second.get_adapter("https://example.com")
+    assert adapter._pool_maxsize == 3
+
+
+class _SetCookieHandler(_KeepAliveHandler):
+    def do_GET(self):
+        body = (self.headers.get("Cookie") or "none").encode()
+        self.send_response(200)
+        self.send_header("Set-Cookie", "sid=user-a; Path=/")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def cookie_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SetCookieHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_shared_clients_do_not_keep_cookies_across_requests(cookie_server):
+    session = http_client.get_http_session()
+    assert session.get(f"{cookie_server}/login", timeout=5).text == "none"
+    assert session.get(f"{cookie_server}/page", timeout=5).text == "none"
+    assert len(session.cookies) == 0
+
+    client = http_client.build_async_http_client()
+    try:
+        await client.get(f"{cookie_server}/login")
+        assert (await client.get(f"{cookie_server}/page")).text == "none"
+        assert len(client.cookies) == 0
+    finally:
+        await client.aclose()
@@ -0,0 +1,147 @@
+import operator
+from typing import Annotated, List, TypedDict
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from langchain_core.tools import tool
+from langgraph.graph import END, START, StateGraph
+from prometheus_client import REGISTRY
+
+import main
+import tools.search.multi_search as multi_search_module
+from agent.core.search_cache import SearchCache
+from common.latency_metrics import GraphMetricsCallback, bind_thread_id
+from tools.core.registry import get_global_registry
+from tools.search.multi_search import (
+    MultiSearchOrchestrator,
+    SearchProvider,
+    SearchResult,
+    SearchStrategy,
+)
+
+
+def _count(name, **labels):
+    return REGISTRY.get_sample_value(f"{name}_count", labels) or 0.0
+
+
+def _series_with(name, key, value):
+    return [
+        s
+        for metric in REGISTRY.collect()
+        if metric.name == name
+        for s in metric.samples
+        if s.labels.get(key) == value
+    ]
+
+
+@pytest.mark.asyncio
+async def test_http_metrics_use_route_templates_with_thread_exemplars():
+    route = "/api/runs/{thread_id}"
+    before = _count("weaver_http_request_duration_seconds", method="GET", path=route)
+
+    transport = ASGITransport(app=main.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        for thread_id in ("thread_metrics_a", "thread_metrics_b"):
+            resp = await ac.get(f"/api/runs/{thread_id}")
+            assert resp.status_code == 404
+        missing = await ac.get("/no/such/path/123")
+        scraped = await ac.get("/metrics", headers={"Accept": "application/openmetrics-text"})
+
+    assert missing.status_code == 404
+    assert _count("weaver_http_request_duration_seconds", method="GET", path=route) == before + 2
+    assert _count("weaver_http_request_duration_seconds", method="GET", path="<unmatched>") >= 1
+    assert not _series_with("weaver_http_request_duration_seconds", "path", "/api/runs/thread_metrics_a")
+
+    assert scraped.headers["content-type"].startswith("application/openmetrics-text")
+    assert 'path="/api/runs/{thread_id}"' in scraped.text
+    assert '# {thread_id="thread_metrics_b"}' in scraped.text
+
+
+class _State(TypedDict, total=False):
+    query: str
+    notes: Annotated[List[str], operator.add]
+
+
+@tool
+def lookup_fact(query: str) -> str:
+    """Look up a fact."""
+    return f"fact about {query}"
+
+
+def test_graph_callback_times_nodes_and_tools():
+    def research(state):
+        return {"notes": [lookup_fact.invoke({"query": state["query"]})]}
+
+    graph = StateGraph(_State)
+    graph.add_node("research_step", research)
+    graph.add_edge(START, "research_step")
+    graph.add_edge("research_step", END)
+    compiled = graph.compile()
+
+    registry = get_global_registry()
+    registry.register("lookup_fact", lookup_fact, override=True)
+    node_before = _count("weaver_graph_node_duration_seconds", node="research_step", status="ok")
+    tool_before = _count("weaver_tool_duration_seconds", tool="lookup_fact", status="ok")
+    try:
+        config = {"configurable": {"thread_id": "thread_graph"}, "callbacks": [GraphMetricsCallback()]}
+        result = compiled.invoke({"query": "tides", "notes": []}, config=config)
+        metadata = registry.get_metadata("lookup_fact")
+        assert metadata.call_count == 1 and metadata.success_count == 1
+    finally:
+        registry.unregister("lookup_fact")
+
+    assert result["notes"] == ["fact about tides"]
+    assert (
+        _count("weaver_graph_node_duration_seconds", node="research_step", status="ok")
+        == node_before + 1
+    )
+    assert _count("weaver_tool_duration_seconds", tool="lookup_fact", status="ok") == tool_before + 1
+    exemplars = [
+        s.exemplar
+        for s in _series_with("weaver_graph_node_duration_seconds", "node", "research_step")
+        if s.exemplar
+    ]
+    assert exemplars and exemplars[0].labels == {"thread_id": "thread_graph"}
+
+
+class _Provider(SearchProvider):
+    def __init__(self, name, ok=True):
+        super().__init__(name)
+        self.ok = ok
+
+    def is_available(self):
+        return True
+
+    def search(self, query, max_results=10):
+        if not self.ok:
+            self.stats.record_failure("boom")
+            return []
+        return [SearchResult(title="t", url=f"https://{self.name}.example.com", snippet="s", provider=self.name)]
+
+
+def test_search_provider_latency_is_observed_from_worker_threads(monkeypatch):
+    cache = SearchCache(max_size=10, ttl_seconds=60.0, similarity_threshold=1.0)
+    monkeypatch.setattr(multi_search_module, "get_search_cache", lambda: cache)
+    orchestrator = MultiSearchOrchestrator(
+        providers=[_Provider("metrics_ok"), _Provider("metrics_down", ok=False)],
+        strategy=SearchStrategy.PARALLEL,
+    )
+    ok_before = _count("weaver_search_provider_duration_seconds", provider="metrics_ok", status="ok")
+
+    bind_thread_id("thread_search")
+    try:
+        orchestrator.search("latency query", max_results=3)
+    finally:
+        bind_thread_id(None)
+
+    assert (
+        _count("weaver_search_provider_duration_seconds", provider="metrics_ok", status="ok")
+        == ok_before + 1
+    )
+    assert _count("weaver_search_provider_duration_seconds", provider="metrics_down", status="error") >= 1
+    exemplars = [
+        s.exemplar
+        for s in _series_with("weaver_search_provider_duration_seconds", "provider", "metrics_ok")
+        if s.exemplar
+    ]
+    assert exemplars and exemplars[0].labels == {"thread_id": "thread_search"}
@@ -0,0 +1,73 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from prometheus_client import CollectorRegistry, generate_latest
+
+import common.loop_monitor as loop_monitor_mod
+import main
+from common.loop_monitor import LoopMonitor, LoopMonitorMetricsCollector
+
+
+async def _blocking_handler(thing_id: str):
+    time.sleep(0.3)
+    return {"id": thing_id}
+
+
+@pytest.mark.asyncio
+async def test_blocking_handler_is_reported_under_its_route(monkeypatch):
+    monitor = LoopMonitor(interval=0.02, slow_threshold=0.05, debug=True)
+    monitor.attach_routes([SimpleNamespace(endpoint=_blocking_handler, path="/api/things/{thing_id}")])
+    monkeypatch.setattr(loop_monitor_mod, "_monitor", monitor)
+
+    monitor.start()
+    try:
+        await asyncio.sleep(0.1)
+        await _blocking_handler("a")
+        await asyncio.sleep(0.2)
+    finally:
+        await monitor.stop()
+
+    report = monitor.report()
+    assert report["stalls"] == 1
+    worst = report["offenders"][0]
+    assert worst["route"] == "/api/things/{thing_id}"
+    assert worst["max_ms"] >= 200
+    assert any("time.sleep(0.3)" in line for line in worst["stack"])
+    assert report["lag"]["max_ms"] >= 200
+
+    registry = CollectorRegistry()
+    registry.register(LoopMonitorMetricsCollector())
+    text = generate_latest(registry).decode()
+    assert 'weaver_event_loop_lag_seconds_bucket{le="+Inf"}' in text
+    assert 'weaver_event_loop_stalls_total{route="/api/things/{thing_id}"} 1.0' in text
+
+
+@pytest.mark.asyncio
+async def test_offloaded_store_reads_do_not_stall_the_loop(monkeypatch):
+    monitor = LoopMonitor(interval=0.02, slow_threshold=0.05, debug=True)
+    monitor.attach_routes(main.app.routes)
+    monkeypatch.setattr(loop_monitor_mod, "_monitor", monitor)
+
+    def slow_profile(agent_id):
+        time.sleep(0.3)
+        return None
+
+    monkeypatch.setattr(main, "get_agent_profile", slow_profile)
+
+    transport = ASGITransport(app=main.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        monitor.start()
+        try:
+            missing = await ac.get("/api/agents/nope")
+            await asyncio.sleep(0.1)
+        finally:
+            await monitor.stop()
+        report = (await ac.get("/api/debug/loop", params={"limit": 5})).json()
+
+    assert missing.status_code == 404
+    assert report["stalls"] == 0
+    assert report["lag"]["samples"] > 0
+    assert report["lag"]["max_ms"] < 200
@@ -0,0 +1,137 @@
+import threading
+import time
+
+import pytest
+
+import tools.search.multi_search as multi_search_module
+from agent.core.search_cache import SearchCache
+from tools.search.multi_search import (
+    MultiSearchOrchestrator,
+    ProviderStats,
+    SearchProvider,
+    SearchResult,
+    SearchStrategy,
+)
+
+
+class _TimedProvider(SearchProvider):
+    def __init__(self, name: str, delay_s: float, *, history_ms: float, results: bool = True):
+        super().__init__(name)
+        self.delay_s = delay_s
+        self.results = results
+        self.calls = 0
+        self.finished = threading.Event()
+        for _ in range(10):
+            self.stats.record_success(history_ms, 0.8)
+
+    def is_available(self) -> bool:
+        return True
+
+    def search(self, query: str, max_results: int = 10):
+        self.calls += 1
+        time.sleep(self.delay_s)
+        self.finished.set()
+        if not self.results:
+            return []
+        return [
+            SearchResult(
+                title=f"{self.name} result",
+                url=f"https://{self.name}.example.com/{query.replace(' ', '-')}",
+                snippet="ok",
+                score=0.7,
+                provider=self.name,
+            )
+        ]
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(monkeypatch):
+    cache = SearchCache(max_size=10, ttl_seconds=60.0, similarity_threshold=1.0)
+    monkeypatch.setattr(multi_search_module, "get_search_cache", lambda: cache)
+
+
+def _orchestrator(*providers):
+    orchestrator = MultiSearchOrchestrator(
+        providers=list(providers), strategy=SearchStrategy.HEDGED
+    )
+    orchestrator.hedge_min_delay_ms = 10.0
+    return orchestrator
+
+
+def test_p90_latency_needs_enough_samples():
+    stats = ProviderStats(name="p")
+    for ms in (100, 200, 300, 400):
+        stats.record_success(ms, 0.5)
+    assert stats.p90_latency_ms is None
+
+    for ms in range(500, 1100, 100):
+        stats.record_success(ms, 0.5)
+    assert stats.p90_latency_ms == 900
+
+
+def test_slow_primary_is_hedged_and_backup_wins():
+    # Primary ranks first (faster history) but hangs well past its 50ms p90.
+    primary = _TimedProvider("primary", 1.0, history_ms=50.0)
+    backup = _TimedProvider("backup", 0.05, history_ms=300.0)
+    orchestrator = _orchestrator(backup, primary)
+
+    start = time.monotonic()
+    results = orchestrator.search("hedged query", max_results=3)
+    elapsed = time.monotonic() - start
+
+    assert results and results[0].provider == "backup"
+    assert elapsed < 0.5
+    assert primary.calls == 1 and backup.calls == 1
+    assert orchestrator.hedge_stats == {"calls": 1, "hedges": 1, "backup_wins": 1}
+
+
+def test_fast_primary_does_not_hedge():
+    primary = _TimedProvider("primary", 0.01, history_ms=200.0)
+    backup = _TimedProvider("backup", 0.01, history_ms=900.0)
+    orchestrator = _orchestrator(primary, backup)
+
+    results = orchestrator.search("quick query", max_results=3)
+
+    assert results[0].provider == "primary"
+    assert backup.calls == 0
+    assert orchestrator.hedge_stats["hedges"] == 0
+
+
+def test_empty_primary_fails_over_without_waiting_for_p90():
+    primary = _TimedProvider("primary", 0.01, history_ms=50.0, results=False)
+    backup = _TimedProvider("backup", 0.01, history_ms=5000.0)
+    orchestrator = _orchestrator(primary, backup)
+    orchestrator.hedge_min_delay_ms = 2000.0
+
+    start = time.monotonic()
+    results = orchestrator.search("empty first", max_results=3)
+
+    assert results[0].provider == "backup"
+    assert time.monotonic() - start < 1.0
+    assert orchestrator.hedge_stats["hedges"] == 0
+
+
+def test_spent_deadline_returns_without_calling_providers():
+    primary = _TimedProvider("primary", 0.0, history_ms=50.0)
+    orchestrator = _orchestrator(primary)
+
+    assert orchestrator.search("no budget left", max_results=3, deadline_s=0) == []
+    assert orchestrator.search("no budget left", max_results=3, deadline_s=-1.5) == []
+    assert primary.calls == 0
+
+
+def test_deadline_bounds_the_call():
+    primary = _TimedProvider("primary", 1.0, history_ms=50.0)
+    backup = _TimedProvider("backup", 1.0, history_ms=300.0)
+    orchestrator = _orchestrator(primary, backup)
+
+    start = time.monotonic()
+    results = orchestrator.search("budgeted query", max_results=3, deadline_s=0.2)
+    elapsed = time.monotonic() - start
+
+    assert results == []
+    assert elapsed < 0.6
+    # The hedge still fired inside the budget.
+    assert backup.calls == 1
+    primary.finished.wait(2.0)
+    backup.finished.wait(2.0)
@@ -0,0 +1,53 @@
+import pytest
+
+import common.near_duplicates as near_duplicates
+from common.near_duplicates import NearDuplicateIndex
+from scripts.benchmark_near_duplicates import run_benchmark
+from tools.search.multi_search import MultiSearchOrchestrator, SearchResult
+
+BASE = (
+    "Nvidia unveiled its next generation of data center accelerators on Tuesday, "
+    "promising twice the inference throughput of the previous parts."
+)
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "pure-python"])
+def backend(request, monkeypatch):
+    if request.param and not near_duplicates.NUMPY_AVAILABLE:
+        pytest.skip("numpy not installed")
+    monkeypatch.setattr(near_duplicates, "NUMPY_AVAILABLE", request.param)
+
+
+def test_index_finds_near_copies_but_not_unrelated_text(backend):
+    index = NearDuplicateIndex(0.7)
+    index.add(index.signature(BASE))
+    index.add(index.signature("A recipe for slow-cooked tomato sauce with fresh basil."))
+
+    assert index.find(index.signature(BASE.replace("Tuesday", "Wednesday"))) == 0
+    assert index.find(index.signature("Quarterly earnings beat analyst estimates.")) is None
+
+    index.replace(0, index.signature("Completely different replacement text."))
+    assert index.find(index.signature(BASE)) is None
+    assert len(index) == 2
+
+
+def test_deduplicate_and_rank_keeps_the_higher_scored_copy(backend):
+    orchestrator = MultiSearchOrchestrator(providers=[])
+    results = [
+        SearchResult(title="a", url="https://a.example.com/1", snippet=BASE, score=0.4),
+        SearchResult(
+            title="b", url="https://b.example.com/2", snippet=BASE + " Shares rose.", score=0.9
+        ),
+        SearchResult(title="c", url="https://c.example.com/3", snippet="Unrelated.", score=0.5),
+    ]
+
+    ranked = orchestrator._deduplicate_and_rank(results, max_results=2, query="chips")
+
+    assert [r.title for r in ranked] == ["b", "c"]
+
+
+def test_benchmark_minhash_matches_distinct_articles():
+    report = run_benchmark(n=60, repeat=1, include_legacy=False)
+
+    assert report["multi_search"]["minhash"]["kept"] == report["distinct_articles"]
+    assert report["aggregator"]["minhash"]["kept"] == report["distinct_articles"]
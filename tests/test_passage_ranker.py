@@ -0,0 +1,52 @@
+from agent.workflows import deepsearch_optimized
+from agent.workflows.passage_ranker import BM25PassageIndex, select_top_passages, tokenize
+
+
+def test_tokenize_handles_latin_words_and_cjk_bigrams():
+    assert tokenize("The Battery market in 2025") == ["battery", "market", "2025"]
+    assert tokenize("固态电池") == ["固态", "态电", "电池"]
+
+
+def test_bm25_prefers_passages_matching_the_query():
+    passages = [
+        {"url": "u1", "text": "Cookie policy and site navigation links."},
+        {"url": "u2", "text": "Solid-state battery energy density reached 500 Wh/kg in 2025."},
+        {"url": "u3", "text": "A history of the company's founders and offices."},
+    ]
+    scores = BM25PassageIndex(passages).score_queries(["solid-state battery density", "固态电池"])
+
+    assert scores[1] > 0
+    assert scores[1] == max(scores)
+    assert scores[0] == 0
+
+
+def test_select_top_passages_uses_global_budget_and_keeps_order():
+    relevant = "Solid-state battery energy density improved sharply."
+    passages = [
+        {"url": "long", "text": f"Filler paragraph number {i} about the weather."} for i in range(8)
+    ]
+    passages.insert(5, {"url": "long", "text": relevant})
+    passages.append({"url": "short", "text": "Battery density numbers from a second source."})
+
+    selected = select_top_passages(passages, ["solid-state battery density"], top_k=2)
+
+    assert [p["text"] for p in selected] == [relevant, passages[-1]["text"]]
+
+
+def test_rank_evidence_passages_respects_top_k_setting(monkeypatch):
+    monkeypatch.setattr(
+        deepsearch_optimized.settings, "deepsearch_evidence_passages_top_k", 1, raising=False
+    )
+    passages = [
+        {"url": "a", "text": "Unrelated. Text. Here."},
+        {"url": "b", "text": "Quantum error correction milestones."},
+    ]
+
+    ranked = deepsearch_optimized._rank_evidence_passages(passages, ["quantum error correction"])
+
+    assert [p["url"] for p in ranked] == ["b"]
+
+    monkeypatch.setattr(
+        deepsearch_optimized.settings, "deepsearch_evidence_passages_top_k", 0, raising=False
+    )
+    assert deepsearch_optimized._rank_evidence_passages(passages, ["x"]) == passages
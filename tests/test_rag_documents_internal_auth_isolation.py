@@ -16,6 +16,10 @@ def add_document(self, *, content: bytes, filename: str):
         self.added.append((filename, content))
         return {"success": True, "chunks": 1}
 
+    def ingest_file(self, path: str, filename: str, **_kwargs):
+        with open(path, "rb") as fh:
+            return self.add_document(content=fh.read(), filename=filename)
+
     def list_documents(self, *, limit: int = 100):
         return []
 
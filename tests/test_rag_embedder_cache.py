@@ -0,0 +1,141 @@
+import threading
+import types
+
+import pytest
+
+from tools.rag import embedder as embedder_mod
+from tools.rag.embedder import Embedder, EmbeddingError
+from tools.rag.embedding_cache import EmbeddingCache
+
+
+class _FakeEmbeddings:
+    def __init__(self, fail_times: int = 0):
+        self.calls = []
+        self.fail_times = fail_times
+        self._lock = threading.Lock()
+
+    def create(self, *, model, input, dimensions=None):
+        with self._lock:
+            self.calls.append(list(input))
+            if self.fail_times > 0:
+                self.fail_times -= 1
+                raise RuntimeError("rate limited")
+        data = [types.SimpleNamespace(embedding=[float(len(t)), 0.5, -1.0]) for t in input]
+        return types.SimpleNamespace(data=data)
+
+
+@pytest.fixture
+def make_embedder(monkeypatch, tmp_path):
+    monkeypatch.setattr(embedder_mod.time, "sleep", lambda _s: None)
+
+    def _make(fake, *, batch_size=2, max_retries=2):
+        cache = EmbeddingCache(tmp_path / "embeddings.sqlite3")
+        emb = Embedder(api_key="test-key", cache=cache)
+        emb.client = types.SimpleNamespace(embeddings=fake)
+        emb.batch_size = batch_size
+        emb.max_retries = max_retries
+        return emb
+
+    return _make
+
+
+def test_reembedding_unchanged_texts_costs_no_api_calls(make_embedder):
+    fake = _FakeEmbeddings()
+    emb = make_embedder(fake)
+    texts = ["alpha", "beta", "gamma", "alpha", "delta"]
+
+    first, stats = emb.embed_with_stats(texts)
+    assert len(fake.calls) == 2  # 4 distinct texts, batch size 2
+    assert first[0] == first[3] == [5.0, 0.5, -1.0]
+    assert stats["embedded"] == 4
+
+    fake.calls.clear()
+    again = Embedder(api_key="test-key", cache=emb.cache)
+    again.client = emb.client
+    vectors, stats = again.embed_with_stats(texts)
+    assert vectors == first
+    assert fake.calls == []
+    assert stats["hit_rate"] == 1.0
+    assert emb.cache.stats()["entries"] == 4
+
+
+def test_failed_batches_are_retried(make_embedder):
+    fake = _FakeEmbeddings(fail_times=1)
+    emb = make_embedder(fake, batch_size=10)
+
+    vectors = emb.embed(["one", "two"])
+
+    assert len(fake.calls) == 2
+    assert vectors == [[3.0, 0.5, -1.0], [3.0, 0.5, -1.0]]
+
+
+def test_exhausted_retries_raise_instead_of_zero_vectors(make_embedder):
+    fake = _FakeEmbeddings(fail_times=10)
+    emb = make_embedder(fake, batch_size=10, max_retries=1)
+
+    with pytest.raises(EmbeddingError):
+        emb.embed(["one", "two"])
+    assert emb.cache.stats()["entries"] == 0
+
+
+def test_cache_is_scoped_to_the_embeddings_endpoint(make_embedder):
+    fake = _FakeEmbeddings()
+    emb = make_embedder(fake)
+    emb.embed(["alpha", "beta"])
+
+    other = Embedder(api_key="test-key", base_url="http://local-llm:8000/v1", cache=emb.cache)
+    other.client = types.SimpleNamespace(embeddings=fake)
+    fake.calls.clear()
+    other.embed(["alpha", "beta"])
+
+    assert other.endpoint != emb.endpoint
+    assert fake.calls == [["alpha", "beta"]]
+    assert emb.cache.stats()["entries"] == 4
+
+
+def test_cache_file_without_endpoint_column_is_rebuilt(tmp_path):
+    import sqlite3
+
+    path = tmp_path / "legacy.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE embeddings (model TEXT, dimensions INTEGER, text_hash TEXT, "
+        "vector BLOB, created_at REAL, PRIMARY KEY (model, dimensions, text_hash))"
+    )
+    conn.execute("INSERT INTO embeddings VALUES ('m', 0, 'h', x'00000000', 0)")
+    conn.commit()
+    conn.close()
+
+    cache = EmbeddingCache(path)
+    assert cache.stats()["entries"] == 0
+    cache.put_many("m", None, [("h", [1.0])], endpoint="https://api.openai.com/v1")
+    assert cache.get_many("m", None, ["h"], endpoint="https://api.openai.com/v1") == {"h": [1.0]}
+    assert cache.get_many("m", None, ["h"], endpoint="http://other/v1") == {}
+
+
+def test_queries_are_read_from_but_not_added_to_the_cache(make_embedder):
+    fake = _FakeEmbeddings()
+    emb = make_embedder(fake)
+    emb.embed(["stored chunk"])
+
+    emb.embed_query("one-off question")
+    fake.calls.clear()
+    assert emb.embed_query("stored chunk") == [12.0, 0.5, -1.0]
+
+    assert fake.calls == []
+    assert emb.cache.stats()["entries"] == 1
+
+
+def test_cache_evicts_least_recently_used_beyond_max_entries(tmp_path):
+    cache = EmbeddingCache(tmp_path / "bounded.sqlite3", max_entries=10)
+    cache.put_many("m", None, [(f"h{i}", [float(i)]) for i in range(10)])
+    cache._conn.execute("UPDATE embeddings SET accessed_at = 0")
+    assert cache.get_many("m", None, ["h0"]) == {"h0": [0.0]}
+
+    cache.put_many("m", None, [("h10", [10.0])])
+
+    stats = cache.stats()
+    assert stats["entries"] == 9
+    assert stats["evictions"] == 2
+    kept = cache.get_many("m", None, [f"h{i}" for i in range(11)])
+    assert {"h0", "h10"} <= set(kept)
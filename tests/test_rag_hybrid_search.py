@@ -0,0 +1,164 @@
+import random
+import re
+import zlib
+
+import numpy as np
+import pytest
+
+from common.config import settings
+from tools.rag import rag_tool as rag_tool_mod
+from tools.rag.lexical_index import LexicalIndex, reciprocal_rank_fusion, tokenize
+
+_TOPICS = {
+    "battery": "battery cell anode cathode electrolyte charge capacity thermal",
+    "network": "network router packet latency bandwidth switch firewall gateway",
+    "billing": "billing invoice payment refund subscription ledger tax currency",
+    "storage": "storage disk volume snapshot replica backup archive retention",
+    "auth": "auth login token session password identity oauth permission",
+}
+
+
+class _WordEmbedder:
+    """Bag-of-words random projection that ignores digit-bearing tokens (like a dense model missing ids)."""
+
+    def __init__(self, model=None, **_kwargs):
+        self.model = model
+
+    @staticmethod
+    def _vector(text):
+        total = np.zeros(64, dtype=np.float32)
+        for word in re.findall(r"[a-z]+(?:[-_][a-z0-9]+)*", text.lower()):
+            if any(ch.isdigit() for ch in word):
+                continue
+            total += np.random.default_rng(zlib.crc32(word.encode())).standard_normal(64).astype(np.float32)
+        return total.tolist()
+
+    def embed_documents(self, texts):
+        return [self._vector(t) for t in texts]
+
+    def embed_with_stats(self, texts):
+        return self.embed_documents(texts), {"embedded": len(texts), "cache_hits": 0}
+
+    def embed_query(self, text):
+        return self._vector(text)
+
+
+@pytest.fixture
+def make_rag(monkeypatch, tmp_path):
+    monkeypatch.setattr(rag_tool_mod, "Embedder", _WordEmbedder)
+    monkeypatch.setattr(settings, "rag_vector_backend", "local", raising=False)
+    monkeypatch.setattr(settings, "rag_hybrid_enabled", True, raising=False)
+
+    def _make(name="docs"):
+        return rag_tool_mod.RAGTool(collection_name=name, persist_directory=str(tmp_path), chunk_size=220, chunk_overlap=0)
+
+    return _make
+
+
+def _corpus(n_docs=40, chunks_per_doc=25, seed=11):
+    rng = random.Random(seed)
+    docs, chunks = {}, []
+    for d in range(n_docs):
+        paragraphs = []
+        for c in range(chunks_per_doc):
+            topic = rng.choice(list(_TOPICS))
+            words = " ".join(rng.choices(_TOPICS[topic].split(), k=12))
+            ident = f"PN-{d:03d}{c:02d}"
+            paragraphs.append(f"The {topic} component {ident} covers {words}.")
+            chunks.append((topic, ident))
+        docs[f"manual_{d}.txt"] = "\n\n".join(paragraphs)
+    return docs, chunks
+
+
+def test_tokenize_keeps_identifiers_whole():
+    tokens = tokenize("Error ERR-4021 in parse_config (v2.3.1)")
+    assert {"err-4021", "parse_config", "v2.3.1", "err", "4021", "parse", "config"} <= set(tokens)
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "a", "d"]], k=60)
+    assert [item for item, _s in fused] == ["a", "c", "b", "d"]
+
+
+def test_lexical_index_is_incremental_and_persistent(tmp_path):
+    path = tmp_path / "lex.sqlite3"
+    index = LexicalIndex(path)
+    index.add(["c1", "c2"], ["reset code ERR-4021 fixed", "router latency notes"], ["a.md", "b.md"])
+    index.add(["c3"], ["ERR-4021 again and again"], ["b.md"])
+
+    assert {cid for cid, _s in index.search("ERR-4021")} == {"c1", "c3"}
+    assert [cid for cid, _s in index.search("err-4021", source="a.md")] == ["c1"]
+
+    assert index.delete(source="b.md") == 2
+    index.close()
+
+    reopened = LexicalIndex(path)
+    assert reopened.count() == 1
+    assert [cid for cid, _s in reopened.search("ERR-4021 latency")] == ["c1"]
+
+
+def test_hybrid_search_finds_identifiers_dense_misses(make_rag, monkeypatch):
+    rag = make_rag()
+    docs, chunks = _corpus()
+    for filename, text in docs.items():
+        assert rag.add_document(content=text.encode(), filename=filename)["success"]
+    assert rag.count() == len(chunks) == rag.lexical_index.count()
+
+    rng = random.Random(5)
+    sample = rng.sample(chunks, 60)
+    id_queries = [(f"which part is {ident}", ident) for _t, ident in sample]
+    topic_queries = [(" ".join(_TOPICS[t].split()[:4]), t) for t in _TOPICS]
+
+    def evaluate():
+        id_hits = sum(any(ident in r["content"] for r in rag.search(q, n_results=5)) for q, ident in id_queries)
+        topic_precision = sum(
+            sum(f"The {t} component" in r["content"] for r in rag.search(q, n_results=5)) / 5
+            for q, t in topic_queries
+        )
+        return id_hits / len(id_queries), topic_precision / len(topic_queries)
+
+    hybrid = evaluate()
+    monkeypatch.setattr(settings, "rag_hybrid_enabled", False, raising=False)
+    dense = evaluate()
+
+    assert hybrid[0] >= 0.95
+    assert hybrid[0] > dense[0]
+    assert hybrid[1] >= 0.8
+
+
+def test_delete_document_removes_lexical_entries_and_reopen_backfills(make_rag):
+    rag = make_rag("notes")
+    rag.add_document(content=b"Gateway PN-77 handles oauth tokens.", filename="a.md")
+    rag.add_document(content=b"Snapshot retention for PN-88 volumes.", filename="b.md")
+
+    assert rag.delete_document("a.md")["success"]
+    assert rag.lexical_index.count() == 1
+    assert all("PN-77" not in r["content"] for r in rag.search("PN-77", n_results=3))
+
+    rag.lexical_index.clear()
+    rag.vector_store.backend.index.wait_for_compaction(timeout=10)
+    reopened = make_rag("notes")
+    # The backfill runs in the background; opening the tool does not wait for it.
+    assert reopened.lexical_backfill is not None
+    reopened.lexical_backfill.join(timeout=10)
+    assert reopened.lexical_index.count() == 1
+    assert reopened.search("PN-88", n_results=1)[0]["filename"] == "b.md"
+
+
+def test_vector_store_iterates_chunks_in_bulk_batches(make_rag, monkeypatch):
+    rag = make_rag("bulk")
+    docs, _chunks = _corpus(n_docs=4, chunks_per_doc=5)
+    for filename, text in docs.items():
+        rag.add_document(content=text.encode(), filename=filename)
+
+    def no_single_gets(doc_id):
+        raise AssertionError("iter_documents must not fetch chunks one by one")
+
+    monkeypatch.setattr(rag.vector_store.backend, "get", no_single_gets)
+    batches = list(rag.vector_store.iter_documents(batch_size=7))
+
+    assert [len(b) for b in batches] == [7, 7, 6]
+    assert sorted(d.chunk_id for b in batches for d in b) == sorted(
+        d["id"] for d in rag.vector_store.list_documents(limit=100)
+    )
+    assert all(d.content for b in batches for d in b)
@@ -0,0 +1,172 @@
+import asyncio
+import io
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+import main
+from common.config import settings
+from tools.rag import ingestion as ingestion_mod
+from tools.rag import rag_tool as rag_tool_mod
+
+
+class _FakeEmbedder:
+    def __init__(self, model=None, fail_on_call=None, **_kwargs):
+        self.calls = 0
+        self.fail_on_call = fail_on_call
+
+    def embed_with_stats(self, texts):
+        self.calls += 1
+        if self.fail_on_call == self.calls:
+            raise RuntimeError("embedding API down")
+        vectors = [[float(len(t) % 7) + 1.0, 1.0, float(i % 3)] for i, t in enumerate(texts)]
+        return vectors, {"embedded": len(texts), "cache_hits": 0}
+
+    def embed_query(self, text):
+        return [1.0, 1.0, 0.0]
+
+
+def _write_pdf(path, pages=20):
+    doc = fitz.open()
+    for n in range(pages):
+        page = doc.new_page()
+        body = "\n".join(f"Section {n}.{i}: the gateway PN-{n:02d}{i} routes packets." for i in range(12))
+        page.insert_text((40, 60), body, fontsize=9)
+    doc.save(str(path))
+    doc.close()
+
+
+@pytest.fixture
+def rag(monkeypatch, tmp_path):
+    monkeypatch.setattr(rag_tool_mod, "Embedder", _FakeEmbedder)
+    monkeypatch.setattr(settings, "rag_vector_backend", "local", raising=False)
+    return rag_tool_mod.RAGTool(collection_name="jobs", persist_directory=str(tmp_path / "store"), chunk_size=400, chunk_overlap=50)
+
+
+def test_ingest_pdf_streams_pages_in_parallel_and_matches_add_document(rag, tmp_path):
+    pdf = tmp_path / "manual.pdf"
+    _write_pdf(pdf)
+    updates = []
+
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        result = rag.ingest_file(str(pdf), "manual.pdf", progress=updates.append, executor=pool, pages_per_task=4, flush_chunks=10)
+
+    expected = rag.loader.load(pdf)
+    assert result["success"]
+    assert result["chunks"] == len(expected) == rag.count()
+    stored = sorted(rag.vector_store.get_document(i).content for i in result["ids"])
+    assert stored == sorted(d.content for d in expected)
+
+    pages = [u["pages_done"] for u in updates]
+    assert pages == sorted(pages)
+    assert updates[0]["pages_total"] == 20
+    assert updates[-1]["stage"] == "done" and updates[-1]["pages_done"] == 20
+    assert any(u["stage"] == "embedding" for u in updates)
+    assert len({u["chunks"] for u in updates}) > 2  # chunks were stored while parsing continued
+
+
+def test_parse_pool_spawns_workers_instead_of_forking(rag, tmp_path):
+    jobs = ingestion_mod.IngestionQueue(spool_dir=tmp_path / "spool", parse_processes=2)
+    pdf = tmp_path / "manual.pdf"
+    _write_pdf(pdf)
+    try:
+        pool = jobs._parse_pool()
+        assert pool._mp_context.get_start_method() == "spawn"
+        result = rag.ingest_file(str(pdf), "manual.pdf", executor=pool, pages_per_task=4)
+    finally:
+        jobs.shutdown(wait=True)
+
+    assert result["success"]
+    assert result["chunks"] == len(rag.loader.load(pdf))
+
+
+def test_failed_ingest_removes_partially_stored_chunks(rag, tmp_path):
+    pdf = tmp_path / "manual.pdf"
+    _write_pdf(pdf, pages=6)
+    rag.embedder.fail_on_call = 2
+
+    with pytest.raises(RuntimeError):
+        rag.ingest_file(str(pdf), "manual.pdf", flush_chunks=5)
+
+    assert rag.count() == 0
+    assert rag.lexical_index.count() == 0
+
+
+class _JobRag:
+    def ingest_file(self, path, filename, *, progress=None, **_kwargs):
+        with open(path, "rb") as fh:
+            size = len(fh.read())
+        for page in range(1, 4):
+            progress({"stage": "parsing", "pages_done": page, "pages_total": 3, "chunks": page})
+        return {"success": True, "source": filename, "chunks": 3, "ids": ["a"], "embedding": {"embedded": size}}
+
+
+@pytest.fixture
+def job_api(monkeypatch, tmp_path):
+    monkeypatch.setitem(main.settings.__dict__, "internal_api_key", "test-key")
+    monkeypatch.setitem(main.settings.__dict__, "auth_user_header", "X-Weaver-User")
+    monkeypatch.setitem(main.settings.__dict__, "rag_enabled", True)
+    monkeypatch.setitem(main.settings.__dict__, "rag_ingest_spool_dir", str(tmp_path / "spool"))
+    monkeypatch.setitem(main.settings.__dict__, "rag_ingest_parse_processes", 0)
+    ingestion_mod.shutdown_ingestion_queue()
+    monkeypatch.setattr(rag_tool_mod, "get_rag_tool", lambda *, collection_name=None: _JobRag())
+    yield tmp_path / "spool"
+    ingestion_mod.shutdown_ingestion_queue()
+
+
+def _headers(user):
+    return {"Authorization": "Bearer test-key", "X-Weaver-User": user}
+
+
+@pytest.mark.asyncio
+async def test_upload_returns_job_and_exposes_progress(job_api):
+    transport = ASGITransport(app=main.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        resp = await ac.post(
+            "/api/documents/upload",
+            headers=_headers("alice"),
+            files={"file": ("notes.md", b"# hello\n" * 10, "text/markdown")},
+        )
+        assert resp.status_code == 200
+        job_id = resp.json()["job_id"]
+
+        for _ in range(100):
+            status = (await ac.get(f"/api/documents/jobs/{job_id}", headers=_headers("alice"))).json()
+            if status["status"] == "completed":
+                break
+            await asyncio.sleep(0.02)
+        assert status["status"] == "completed"
+        assert status["chunks"] == 3 and status["progress"] == 1.0
+        assert status["embedding"] == {"embedded": 80}
+        assert list(job_api.iterdir()) == []  # spool file removed
+
+        other = await ac.get(f"/api/documents/jobs/{job_id}", headers=_headers("bob"))
+        assert other.status_code == 404
+
+        events = []
+        async with ac.stream("GET", f"/api/documents/jobs/{job_id}/events", headers=_headers("alice")) as stream:
+            async for line in stream.aiter_lines():
+                if line.startswith("event:"):
+                    events.append(line.split(":", 1)[1].strip())
+                elif line.startswith("data:") and events[-1] == "completed":
+                    assert json.loads(line[5:])["job_id"] == job_id
+        assert events == ["completed", "done"]
+
+        waited = await ac.post(
+            "/api/documents/upload?wait=true",
+            headers=_headers("alice"),
+            files={"file": ("more.txt", b"x" * 5, "text/plain")},
+        )
+        assert waited.json()["chunks"] == 3
+
+
+@pytest.mark.asyncio
+async def test_upload_rejects_oversized_files_while_spooling(job_api, monkeypatch):
+    monkeypatch.setattr(ingestion_mod, "_COPY_BUFFER", 4)
+    queue = ingestion_mod.get_ingestion_queue()
+    with pytest.raises(ingestion_mod.UploadTooLargeError):
+        queue.spool(io.BytesIO(b"0123456789"), "a.txt", max_bytes=8)
+    assert list(job_api.iterdir()) == []
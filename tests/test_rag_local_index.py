@@ -0,0 +1,164 @@
+import numpy as np
+import pytest
+
+from tools.rag.document_loader import Document
+from tools.rag.local_index import LocalVectorIndex, matches_where
+from tools.rag.vector_store import VectorStore
+
+
+def _unit(rng, n, dim=32):
+    vectors = rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _add(index, vectors, prefix="d", metadata=None):
+    ids = [f"{prefix}{i}" for i in range(len(vectors))]
+    index.add(
+        ids,
+        vectors.tolist(),
+        [f"text {i}" for i in range(len(vectors))],
+        [dict(metadata or {}, n=i) for i in range(len(vectors))],
+    )
+    return ids
+
+
+def test_search_matches_brute_force_and_persists(tmp_path):
+    rng = np.random.default_rng(0)
+    vectors = _unit(rng, 300)
+    index = LocalVectorIndex(tmp_path / "c", background_compaction=False)
+    _add(index, vectors[:150])
+    _add(index, vectors[150:], prefix="e")
+
+    query = vectors[42] + 0.05 * rng.standard_normal(32).astype(np.float32)
+    hits = index.search(query, n_results=5)
+    expected = np.argsort(-(vectors @ (query / np.linalg.norm(query))))[:5]
+
+    assert hits[0][0] == "d42"
+    assert len(hits) == 5
+    assert [h[3] for h in hits] == sorted((h[3] for h in hits), reverse=True)
+    assert {int(h[0][1:]) + (150 if h[0][0] == "e" else 0) for h in hits} == set(expected.tolist())
+
+    reopened = LocalVectorIndex(tmp_path / "c")
+    assert reopened.count() == 300
+    assert isinstance(reopened._segments[0].vectors, np.memmap)
+    assert [h[0] for h in reopened.search(query, n_results=5)] == [h[0] for h in hits]
+
+
+def test_upsert_delete_and_filter(tmp_path):
+    rng = np.random.default_rng(1)
+    vectors = _unit(rng, 10)
+    index = LocalVectorIndex(tmp_path / "c", background_compaction=False, compact_dead_ratio=1.0)
+    index.add(
+        [f"d{i}" for i in range(10)],
+        vectors.tolist(),
+        [f"t{i}" for i in range(10)],
+        [{"doc_id": "a" if i < 5 else "b", "n": i} for i in range(10)],
+    )
+
+    index.add(["d0"], [vectors[9].tolist()], ["replaced"], [{"doc_id": "a", "n": 0}])
+    assert index.count() == 10
+    assert index.get("d0")[0] == "replaced"
+
+    hits = index.search(vectors[9], n_results=3, where={"doc_id": "a"})
+    assert hits[0][0] == "d0"
+    assert all(h[2]["doc_id"] == "a" for h in hits)
+
+    assert index.delete(where={"doc_id": "b"}) == 5
+    assert index.delete(ids=["d1", "missing"]) == 1
+    assert index.count() == 4
+
+    reopened = LocalVectorIndex(tmp_path / "c")
+    assert sorted(i for i, _m in reopened.list(limit=100)) == ["d0", "d2", "d3", "d4"]
+
+
+def test_reload_tombstones_duplicates_left_by_an_interrupted_upsert(tmp_path):
+    rng = np.random.default_rng(3)
+    vectors = _unit(rng, 2)
+    index = LocalVectorIndex(tmp_path / "c", background_compaction=False, compact_dead_ratio=1.0)
+    index.add(["a"], [vectors[0].tolist()], ["old"], [{}])
+    index.add(["a"], [vectors[1].tolist()], ["new"], [{}])
+    # Simulate a crash after the new segment was published but before the old row was tombstoned.
+    (tmp_path / "c" / "tombstones.jsonl").write_text("", encoding="utf-8")
+
+    reopened = LocalVectorIndex(tmp_path / "c", background_compaction=False, compact_dead_ratio=1.0)
+    hits = reopened.search(vectors[0], n_results=5)
+
+    assert [(h[0], h[1]) for h in hits] == [("a", "new")]
+    assert reopened.count() == 1
+    again = LocalVectorIndex(tmp_path / "c", background_compaction=False, compact_dead_ratio=1.0)
+    assert not again._segments[0].alive[0]
+
+
+def test_where_operators():
+    meta = {"doc_id": "a", "page": 3}
+    assert matches_where(meta, {"$and": [{"doc_id": {"$in": ["a", "b"]}}, {"page": {"$gte": 2}}]})
+    assert matches_where(meta, {"$or": [{"doc_id": "z"}, {"page": {"$lt": 4}}]})
+    assert not matches_where(meta, {"doc_id": {"$ne": "a"}})
+    with pytest.raises(ValueError):
+        matches_where(meta, {"page": {"$regex": "x"}})
+
+
+def test_background_compaction_merges_segments_and_keeps_concurrent_deletes(tmp_path):
+    rng = np.random.default_rng(2)
+    index = LocalVectorIndex(tmp_path / "c", compact_segments=3)
+    all_vectors = []
+    for seg in range(5):
+        vectors = _unit(rng, 20)
+        all_vectors.append(vectors)
+        _add(index, vectors, prefix=f"s{seg}-")
+    index.delete(ids=["s0-3"])
+    index.wait_for_compaction(timeout=10)
+    index.compact()
+
+    assert len(index._segments) == 1
+    assert index.count() == 99
+    assert index.get("s0-3") is None
+    assert index.search(all_vectors[4][7], n_results=1)[0][0] == "s4-7"
+
+    files = sorted(p.name for p in (tmp_path / "c").glob("seg-*.npy"))
+    assert files == [f"{index._segments[0].name}.npy"]
+    assert LocalVectorIndex(tmp_path / "c").count() == 99
+
+
+def test_ivf_segment_recall(tmp_path):
+    rng = np.random.default_rng(3)
+    n, dim = 20_000, 64
+    centers = _unit(rng, 200, dim)
+    vectors = centers[rng.integers(0, 200, n)] + 0.05 * rng.standard_normal((n, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    index = LocalVectorIndex(tmp_path / "c", ivf_threshold=10_000, nprobe=12, background_compaction=False)
+    _add(index, vectors)
+    index.compact()
+    assert index._segments[0].ivf is not None
+
+    queries = vectors[rng.choice(n, 50, replace=False)]
+    recall = 0.0
+    for q in queries:
+        got = {h[0] for h in index.search(q, n_results=10)}
+        truth = {f"d{i}" for i in np.argsort(-(vectors @ q))[:10]}
+        recall += len(got & truth) / 10
+
+    assert recall / len(queries) >= 0.8
+
+
+def test_vector_store_local_backend_roundtrip(tmp_path):
+    store = VectorStore("my docs", persist_directory=str(tmp_path), backend="local")
+    docs = [
+        Document(content="alpha", metadata={"doc_id": "x"}, chunk_id="c1"),
+        Document(content="beta", metadata={"doc_id": "y"}, chunk_id="c2"),
+    ]
+    store.add_documents(docs, embeddings=[[1.0, 0.0], [0.0, 1.0]])
+
+    results = store.search("q", query_embedding=[0.9, 0.1], n_results=2)
+    assert [d.chunk_id for d, _s in results] == ["c1", "c2"]
+    assert results[0][1] == pytest.approx(0.9 / np.hypot(0.9, 0.1))
+    assert store.get_document("c2").content == "beta"
+    assert store.list_documents() == [{"id": "c1", "doc_id": "x"}, {"id": "c2", "doc_id": "y"}]
+    assert store.delete_documents(filter_metadata={"doc_id": "x"}) == 1
+    assert store.count() == 1
+    store.clear()
+    assert store.count() == 0
+
+    with pytest.raises(ValueError):
+        store.add_documents(docs)
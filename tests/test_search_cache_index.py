@@ -0,0 +1,86 @@
+import random
+import string
+
+from agent.core.search_cache import SearchCache
+from scripts.benchmark_search_cache import run_benchmark
+
+
+def test_similar_query_found_via_index():
+    cache = SearchCache(max_size=100, ttl_seconds=60.0, similarity_threshold=0.85)
+    cache.set("latest nvidia blackwell gpu benchmarks", [{"url": "https://a.example.com"}])
+    cache.set("python asyncio task groups tutorial", [{"url": "https://b.example.com"}])
+
+    hit = cache.get("latest nvidia blackwel gpu benchmark")
+    assert hit == [{"url": "https://a.example.com"}]
+    assert cache.similar_hits == 1
+
+    assert cache.get("rust borrow checker lifetimes") is None
+    assert cache.misses == 1
+
+
+def test_evicted_entries_leave_the_index():
+    cache = SearchCache(max_size=2, ttl_seconds=60.0, similarity_threshold=0.85)
+    cache.set("climate policy europe 2024", [{"url": "https://old.example.com"}])
+    cache.set("solid state battery startups", [{"url": "https://b.example.com"}])
+    cache.set("quantum error correction surface code", [{"url": "https://c.example.com"}])
+
+    assert len(cache._index) == 2
+    assert cache.get("climate policy europe 2025") is None
+
+    cache.clear()
+    assert len(cache._index) == 0
+
+
+def test_reset_same_query_does_not_evict_others():
+    cache = SearchCache(max_size=2, ttl_seconds=60.0, similarity_threshold=0.85)
+    cache.set("alpha query", [{"url": "https://a.example.com"}])
+    cache.set("beta query", [{"url": "https://b.example.com"}])
+    cache.set("beta query", [{"url": "https://b2.example.com"}])
+
+    assert cache.get("alpha query") == [{"url": "https://a.example.com"}]
+    assert cache.get("beta query") == [{"url": "https://b2.example.com"}]
+
+
+def test_benchmark_reports_latency_per_size():
+    report = run_benchmark(sizes=(200, 2_000), lookups=20, linear_max_size=200)
+
+    sizes = [row["size"] for row in report["results"]]
+    assert sizes == [200, 2_000]
+    for row in report["results"]:
+        assert row["near_duplicate_recall"] >= 0.9
+        assert row["miss"]["mean_ms"] >= 0.0
+        assert row["max_bucket"] < 50
+    assert "linear_scan_miss" in report["results"][0]
+    assert "linear_scan_miss" not in report["results"][1]
+
+
+def test_fuzzy_lookup_stays_within_key_namespace():
+    cache = SearchCache(max_size=100, ttl_seconds=60.0, similarity_threshold=0.85)
+    query = (
+        "history of the transatlantic telegraph cable, how it was laid across the ocean floor, "
+        "and its economic effects on trade between europe and america"
+    )
+    cache.set(f"multi_search::parallel::10::::{query}", [{"url": "https://multi.example.com"}])
+
+    assert cache.get(f"web_plan::{query}") is None
+    assert cache.get(f"multi_search::parallel::10::::{query}s") == [{"url": "https://multi.example.com"}]
+
+
+def test_shared_key_prefix_does_not_grow_index_buckets():
+    rng = random.Random(3)
+    keys = [
+        "multi_search::fallback::10::::"
+        + " ".join("".join(rng.choices(string.ascii_lowercase, k=6)) for _ in range(4))
+        for _ in range(1_000)
+    ]
+    cache = SearchCache(max_size=2_000, ttl_seconds=60.0, similarity_threshold=0.9)
+    for i, key in enumerate(keys):
+        cache.set(key, [{"url": f"https://{i}.example.com"}])
+
+    largest = max(len(bucket) for band in cache._index._buckets for bucket in band.values())
+    assert largest < 50
+
+    for key in keys[::2]:
+        cache._remove(cache._query_hash(key))
+    assert len(cache._index) == 500
+    assert all(bucket for band in cache._index._buckets for bucket in band.values())
@@ -0,0 +1,116 @@
+import fnmatch
+import threading
+import time
+
+from agent.core.search_cache import (
+    RedisSearchCacheBackend,
+    SearchCache,
+    SQLiteSearchCacheBackend,
+)
+
+
+def _results(url: str):
+    return [{"title": "t", "url": url, "snippet": "s" * 50}]
+
+
+def test_sqlite_l2_is_shared_between_workers(tmp_path):
+    path = tmp_path / "search_cache.sqlite3"
+    worker_a = SearchCache(max_size=10, ttl_seconds=60.0, l2=SQLiteSearchCacheBackend(path))
+    worker_b = SearchCache(max_size=10, ttl_seconds=60.0, l2=SQLiteSearchCacheBackend(path))
+
+    worker_a.set("multi_search::fallback::5::::ai chips", _results("https://a.example.com"))
+
+    assert worker_b.get("multi_search::fallback::5::::ai chips") == _results(
+        "https://a.example.com"
+    )
+    # Promoted into B's L1: the next lookup does not touch the shared tier.
+    assert worker_b.get("multi_search::fallback::5::::ai chips") is not None
+    stats = worker_b.stats()
+    assert stats["l2_hits"] == 1
+    assert stats["hits"] == 1
+    assert stats["backend"] == "sqlite"
+    assert stats["l2_entries"] == 1
+
+
+def test_sqlite_l2_respects_ttl(tmp_path):
+    backend = SQLiteSearchCacheBackend(tmp_path / "c.sqlite3")
+    backend.set("k", "q", b"[]", ttl_seconds=0.0)
+    assert backend.get("k") is None
+
+
+def test_l1_byte_budget_evicts_lru():
+    one_entry = len(str(_results("https://0.example.com")).encode()) + 16
+    cache = SearchCache(max_size=100, ttl_seconds=60.0, max_bytes=one_entry * 2)
+    for i in range(5):
+        cache.set(f"query number {i} about topic {i * 7}", _results(f"https://{i}.example.com"))
+
+    stats = cache.stats()
+    assert stats["bytes"] <= one_entry * 2
+    assert stats["size"] == 2
+    assert stats["evictions"] == 3
+
+
+def test_get_or_compute_single_flight():
+    cache = SearchCache(max_size=10, ttl_seconds=60.0)
+    calls = {"n": 0}
+    started = threading.Barrier(8)
+
+    def compute():
+        calls["n"] += 1
+        time.sleep(0.2)
+        return _results("https://slow.example.com")
+
+    out = []
+
+    def worker():
+        started.wait()
+        out.append(cache.get_or_compute("stampede query", compute))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls["n"] == 1
+    assert len(out) == 8
+    assert all(r == _results("https://slow.example.com") for r in out)
+    assert cache.stats()["coalesced"] == 7
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def scan_iter(self, match="*"):
+        return [k for k in list(self.data) if fnmatch.fnmatch(k, match)]
+
+    def delete(self, *keys):
+        for k in keys:
+            self.data.pop(k, None)
+
+
+def test_redis_l2_roundtrip_and_clear():
+    client = _FakeRedis()
+    client.set("other:key", b"keep")
+    cache = SearchCache(max_size=10, ttl_seconds=60.0, l2=RedisSearchCacheBackend(client=client))
+    cache.set("quantum chips", _results("https://q.example.com"))
+
+    fresh = SearchCache(max_size=10, ttl_seconds=60.0, l2=RedisSearchCacheBackend(client=client))
+    assert fresh.get("quantum chips") == _results("https://q.example.com")
+
+    fresh.clear()
+    assert list(client.data) == ["other:key"]
+
+
+def test_workflow_module_reexports_the_shared_cache():
+    from agent.core.search_cache import get_search_cache as core_get
+    from agent.workflows.search_cache import get_search_cache as workflow_get
+
+    assert workflow_get() is core_get()
@@ -0,0 +1,211 @@
+import asyncio
+import time
+from dataclasses import replace
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.memory import MemorySaver
+
+import common.session_manager as session_manager_mod
+import main
+from common.session_index import SessionIndex, SessionIndexEntry
+from common.session_manager import SessionManager
+
+
+def _entry(i, *, user, status):
+    return SessionIndexEntry(
+        thread_id=f"thread_{i:03d}",
+        status=status,
+        topic=f"topic {i}",
+        created_at="",
+        updated_at="",
+        route="direct",
+        has_report=False,
+        revision_count=0,
+        message_count=0,
+        user_id=user,
+        sort_ts=1000.0 + i,
+    )
+
+
+def _put(saver, config, values, version):
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = values
+    checkpoint["channel_versions"] = {k: version for k in values}
+    return saver.put(config, checkpoint, {}, dict(checkpoint["channel_versions"]))
+
+
+def _saver_with_threads(count, checkpoints_per_thread=3):
+    saver = MemorySaver()
+    for i in range(count):
+        config = {"configurable": {"thread_id": f"thread_{i:03d}", "checkpoint_ns": ""}}
+        for step in range(checkpoints_per_thread):
+            values = {
+                "input": f"question {i}",
+                "user_id": "alice" if i % 2 == 0 else "bob",
+                "started_at": f"2026-03-01T00:{i:02d}:00",
+                "is_complete": step == checkpoints_per_thread - 1,
+            }
+            config = _put(saver, config, values, step + 1)
+    return saver
+
+
+def test_keyset_pages_cover_filtered_rows_once_in_recency_order():
+    index = SessionIndex()
+    for i in range(30):
+        index.upsert(
+            _entry(i, user="alice" if i % 3 else "bob", status="completed" if i % 2 else "running")
+        )
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = index.page(limit=4, cursor=cursor, status="completed", user_id="alice")
+        seen.extend(e.thread_id for e in page)
+        if cursor is None:
+            break
+
+    expected = [f"thread_{i:03d}" for i in range(29, -1, -1) if i % 3 and i % 2]
+    assert seen == expected
+
+    # Re-indexing moves a thread to the front without leaving a stale key behind.
+    index.upsert(replace(_entry(1, user="bob", status="completed"), sort_ts=5000.0))
+    assert [e.thread_id for e in index.page(limit=1)[0]] == ["thread_001"]
+    assert "thread_001" not in [e.thread_id for e in index.page(limit=50, user_id="alice")[0]]
+    assert len(index) == 30
+
+    with pytest.raises(ValueError):
+        index.page(cursor="not-a-cursor")
+
+
+def test_manager_backfills_once_and_returns_full_pages():
+    saver = _saver_with_threads(12)
+    list_calls = []
+    real_list = saver.list
+
+    def counting_list(*args, **kwargs):
+        list_calls.append(args)
+        return real_list(*args, **kwargs)
+
+    saver.list = counting_list
+    manager = SessionManager(saver)
+
+    first, cursor = manager.list_sessions_page(limit=5)
+    # 36 checkpoints, 12 threads: a full page of distinct threads, newest first.
+    assert [s.thread_id for s in first] == [f"thread_{i:03d}" for i in (11, 10, 9, 8, 7)]
+    assert all(s.status == "completed" for s in first)
+
+    rest, cursor = manager.list_sessions_page(limit=50, cursor=cursor)
+    assert len(rest) == 7 and cursor is None
+    assert len(list_calls) == 1
+
+    alice = manager.list_sessions(limit=50, user_id_filter="alice")
+    assert [s.thread_id for s in alice] == [f"thread_{i:03d}" for i in range(10, -1, -2)]
+    assert len(list_calls) == 1
+
+    # A run finishing re-indexes just that thread from its latest checkpoint.
+    config = {"configurable": {"thread_id": "thread_new", "checkpoint_ns": ""}}
+    _put(saver, config, {"input": "fresh", "user_id": "alice", "started_at": "2026-04-01T00:00:00"}, 1)
+    assert manager.refresh_session("thread_new").topic == "fresh"
+    assert manager.list_sessions(limit=1)[0].thread_id == "thread_new"
+    assert len(list_calls) == 1
+
+
+class _BatchRecordingIndex(SessionIndex):
+    def __init__(self, fail_after=None):
+        super().__init__()
+        self.batches = []
+        self.marks = 0
+        self.fail_after = fail_after
+
+    def upsert_many(self, entries):
+        entries = list(entries)
+        if self.fail_after is not None and len(self.batches) >= self.fail_after:
+            raise RuntimeError("database went away")
+        self.batches.append(len(entries))
+        return super().upsert_many(entries)
+
+    def mark_backfilled(self):
+        self.marks += 1
+        super().mark_backfilled()
+
+
+def test_backfill_writes_batches_and_marks_only_a_completed_pass():
+    saver = _saver_with_threads(12, checkpoints_per_thread=1)
+
+    interrupted = _BatchRecordingIndex(fail_after=1)
+    with pytest.raises(RuntimeError):
+        SessionManager(saver, index=interrupted).backfill_index(batch_size=5)
+    assert interrupted.batches == [5]
+    assert interrupted.marks == 0 and not interrupted.backfilled
+
+    index = _BatchRecordingIndex()
+    manager = SessionManager(saver, index=index)
+    assert manager.backfill_index(batch_size=5) == 12
+    assert index.batches == [5, 5, 2]
+    assert index.marks == 1 and index.backfilled
+    assert len(manager.list_sessions(limit=50)) == 12
+    assert index.marks == 1
+
+
+@pytest.mark.asyncio
+async def test_sessions_api_paginates_with_cursor(monkeypatch):
+    saver = _saver_with_threads(7, checkpoints_per_thread=1)
+    monkeypatch.setattr(main, "checkpointer", saver)
+    monkeypatch.setattr(session_manager_mod, "_session_manager", None)
+
+    transport = ASGITransport(app=main.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        ids, cursor = [], None
+        for _ in range(5):
+            params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+            resp = await ac.get("/api/sessions", params=params)
+            assert resp.status_code == 200
+            body = resp.json()
+            ids.extend(s["thread_id"] for s in body["sessions"])
+            cursor = body["next_cursor"]
+            if not cursor:
+                break
+
+        bad = await ac.get("/api/sessions", params={"cursor": "%%%"})
+
+    assert ids == [f"thread_{i:03d}" for i in range(6, -1, -1)]
+    assert bad.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_run_start_indexes_session_before_the_first_checkpoint(monkeypatch):
+    saver = MemorySaver()
+    monkeypatch.setattr(main, "checkpointer", saver)
+    monkeypatch.setattr(session_manager_mod, "_session_manager", None)
+
+    main._schedule_session_index(
+        "thread_live", {"input": "still running", "user_id": "alice", "status": "running"}
+    )
+    await asyncio.gather(*main._session_index_tasks)
+
+    manager = session_manager_mod.get_session_manager(saver)
+    sessions = manager.list_sessions(limit=10, status_filter="running")
+    assert [(s.thread_id, s.topic) for s in sessions] == [("thread_live", "still running")]
+
+
+@pytest.mark.asyncio
+async def test_session_index_updates_for_one_thread_apply_in_order(monkeypatch):
+    monkeypatch.setattr(main, "checkpointer", MemorySaver())
+    applied = []
+
+    def slow_index(thread_id, state):
+        if state is not None:
+            time.sleep(0.2)
+        applied.append((thread_id, "start" if state is not None else "end"))
+
+    monkeypatch.setattr(main, "_index_session_sync", slow_index)
+
+    main._schedule_session_index("thread_a", {"status": "running"})
+    main._schedule_session_index("thread_a")
+    main._schedule_session_index("thread_b")
+    await asyncio.gather(*main._session_index_tasks)
+
+    assert [event for thread, event in applied if thread == "thread_a"] == ["start", "end"]
+    assert applied[0] == ("thread_b", "end")
+    assert main._session_index_tails == {}
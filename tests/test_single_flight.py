@@ -0,0 +1,205 @@
+import asyncio
+import threading
+import time
+import types
+
+import pytest
+
+import tools.search.multi_search as multi_search_module
+from agent.core.search_cache import SearchCache
+from common.single_flight import SingleFlight, get_single_flight
+from tools.research.content_fetcher import ContentFetcher
+from tools.search.multi_search import (
+    MultiSearchOrchestrator,
+    SearchProvider,
+    SearchResult,
+    SearchStrategy,
+)
+
+
+def _run_threads(n, target):
+    barrier = threading.Barrier(n)
+
+    def _wrapped():
+        barrier.wait()
+        target()
+
+    threads = [threading.Thread(target=_wrapped) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def test_threads_share_one_execution():
+    flight = SingleFlight()
+    calls = {"n": 0}
+    results = []
+
+    def upstream():
+        calls["n"] += 1
+        time.sleep(0.1)
+        return {"value": 42}
+
+    _run_threads(6, lambda: results.append(flight.do("k", upstream)))
+
+    assert calls["n"] == 1
+    assert [r[0] for r in results] == [{"value": 42}] * 6
+    assert sorted(r[1] for r in results) == [False] + [True] * 5
+    assert flight.stats() == {"executions": 1, "coalesced": 5, "in_flight": 0}
+
+
+def test_errors_propagate_to_waiters():
+    flight = SingleFlight()
+    errors = []
+
+    def upstream():
+        time.sleep(0.05)
+        raise RuntimeError("provider down")
+
+    def call():
+        try:
+            flight.do("k", upstream)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    _run_threads(3, call)
+    assert errors == ["provider down"] * 3
+    assert flight.executions == 1
+
+
+@pytest.mark.asyncio
+async def test_async_tasks_share_one_execution_with_thread_leader():
+    flight = SingleFlight()
+    calls = {"n": 0}
+    started = threading.Event()
+
+    def slow_sync():
+        calls["n"] += 1
+        started.set()
+        time.sleep(0.2)
+        return "page"
+
+    async def async_upstream():
+        calls["n"] += 1
+        return "should not run"
+
+    leader = asyncio.create_task(asyncio.to_thread(flight.do, "url", slow_sync))
+    await asyncio.to_thread(started.wait)
+    followers = await asyncio.gather(*(flight.ado("url", async_upstream) for _ in range(4)))
+
+    assert await leader == ("page", False)
+    assert followers == [("page", True)] * 4
+    assert calls["n"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_async_leader_hands_over_to_waiter():
+    flight = SingleFlight()
+    gate = asyncio.Event()
+
+    async def hangs():
+        await gate.wait()
+        return "never"
+
+    async def quick():
+        return "fresh"
+
+    leader = asyncio.create_task(flight.ado("k", hangs))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.ado("k", quick))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == ("fresh", False)
+    assert flight.executions == 2
+
+
+def test_content_fetcher_coalesces_concurrent_fetches(monkeypatch):
+    import tools.research.content_fetcher as mod
+
+    monkeypatch.setattr(mod.settings, "research_fetch_cache_ttl_s", 0.0, raising=False)
+    monkeypatch.setattr(mod.settings, "research_fetch_disk_cache_enabled", False, raising=False)
+    monkeypatch.setattr(mod.settings, "research_fetch_render_mode", "off", raising=False)
+    calls = {"get": 0}
+
+    class FakeResp:
+        status_code = 200
+        headers = {"content-type": "text/plain"}
+        content = b"trending"
+        text = "trending"
+
+        def iter_content(self, chunk_size=65536):
+            yield self.content
+
+        def close(self):
+            return None
+
+    def fake_get(url, timeout=None, headers=None, **kwargs):
+        calls["get"] += 1
+        time.sleep(0.2)
+        return FakeResp()
+
+    monkeypatch.setattr(mod, "get_http_session", lambda: types.SimpleNamespace(get=fake_get))
+    flight = get_single_flight("fetch")
+    before = flight.coalesced
+
+    pages = []
+    fetcher = ContentFetcher()
+    urls = iter(f"https://news.example.com/story?utm_source={i}" for i in range(5))
+    lock = threading.Lock()
+
+    def fetch():
+        with lock:
+            url = next(urls)
+        pages.append(fetcher.fetch(url))
+
+    _run_threads(5, fetch)
+
+    assert calls["get"] == 1
+    assert {p.text for p in pages} == {"trending"}
+    assert len({p.raw_url for p in pages}) == 5
+    assert flight.coalesced - before == 4
+
+
+class _SlowProvider(SearchProvider):
+    def __init__(self):
+        super().__init__("slow")
+        self.calls = 0
+
+    def is_available(self) -> bool:
+        return True
+
+    def search(self, query: str, max_results: int = 10):
+        self.calls += 1
+        time.sleep(0.2)
+        return [
+            SearchResult(
+                title="Trending",
+                url="https://example.com/trending",
+                snippet="ok",
+                score=0.7,
+                provider=self.name,
+            )
+        ]
+
+
+def test_orchestrator_coalesces_concurrent_identical_searches(monkeypatch):
+    provider = _SlowProvider()
+    cache = SearchCache(max_size=10, ttl_seconds=60.0, similarity_threshold=1.0)
+    monkeypatch.setattr(multi_search_module, "get_search_cache", lambda: cache)
+    orchestrator = MultiSearchOrchestrator(providers=[provider], strategy=SearchStrategy.FALLBACK)
+
+    results = []
+    _run_threads(
+        5,
+        lambda: results.append(
+            orchestrator.search("trending topic", max_results=3, strategy=SearchStrategy.FALLBACK)
+        ),
+    )
+
+    assert provider.calls == 1
+    assert all(r and r[0].url == "https://example.com/trending" for r in results)
+    # Waiters get their own copies.
+    assert len({id(r[0]) for r in results}) == 5
+    assert cache.stats()["coalesced"] == 4
@@ -0,0 +1,144 @@
+import asyncio
+import json
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+import main
+from common.metrics import metrics_registry
+from common.stream_coalesce import TextDeltaCoalescer
+from common.stream_frames import encode_stream_event
+
+
+def _text(content):
+    return encode_stream_event("text", {"content": content})
+
+
+def _decode(items):
+    return [(json.loads(i[2:])["type"], json.loads(i[2:])["data"]) for i in items]
+
+
+async def _collect(coalescer, source):
+    return [item async for item in coalescer.run(source)]
+
+
+def test_merges_bursts_and_flushes_before_non_text_events():
+    async def source():
+        for tok in ("Hel", "lo", " wor", "ld"):
+            yield _text(tok)
+        yield encode_stream_event("tool", {"name": "search"})
+        yield _text("!")
+        yield '0:{"type":"done","data":{}}\n'
+
+    coalescer = TextDeltaCoalescer(min_window_ms=1000, max_window_ms=1000)
+    out = asyncio.run(_collect(coalescer, source()))
+
+    assert _decode(out) == [
+        ("text", {"content": "Hello world"}),
+        ("tool", {"name": "search"}),
+        ("text", {"content": "!"}),
+        ("done", {}),
+    ]
+    assert (coalescer.deltas_in, coalescer.frames_out) == (5, 2)
+    assert coalescer.frames_saved_ratio == 0.6
+
+
+def test_window_and_byte_cap_bound_the_delay():
+    async def slow_source():
+        yield _text("a")
+        yield _text("b")
+        await asyncio.sleep(0.2)  # the model stalls; buffered text must not wait for it
+        yield _text("c")
+
+    async def run():
+        coalescer = TextDeltaCoalescer(min_window_ms=20, max_window_ms=20)
+        stamps = []
+        start = asyncio.get_running_loop().time()
+        async for item in coalescer.run(slow_source()):
+            stamps.append((json.loads(item[2:])["data"]["content"], asyncio.get_running_loop().time() - start))
+        return stamps
+
+    stamps = asyncio.run(run())
+    assert [s[0] for s in stamps] == ["ab", "c"]
+    assert stamps[0][1] < 0.15
+
+    async def burst():
+        for _ in range(10):
+            yield _text("x" * 10)
+
+    capped = asyncio.run(_collect(TextDeltaCoalescer(min_window_ms=1000, max_window_ms=1000, max_bytes=30), burst()))
+    assert [len(json.loads(i[2:])["data"]["content"]) for i in capped] == [30, 30, 30, 10]
+
+
+def test_window_grows_under_backpressure_and_decays_when_client_keeps_up():
+    backlog = {"frames": 100}
+    coalescer = TextDeltaCoalescer(min_window_ms=16, max_window_ms=50, backlog=lambda: backlog["frames"])
+
+    for _ in range(5):
+        coalescer._adapt(0.0)
+    assert coalescer.window_s == pytest.approx(0.050)
+
+    backlog["frames"] = 0
+    coalescer._adapt(0.0)
+    assert coalescer.window_s < 0.050
+    for _ in range(20):
+        coalescer._adapt(0.0)
+    assert coalescer.window_s == pytest.approx(0.016)
+
+    coalescer._adapt(0.5)  # downstream write took longer than the window
+    assert coalescer.window_s == pytest.approx(0.032)
+
+
+def test_cancelling_consumer_closes_the_source():
+    closed = asyncio.Event()
+
+    async def source():
+        try:
+            yield _text("partial")
+            await asyncio.sleep(10)
+            yield _text("never")
+        finally:
+            closed.set()
+
+    async def run():
+        coalescer = TextDeltaCoalescer(min_window_ms=5000, max_window_ms=5000)
+        consumer = asyncio.create_task(_collect(coalescer, source()))
+        await asyncio.sleep(0.05)
+        consumer.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await consumer
+        return closed.is_set()
+
+    assert asyncio.run(run())
+
+
+@pytest.mark.asyncio
+async def test_chat_sse_coalesces_tokens_and_records_saved_frames(monkeypatch):
+    monkeypatch.setattr(main.settings, "openai_api_key", "dummy")
+    monkeypatch.setitem(main.settings.__dict__, "stream_coalesce_min_ms", 1000)
+    monkeypatch.setitem(main.settings.__dict__, "stream_coalesce_max_ms", 1000)
+
+    async def _fake_stream_agent_events(input_text, *, thread_id, model, search_mode, agent_id=None, images=None, user_id):
+        metrics_registry.start(thread_id, model=model)
+        for tok in "streaming tokens".split():
+            yield await main.format_stream_event("text", {"content": tok + " "})
+        yield await main.format_stream_event("done", {})
+
+    monkeypatch.setattr(main, "stream_agent_events", _fake_stream_agent_events)
+
+    transport = ASGITransport(app=main.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        resp = await ac.post("/api/chat/sse", json={"messages": [{"role": "user", "content": "hi"}]})
+
+    events = [line[7:] for line in resp.text.splitlines() if line.startswith("event: ")]
+    assert events == ["text", "done"]
+    assert '"content":"streaming tokens "' in resp.text
+
+    thread_id = resp.headers["X-Thread-ID"]
+    for _ in range(50):
+        if metrics_registry.get(thread_id).text_deltas:
+            break
+        await asyncio.sleep(0.01)
+    metrics = metrics_registry.get(thread_id).to_dict()
+    assert (metrics["text_deltas"], metrics["text_frames"]) == (2, 1)
+    assert metrics["frames_saved_ratio"] == 0.5
@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+import main
+from agent.core.events import Event, ToolEventType
+from common import stream_frames
+from common.chat_stream_translate import translate_legacy_line_to_sse
+from common.stream_frames import StreamFrame, encode_stream_event, sse_message_frame
+from scripts.benchmark_stream_frames import _old_legacy, _old_message_only, _old_sse, make_events
+
+
+def _sse_fields(frame):
+    return dict(line.split(": ", 1) for line in frame.strip("\n").split("\n"))
+
+
+def test_stream_event_is_legacy_line_and_translates_without_reparsing(monkeypatch):
+    data = {"content": "你好 <b>", "n": 3}
+    line = asyncio.run(main.format_stream_event("text", data))
+
+    assert isinstance(line, StreamFrame)
+    assert line.startswith("0:") and line.endswith("\n")
+    assert json.loads(line[2:]) == {"type": "text", "data": data}
+
+    def _no_parse(*_args, **_kwargs):
+        raise AssertionError("pre-encoded frames must not be re-parsed")
+
+    monkeypatch.setattr("common.chat_stream_translate.json.loads", _no_parse)
+    frame = translate_legacy_line_to_sse(line, seq=7)
+    monkeypatch.undo()
+
+    fields = _sse_fields(frame)
+    assert fields["id"] == "7" and fields["event"] == "text"
+    assert json.loads(fields["data"]) == {"type": "text", "data": data}
+
+    # Plain legacy strings (e.g. from other producers) still go through the parser.
+    plain = translate_legacy_line_to_sse('0:{"type":"done","data":{}}\n', seq=8)
+    assert _sse_fields(plain)["event"] == "done"
+
+
+def test_encoder_falls_back_for_values_orjson_rejects(monkeypatch):
+    payload = {1: "int key", "big": 2**70}
+    frame = encode_stream_event("status", payload)
+    assert json.loads(frame.payload)["data"] == {"1": "int key", "big": 2**70}
+
+    monkeypatch.setattr(stream_frames, "orjson", None)
+    assert json.loads(stream_frames.dumps({"a": "é"})) == {"a": "é"}
+    assert "é" in stream_frames.dumps({"a": "é"})
+
+
+def test_event_is_encoded_once_for_typed_message_and_log_frames(monkeypatch):
+    event = Event(type=ToolEventType.TOOL_START, data={"tool": "browser"}, seq=4, thread_id="t1")
+    calls = []
+    real_dumps = stream_frames.dumps
+
+    def counting_dumps(obj, **kwargs):
+        calls.append(obj)
+        return real_dumps(obj, **kwargs)
+
+    monkeypatch.setattr("agent.core.events.dumps", counting_dumps)
+
+    typed = event.to_sse()
+    message = event.to_sse_message()
+    assert event.to_json() in typed and event.to_json() in message
+    assert len(calls) == 1
+
+    assert _sse_fields(typed)["event"] == "tool_start"
+    assert "event:" not in message
+    assert message == sse_message_frame(event.to_json(), 4)
+    assert json.loads(_sse_fields(message)["data"])["data"] == {"tool": "browser"}
+
+
+def test_benchmark_frames_match_the_old_encoding():
+    # Throughput is gated by scripts/benchmark_stream_frames.py; here only the output is checked.
+    for seq, (event_type, data) in enumerate(make_events(300), 1):
+        old_typed = _old_sse(_old_legacy(event_type, data), seq)
+        new_typed = translate_legacy_line_to_sse(encode_stream_event(event_type, data), seq=seq)
+        old_fields, new_fields = _sse_fields(old_typed), _sse_fields(new_typed)
+        assert new_fields.keys() == old_fields.keys()
+        assert new_fields["id"] == old_fields["id"] and new_fields["event"] == old_fields["event"]
+        assert json.loads(new_fields["data"]) == json.loads(old_fields["data"])
+
+        new_message = sse_message_frame(encode_stream_event(event_type, data).payload, seq)
+        old_message = _old_message_only(old_typed)
+        assert "event:" not in new_message
+        assert json.loads(_sse_fields(new_message)["data"]) == json.loads(_sse_fields(old_message)["data"])
@@ -63,7 +63,7 @@ async def test_events_forbidden_for_other_user_when_internal_auth_enabled(monkey
     )
     monkeypatch.setattr(main, "checkpointer", fake_checkpointer)
 
-    async def _fake_event_stream_generator(thread_id: str, *, timeout: float, last_event_id=None):
+    async def _fake_event_stream_generator(thread_id: str, *, timeout: float, last_event_id=None, message_only=False):
         yield "event: test\ndata: {}\n\n"
 
     monkeypatch.setattr(main, "event_stream_generator", _fake_event_stream_generator)
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from agent.core.processor_config import AgentProcessorConfig
+from agent.parsers import StreamingXMLToolParser, XMLToolParser
+from agent.workflows.response_handler import ResponseHandler
+
+CONTENT = (
+    "Let me look that up.\n"
+    "<function_calls>\n"
+    '<invoke name="search_web">\n'
+    '<parameter name="query">python asyncio</parameter>\n'
+    '<parameter name="max_results">5</parameter>\n'
+    "</invoke>\n"
+    '<invoke name="execute_code">\n'
+    '<parameter name="code">print("hi")</parameter>\n'
+    "</invoke>\n"
+    "</function_calls>\n"
+    "Done."
+)
+
+
+def _chunks(text, size):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def _signature(calls):
+    return [(c.function_name, c.parameters) for c in calls]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 16, 17, 64, 10_000])
+def test_chunked_feed_matches_batch_parse(size):
+    stream = StreamingXMLToolParser()
+    calls = []
+    for chunk in _chunks(CONTENT, size):
+        calls.extend(stream.feed(chunk))
+
+    assert _signature(calls) == _signature(XMLToolParser().parse_content(CONTENT))
+    assert calls[0].parameters == {"query": "python asyncio", "max_results": 5}
+    assert not stream.in_function_calls
+
+
+def test_each_invoke_is_emitted_before_the_block_closes():
+    stream = StreamingXMLToolParser()
+    first_close = CONTENT.index("</invoke>") + len("</invoke>")
+
+    assert stream.feed(CONTENT[: first_close - 1]) == []
+    assert stream.open_invoke
+    emitted = stream.feed(CONTENT[first_close - 1 : first_close])
+    assert [c.function_name for c in emitted] == ["search_web"]
+    assert stream.in_function_calls and not stream.open_invoke
+
+    rest = stream.feed(CONTENT[first_close:])
+    assert [c.function_name for c in rest] == ["execute_code"]
+    assert len(stream.calls) == 2
+
+
+def test_tags_are_case_insensitive_and_text_outside_blocks_is_ignored():
+    stream = StreamingXMLToolParser()
+    text = (
+        '<invoke name="stray"></invoke>'
+        '<FUNCTION_CALLS><INVOKE name="a"><parameter name="x">1</parameter></INVOKE>'
+        "</Function_Calls>"
+    )
+    calls = [c for chunk in _chunks(text, 5) for c in stream.feed(chunk)]
+    assert _signature(calls) == [("a", {"x": 1})]
+
+    stream.reset()
+    assert stream.calls == [] and not stream.in_function_calls
+
+
+def test_handler_starts_tool_while_model_is_still_streaming():
+    started = asyncio.Event()
+    log = []
+
+    async def search_web(query, max_results=10):
+        log.append(("tool_start", query))
+        started.set()
+        return {"hits": [query]}
+
+    async def model_stream():
+        for chunk in _chunks(CONTENT.split("<invoke name=\"execute_code\">")[0], 11):
+            yield {"content": chunk}
+        # Give the early task a chance to run before the rest of the response.
+        await asyncio.wait_for(started.wait(), timeout=1)
+        log.append(("model", "tail"))
+        yield {"content": "</function_calls>"}
+
+    config = AgentProcessorConfig(
+        xml_tool_calling=True,
+        native_tool_calling=False,
+        tool_execution_strategy="parallel",
+        execute_on_stream=True,
+    )
+    handler = ResponseHandler(tool_registry={"search_web": search_web}, config=config)
+
+    async def run():
+        return [e async for e in handler.process_streaming_response(model_stream(), "s1")]
+
+    events = asyncio.run(run())
+    assert log == [("tool_start", "python asyncio"), ("model", "tail")]
+    results = [e for e in events if e["type"] == "tool_result"]
+    assert len(results) == 1 and results[0]["success"]
+    assert events[-1]["type"] == "response_complete"
@@ -36,6 +36,7 @@
 except Exception:  # pragma: no cover
     CoreBaseTool = None  # type: ignore[assignment]
 
+from common.latency_metrics import observe, tool_duration_seconds
 from tools.core.base import ToolResult, WeaverTool, tool_schema
 
 logger = logging.getLogger(__name__)
@@ -84,8 +85,14 @@ class ToolMetadata:
     deprecated: bool = False
     deprecation_message: Optional[str] = None
 
-    def increment_call(self, success: bool, duration_ms: float):
-        """Record a tool call."""
+    def increment_call(self, success: bool, duration_ms: float, thread_id: Optional[str] = None):
+        """Record a tool call (also observed in the tool latency histogram)."""
+        observe(
+            tool_duration_seconds,
+            [self.name, "ok" if success else "error"],
+            duration_ms / 1000,
+            thread_id=thread_id,
+        )
         self.call_count += 1
         if success:
             self.success_count += 1
@@ -3,21 +3,27 @@
 
 Provides functionality for:
 - Document parsing (PDF, DOCX, TXT, MD)
-- Text embedding (OpenAI embeddings)
-- Vector storage (ChromaDB)
+- Text embedding (OpenAI embeddings, content-hash cache)
+- Vector storage (ChromaDB or the embedded NumPy index)
 - Retrieval-augmented generation
 """
 
 from tools.rag.document_loader import Document, DocumentLoader
-from tools.rag.embedder import Embedder
+from tools.rag.embedder import Embedder, EmbeddingError
+from tools.rag.embedding_cache import EmbeddingCache
+from tools.rag.local_index import LocalVectorIndex
 from tools.rag.rag_tool import RAGTool, rag_search
-from tools.rag.vector_store import VectorStore
+from tools.rag.vector_store import VectorBackend, VectorStore
 
 __all__ = [
     "DocumentLoader",
     "Document",
     "Embedder",
+    "EmbeddingError",
+    "EmbeddingCache",
     "VectorStore",
+    "VectorBackend",
+    "LocalVectorIndex",
     "RAGTool",
     "rag_search",
 ]
@@ -10,7 +10,7 @@
 import re
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +30,46 @@
     DOCX_AVAILABLE = False
 
 
+def _format_page(page_num: int, page_text: str) -> str:
+    return f"[Page {page_num}]\n{page_text}"
+
+
+def pdf_page_count(source: Union[str, Path, bytes]) -> int:
+    """Number of pages in a PDF given as a path or bytes."""
+    if not PYMUPDF_AVAILABLE:
+        raise ImportError("PyMuPDF is required for PDF parsing.")
+    with _open_pdf(source) as doc:
+        return doc.page_count
+
+
+def extract_pdf_pages(
+    source: Union[str, Path, bytes],
+    start: int = 0,
+    stop: Optional[int] = None,
+) -> List[Tuple[int, str]]:
+    """
+    Extract `(page_number, text)` for pages `[start, stop)` (0-based, numbers 1-based).
+
+    Pages without text are skipped. Module-level so it can run in a process pool.
+    """
+    if not PYMUPDF_AVAILABLE:
+        raise ImportError("PyMuPDF is required for PDF parsing.")
+    pages = []
+    with _open_pdf(source) as doc:
+        stop = doc.page_count if stop is None else min(stop, doc.page_count)
+        for index in range(start, stop):
+            page_text = doc[index].get_text()
+            if page_text.strip():
+                pages.append((index + 1, page_text))
+    return pages
+
+
+def _open_pdf(source: Union[str, Path, bytes]):
+    if isinstance(source, (bytes, bytearray)):
+        return fitz.open(stream=bytes(source), filetype="pdf")
+    return fitz.open(source)
+
+
 @dataclass
 class Document:
     """A document chunk with metadata."""
@@ -81,36 +121,38 @@ def load(self, file_path: Union[str, Path]) -> List[Document]:
             List of Document chunks
         """
         path = Path(file_path)
-        if not path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-
-        suffix = path.suffix.lower()
-        text = ""
         metadata = {
             "source": str(path),
             "filename": path.name,
-            "file_type": suffix,
+            "file_type": path.suffix.lower(),
         }
 
-        if suffix == ".pdf":
-            text = self._load_pdf(path)
-        elif suffix in (".docx", ".doc"):
-            text = self._load_docx(path)
-        elif suffix in (".txt", ".md", ".markdown", ".rst"):
-            text = self._load_text(path)
-        else:
-            # Try as plain text
-            try:
-                text = self._load_text(path)
-            except Exception as e:
-                raise ValueError(f"Unsupported file format: {suffix}") from e
-
+        text = self.load_text(path)
         if not text.strip():
             logger.warning(f"No text extracted from {path}")
             return []
 
         return self._chunk_text(text, metadata)
 
+    def load_text(self, file_path: Union[str, Path]) -> str:
+        """Extract the full text of a document without chunking it."""
+        path = Path(file_path)
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        suffix = path.suffix.lower()
+        if suffix == ".pdf":
+            return self._load_pdf(path)
+        if suffix in (".docx", ".doc"):
+            return self._load_docx(path)
+        if suffix in (".txt", ".md", ".markdown", ".rst"):
+            return self._load_text(path)
+        # Try as plain text
+        try:
+            return self._load_text(path)
+        except Exception as e:
+            raise ValueError(f"Unsupported file format: {suffix}") from e
+
     def load_from_bytes(
         self,
         content: bytes,
@@ -163,28 +205,46 @@ def _load_pdf(self, path: Path) -> str:
                 "Install with: pip install pymupdf"
             )
 
-        text_parts = []
-        with fitz.open(path) as doc:
-            for page_num, page in enumerate(doc, 1):
-                page_text = page.get_text()
-                if page_text.strip():
-                    text_parts.append(f"[Page {page_num}]\n{page_text}")
-
-        return "\n\n".join(text_parts)
+        return "\n\n".join(_format_page(n, text) for n, text in extract_pdf_pages(path))
 
     def _parse_pdf_bytes(self, content: bytes) -> str:
         """Parse PDF from bytes."""
         if not PYMUPDF_AVAILABLE:
             raise ImportError("PyMuPDF is required for PDF parsing.")
 
-        text_parts = []
-        with fitz.open(stream=content, filetype="pdf") as doc:
-            for page_num, page in enumerate(doc, 1):
-                page_text = page.get_text()
-                if page_text.strip():
-                    text_parts.append(f"[Page {page_num}]\n{page_text}")
+        return "\n\n".join(_format_page(n, text) for n, text in extract_pdf_pages(content))
 
-        return "\n\n".join(text_parts)
+    def iter_pdf_pages(
+        self,
+        path: Union[str, Path],
+        *,
+        executor: Optional[Any] = None,
+        pages_per_task: int = 8,
+        page_count: Optional[int] = None,
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Yield `(page_number, formatted_text)` in page order.
+
+        With an executor (e.g. a ProcessPoolExecutor) page ranges are parsed in
+        parallel while earlier pages are already being consumed.
+        """
+        total = pdf_page_count(path) if page_count is None else page_count
+        step = max(1, int(pages_per_task))
+        ranges = [(start, min(start + step, total)) for start in range(0, total, step)]
+        if executor is None or len(ranges) <= 1:
+            for start, stop in ranges:
+                for page_num, text in extract_pdf_pages(path, start, stop):
+                    yield page_num, _format_page(page_num, text)
+            return
+
+        futures = [executor.submit(extract_pdf_pages, str(path), start, stop) for start, stop in ranges]
+        try:
+            for future in futures:
+                for page_num, text in future.result():
+                    yield page_num, _format_page(page_num, text)
+        finally:
+            for future in futures:
+                future.cancel()
 
     def _load_docx(self, path: Path) -> str:
         """Load text from DOCX file."""
@@ -225,11 +285,7 @@ def _chunk_text(
 
         Uses sentence-aware splitting when possible.
         """
-        # Clean up text
-        text = re.sub(r"\n{3,}", "\n\n", text)
-        text = re.sub(r" {2,}", " ", text)
-
-        chunks = []
+        text = self._clean_text(text)
         doc_id = hashlib.md5(text[:1000].encode()).hexdigest()[:12]
 
         if len(text) <= self.chunk_size:
@@ -239,52 +295,67 @@ def _chunk_text(
                 doc_id=doc_id,
             )]
 
-        # Split by paragraphs first
-        paragraphs = text.split("\n\n")
+        chunks = list(self.iter_chunks([text], metadata, doc_id))
+        logger.info(f"Split document into {len(chunks)} chunks")
+        return chunks
+
+    @staticmethod
+    def _clean_text(text: str) -> str:
+        text = re.sub(r"\n{3,}", "\n\n", text)
+        return re.sub(r" {2,}", " ", text)
+
+    def iter_chunks(
+        self,
+        pieces: Iterable[str],
+        metadata: Dict[str, Any],
+        doc_id: str,
+    ) -> Iterator[Document]:
+        """
+        Streaming form of `_chunk_text`: consume text pieces (e.g. pages) and
+        yield chunks as soon as they are complete.
+
+        Pieces are treated as if joined by blank lines.
+        """
+        index = 0
         current_chunk = ""
 
-        for para in paragraphs:
-            para = para.strip()
-            if not para:
-                continue
-
-            if len(current_chunk) + len(para) + 2 <= self.chunk_size:
-                current_chunk = f"{current_chunk}\n\n{para}" if current_chunk else para
-            else:
-                if current_chunk:
-                    chunks.append(Document(
-                        content=current_chunk.strip(),
-                        metadata={**metadata, "chunk_index": len(chunks)},
-                        doc_id=doc_id,
-                    ))
+        def make(content: str) -> Document:
+            nonlocal index
+            doc = Document(
+                content=content.strip(),
+                metadata={**metadata, "chunk_index": index},
+                doc_id=doc_id,
+            )
+            index += 1
+            return doc
+
+        for piece in pieces:
+            # Split by paragraphs first
+            for para in self._clean_text(piece).split("\n\n"):
+                para = para.strip()
+                if not para:
+                    continue
+
+                if len(current_chunk) + len(para) + 2 <= self.chunk_size:
+                    current_chunk = f"{current_chunk}\n\n{para}" if current_chunk else para
+                elif current_chunk:
+                    yield make(current_chunk)
                     # Overlap: keep last part of current chunk
                     overlap_text = current_chunk[-self.chunk_overlap:] if len(current_chunk) > self.chunk_overlap else ""
                     current_chunk = f"{overlap_text}\n\n{para}" if overlap_text else para
                 else:
                     # Paragraph itself is too long, split by sentences
-                    sentences = re.split(r"(?<=[.!?])\s+", para)
-                    for sent in sentences:
+                    for sent in re.split(r"(?<=[.!?])\s+", para):
                         if len(current_chunk) + len(sent) + 1 <= self.chunk_size:
                             current_chunk = f"{current_chunk} {sent}" if current_chunk else sent
                         else:
                             if current_chunk:
-                                chunks.append(Document(
-                                    content=current_chunk.strip(),
-                                    metadata={**metadata, "chunk_index": len(chunks)},
-                                    doc_id=doc_id,
-                                ))
+                                yield make(current_chunk)
                             current_chunk = sent
 
         # Don't forget the last chunk
         if current_chunk.strip():
-            chunks.append(Document(
-                content=current_chunk.strip(),
-                metadata={**metadata, "chunk_index": len(chunks)},
-                doc_id=doc_id,
-            ))
-
-        logger.info(f"Split document into {len(chunks)} chunks")
-        return chunks
+            yield make(current_chunk)
 
 
 def load_documents(
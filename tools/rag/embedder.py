@@ -2,10 +2,16 @@
 Text Embedder for RAG Pipeline.
 
 Generates embeddings using OpenAI API or compatible endpoints.
+Vectors are cached by content hash (see `embedding_cache.py`), and uncached
+batches are sent concurrently with retries.
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+
+from tools.rag.embedding_cache import EmbeddingCache, get_embedding_cache, text_hash
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +24,10 @@
     OPENAI_AVAILABLE = False
 
 
+class EmbeddingError(RuntimeError):
+    """Raised when a batch cannot be embedded after all retries."""
+
+
 class Embedder:
     """
     Generate text embeddings using OpenAI API.
@@ -31,6 +41,7 @@ def __init__(
         api_key: Optional[str] = None,
         base_url: Optional[str] = None,
         dimensions: Optional[int] = None,
+        cache: Optional[EmbeddingCache] = None,
     ):
         """
         Initialize the embedder.
@@ -40,6 +51,7 @@ def __init__(
             api_key: OpenAI API key (uses env var if not provided)
             base_url: Custom API base URL
             dimensions: Output embedding dimensions (for models that support it)
+            cache: Embedding cache (defaults to the shared persistent cache, if enabled)
         """
         if not OPENAI_AVAILABLE:
             raise ImportError(
@@ -50,6 +62,10 @@ def __init__(
 
         self.model = model
         self.dimensions = dimensions
+        self.cache = cache if cache is not None else get_embedding_cache()
+        self.batch_size = max(1, int(getattr(settings, "rag_embedding_batch_size", 100) or 100))
+        self.concurrency = max(1, int(getattr(settings, "rag_embedding_concurrency", 4) or 1))
+        self.max_retries = max(0, int(getattr(settings, "rag_embedding_max_retries", 3) or 0))
 
         client_kwargs = {
             "api_key": api_key or settings.openai_api_key,
@@ -58,6 +74,8 @@ def __init__(
             client_kwargs["base_url"] = base_url or settings.openai_base_url
 
         self.client = OpenAI(**client_kwargs)
+        # Cache scope: the same model name on another backend is a different model.
+        self.endpoint = str(self.client.base_url).rstrip("/")
 
     def embed(self, texts: List[str]) -> List[List[float]]:
         """
@@ -69,32 +87,121 @@ def embed(self, texts: List[str]) -> List[List[float]]:
         Returns:
             List of embedding vectors
         """
-        if not texts:
-            return []
+        vectors, _stats = self.embed_with_stats(texts)
+        return vectors
 
-        # OpenAI has a limit on batch size
-        batch_size = 100
-        all_embeddings = []
+    def embed_with_stats(
+        self, texts: List[str], *, cache_new: bool = True
+    ) -> Tuple[List[List[float]], Dict[str, Any]]:
+        """
+        Like `embed`, but also return this call's cache statistics.
 
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
+        The stats belong to the call, so concurrent ingests sharing one
+        embedder each see their own numbers.
 
-            try:
-                kwargs = {"model": self.model, "input": batch}
-                if self.dimensions:
-                    kwargs["dimensions"] = self.dimensions
+        Args:
+            texts: List of text strings to embed
+            cache_new: Store newly embedded vectors in the cache
 
-                response = self.client.embeddings.create(**kwargs)
-                batch_embeddings = [item.embedding for item in response.data]
-                all_embeddings.extend(batch_embeddings)
+        Returns:
+            (vectors, {"texts", "cache_hits", "embedded", "api_calls", "hit_rate"})
+        """
+        if not texts:
+            return [], {"texts": 0, "cache_hits": 0, "embedded": 0, "api_calls": 0, "hit_rate": 0.0}
 
-            except Exception as e:
-                logger.error(f"Embedding error: {e}")
-                # Return zero vectors for failed batch
-                dim = self.dimensions or 1536
-                all_embeddings.extend([[0.0] * dim] * len(batch))
+        hashes = [text_hash(t) for t in texts]
+        vectors: Dict[str, List[float]] = {}
+        if self.cache is not None:
+            vectors = self.cache.get_many(
+                self.model, self.dimensions, hashes, endpoint=self.endpoint
+            )
 
-        return all_embeddings
+        # Each distinct uncached text is sent once, in input order.
+        pending: Dict[str, str] = {}
+        for digest, text in zip(hashes, texts, strict=True):
+            if digest not in vectors and digest not in pending:
+                pending[digest] = text
+
+        missing = list(pending.items())
+        batches = [
+            missing[i:i + self.batch_size] for i in range(0, len(missing), self.batch_size)
+        ]
+        if batches:
+            vectors.update(self._embed_batches(batches, cache_new=cache_new))
+
+        cache_hits = sum(1 for digest in hashes if digest not in pending)
+        stats = {
+            "texts": len(texts),
+            "cache_hits": cache_hits,
+            "embedded": len(missing),
+            "api_calls": len(batches),
+            "hit_rate": round(cache_hits / len(texts), 3),
+        }
+        logger.info(
+            f"Embedded {len(texts)} texts | cache hits {cache_hits} "
+            f"({stats['hit_rate']:.0%}) | new {len(missing)} in {len(batches)} API calls"
+        )
+        return [vectors[digest] for digest in hashes], stats
+
+    def _embed_batches(
+        self, batches: List[List[tuple]], *, cache_new: bool = True
+    ) -> Dict[str, List[float]]:
+        """Embed batches with bounded concurrency; cache each batch as soon as it succeeds."""
+        results: Dict[str, List[float]] = {}
+        errors: List[Exception] = []
+        workers = min(self.concurrency, len(batches))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._create_with_retry, [text for _h, text in batch]): batch
+                for batch in batches
+            }
+            for future in as_completed(futures):
+                batch = futures[future]
+                try:
+                    embeddings = future.result()
+                except Exception as e:
+                    errors.append(e)
+                    continue
+                items = list(zip([digest for digest, _t in batch], embeddings, strict=True))
+                results.update(items)
+                if self.cache is not None and cache_new:
+                    try:
+                        self.cache.put_many(
+                            self.model, self.dimensions, items, endpoint=self.endpoint
+                        )
+                    except Exception as e:
+                        logger.warning(f"Embedding cache store failed: {e}")
+
+        if errors:
+            raise EmbeddingError(
+                f"{len(errors)}/{len(batches)} embedding batches failed: {errors[0]}"
+            ) from errors[0]
+        return results
+
+    def _create_with_retry(self, batch: List[str]) -> List[List[float]]:
+        kwargs: Dict[str, Any] = {"model": self.model, "input": batch}
+        if self.dimensions:
+            kwargs["dimensions"] = self.dimensions
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.client.embeddings.create(**kwargs)
+                embeddings = [item.embedding for item in response.data]
+                if len(embeddings) != len(batch):
+                    raise EmbeddingError(
+                        f"expected {len(batch)} embeddings, got {len(embeddings)}"
+                    )
+                return embeddings
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = min(8.0, 0.5 * (2 ** attempt))
+                logger.warning(
+                    f"Embedding error (attempt {attempt + 1}/{self.max_retries + 1}): {e}; "
+                    f"retrying in {delay:.1f}s"
+                )
+                time.sleep(delay)
+        return []
 
     def embed_single(self, text: str) -> List[float]:
         """
@@ -114,7 +221,9 @@ def embed_query(self, query: str) -> List[float]:
         Embed a search query.
 
         Some models use different embeddings for queries vs documents.
-        This method handles that distinction if needed.
+        This method handles that distinction if needed. Query vectors are
+        looked up in the cache but not added to it: queries rarely repeat and
+        would otherwise fill the cache with one-off entries.
 
         Args:
             query: Search query text
@@ -122,7 +231,8 @@ def embed_query(self, query: str) -> List[float]:
         Returns:
             Query embedding vector
         """
-        return self.embed_single(query)
+        vectors, _stats = self.embed_with_stats([query], cache_new=False)
+        return vectors[0]
 
     def embed_documents(self, documents: List[str]) -> List[List[float]]:
         """
@@ -0,0 +1,252 @@
+"""
+Persistent Embedding Cache for RAG Pipeline.
+
+Stores embeddings in SQLite keyed by (endpoint, model, dimensions,
+sha256(text)) so re-uploading an unchanged document, or the same document
+into another collection, does not call the embeddings API again. The
+endpoint (API base URL) is part of the key because OpenAI-compatible
+backends can serve different models under the same name. Vectors are
+stored as float32 blobs.
+
+The cache holds at most `rag_embedding_cache_max_entries` vectors; beyond
+that the least recently used ones are evicted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from common.config import settings
+
+logger = logging.getLogger(__name__)
+
+# SQLite limits bound parameters per statement; stay well below the default.
+_LOOKUP_CHUNK = 500
+# Eviction trims to this fraction of the cap so it does not run on every store.
+_EVICT_TO = 0.9
+
+
+def text_hash(text: str) -> str:
+    """Content hash used as the cache key for one text."""
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def _encode(vector: List[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _decode(blob: bytes) -> List[float]:
+    values = array("f")
+    values.frombytes(blob)
+    return values.tolist()
+
+
+class EmbeddingCache:
+    """
+    SQLite-backed embedding cache shared across collections, restarts and workers.
+
+    Counters (`hits`, `misses`, `stores`, `evictions`) are per process and
+    reported by `stats()`. `max_entries <= 0` disables the size bound.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS embeddings (
+            endpoint TEXT NOT NULL,
+            model TEXT NOT NULL,
+            dimensions INTEGER NOT NULL,
+            text_hash TEXT NOT NULL,
+            vector BLOB NOT NULL,
+            created_at REAL NOT NULL,
+            accessed_at REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (endpoint, model, dimensions, text_hash)
+        );
+        CREATE INDEX IF NOT EXISTS idx_embeddings_accessed ON embeddings(accessed_at);
+    """
+
+    def __init__(self, path: str | Path, *, max_entries: int = 0) -> None:
+        self.path = Path(path)
+        self.max_entries = max(0, int(max_entries or 0))
+        self._lock = threading.RLock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=10.0, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(embeddings)")}
+            if columns and "endpoint" not in columns:
+                # Rows from before the endpoint was keyed cannot be attributed; start over.
+                logger.info("[embedding_cache] rebuilding cache with endpoint-scoped keys")
+                self._conn.execute("DROP TABLE embeddings")
+            elif columns and "accessed_at" not in columns:
+                self._conn.execute(
+                    "ALTER TABLE embeddings ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0"
+                )
+            self._conn.executescript(self._SCHEMA)
+            self._conn.commit()
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+            # Upper bound on the row count: stores add to it, eviction re-counts.
+            self._approx_entries = int(count)
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def get_many(
+        self,
+        model: str,
+        dimensions: Optional[int],
+        hashes: Iterable[str],
+        *,
+        endpoint: str = "",
+    ) -> Dict[str, List[float]]:
+        """Return cached vectors for the given text hashes (missing ones are absent)."""
+        wanted = list(dict.fromkeys(h for h in hashes if h))
+        found: Dict[str, List[float]] = {}
+        if not wanted:
+            return found
+
+        dims = int(dimensions or 0)
+        now = time.time()
+        with self._lock:
+            for start in range(0, len(wanted), _LOOKUP_CHUNK):
+                chunk = wanted[start : start + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE endpoint = ? AND model = ? AND dimensions = ? "
+                    f"AND text_hash IN ({placeholders})",
+                    (endpoint, model, dims, *chunk),
+                ).fetchall()
+                for digest, blob in rows:
+                    found[digest] = _decode(blob)
+                if rows and self.max_entries:
+                    hit_hashes = [digest for digest, _blob in rows]
+                    self._conn.execute(
+                        f"UPDATE embeddings SET accessed_at = ? "
+                        f"WHERE endpoint = ? AND model = ? AND dimensions = ? "
+                        f"AND text_hash IN ({','.join('?' * len(hit_hashes))})",
+                        (now, endpoint, model, dims, *hit_hashes),
+                    )
+            if found and self.max_entries:
+                self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(wanted) - len(found)
+        return found
+
+    def put_many(
+        self,
+        model: str,
+        dimensions: Optional[int],
+        items: Iterable[Tuple[str, List[float]]],
+        *,
+        endpoint: str = "",
+    ) -> None:
+        dims = int(dimensions or 0)
+        now = time.time()
+        rows = [
+            (endpoint, model, dims, digest, _encode(vector), now, now)
+            for digest, vector in items
+            if digest
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings "
+                "(endpoint, model, dimensions, text_hash, vector, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.stores += len(rows)
+            self._approx_entries += len(rows)
+            self._evict_locked()
+            self._conn.commit()
+
+    def _evict_locked(self) -> None:
+        """Drop least recently used rows once the cache is over `max_entries`."""
+        if not self.max_entries or self._approx_entries <= self.max_entries:
+            return
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        excess = int(count) - int(self.max_entries * _EVICT_TO)
+        if count > self.max_entries and excess > 0:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE rowid IN "
+                "(SELECT rowid FROM embeddings ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            )
+            self.evictions += excess
+            count -= excess
+        self._approx_entries = int(count)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self._approx_entries = 0
+            self.hits = 0
+            self.misses = 0
+            self.stores = 0
+            self.evictions = 0
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "entries": int(count),
+                "hits": self.hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "max_entries": self.max_entries,
+                "hit_rate": round(self.hits / max(lookups, 1), 3),
+            }
+
+
+_cache: Optional[EmbeddingCache] = None
+_cache_lock = threading.RLock()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    if not bool(getattr(settings, "rag_embedding_cache_enabled", True)):
+        return None
+
+    path = str(getattr(settings, "rag_embedding_cache_path", "") or "").strip()
+    if not path:
+        return None
+
+    global _cache
+    with _cache_lock:
+        if _cache is None or str(_cache.path) != str(Path(path)):
+            if _cache is not None:
+                _cache.close()
+            try:
+                max_entries = int(getattr(settings, "rag_embedding_cache_max_entries", 200_000) or 0)
+                _cache = EmbeddingCache(path, max_entries=max_entries)
+            except Exception as e:
+                logger.warning(f"[embedding_cache] unavailable at {path}: {e}")
+                _cache = None
+        return _cache
+
+
+def close_embedding_cache() -> None:
+    global _cache
+    with _cache_lock:
+        if _cache is not None:
+            _cache.close()
+        _cache = None
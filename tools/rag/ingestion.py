@@ -0,0 +1,319 @@
+"""
+Background Document Ingestion for RAG Pipeline.
+
+Uploads are spooled to disk and ingested by worker threads, so parsing,
+chunking and embedding never run on the API event loop. PDF pages are parsed
+in page ranges on a shared process pool (`RAGTool.ingest_file`). Each job's
+progress is kept in memory for `GET /api/documents/jobs/{id}` and its SSE
+stream; watchers poll `IngestionJob.version` to see changes.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional
+
+from common.config import settings
+
+logger = logging.getLogger(__name__)
+
+_COPY_BUFFER = 1024 * 1024
+
+
+class IngestionJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class UploadTooLargeError(ValueError):
+    pass
+
+
+@dataclass
+class IngestionJob:
+    id: str
+    collection: str
+    filename: str
+    spool_path: str
+    size_bytes: int
+    status: IngestionJobStatus = IngestionJobStatus.QUEUED
+    stage: str = "queued"
+    pages_done: int = 0
+    pages_total: Optional[int] = None
+    chunks: int = 0
+    error: Optional[str] = None
+    result: Dict[str, Any] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    completed_at: Optional[float] = None
+    version: int = 0
+    rag: Any = field(default=None, repr=False)
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.status in (IngestionJobStatus.COMPLETED, IngestionJobStatus.FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        progress = None
+        if self.pages_total:
+            progress = round(min(1.0, self.pages_done / self.pages_total), 3)
+        elif self.status == IngestionJobStatus.COMPLETED:
+            progress = 1.0
+        return {
+            "job_id": self.id,
+            "filename": self.filename,
+            "status": self.status.value,
+            "stage": self.stage,
+            "size_bytes": self.size_bytes,
+            "pages_done": self.pages_done,
+            "pages_total": self.pages_total,
+            "progress": progress,
+            "chunks": self.chunks,
+            "error": self.error,
+            "embedding": self.result.get("embedding") or {},
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "completed_at": self.completed_at,
+            "version": self.version,
+        }
+
+
+class IngestionQueue:
+    """
+    Job registry plus worker threads for document ingestion.
+
+    Terminal jobs beyond `max_jobs` are evicted oldest first.
+    """
+
+    def __init__(
+        self,
+        *,
+        spool_dir: str | Path,
+        workers: int = 2,
+        parse_processes: int = 2,
+        pages_per_task: int = 8,
+        max_jobs: int = 500,
+    ) -> None:
+        self.spool_dir = Path(spool_dir)
+        self.workers = max(1, int(workers))
+        self.parse_processes = max(0, int(parse_processes))
+        self.pages_per_task = max(1, int(pages_per_task))
+        self.max_jobs = max(1, int(max_jobs))
+
+        self._lock = threading.RLock()
+        self._jobs: OrderedDict[str, IngestionJob] = OrderedDict()
+        self._queue: queue.Queue[Optional[str]] = queue.Queue()
+        self._threads: list[threading.Thread] = []
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._closed = False
+
+    # ------------------------------------------------------------------ #
+    # Submission
+    # ------------------------------------------------------------------ #
+
+    def spool(self, source: BinaryIO, filename: str, *, max_bytes: int) -> tuple[str, int]:
+        """Copy an upload stream to the spool directory (bounded size); returns (path, size)."""
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        suffix = Path(filename or "").suffix.lower()[:16]
+        path = self.spool_dir / f"{uuid.uuid4().hex}{suffix}"
+        size = 0
+        try:
+            with open(path, "wb") as out:
+                while True:
+                    block = source.read(_COPY_BUFFER)
+                    if not block:
+                        break
+                    size += len(block)
+                    if size > max_bytes:
+                        raise UploadTooLargeError(f"upload exceeds {max_bytes} bytes")
+                    out.write(block)
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+        return str(path), size
+
+    def submit(self, *, rag: Any, collection: str, filename: str, spool_path: str, size_bytes: int) -> IngestionJob:
+        job = IngestionJob(
+            id=f"ingest_{uuid.uuid4().hex}",
+            collection=collection,
+            filename=filename,
+            spool_path=spool_path,
+            size_bytes=size_bytes,
+            rag=rag,
+        )
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ingestion queue is shut down")
+            self._jobs[job.id] = job
+            self._evict_locked()
+            self._ensure_workers_locked()
+        self._queue.put(job.id)
+        logger.info(f"[ingestion] queued {job.id}: {filename} ({size_bytes} bytes) -> {collection}")
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def snapshot(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.to_dict() if job is not None else None
+
+    def _evict_locked(self) -> None:
+        overflow = len(self._jobs) - self.max_jobs
+        if overflow <= 0:
+            return
+        for job_id in [jid for jid, j in self._jobs.items() if j.is_terminal][:overflow]:
+            self._jobs.pop(job_id, None)
+
+    # ------------------------------------------------------------------ #
+    # Workers
+    # ------------------------------------------------------------------ #
+
+    def _ensure_workers_locked(self) -> None:
+        self._threads = [t for t in self._threads if t.is_alive()]
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(
+                target=self._worker, name=f"rag-ingest-{len(self._threads)}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _parse_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.parse_processes <= 0:
+            return None
+        with self._lock:
+            if self._pool is None and not self._closed:
+                # Forked children would inherit the ingest threads' held locks and
+                # the parent's open clients; start clean interpreters instead.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.parse_processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def _update(self, job: IngestionJob, **changes: Any) -> None:
+        with self._lock:
+            for key, value in changes.items():
+                setattr(job, key, value)
+            job.version += 1
+
+    def _worker(self) -> None:
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            job = self.get(job_id)
+            if job is not None:
+                self._run(job)
+
+    def _run(self, job: IngestionJob) -> None:
+        self._update(job, status=IngestionJobStatus.RUNNING, stage="parsing", started_at=time.time())
+
+        def on_progress(state: Dict[str, Any]) -> None:
+            self._update(
+                job,
+                stage=state.get("stage") or job.stage,
+                pages_done=int(state.get("pages_done") or 0),
+                pages_total=state.get("pages_total"),
+                chunks=int(state.get("chunks") or 0),
+            )
+
+        try:
+            executor = self._parse_pool() if job.filename.lower().endswith(".pdf") else None
+            result = job.rag.ingest_file(
+                job.spool_path,
+                job.filename,
+                progress=on_progress,
+                executor=executor,
+                pages_per_task=self.pages_per_task,
+            )
+            if result.get("success"):
+                self._update(
+                    job,
+                    status=IngestionJobStatus.COMPLETED,
+                    stage="done",
+                    chunks=int(result.get("chunks") or 0),
+                    result={k: v for k, v in result.items() if k != "ids"},
+                    completed_at=time.time(),
+                )
+            else:
+                self._update(
+                    job,
+                    status=IngestionJobStatus.FAILED,
+                    stage="failed",
+                    error=str(result.get("error") or "Upload failed"),
+                    completed_at=time.time(),
+                )
+        except Exception as e:
+            logger.error(f"[ingestion] {job.id} failed: {e}", exc_info=True)
+            self._update(
+                job,
+                status=IngestionJobStatus.FAILED,
+                stage="failed",
+                error=str(e),
+                completed_at=time.time(),
+            )
+        finally:
+            job.rag = None
+            try:
+                os.unlink(job.spool_path)
+            except OSError:
+                pass
+            logger.info(
+                f"[ingestion] {job.id} {job.status.value}: {job.filename} "
+                f"({job.chunks} chunks, {(job.completed_at or time.time()) - (job.started_at or 0):.2f}s)"
+            )
+
+    def shutdown(self, *, wait: bool = False) -> None:
+        with self._lock:
+            self._closed = True
+            threads = list(self._threads)
+            pool, self._pool = self._pool, None
+        for _ in threads:
+            self._queue.put(None)
+        if wait:
+            for thread in threads:
+                thread.join()
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+_ingestion_queue: Optional[IngestionQueue] = None
+_ingestion_lock = threading.RLock()
+
+
+def get_ingestion_queue() -> IngestionQueue:
+    global _ingestion_queue
+    with _ingestion_lock:
+        if _ingestion_queue is None:
+            _ingestion_queue = IngestionQueue(
+                spool_dir=str(getattr(settings, "rag_ingest_spool_dir", "") or "data/ingest_spool"),
+                workers=int(getattr(settings, "rag_ingest_workers", 2) or 2),
+                parse_processes=int(getattr(settings, "rag_ingest_parse_processes", 2) or 0),
+                pages_per_task=int(getattr(settings, "rag_ingest_pages_per_task", 8) or 8),
+                max_jobs=int(getattr(settings, "rag_ingest_max_jobs", 500) or 500),
+            )
+        return _ingestion_queue
+
+
+def shutdown_ingestion_queue() -> None:
+    global _ingestion_queue
+    with _ingestion_lock:
+        if _ingestion_queue is not None:
+            _ingestion_queue.shutdown(wait=False)
+        _ingestion_queue = None
@@ -0,0 +1,192 @@
+"""
+Persistent BM25 Index for RAG Pipeline.
+
+Dense retrieval misses exact identifiers (part numbers, function names, error
+codes). `LexicalIndex` keeps a per-collection inverted index in SQLite that is
+updated incrementally as documents are added and deleted, and scores chunks
+with Okapi BM25 so `RAGTool.search` can fuse it with vector results.
+
+Tokens are the deepsearch passage tokens (latin words, CJK bigrams) plus whole
+compound identifiers such as `err-4021`, `parse_config` or `v2.3.1`.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from agent.workflows.passage_ranker import tokenize as _passage_tokens
+
+logger = logging.getLogger(__name__)
+
+_IDENTIFIER_RE = re.compile(r"[a-z0-9]+(?:[_\-./:#][a-z0-9]+)+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Passage tokens plus compound identifiers kept whole."""
+    lowered = str(text or "").lower()
+    return _passage_tokens(lowered) + _IDENTIFIER_RE.findall(lowered)
+
+
+class LexicalIndex:
+    """
+    Incremental BM25 over one collection's chunks.
+
+    `path=None` keeps the index in memory (tests, in-memory vector stores).
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS chunks (
+            chunk_id TEXT PRIMARY KEY,
+            source TEXT NOT NULL,
+            length INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_chunks_source ON chunks(source);
+        CREATE TABLE IF NOT EXISTS postings (
+            term TEXT NOT NULL,
+            chunk_id TEXT NOT NULL,
+            tf INTEGER NOT NULL,
+            PRIMARY KEY (term, chunk_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_postings_chunk ON postings(chunk_id);
+    """
+
+    def __init__(self, path: Optional[str | Path] = None, *, k1: float = 1.5, b: float = 0.75) -> None:
+        self.path = Path(path) if path else None
+        self.k1 = float(k1)
+        self.b = float(b)
+        self._lock = threading.RLock()
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path) if self.path else ":memory:", timeout=10.0, check_same_thread=False
+        )
+        with self._lock:
+            if self.path is not None:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self._SCHEMA)
+            self._conn.commit()
+            n, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(length), 0) FROM chunks").fetchone()
+            self._n = int(n)
+            self._total_len = int(total)
+
+    def count(self) -> int:
+        with self._lock:
+            return self._n
+
+    def add(self, chunk_ids: Sequence[str], texts: Sequence[str], sources: Sequence[str]) -> None:
+        """Index chunks; re-adding an existing chunk id replaces it."""
+        rows = list(zip(chunk_ids, texts, sources, strict=True))
+        if not rows:
+            return
+        with self._lock:
+            self._delete_ids_locked([chunk_id for chunk_id, _t, _s in rows])
+            chunk_rows = []
+            posting_rows = []
+            for chunk_id, text, source in dict((r[0], r) for r in rows).values():
+                tf = Counter(tokenize(text))
+                length = sum(tf.values())
+                chunk_rows.append((chunk_id, str(source or ""), length))
+                posting_rows.extend((term, chunk_id, freq) for term, freq in tf.items())
+                self._n += 1
+                self._total_len += length
+            self._conn.executemany("INSERT INTO chunks (chunk_id, source, length) VALUES (?, ?, ?)", chunk_rows)
+            self._conn.executemany("INSERT INTO postings (term, chunk_id, tf) VALUES (?, ?, ?)", posting_rows)
+            self._conn.commit()
+
+    def delete(self, *, chunk_ids: Optional[Sequence[str]] = None, source: Optional[str] = None) -> int:
+        with self._lock:
+            if chunk_ids:
+                ids = list(chunk_ids)
+            elif source is not None:
+                ids = [r[0] for r in self._conn.execute("SELECT chunk_id FROM chunks WHERE source = ?", (source,))]
+            else:
+                return 0
+            removed = self._delete_ids_locked(ids)
+            self._conn.commit()
+            return removed
+
+    def _delete_ids_locked(self, chunk_ids: List[str]) -> int:
+        removed = 0
+        for start in range(0, len(chunk_ids), 500):
+            chunk = chunk_ids[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            n, total = self._conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(length), 0) FROM chunks WHERE chunk_id IN ({placeholders})",
+                chunk,
+            ).fetchone()
+            if not n:
+                continue
+            self._conn.execute(f"DELETE FROM postings WHERE chunk_id IN ({placeholders})", chunk)
+            self._conn.execute(f"DELETE FROM chunks WHERE chunk_id IN ({placeholders})", chunk)
+            self._n -= int(n)
+            self._total_len -= int(total)
+            removed += int(n)
+        return removed
+
+    def search(self, query: str, n_results: int = 10, *, source: Optional[str] = None) -> List[Tuple[str, float]]:
+        """Top chunks by BM25 as (chunk_id, score), best first; zero-score chunks are omitted."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or n_results <= 0:
+            return []
+
+        scores: Dict[str, float] = {}
+        with self._lock:
+            if not self._n:
+                return []
+            n = self._n
+            avg_len = self._total_len / n if self._total_len else 1.0
+            k1, b = self.k1, self.b
+            for term in terms:
+                (df,) = self._conn.execute("SELECT COUNT(*) FROM postings WHERE term = ?", (term,)).fetchone()
+                if not df:
+                    continue
+                # Lucene-style idf (never negative), as in the deepsearch passage ranker.
+                idf = math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+                sql = (
+                    "SELECT p.chunk_id, p.tf, c.length FROM postings p "
+                    "JOIN chunks c ON c.chunk_id = p.chunk_id WHERE p.term = ?"
+                )
+                params: Tuple = (term,)
+                if source is not None:
+                    sql += " AND c.source = ?"
+                    params = (term, source)
+                for chunk_id, tf, length in self._conn.execute(sql, params):
+                    norm = k1 * (1.0 - b + b * length / avg_len)
+                    scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (k1 + 1.0) / (tf + norm)
+
+        return heapq.nlargest(n_results, scores.items(), key=lambda item: (item[1], item[0]))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM postings")
+            self._conn.execute("DELETE FROM chunks")
+            self._conn.commit()
+            self._n = 0
+            self._total_len = 0
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], *, k: int = 60) -> List[Tuple[str, float]]:
+    """Fuse ranked id lists: score(id) = sum over lists of 1 / (k + rank), rank starting at 1."""
+    fused: Dict[str, float] = {}
+    first_seen: Dict[str, int] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            fused[item] = fused.get(item, 0.0) + 1.0 / (k + rank)
+            first_seen.setdefault(item, len(first_seen))
+    return sorted(fused.items(), key=lambda kv: (-kv[1], first_seen[kv[0]]))
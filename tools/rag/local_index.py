@@ -0,0 +1,583 @@
+"""
+Embedded NumPy Vector Index for RAG Pipeline.
+
+A chromadb-free engine for per-user collections:
+
+- Each `add` appends an immutable segment: a float32 `.npy` matrix of
+  L2-normalized embeddings (memory-mapped on load, so cold start does not read
+  the vectors) plus a `.meta.jsonl` sidecar with ids, texts and metadata.
+- Deletes and upserts write tombstones; a background compaction merges
+  segments and drops dead rows once there are too many of either.
+- Search is brute-force cosine similarity by blocked matrix multiplication.
+  Segments larger than `ivf_threshold` rows get an IVF index (k-means
+  coarse quantizer) at compaction time and only the `nprobe` closest lists
+  are scanned.
+- Metadata filters (Chroma-style `where`) are applied as a row mask before
+  scoring.
+
+With `persist_directory=None` everything stays in memory.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_MANIFEST = "manifest.json"
+_TOMBSTONES = "tombstones.jsonl"
+_BLOCK_ROWS = 65536
+
+
+def _compare(op: str, value: Any, expected: Any) -> bool:
+    try:
+        if op == "$eq":
+            return value == expected
+        if op == "$ne":
+            return value != expected
+        if op == "$in":
+            return value in expected
+        if op == "$nin":
+            return value not in expected
+        if value is None:
+            return False
+        if op == "$gt":
+            return value > expected
+        if op == "$gte":
+            return value >= expected
+        if op == "$lt":
+            return value < expected
+        if op == "$lte":
+            return value <= expected
+    except TypeError:
+        return False
+    raise ValueError(f"Unsupported metadata operator: {op}")
+
+
+def matches_where(metadata: Dict[str, Any], where: Optional[Dict[str, Any]]) -> bool:
+    """Evaluate a Chroma-style metadata filter (`$eq/$ne/$in/$nin/$gt/$gte/$lt/$lte/$and/$or`)."""
+    if not where:
+        return True
+    for key, cond in where.items():
+        if key == "$and":
+            if not all(matches_where(metadata, c) for c in cond):
+                return False
+            continue
+        if key == "$or":
+            if not any(matches_where(metadata, c) for c in cond):
+                return False
+            continue
+
+        value = metadata.get(key)
+        if not isinstance(cond, dict):
+            if value != cond:
+                return False
+            continue
+        for op, expected in cond.items():
+            if not _compare(op, value, expected):
+                return False
+    return True
+
+
+@dataclass
+class _IVF:
+    centroids: Any  # (nlist, dim) float32
+    order: Any  # row ids grouped by list
+    offsets: Any  # (nlist + 1,) start of each list in `order`
+
+    def rows_for(self, query: Any, nprobe: int) -> Any:
+        sims = self.centroids @ query
+        nprobe = min(max(1, nprobe), len(sims))
+        probe = np.argpartition(-sims, nprobe - 1)[:nprobe]
+        parts = [self.order[self.offsets[c] : self.offsets[c + 1]] for c in probe]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+
+@dataclass
+class _Segment:
+    name: str
+    vectors: Any  # (n, dim) float32, L2-normalized; np.memmap when persisted
+    ids: List[str]
+    texts: List[str]
+    metadatas: List[Dict[str, Any]]
+    alive: Any  # (n,) bool
+    ivf: Optional[_IVF] = None
+
+    @property
+    def live_count(self) -> int:
+        return int(self.alive.sum())
+
+
+def _normalize(matrix: Any) -> Any:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+def _build_ivf(vectors: Any, *, iterations: int = 8, seed: int = 0) -> _IVF:
+    n = vectors.shape[0]
+    nlist = int(min(4096, max(16, round(n ** 0.5))))
+    rng = np.random.default_rng(seed)
+    sample_size = min(n, nlist * 64)
+    sample = np.asarray(vectors[np.sort(rng.choice(n, size=sample_size, replace=False))])
+    centroids = sample[rng.choice(sample_size, size=nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assign = np.argmax(sample @ centroids.T, axis=1)
+        for c in range(nlist):
+            members = sample[assign == c]
+            if len(members):
+                centroids[c] = members.mean(axis=0)
+        centroids = _normalize(centroids)
+
+    assignments = np.empty(n, dtype=np.int32)
+    for start in range(0, n, _BLOCK_ROWS):
+        block = np.asarray(vectors[start : start + _BLOCK_ROWS])
+        assignments[start : start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    order = np.argsort(assignments, kind="stable").astype(np.int64)
+    offsets = np.searchsorted(assignments[order], np.arange(nlist + 1)).astype(np.int64)
+    return _IVF(centroids=centroids, order=order, offsets=offsets)
+
+
+class LocalVectorIndex:
+    """Append-only segmented vector index backed by NumPy (optionally memory-mapped)."""
+
+    def __init__(
+        self,
+        root: Optional[str | Path] = None,
+        *,
+        compact_segments: int = 8,
+        compact_dead_ratio: float = 0.25,
+        ivf_threshold: int = 50_000,
+        nprobe: int = 16,
+        background_compaction: bool = True,
+    ) -> None:
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for the local vector index. Install with: pip install numpy")
+
+        self.root = Path(root) if root else None
+        self.compact_segments = max(2, int(compact_segments))
+        self.compact_dead_ratio = float(compact_dead_ratio)
+        self.ivf_threshold = max(1, int(ivf_threshold))
+        self.nprobe = max(1, int(nprobe))
+        self.background_compaction = bool(background_compaction)
+
+        self._lock = threading.RLock()
+        self._compact_lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+        self._segments: List[_Segment] = []
+        self._locations: Dict[str, Tuple[_Segment, int]] = {}
+        self._dim: Optional[int] = None
+        self._next_seq = 1
+
+        if self.root is not None:
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._load()
+
+    # ------------------------------------------------------------------ #
+    # Persistence
+    # ------------------------------------------------------------------ #
+
+    def _load(self) -> None:
+        manifest_path = self.root / _MANIFEST
+        if not manifest_path.exists():
+            return
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        self._dim = manifest.get("dim")
+        self._next_seq = int(manifest.get("next_seq", 1))
+        by_name: Dict[str, _Segment] = {}
+        for name in manifest.get("segments", []):
+            vectors = np.load(self.root / f"{name}.npy", mmap_mode="r")
+            ids, texts, metadatas = [], [], []
+            with open(self.root / f"{name}.meta.jsonl", encoding="utf-8") as fh:
+                for line in fh:
+                    row = json.loads(line)
+                    ids.append(row["id"])
+                    texts.append(row.get("text") or "")
+                    metadatas.append(row.get("metadata") or {})
+            ivf = None
+            ivf_path = self.root / f"{name}.ivf.npz"
+            if ivf_path.exists():
+                data = np.load(ivf_path)
+                ivf = _IVF(centroids=data["centroids"], order=data["order"], offsets=data["offsets"])
+            segment = _Segment(
+                name=name,
+                vectors=vectors,
+                ids=ids,
+                texts=texts,
+                metadatas=metadatas,
+                alive=np.ones(len(ids), dtype=bool),
+                ivf=ivf,
+            )
+            self._segments.append(segment)
+            by_name[name] = segment
+
+        tombstones = self.root / _TOMBSTONES
+        if tombstones.exists():
+            with open(tombstones, encoding="utf-8") as fh:
+                for line in fh:
+                    entry = json.loads(line)
+                    segment = by_name.get(entry.get("segment"))
+                    if segment is not None:
+                        segment.alive[int(entry["row"])] = False
+
+        # A crash between publishing a segment and tombstoning the rows it replaced
+        # leaves the same id alive twice; the later segment wins and the older row
+        # is tombstoned now, so search never returns both.
+        stale: List[Tuple[_Segment, int]] = []
+        for segment in self._segments:
+            for row, doc_id in enumerate(segment.ids):
+                if segment.alive[row]:
+                    previous = self._locations.get(doc_id)
+                    if previous is not None:
+                        stale.append(previous)
+                    self._locations[doc_id] = (segment, row)
+        self._kill_locked(stale)
+
+    def _write_manifest_locked(self) -> None:
+        if self.root is None:
+            return
+        manifest = {
+            "dim": self._dim,
+            "next_seq": self._next_seq,
+            "segments": [s.name for s in self._segments],
+        }
+        tmp = self.root / f"{_MANIFEST}.tmp"
+        tmp.write_text(json.dumps(manifest), encoding="utf-8")
+        os.replace(tmp, self.root / _MANIFEST)
+
+    def _write_segment_files(self, segment: _Segment) -> None:
+        np.save(self.root / f"{segment.name}.npy", np.asarray(segment.vectors))
+        with open(self.root / f"{segment.name}.meta.jsonl", "w", encoding="utf-8") as fh:
+            for doc_id, text, metadata in zip(segment.ids, segment.texts, segment.metadatas, strict=True):
+                fh.write(json.dumps({"id": doc_id, "text": text, "metadata": metadata}, ensure_ascii=False))
+                fh.write("\n")
+        if segment.ivf is not None:
+            np.savez(
+                self.root / f"{segment.name}.ivf.npz",
+                centroids=segment.ivf.centroids,
+                order=segment.ivf.order,
+                offsets=segment.ivf.offsets,
+            )
+
+    def _remove_segment_files(self, name: str) -> None:
+        if self.root is None:
+            return
+        for suffix in (".npy", ".meta.jsonl", ".ivf.npz"):
+            try:
+                (self.root / f"{name}{suffix}").unlink(missing_ok=True)
+            except OSError as e:  # e.g. still memory-mapped on Windows
+                logger.debug(f"[local_index] could not remove {name}{suffix}: {e}")
+
+    def _rewrite_tombstones_locked(self) -> None:
+        if self.root is None:
+            return
+        tmp = self.root / f"{_TOMBSTONES}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            for segment in self._segments:
+                for row in np.nonzero(~segment.alive)[0]:
+                    fh.write(json.dumps({"segment": segment.name, "row": int(row)}) + "\n")
+        os.replace(tmp, self.root / _TOMBSTONES)
+
+    def _kill_locked(self, targets: Sequence[Tuple[_Segment, int]]) -> None:
+        if not targets:
+            return
+        for segment, row in targets:
+            segment.alive[row] = False
+            if self._locations.get(segment.ids[row]) == (segment, row):
+                self._locations.pop(segment.ids[row], None)
+        if self.root is not None:
+            with open(self.root / _TOMBSTONES, "a", encoding="utf-8") as fh:
+                for segment, row in targets:
+                    fh.write(json.dumps({"segment": segment.name, "row": int(row)}) + "\n")
+
+    # ------------------------------------------------------------------ #
+    # Writes
+    # ------------------------------------------------------------------ #
+
+    def add(
+        self,
+        ids: List[str],
+        embeddings: Sequence[Sequence[float]],
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+    ) -> None:
+        """Append rows as a new segment; existing ids are replaced (upsert)."""
+        if not ids:
+            return
+        # Last occurrence wins within one call, like repeated upserts.
+        last = {doc_id: i for i, doc_id in enumerate(ids)}
+        keep = sorted(last.values())
+        matrix = np.asarray([embeddings[i] for i in keep], dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[0] != len(keep):
+            raise ValueError("embeddings must be a list of equal-length vectors")
+
+        with self._lock:
+            if self._dim is None:
+                self._dim = int(matrix.shape[1])
+            elif matrix.shape[1] != self._dim:
+                raise ValueError(f"embedding dimension {matrix.shape[1]} != index dimension {self._dim}")
+
+            segment = _Segment(
+                name=f"seg-{self._next_seq:08d}",
+                vectors=_normalize(matrix),
+                ids=[ids[i] for i in keep],
+                texts=[texts[i] or "" for i in keep],
+                metadatas=[dict(metadatas[i] or {}) for i in keep],
+                alive=np.ones(len(keep), dtype=bool),
+            )
+            self._next_seq += 1
+            if self.root is not None:
+                self._write_segment_files(segment)
+                segment.vectors = np.load(self.root / f"{segment.name}.npy", mmap_mode="r")
+
+            # Publish the segment before tombstoning the rows it replaces, so a crash in
+            # between leaves duplicates (later segment wins on load) rather than data loss.
+            replaced = [self._locations[d] for d in segment.ids if d in self._locations]
+            self._segments.append(segment)
+            self._write_manifest_locked()
+            self._kill_locked(replaced)
+            for row, doc_id in enumerate(segment.ids):
+                self._locations[doc_id] = (segment, row)
+
+        self._maybe_compact()
+
+    def delete(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        with self._lock:
+            targets: List[Tuple[_Segment, int]] = []
+            if ids:
+                targets = [self._locations[d] for d in dict.fromkeys(ids) if d in self._locations]
+            elif where:
+                for segment in self._segments:
+                    for row in np.nonzero(segment.alive)[0]:
+                        if matches_where(segment.metadatas[row], where):
+                            targets.append((segment, int(row)))
+            self._kill_locked(targets)
+
+        if targets:
+            self._maybe_compact()
+        return len(targets)
+
+    def clear(self) -> None:
+        self.wait_for_compaction()
+        with self._lock:
+            names = [s.name for s in self._segments]
+            self._segments = []
+            self._locations = {}
+            self._dim = None
+            if self.root is not None:
+                self._write_manifest_locked()
+                (self.root / _TOMBSTONES).unlink(missing_ok=True)
+        for name in names:
+            self._remove_segment_files(name)
+
+    # ------------------------------------------------------------------ #
+    # Reads
+    # ------------------------------------------------------------------ #
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._locations)
+
+    def get(self, doc_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        with self._lock:
+            location = self._locations.get(doc_id)
+            if location is None:
+                return None
+            segment, row = location
+            return segment.texts[row], dict(segment.metadatas[row])
+
+    def list(self, limit: int = 100, offset: int = 0, *, with_texts: bool = False) -> List[Tuple]:
+        """Live rows as (id, metadata), or (id, text, metadata) with `with_texts`."""
+        out: List[Tuple] = []
+        skipped = 0
+        with self._lock:
+            for segment in self._segments:
+                for row in np.nonzero(segment.alive)[0]:
+                    if skipped < offset:
+                        skipped += 1
+                        continue
+                    metadata = dict(segment.metadatas[row])
+                    if with_texts:
+                        out.append((segment.ids[row], segment.texts[row], metadata))
+                    else:
+                        out.append((segment.ids[row], metadata))
+                    if len(out) >= limit:
+                        return out
+        return out
+
+    def search(
+        self,
+        query: Sequence[float],
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> List[Tuple[str, str, Dict[str, Any], float]]:
+        """Top `n_results` rows as (id, text, metadata, cosine similarity)."""
+        with self._lock:
+            segments = list(self._segments)
+            dim = self._dim
+            masks = [s.alive.copy() for s in segments]
+        if not segments or n_results <= 0:
+            return []
+
+        q = np.asarray(query, dtype=np.float32).reshape(-1)
+        if dim is not None and q.shape[0] != dim:
+            raise ValueError(f"query dimension {q.shape[0]} != index dimension {dim}")
+        norm = float(np.linalg.norm(q))
+        if norm > 0:
+            q = q / norm
+
+        best: List[Tuple[float, int, int]] = []  # (score, segment index, row)
+        for seg_idx, (segment, mask) in enumerate(zip(segments, masks, strict=True)):
+            if where:
+                for row in np.nonzero(mask)[0]:
+                    if not matches_where(segment.metadatas[row], where):
+                        mask[row] = False
+            if not mask.any():
+                continue
+
+            if segment.ivf is not None:
+                rows = segment.ivf.rows_for(q, self.nprobe)
+                rows = np.sort(rows[mask[rows]])  # sorted rows keep mmap reads sequential
+                if rows.size == 0:
+                    continue
+                scores = np.asarray(segment.vectors[rows]) @ q
+            elif mask.all() or mask.sum() > len(mask) // 2:
+                scores = self._scan(segment.vectors, q)
+                scores[~mask] = -np.inf
+                rows = None
+            else:
+                rows = np.nonzero(mask)[0]
+                scores = np.asarray(segment.vectors[rows]) @ q
+
+            k = min(n_results, int(np.isfinite(scores).sum()))
+            if k <= 0:
+                continue
+            top = np.argpartition(-scores, k - 1)[:k]
+            for i in top:
+                row = int(rows[i]) if rows is not None else int(i)
+                best.append((float(scores[i]), seg_idx, row))
+
+        best.sort(key=lambda item: -item[0])
+        results = []
+        for score, seg_idx, row in best[:n_results]:
+            segment = segments[seg_idx]
+            results.append((segment.ids[row], segment.texts[row], dict(segment.metadatas[row]), score))
+        return results
+
+    @staticmethod
+    def _scan(vectors: Any, q: Any) -> Any:
+        n = vectors.shape[0]
+        if n <= _BLOCK_ROWS:
+            return np.asarray(vectors) @ q
+        scores = np.empty(n, dtype=np.float32)
+        for start in range(0, n, _BLOCK_ROWS):
+            scores[start : start + _BLOCK_ROWS] = np.asarray(vectors[start : start + _BLOCK_ROWS]) @ q
+        return scores
+
+    # ------------------------------------------------------------------ #
+    # Compaction
+    # ------------------------------------------------------------------ #
+
+    def _needs_compaction(self) -> bool:
+        with self._lock:
+            if len(self._segments) > self.compact_segments:
+                return True
+            total = sum(len(s.ids) for s in self._segments)
+            dead = total - len(self._locations)
+            return total > 0 and dead / total > self.compact_dead_ratio
+
+    def _maybe_compact(self) -> None:
+        if not self._needs_compaction():
+            return
+        if not self.background_compaction:
+            self.compact()
+            return
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            self._compactor = threading.Thread(
+                target=self.compact, name="rag-index-compaction", daemon=True
+            )
+            self._compactor.start()
+
+    def wait_for_compaction(self, timeout: Optional[float] = None) -> None:
+        thread = self._compactor
+        if thread is not None and thread.is_alive():
+            thread.join(timeout)
+
+    def compact(self) -> None:
+        """Merge all current segments into one, dropping dead rows (and build IVF if large)."""
+        with self._compact_lock:
+            with self._lock:
+                snapshot = list(self._segments)
+                if not snapshot:
+                    return
+                origins = [(s, np.nonzero(s.alive)[0]) for s in snapshot]
+                name = f"seg-{self._next_seq:08d}"
+                self._next_seq += 1
+
+            # Heavy work happens without the index lock; writers keep appending new segments.
+            parts = [np.asarray(s.vectors[rows]) for s, rows in origins if rows.size]
+            dim = self._dim or 0
+            vectors = np.concatenate(parts) if parts else np.empty((0, dim), dtype=np.float32)
+            merged = _Segment(
+                name=name,
+                vectors=vectors,
+                ids=[s.ids[r] for s, rows in origins for r in rows],
+                texts=[s.texts[r] for s, rows in origins for r in rows],
+                metadatas=[s.metadatas[r] for s, rows in origins for r in rows],
+                alive=np.ones(len(vectors), dtype=bool),
+            )
+            if len(vectors) >= self.ivf_threshold:
+                merged.ivf = _build_ivf(vectors)
+            if self.root is not None:
+                self._write_segment_files(merged)
+                merged.vectors = np.load(self.root / f"{name}.npy", mmap_mode="r")
+
+            with self._lock:
+                # Apply deletes/upserts that landed while we were merging.
+                new_row = 0
+                for s, rows in origins:
+                    for r in rows:
+                        if not s.alive[r]:
+                            merged.alive[new_row] = False
+                        new_row += 1
+                position = len(snapshot)
+                self._segments = [merged, *self._segments[position:]]
+                for row, doc_id in enumerate(merged.ids):
+                    if merged.alive[row] and self._locations.get(doc_id, (None,))[0] in snapshot:
+                        self._locations[doc_id] = (merged, row)
+                # Every on-disk state along the way is consistent: tombstones for the merged
+                # segment are ignored until the manifest lists it, and the old segments'
+                # tombstones are only dropped once the manifest no longer lists them.
+                dead = [(merged, int(r)) for r in np.nonzero(~merged.alive)[0]]
+                if self.root is not None and dead:
+                    with open(self.root / _TOMBSTONES, "a", encoding="utf-8") as fh:
+                        for _s, r in dead:
+                            fh.write(json.dumps({"segment": name, "row": r}) + "\n")
+                self._write_manifest_locked()
+                self._rewrite_tombstones_locked()
+
+            for s in snapshot:
+                self._remove_segment_files(s.name)
+            logger.info(
+                f"[local_index] compacted {len(snapshot)} segments -> {name} "
+                f"({merged.live_count} rows{', IVF' if merged.ivf is not None else ''})"
+            )
@@ -2,16 +2,23 @@
 RAG Tool for Research Pipeline.
 
 Provides a LangChain-compatible tool for searching local documents.
+Search is hybrid: dense vector results and BM25 results from a per-collection
+lexical index are fused with reciprocal-rank fusion.
 """
 
+import hashlib
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from langchain_core.tools import tool
 
-from tools.rag.document_loader import DocumentLoader
+from common.config import settings
+from tools.rag.document_loader import Document, DocumentLoader, pdf_page_count
 from tools.rag.embedder import Embedder
-from tools.rag.vector_store import VectorStore
+from tools.rag.lexical_index import LexicalIndex, reciprocal_rank_fusion
+from tools.rag.vector_store import VectorStore, safe_collection_name
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +62,51 @@ def __init__(
             embedding_function=self.embedder,
         )
 
+        lexical_path = None
+        if persist_directory:
+            lexical_path = Path(persist_directory) / "lexical" / f"{safe_collection_name(collection_name)}.sqlite3"
+        self.lexical_index = LexicalIndex(lexical_path)
+        self.lexical_backfill: Optional[threading.Thread] = None
+        self._start_lexical_backfill()
+
+    def _start_lexical_backfill(self) -> None:
+        """
+        Index chunks stored before the lexical index existed, in a background thread.
+
+        Opening a RAG tool happens on request paths, so the one-time scan never
+        runs inline. Until it finishes, hybrid search may miss lexical matches
+        for those older chunks.
+        """
+        if self.lexical_index.count() > 0:
+            return
+        try:
+            total = self.vector_store.count()
+        except Exception:
+            return
+        if not total:
+            return
+        self.lexical_backfill = threading.Thread(
+            target=self._backfill_lexical_index,
+            name=f"rag-lexical-backfill-{self.vector_store.collection_name}",
+            daemon=True,
+        )
+        self.lexical_backfill.start()
+
+    def _backfill_lexical_index(self) -> None:
+        indexed = 0
+        try:
+            for docs in self.vector_store.iter_documents(batch_size=500):
+                self.lexical_index.add(
+                    [doc.chunk_id for doc in docs],
+                    [doc.content for doc in docs],
+                    [doc.metadata.get("source", "") for doc in docs],
+                )
+                indexed += len(docs)
+        except Exception as e:
+            logger.warning(f"Lexical index backfill stopped after {indexed} chunks: {e}")
+            return
+        logger.info(f"Backfilled lexical index: {indexed} chunks")
+
     def add_document(
         self,
         file_path: str = None,
@@ -89,12 +141,7 @@ def add_document(
                     "source": source,
                 }
 
-            # Generate embeddings
-            texts = [doc.content for doc in documents]
-            embeddings = self.embedder.embed_documents(texts)
-
-            # Add to vector store
-            ids = self.vector_store.add_documents(documents, embeddings)
+            ids, embedding_stats = self._store_chunks(documents)
 
             logger.info(f"Added document: {source} ({len(documents)} chunks)")
 
@@ -103,6 +150,7 @@ def add_document(
                 "source": source,
                 "chunks": len(documents),
                 "ids": ids,
+                "embedding": embedding_stats,
             }
 
         except Exception as e:
@@ -113,6 +161,117 @@ def add_document(
                 "source": file_path or filename,
             }
 
+    def _store_chunks(self, documents: List[Document]) -> Tuple[List[str], Dict[str, Any]]:
+        """Embed chunks, add them to the vector store and the lexical index; return (ids, embed stats)."""
+        texts = [doc.content for doc in documents]
+        embeddings, stats = self.embedder.embed_with_stats(texts)
+        ids = self.vector_store.add_documents(documents, embeddings)
+        self.lexical_index.add(ids, texts, [doc.metadata.get("source", "") for doc in documents])
+        return ids, stats
+
+    def ingest_file(
+        self,
+        path: str,
+        filename: str,
+        *,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        executor: Optional[Any] = None,
+        pages_per_task: int = 8,
+        flush_chunks: int = 256,
+    ) -> Dict[str, Any]:
+        """
+        Streaming variant of `add_document` for a file already on disk.
+
+        PDF pages are parsed in page ranges (in parallel when `executor` is a
+        process pool); chunks are embedded and stored every `flush_chunks`, so
+        memory stays bounded and progress can be reported while parsing. If a
+        later batch fails, chunks stored by this call are removed again.
+
+        Args:
+            path: Spooled file path
+            filename: Original filename (used as the chunks' source)
+            progress: Called with {"stage", "pages_done", "pages_total", "chunks"}
+            executor: Optional executor for PDF page parsing
+            pages_per_task: Pages per parse task
+            flush_chunks: Chunks per embed/store batch
+
+        Returns:
+            Same shape as `add_document`
+        """
+        suffix = Path(filename).suffix.lower()
+        metadata = {"source": filename, "filename": filename, "file_type": suffix}
+        state: Dict[str, Any] = {"stage": "parsing", "pages_done": 0, "pages_total": None, "chunks": 0}
+
+        def report(**changes: Any) -> None:
+            state.update(changes)
+            if progress is not None:
+                progress(dict(state))
+
+        if suffix == ".pdf":
+            total = pdf_page_count(path)
+            report(pages_total=total)
+            with open(path, "rb") as fh:
+                doc_id = hashlib.md5(fh.read(1 << 20)).hexdigest()[:12]
+
+            def pages():
+                for page_num, text in self.loader.iter_pdf_pages(
+                    path, executor=executor, pages_per_task=pages_per_task, page_count=total
+                ):
+                    state["pages_done"] = page_num
+                    yield text
+
+            chunks = self.loader.iter_chunks(pages(), metadata, doc_id)
+        else:
+            # Non-paged formats are small; chunk exactly like `add_document`.
+            text = self.loader.load_text(path)
+            chunks = iter(self.loader._chunk_text(text, metadata) if text.strip() else [])
+
+        stored: List[str] = []
+        embedded = cache_hits = 0
+        batch: List[Document] = []
+
+        def flush() -> None:
+            nonlocal embedded, cache_hits
+            if not batch:
+                return
+            report(stage="embedding")
+            ids, stats = self._store_chunks(batch)
+            stored.extend(ids)
+            embedded += int(stats.get("embedded", 0))
+            cache_hits += int(stats.get("cache_hits", 0))
+            batch.clear()
+            report(stage="parsing", chunks=len(stored))
+
+        try:
+            for doc in chunks:
+                batch.append(doc)
+                if len(batch) >= max(1, flush_chunks):
+                    flush()
+            flush()
+        except Exception:
+            if stored:
+                self.vector_store.delete_documents(ids=stored)
+                self.lexical_index.delete(chunk_ids=stored)
+            raise
+
+        if not stored:
+            return {"success": False, "error": "No content extracted from document", "source": filename}
+
+        report(stage="done", pages_done=state["pages_total"] or state["pages_done"])
+        logger.info(f"Ingested document: {filename} ({len(stored)} chunks)")
+        return {
+            "success": True,
+            "source": filename,
+            "chunks": len(stored),
+            "ids": stored,
+            "embedding": {
+                "texts": len(stored),
+                "cache_hits": cache_hits,
+                "embedded": embedded,
+                "hit_rate": round(cache_hits / len(stored), 3),
+            },
+        }
+
     def search(
         self,
         query: str,
@@ -134,22 +293,55 @@ def search(
         if filter_source:
             filter_metadata = {"source": filter_source}
 
-        results = self.vector_store.search(
+        if not bool(getattr(settings, "rag_hybrid_enabled", True)):
+            results = self.vector_store.search(
+                query=query,
+                n_results=n_results,
+                filter_metadata=filter_metadata,
+            )
+            return [self._format_result(doc, score) for doc, score in results]
+
+        depth = max(n_results, int(getattr(settings, "rag_hybrid_candidates", 20) or 20))
+        dense = self.vector_store.search(
             query=query,
-            n_results=n_results,
+            n_results=depth,
             filter_metadata=filter_metadata,
         )
+        lexical = self.lexical_index.search(query, n_results=depth, source=filter_source)
 
-        return [
-            {
-                "content": doc.content,
-                "score": score,
-                "source": doc.metadata.get("source", "unknown"),
-                "filename": doc.metadata.get("filename", "unknown"),
-                "chunk_index": doc.metadata.get("chunk_index", 0),
-            }
-            for doc, score in results
-        ]
+        rrf_k = int(getattr(settings, "rag_rrf_k", 60) or 60)
+        fused = reciprocal_rank_fusion(
+            [[doc.chunk_id for doc, _s in dense], [chunk_id for chunk_id, _s in lexical]],
+            k=rrf_k,
+        )
+        # Normalize so a top hit in both lists scores 1.0.
+        best_possible = 2.0 / (rrf_k + 1)
+        docs: Dict[str, Document] = {doc.chunk_id: doc for doc, _s in dense}
+        dense_scores = {doc.chunk_id: score for doc, score in dense}
+        lexical_scores = dict(lexical)
+
+        output = []
+        for chunk_id, fused_score in fused:
+            doc = docs.get(chunk_id) or self.vector_store.get_document(chunk_id)
+            if doc is None:
+                continue
+            result = self._format_result(doc, fused_score / best_possible)
+            result["dense_score"] = dense_scores.get(chunk_id)
+            result["lexical_score"] = lexical_scores.get(chunk_id)
+            output.append(result)
+            if len(output) >= n_results:
+                break
+        return output
+
+    @staticmethod
+    def _format_result(doc: Document, score: float) -> Dict[str, Any]:
+        return {
+            "content": doc.content,
+            "score": score,
+            "source": doc.metadata.get("source", "unknown"),
+            "filename": doc.metadata.get("filename", "unknown"),
+            "chunk_index": doc.metadata.get("chunk_index", 0),
+        }
 
     def list_documents(self, limit: int = 100) -> List[Dict[str, Any]]:
         """List all documents in the store."""
@@ -169,6 +361,7 @@ def delete_document(self, source: str) -> Dict[str, Any]:
             count = self.vector_store.delete_documents(
                 filter_metadata={"source": source}
             )
+            self.lexical_index.delete(source=source)
             return {"success": True, "deleted": count}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -187,8 +380,6 @@ def get_rag_tool(*, collection_name: Optional[str] = None) -> Optional[RAGTool]:
     - enterprise-internal mode: per-principal isolated collections (caller chooses collection_name)
     """
 
-    from common.config import settings
-
     if not getattr(settings, "rag_enabled", False):
         return None
 
@@ -1,15 +1,25 @@
 """
 Vector Store for RAG Pipeline.
 
-Stores and retrieves document embeddings using ChromaDB.
+Stores and retrieves document embeddings through a pluggable backend:
+
+- "chroma": ChromaDB (optional dependency)
+- "local": the embedded NumPy index in `tools.rag.local_index` (mmap'd
+  float32 segments, no server or extra dependency beyond numpy)
+
+`rag_vector_backend="auto"` uses ChromaDB when it is installed and the local
+index otherwise.
 """
 
 import logging
-import os
+import re
+from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+from common.config import settings
 from tools.rag.document_loader import Document
+from tools.rag.local_index import NUMPY_AVAILABLE, LocalVectorIndex
 
 logger = logging.getLogger(__name__)
 
@@ -22,31 +32,68 @@
     chromadb = None
     CHROMADB_AVAILABLE = False
 
+# (id, text, metadata, similarity)
+SearchHit = Tuple[str, str, Dict[str, Any], float]
 
-class VectorStore:
-    """
-    Vector storage and retrieval using ChromaDB.
 
-    Supports:
-    - Local persistent storage
-    - In-memory storage for testing
-    - Similarity search with metadata filtering
-    """
+def safe_collection_name(collection_name: str) -> str:
+    """Filesystem-safe form of a collection name (collections can be per-principal)."""
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", collection_name or "") or "default"
 
-    def __init__(
+
+class VectorBackend(ABC):
+    """Storage engine behind `VectorStore`. Scores are cosine similarities."""
+
+    name: str = ""
+
+    @abstractmethod
+    def add(
         self,
-        collection_name: str = "weaver_documents",
-        persist_directory: Optional[str] = None,
-        embedding_function: Optional[Any] = None,
-    ):
-        """
-        Initialize the vector store.
+        ids: List[str],
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        embeddings: Optional[List[List[float]]],
+    ) -> None: ...
+
+    @abstractmethod
+    def query(
+        self,
+        query: str,
+        query_embedding: Optional[List[float]],
+        n_results: int,
+        where: Optional[Dict[str, Any]],
+    ) -> List[SearchHit]: ...
 
-        Args:
-            collection_name: Name of the ChromaDB collection
-            persist_directory: Directory for persistent storage (None for in-memory)
-            embedding_function: Optional custom embedding function
-        """
+    @abstractmethod
+    def delete(self, ids: Optional[List[str]], where: Optional[Dict[str, Any]]) -> int:
+        """Delete by ids or filter; returns the number removed (-1 if unknown)."""
+
+    @abstractmethod
+    def get(self, doc_id: str) -> Optional[Tuple[str, Dict[str, Any]]]: ...
+
+    @abstractmethod
+    def list(self, limit: int, offset: int) -> List[Tuple[str, Dict[str, Any]]]: ...
+
+    def list_with_texts(self, limit: int, offset: int) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Like `list`, with each row's text; backends override this with one bulk read."""
+        rows = []
+        for doc_id, _metadata in self.list(limit, offset):
+            found = self.get(doc_id)
+            if found is not None:
+                rows.append((doc_id, found[0], found[1]))
+        return rows
+
+    @abstractmethod
+    def count(self) -> int: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+
+class ChromaBackend(VectorBackend):
+    name = "chroma"
+
+    def __init__(self, collection_name: str, persist_directory: Optional[str]):
         if not CHROMADB_AVAILABLE:
             raise ImportError(
                 "chromadb is required for vector storage. "
@@ -54,9 +101,6 @@ def __init__(
             )
 
         self.collection_name = collection_name
-        self.persist_directory = persist_directory
-
-        # Initialize ChromaDB client
         if persist_directory:
             Path(persist_directory).mkdir(parents=True, exist_ok=True)
             self.client = chromadb.PersistentClient(
@@ -68,14 +112,180 @@ def __init__(
                 settings=Settings(anonymized_telemetry=False),
             )
 
-        # Get or create collection
         self.collection = self.client.get_or_create_collection(
             name=collection_name,
             metadata={"hnsw:space": "cosine"},
         )
 
+    def add(self, ids, texts, metadatas, embeddings):
+        if embeddings:
+            self.collection.add(ids=ids, embeddings=embeddings, documents=texts, metadatas=metadatas)
+        else:
+            # Let ChromaDB use its default embedding
+            self.collection.add(ids=ids, documents=texts, metadatas=metadatas)
+
+    def query(self, query, query_embedding, n_results, where):
+        query_kwargs: Dict[str, Any] = {"n_results": n_results}
+        if query_embedding:
+            query_kwargs["query_embeddings"] = [query_embedding]
+        else:
+            query_kwargs["query_texts"] = [query]
+        if where:
+            query_kwargs["where"] = where
+
+        results = self.collection.query(**query_kwargs)
+
+        hits: List[SearchHit] = []
+        if results and results.get("documents"):
+            docs = results["documents"][0]
+            metadatas = results["metadatas"][0] if results.get("metadatas") else [{}] * len(docs)
+            distances = results["distances"][0] if results.get("distances") else [0.0] * len(docs)
+            ids = results["ids"][0] if results.get("ids") else [""] * len(docs)
+            for text, metadata, distance, doc_id in zip(docs, metadatas, distances, ids, strict=False):
+                # Convert distance to similarity score (cosine distance -> similarity)
+                hits.append((doc_id, text, metadata or {}, 1.0 - distance))
+        return hits
+
+    def delete(self, ids, where):
+        if ids:
+            self.collection.delete(ids=ids)
+            return len(ids)
+        if where:
+            self.collection.delete(where=where)
+            return -1  # Unknown count
+        return 0
+
+    def get(self, doc_id):
+        result = self.collection.get(ids=[doc_id])
+        if result and result.get("documents"):
+            metadata = result["metadatas"][0] if result.get("metadatas") else {}
+            return result["documents"][0], metadata or {}
+        return None
+
+    def list(self, limit, offset):
+        result = self.collection.get(limit=limit, offset=offset, include=["metadatas"])
+        rows = []
+        if result and result.get("ids"):
+            for i, doc_id in enumerate(result["ids"]):
+                metadata = result["metadatas"][i] if result.get("metadatas") else {}
+                rows.append((doc_id, metadata or {}))
+        return rows
+
+    def list_with_texts(self, limit, offset):
+        result = self.collection.get(limit=limit, offset=offset, include=["documents", "metadatas"])
+        rows = []
+        if result and result.get("ids"):
+            documents = result.get("documents") or []
+            metadatas = result.get("metadatas") or []
+            for i, doc_id in enumerate(result["ids"]):
+                text = documents[i] if i < len(documents) else ""
+                metadata = metadatas[i] if i < len(metadatas) else {}
+                rows.append((doc_id, text or "", metadata or {}))
+        return rows
+
+    def count(self):
+        return self.collection.count()
+
+    def clear(self):
+        self.client.delete_collection(self.collection_name)
+        self.collection = self.client.get_or_create_collection(
+            name=self.collection_name,
+            metadata={"hnsw:space": "cosine"},
+        )
+
+
+class LocalBackend(VectorBackend):
+    """Backend over `LocalVectorIndex`; needs caller-supplied embeddings."""
+
+    name = "local"
+
+    def __init__(self, collection_name: str, persist_directory: Optional[str]):
+        root = None
+        if persist_directory:
+            root = Path(persist_directory) / "local" / safe_collection_name(collection_name)
+        self.index = LocalVectorIndex(
+            root,
+            compact_segments=int(getattr(settings, "rag_local_compact_segments", 8) or 8),
+            ivf_threshold=int(getattr(settings, "rag_local_ivf_threshold", 50_000) or 50_000),
+            nprobe=int(getattr(settings, "rag_local_ivf_nprobe", 16) or 16),
+        )
+
+    def add(self, ids, texts, metadatas, embeddings):
+        if not embeddings:
+            raise ValueError("the local vector backend requires precomputed embeddings")
+        self.index.add(ids, embeddings, texts, metadatas)
+
+    def query(self, query, query_embedding, n_results, where):
+        if query_embedding is None:
+            raise ValueError("the local vector backend requires a query embedding")
+        return self.index.search(query_embedding, n_results=n_results, where=where)
+
+    def delete(self, ids, where):
+        return self.index.delete(ids=ids, where=where)
+
+    def get(self, doc_id):
+        return self.index.get(doc_id)
+
+    def list(self, limit, offset):
+        return self.index.list(limit=limit, offset=offset)
+
+    def list_with_texts(self, limit, offset):
+        return self.index.list(limit=limit, offset=offset, with_texts=True)
+
+    def count(self):
+        return self.index.count()
+
+    def clear(self):
+        self.index.clear()
+
+
+def create_backend(
+    collection_name: str,
+    persist_directory: Optional[str],
+    backend: Optional[str] = None,
+) -> VectorBackend:
+    """Build the backend named by `backend` (or the `rag_vector_backend` setting)."""
+    choice = str(backend or getattr(settings, "rag_vector_backend", "auto") or "auto").strip().lower()
+    if choice == "auto":
+        choice = "chroma" if CHROMADB_AVAILABLE or not NUMPY_AVAILABLE else "local"
+    if choice == "chroma":
+        return ChromaBackend(collection_name, persist_directory)
+    if choice == "local":
+        return LocalBackend(collection_name, persist_directory)
+    raise ValueError(f"Unknown vector backend: {choice!r} (expected auto, chroma or local)")
+
+
+class VectorStore:
+    """
+    Vector storage and retrieval over a pluggable backend.
+
+    Supports:
+    - Local persistent storage
+    - In-memory storage for testing
+    - Similarity search with metadata filtering
+    """
+
+    def __init__(
+        self,
+        collection_name: str = "weaver_documents",
+        persist_directory: Optional[str] = None,
+        embedding_function: Optional[Any] = None,
+        backend: Optional[str] = None,
+    ):
+        """
+        Initialize the vector store.
+
+        Args:
+            collection_name: Name of the collection
+            persist_directory: Directory for persistent storage (None for in-memory)
+            embedding_function: Optional custom embedding function
+            backend: "chroma", "local" or "auto" (defaults to settings.rag_vector_backend)
+        """
+        self.collection_name = collection_name
+        self.persist_directory = persist_directory
+        self.backend = create_backend(collection_name, persist_directory, backend)
         self.embedding_function = embedding_function
-        logger.info(f"Initialized vector store: {collection_name}")
+        logger.info(f"Initialized vector store: {collection_name} ({self.backend.name})")
 
     def add_documents(
         self,
@@ -95,7 +305,6 @@ def add_documents(
         if not documents:
             return []
 
-        # Prepare data for ChromaDB
         ids = [doc.chunk_id for doc in documents]
         texts = [doc.content for doc in documents]
         metadatas = [doc.metadata for doc in documents]
@@ -104,21 +313,7 @@ def add_documents(
         if embeddings is None and self.embedding_function:
             embeddings = self.embedding_function.embed_documents(texts)
 
-        # Add to collection
-        if embeddings:
-            self.collection.add(
-                ids=ids,
-                embeddings=embeddings,
-                documents=texts,
-                metadatas=metadatas,
-            )
-        else:
-            # Let ChromaDB use its default embedding
-            self.collection.add(
-                ids=ids,
-                documents=texts,
-                metadatas=metadatas,
-            )
+        self.backend.add(ids, texts, metadatas, embeddings)
 
         logger.info(f"Added {len(documents)} documents to vector store")
         return ids
@@ -146,41 +341,11 @@ def search(
         if query_embedding is None and self.embedding_function:
             query_embedding = self.embedding_function.embed_query(query)
 
-        # Build query kwargs
-        query_kwargs = {"n_results": n_results}
-
-        if query_embedding:
-            query_kwargs["query_embeddings"] = [query_embedding]
-        else:
-            query_kwargs["query_texts"] = [query]
-
-        if filter_metadata:
-            query_kwargs["where"] = filter_metadata
-
-        # Execute search
-        results = self.collection.query(**query_kwargs)
-
-        # Convert to Document objects
-        documents_with_scores = []
-
-        if results and results.get("documents"):
-            docs = results["documents"][0]
-            metadatas = results["metadatas"][0] if results.get("metadatas") else [{}] * len(docs)
-            distances = results["distances"][0] if results.get("distances") else [0.0] * len(docs)
-            ids = results["ids"][0] if results.get("ids") else [""] * len(docs)
-
-            for i, (text, metadata, distance, doc_id) in enumerate(zip(docs, metadatas, distances, ids)):
-                # Convert distance to similarity score (cosine distance -> similarity)
-                score = 1.0 - distance
-
-                doc = Document(
-                    content=text,
-                    metadata=metadata,
-                    chunk_id=doc_id,
-                )
-                documents_with_scores.append((doc, score))
-
-        return documents_with_scores
+        hits = self.backend.query(query, query_embedding, n_results, filter_metadata)
+        return [
+            (Document(content=text, metadata=metadata, chunk_id=doc_id), score)
+            for doc_id, text, metadata, score in hits
+        ]
 
     def delete_documents(
         self,
@@ -195,16 +360,10 @@ def delete_documents(
             filter_metadata: Delete documents matching this filter
 
         Returns:
-            Number of documents deleted
+            Number of documents deleted (-1 when the backend cannot tell)
         """
         try:
-            if ids:
-                self.collection.delete(ids=ids)
-                return len(ids)
-            elif filter_metadata:
-                self.collection.delete(where=filter_metadata)
-                return -1  # Unknown count
-            return 0
+            return self.backend.delete(ids, filter_metadata)
         except Exception as e:
             logger.error(f"Delete error: {e}")
             return 0
@@ -220,13 +379,10 @@ def get_document(self, doc_id: str) -> Optional[Document]:
             Document if found, None otherwise
         """
         try:
-            result = self.collection.get(ids=[doc_id])
-            if result and result.get("documents"):
-                return Document(
-                    content=result["documents"][0],
-                    metadata=result["metadatas"][0] if result.get("metadatas") else {},
-                    chunk_id=doc_id,
-                )
+            found = self.backend.get(doc_id)
+            if found is not None:
+                text, metadata = found
+                return Document(content=text, metadata=metadata, chunk_id=doc_id)
         except Exception as e:
             logger.error(f"Get document error: {e}")
         return None
@@ -247,35 +403,35 @@ def list_documents(
             List of document metadata dicts
         """
         try:
-            result = self.collection.get(
-                limit=limit,
-                offset=offset,
-                include=["metadatas"],
-            )
-
-            documents = []
-            if result and result.get("ids"):
-                for i, doc_id in enumerate(result["ids"]):
-                    metadata = result["metadatas"][i] if result.get("metadatas") else {}
-                    documents.append({
-                        "id": doc_id,
-                        **metadata,
-                    })
-            return documents
-
+            return [{"id": doc_id, **metadata} for doc_id, metadata in self.backend.list(limit, offset)]
         except Exception as e:
             logger.error(f"List documents error: {e}")
             return []
 
+    def iter_documents(self, batch_size: int = 500) -> Iterator[List[Document]]:
+        """
+        Yield every stored chunk, `batch_size` at a time, with its text.
+
+        Each batch is one backend read, not one lookup per chunk.
+        """
+        offset = 0
+        while True:
+            rows = self.backend.list_with_texts(batch_size, offset)
+            if not rows:
+                return
+            yield [
+                Document(content=text, metadata=metadata, chunk_id=doc_id)
+                for doc_id, text, metadata in rows
+            ]
+            if len(rows) < batch_size:
+                return
+            offset += len(rows)
+
     def count(self) -> int:
         """Get the number of documents in the store."""
-        return self.collection.count()
+        return self.backend.count()
 
     def clear(self) -> None:
         """Delete all documents from the store."""
-        self.client.delete_collection(self.collection_name)
-        self.collection = self.client.get_or_create_collection(
-            name=self.collection_name,
-            metadata={"hnsw:space": "cosine"},
-        )
+        self.backend.clear()
         logger.info(f"Cleared vector store: {self.collection_name}")
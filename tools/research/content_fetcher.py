@@ -1,19 +1,28 @@
 from __future__ import annotations
 
+import asyncio
 import html
 import ipaddress
 import re
 import threading
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 from typing import Optional
 from urllib.parse import urlsplit
 
-import requests
-
 from agent.workflows.source_registry import SourceRegistry
 from common.config import settings
+from common.http_client import get_async_http_client, get_http_session
+from common.single_flight import get_single_flight
 from tools.research.models import FetchedPage, truncate_bytes
-from tools.research.page_cache import get_fetched_page_cache
+from tools.research.page_cache import (
+    FetchedPageCache,
+    PersistedPage,
+    PersistentPageCache,
+    get_fetched_page_cache,
+    get_persistent_page_cache,
+)
 from tools.research.reader_client import ReaderClient
 
 DEFAULT_UA = (
@@ -34,19 +43,26 @@ def _strip_html(html: str) -> str:
     return text
 
 
-def _content_type(headers: object) -> str:
+def _header(headers: object, name: str) -> str:
     if not headers:
         return ""
     getter = getattr(headers, "get", None)
     if not callable(getter):
         return ""
     try:
-        value = getter("content-type") or getter("Content-Type") or getter("CONTENT-TYPE")
+        value = getter(name.lower()) or getter(name.title()) or getter(name.upper())
+        if not value and isinstance(headers, dict):
+            wanted = name.lower()
+            value = next((v for k, v in headers.items() if str(k).lower() == wanted), None)
     except Exception:
         return ""
     return str(value) if value else ""
 
 
+def _content_type(headers: object) -> str:
+    return _header(headers, "content-type")
+
+
 def _html_to_markdown(html: str) -> str:
     if not html:
         return ""
@@ -125,12 +141,16 @@ def _is_blocked_fetch_target(url: str) -> bool:
     )
 
 
-def _read_response_bytes(resp: object) -> bytes:
+def _response_limit() -> int:
     max_bytes = getattr(settings, "research_fetch_max_bytes", 0)
     try:
-        limit = int(max_bytes)
+        return int(max_bytes)
     except Exception:
-        limit = 0
+        return 0
+
+
+def _read_response_bytes(resp: object) -> bytes:
+    limit = _response_limit()
 
     iterator = getattr(resp, "iter_content", None)
     if callable(iterator):
@@ -167,33 +187,218 @@ def _read_response_bytes(resp: object) -> bytes:
     return truncate_bytes(bytes(data), max_bytes=limit)
 
 
-def _extract_body_from_response(resp: object) -> tuple[str, Optional[str], Optional[str], Optional[int], str]:
-    status_code: Optional[int]
+async def _aread_response_bytes(resp: object) -> bytes:
+    limit = _response_limit()
+
+    iterator = getattr(resp, "aiter_bytes", None)
+    if not callable(iterator):
+        return b""
+
+    chunks: list[bytes] = []
+    total = 0
     try:
-        status_code = int(getattr(resp, "status_code", None))
+        async for chunk in iterator():
+            if not chunk:
+                continue
+            chunk_bytes = bytes(chunk)
+            if limit > 0:
+                remaining = limit - total
+                if remaining <= 0:
+                    break
+                if len(chunk_bytes) > remaining:
+                    chunks.append(chunk_bytes[:remaining])
+                    total += remaining
+                    break
+            chunks.append(chunk_bytes)
+            total += len(chunk_bytes)
     except Exception:
-        status_code = None
+        return b""
+    return b"".join(chunks)
 
-    headers = getattr(resp, "headers", None)
-    content_type = _content_type(headers).lower()
 
-    raw_bytes = _read_response_bytes(resp)
+def _status_code_of(resp: object) -> Optional[int]:
+    try:
+        return int(getattr(resp, "status_code", None))
+    except Exception:
+        return None
+
 
+def _decode_body(
+    raw_bytes: bytes,
+    *,
+    content_type: str,
+    fallback_text: str = "",
+) -> tuple[str, Optional[str], Optional[str]]:
     if raw_bytes:
         decoded = raw_bytes.decode("utf-8", errors="replace")
     else:
-        decoded = str(getattr(resp, "text", "") or "")
+        decoded = fallback_text
 
-    markdown: Optional[str] = None
     if "html" in content_type:
         title = _extract_title_from_html(decoded) or None
         text = _strip_html(decoded)
+        markdown: Optional[str] = None
         if bool(getattr(settings, "research_fetch_extract_markdown", True)):
             md = _html_to_markdown(decoded)
             markdown = md or None
-        return text, markdown, title, status_code, content_type
+        return text, markdown, title
+
+    return decoded, None, None
+
+
+def _extract_body_from_response(resp: object) -> tuple[str, Optional[str], Optional[str], Optional[int], str]:
+    status_code = _status_code_of(resp)
+    content_type = _content_type(getattr(resp, "headers", None)).lower()
+    raw_bytes = _read_response_bytes(resp)
+    fallback_text = "" if raw_bytes else str(getattr(resp, "text", "") or "")
+    text, markdown, title = _decode_body(raw_bytes, content_type=content_type, fallback_text=fallback_text)
+    return text, markdown, title, status_code, content_type
+
+
+async def _aextract_body_from_response(
+    resp: object,
+) -> tuple[str, Optional[str], Optional[str], Optional[int], str]:
+    status_code = _status_code_of(resp)
+    content_type = _content_type(getattr(resp, "headers", None)).lower()
+    raw_bytes = await _aread_response_bytes(resp)
+    text, markdown, title = _decode_body(raw_bytes, content_type=content_type)
+    return text, markdown, title, status_code, content_type
+
+
+@dataclass(slots=True)
+class _FetchContext:
+    canonical_url: str
+    raw_url: str
+    cache: Optional[FetchedPageCache]
+    cache_key: str
+    disk_cache: Optional[PersistentPageCache] = None
+    # Stale disk entry with validators; the direct request is sent as a conditional GET.
+    stale: Optional[PersistedPage] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def request_headers(self) -> dict[str, str]:
+        headers = {"User-Agent": DEFAULT_UA}
+        if self.stale is not None:
+            if self.stale.etag:
+                headers["If-None-Match"] = self.stale.etag
+            if self.stale.last_modified:
+                headers["If-Modified-Since"] = self.stale.last_modified
+        return headers
+
+    def record_validators(self, resp: object) -> None:
+        headers = getattr(resp, "headers", None)
+        self.etag = _header(headers, "etag") or None
+        self.last_modified = _header(headers, "last-modified") or None
+
+    def not_modified(self, resp: object) -> Optional[FetchedPage]:
+        """Return the stored page when the origin answered our conditional GET with 304."""
+        if self.stale is None:
+            return None
+        if _status_code_of(resp) != 304:
+            if self.disk_cache is not None:
+                self.disk_cache.record_revalidate_modified()
+            return None
+        page = self.stale.page
+        page.raw_url = self.raw_url
+        if self.disk_cache is not None:
+            self.disk_cache.mark_revalidated(self.cache_key)
+        if self.cache is not None:
+            self.cache.set(self.cache_key, page)
+        return page
+
+    async def anot_modified(self, resp: object) -> Optional[FetchedPage]:
+        """`not_modified` with the SQLite update run in a worker thread."""
+        if self.stale is None:
+            return None
+        return await asyncio.to_thread(self.not_modified, resp)
+
+    async def amaybe_cache(self, page: FetchedPage) -> None:
+        """`maybe_cache` with the disk store (zlib + SQLite) run in a worker thread."""
+        if self.disk_cache is None:
+            self.maybe_cache(page)
+            return
+        await asyncio.to_thread(self.maybe_cache, page)
+
+    def maybe_cache(self, page: FetchedPage) -> None:
+        if not self.cache_key:
+            return
+        ok = page.http_status == 200 and bool(page.text or page.markdown)
+        if self.cache is not None:
+            store_errors = bool(getattr(settings, "research_fetch_cache_store_errors", False))
+            if ok or (store_errors and page.error):
+                self.cache.set(self.cache_key, page)
+        if self.disk_cache is not None and ok:
+            # Validators only describe the direct response, not reader/render output.
+            direct = page.method == "direct_http"
+            self.disk_cache.store(
+                self.cache_key,
+                page,
+                etag=self.etag if direct else None,
+                last_modified=self.last_modified if direct else None,
+            )
+
 
-    return decoded, None, None, status_code, content_type
+@dataclass(slots=True)
+class _FallbackPlan:
+    """What to try after the direct request, in order, before settling on `final`."""
+
+    steps: list[str]
+    final: FetchedPage
+
+
+def _render_mode() -> str:
+    return str(getattr(settings, "research_fetch_render_mode", "off") or "off").strip().lower()
+
+
+def _plan_after_direct_error(ctx: _FetchContext, exc: Exception) -> _FallbackPlan:
+    direct_attempt = FetchedPage(
+        url=ctx.canonical_url,
+        raw_url=ctx.raw_url,
+        method="direct_http",
+        attempts=1,
+        error=str(exc),
+        retrieved_at=_now_iso(),
+    )
+    return _FallbackPlan(steps=["render", "reader"], final=direct_attempt)
+
+
+def _plan_after_direct_response(
+    ctx: _FetchContext,
+    body: tuple[str, Optional[str], Optional[str], Optional[int], str],
+) -> _FallbackPlan:
+    text, markdown, title, status_code, content_type = body
+    direct_attempt = FetchedPage(
+        url=ctx.canonical_url,
+        raw_url=ctx.raw_url,
+        method="direct_http",
+        attempts=1,
+        text=text or None,
+        title=title,
+        markdown=markdown,
+        http_status=status_code,
+        retrieved_at=_now_iso(),
+    )
+
+    render_mode = _render_mode()
+    min_chars = int(getattr(settings, "research_fetch_render_min_chars", 200) or 200)
+
+    if status_code == 200 and (text or "").strip():
+        wants_render = (
+            render_mode != "off"
+            and "html" in content_type
+            and (
+                _looks_like_javascript_interstitial(text)
+                or len((text or "").strip()) < max(1, min_chars)
+            )
+        )
+        return _FallbackPlan(steps=["render"] if wants_render else [], final=direct_attempt)
+
+    steps: list[str] = []
+    if render_mode != "off" and ("html" in content_type or status_code != 200):
+        steps.append("render")
+    steps.append("reader")
+    return _FallbackPlan(steps=steps, final=direct_attempt)
 
 
 class ContentFetcher:
@@ -225,19 +430,47 @@ def _reader_method_label(self) -> str:
             return "reader_self_hosted" if self._reader_self_hosted_base else "reader_public"
         return "reader_unknown"
 
-    def _fetch_via_reader(self, canonical_url: str, raw_url: str, *, attempts: int) -> Optional[FetchedPage]:
+    def _reader_url(self, canonical_url: str) -> Optional[str]:
         try:
             client = ReaderClient(
                 mode=self._reader_mode,
                 public_base=self._reader_public_base,
                 self_hosted_base=self._reader_self_hosted_base,
             )
-            reader_url = client.build_reader_url(canonical_url)
+            return client.build_reader_url(canonical_url)
         except Exception:
             return None
 
+    def _reader_page(
+        self,
+        canonical_url: str,
+        raw_url: str,
+        body: tuple[str, Optional[str], Optional[str], Optional[int], str],
+        *,
+        attempts: int,
+    ) -> Optional[FetchedPage]:
+        text, markdown, title, status_code, _content_type = body
+        if status_code == 200 and (text or "").strip():
+            return FetchedPage(
+                url=canonical_url,
+                raw_url=raw_url,
+                method=self._reader_method_label(),
+                text=text,
+                title=title,
+                markdown=markdown,
+                http_status=status_code,
+                attempts=attempts,
+                retrieved_at=_now_iso(),
+            )
+        return None
+
+    def _fetch_via_reader(self, canonical_url: str, raw_url: str, *, attempts: int) -> Optional[FetchedPage]:
+        reader_url = self._reader_url(canonical_url)
+        if not reader_url:
+            return None
+
         try:
-            resp = requests.get(
+            resp = get_http_session().get(
                 reader_url,
                 timeout=settings.research_fetch_timeout_s,
                 headers={"User-Agent": DEFAULT_UA},
@@ -247,24 +480,32 @@ def _fetch_via_reader(self, canonical_url: str, raw_url: str, *, attempts: int)
             return None
 
         try:
-            text, markdown, title, status_code, _content_type = _extract_body_from_response(resp)
+            body = _extract_body_from_response(resp)
         finally:
             closer = getattr(resp, "close", None)
             if callable(closer):
                 closer()
-        if status_code == 200 and (text or "").strip():
-            return FetchedPage(
-                url=canonical_url,
-                raw_url=raw_url,
-                method=self._reader_method_label(),
-                text=text,
-                title=title,
-                markdown=markdown,
-                http_status=status_code,
-                attempts=attempts,
-                retrieved_at=_now_iso(),
-            )
-        return None
+        return self._reader_page(canonical_url, raw_url, body, attempts=attempts)
+
+    async def _afetch_via_reader(
+        self, canonical_url: str, raw_url: str, *, attempts: int
+    ) -> Optional[FetchedPage]:
+        reader_url = self._reader_url(canonical_url)
+        if not reader_url:
+            return None
+
+        try:
+            client = get_async_http_client()
+            async with client.stream(
+                "GET",
+                reader_url,
+                timeout=settings.research_fetch_timeout_s,
+                headers={"User-Agent": DEFAULT_UA},
+            ) as resp:
+                body = await _aextract_body_from_response(resp)
+        except Exception:
+            return None
+        return self._reader_page(canonical_url, raw_url, body, attempts=attempts)
 
     def _fetch_via_crawler(self, canonical_url: str, raw_url: str, *, attempts: int) -> Optional[FetchedPage]:
         mode = str(getattr(settings, "research_fetch_render_mode", "off") or "off").strip().lower()
@@ -311,7 +552,8 @@ def _fetch_via_crawler(self, canonical_url: str, raw_url: str, *, attempts: int)
             retrieved_at=_now_iso(),
         )
 
-    def fetch(self, url: str) -> FetchedPage:
+    def _prepare_fetch(self, url: str) -> FetchedPage | _FetchContext:
+        """Canonicalize + guard + cache lookup; returns a page when no request is needed."""
         raw_url = (url or "").strip()
         canonical_url = self._registry.canonicalize_url(raw_url)
         if not canonical_url:
@@ -332,97 +574,130 @@ def fetch(self, url: str) -> FetchedPage:
             )
 
         cache = get_fetched_page_cache()
-        cache_key = ""
+        disk_cache = get_persistent_page_cache()
+        # Also the single-flight key, so it is computed even with caching disabled.
+        reader_mode = (self._reader_mode or "").strip().lower()
+        cache_key = f"{canonical_url}::render={_render_mode()}::reader={reader_mode}"
         if cache is not None:
-            reader_mode = (self._reader_mode or "").strip().lower()
-            render_mode = str(getattr(settings, "research_fetch_render_mode", "off") or "off").strip().lower()
-            cache_key = f"{canonical_url}::render={render_mode}::reader={reader_mode}"
             cached = cache.get(cache_key)
             if cached and (cached.text or cached.markdown or cached.error):
                 cached.raw_url = raw_url
                 return cached
 
-        direct_attempt = FetchedPage(
-            url=canonical_url,
+        stale: Optional[PersistedPage] = None
+        if disk_cache is not None:
+            persisted = disk_cache.lookup(cache_key)
+            if persisted is not None and persisted.fresh:
+                if cache is not None:
+                    cache.set(cache_key, persisted.page)
+                persisted.page.raw_url = raw_url
+                return persisted.page
+            if persisted is not None and persisted.revalidatable:
+                stale = persisted
+
+        return _FetchContext(
+            canonical_url=canonical_url,
             raw_url=raw_url,
-            method="direct_http",
-            attempts=1,
+            cache=cache,
+            cache_key=cache_key,
+            disk_cache=disk_cache,
+            stale=stale,
         )
 
-        def _maybe_cache(page: FetchedPage) -> None:
-            if cache is None or not cache_key:
-                return
-            store_errors = bool(getattr(settings, "research_fetch_cache_store_errors", False))
-            if (page.http_status == 200 and (page.text or page.markdown)) or (store_errors and page.error):
-                cache.set(cache_key, page)
+    def _run_fallbacks(self, ctx: _FetchContext, plan: _FallbackPlan) -> FetchedPage:
+        for step in plan.steps:
+            if step == "render":
+                page = self._fetch_via_crawler(ctx.canonical_url, ctx.raw_url, attempts=2)
+            else:
+                page = self._fetch_via_reader(ctx.canonical_url, ctx.raw_url, attempts=2)
+            if page:
+                ctx.maybe_cache(page)
+                return page
+        ctx.maybe_cache(plan.final)
+        return plan.final
+
+    async def _arun_fallbacks(self, ctx: _FetchContext, plan: _FallbackPlan) -> FetchedPage:
+        for step in plan.steps:
+            if step == "render":
+                # Rendering drives a (sync) headless browser; keep it off the event loop.
+                page = await asyncio.to_thread(
+                    self._fetch_via_crawler, ctx.canonical_url, ctx.raw_url, attempts=2
+                )
+            else:
+                page = await self._afetch_via_reader(ctx.canonical_url, ctx.raw_url, attempts=2)
+            if page:
+                await ctx.amaybe_cache(page)
+                return page
+        await ctx.amaybe_cache(plan.final)
+        return plan.final
+
+    def fetch(self, url: str) -> FetchedPage:
+        prepared = self._prepare_fetch(url)
+        if isinstance(prepared, FetchedPage):
+            return prepared
+        ctx = prepared
+
+        # Concurrent fetches of the same page (threads or asyncio) share one download.
+        page, shared = get_single_flight("fetch").do(ctx.cache_key, lambda: self._fetch_once(ctx))
+        return replace(page, raw_url=ctx.raw_url) if shared else page
 
+    def _fetch_once(self, ctx: _FetchContext) -> FetchedPage:
         try:
-            resp = requests.get(
-                canonical_url,
+            resp = get_http_session().get(
+                ctx.canonical_url,
                 timeout=settings.research_fetch_timeout_s,
-                headers={"User-Agent": DEFAULT_UA},
+                headers=ctx.request_headers(),
                 stream=True,
             )
         except Exception as exc:
-            direct_attempt.error = str(exc)
-            direct_attempt.retrieved_at = _now_iso()
-            render_attempt = self._fetch_via_crawler(canonical_url, raw_url, attempts=2)
-            if render_attempt:
-                _maybe_cache(render_attempt)
-                return render_attempt
-
-            reader_attempt = self._fetch_via_reader(canonical_url, raw_url, attempts=2)
-            final = reader_attempt or direct_attempt
-            _maybe_cache(final)
-            return final
+            return self._run_fallbacks(ctx, _plan_after_direct_error(ctx, exc))
 
         try:
-            text, markdown, title, status_code, content_type = _extract_body_from_response(resp)
+            revalidated = ctx.not_modified(resp)
+            if revalidated is not None:
+                return revalidated
+            ctx.record_validators(resp)
+            body = _extract_body_from_response(resp)
         finally:
             closer = getattr(resp, "close", None)
             if callable(closer):
                 closer()
 
-        direct_attempt.text = text or None
-        direct_attempt.title = title
-        direct_attempt.markdown = markdown
-        direct_attempt.http_status = status_code
-        direct_attempt.retrieved_at = _now_iso()
+        return self._run_fallbacks(ctx, _plan_after_direct_response(ctx, body))
 
-        render_mode = str(getattr(settings, "research_fetch_render_mode", "off") or "off").strip().lower()
-        min_chars = int(getattr(settings, "research_fetch_render_min_chars", 200) or 200)
+    async def afetch(self, url: str) -> FetchedPage:
+        """Async counterpart of `fetch` built on the shared `httpx.AsyncClient`."""
+        # The disk cache lookup (SQLite + zlib) must not block the event loop.
+        prepared = await asyncio.to_thread(self._prepare_fetch, url)
+        if isinstance(prepared, FetchedPage):
+            return prepared
+        ctx = prepared
 
-        if status_code == 200 and (text or "").strip():
-            if render_mode != "off" and "html" in content_type and _looks_like_javascript_interstitial(text):
-                render_attempt = self._fetch_via_crawler(canonical_url, raw_url, attempts=2)
-                if render_attempt:
-                    _maybe_cache(render_attempt)
-                    return render_attempt
-
-            if (
-                render_mode != "off"
-                and "html" in content_type
-                and len((text or "").strip()) < max(1, min_chars)
-            ):
-                render_attempt = self._fetch_via_crawler(canonical_url, raw_url, attempts=2)
-                if render_attempt:
-                    _maybe_cache(render_attempt)
-                    return render_attempt
-            _maybe_cache(direct_attempt)
-            return direct_attempt
-
-        if render_mode != "off" and ("html" in content_type or status_code != 200):
-            render_attempt = self._fetch_via_crawler(canonical_url, raw_url, attempts=2)
-            if render_attempt:
-                _maybe_cache(render_attempt)
-                return render_attempt
-
-        reader_attempt = self._fetch_via_reader(canonical_url, raw_url, attempts=2)
-        final = reader_attempt or direct_attempt
-        _maybe_cache(final)
-        return final
+        page, shared = await get_single_flight("fetch").ado(
+            ctx.cache_key, lambda: self._afetch_once(ctx)
+        )
+        return replace(page, raw_url=ctx.raw_url) if shared else page
 
-    def fetch_many(self, urls: list[str]) -> list[FetchedPage]:
+    async def _afetch_once(self, ctx: _FetchContext) -> FetchedPage:
+        try:
+            client = get_async_http_client()
+            async with client.stream(
+                "GET",
+                ctx.canonical_url,
+                timeout=settings.research_fetch_timeout_s,
+                headers=ctx.request_headers(),
+            ) as resp:
+                revalidated = await ctx.anot_modified(resp)
+                if revalidated is not None:
+                    return revalidated
+                ctx.record_validators(resp)
+                body = await _aextract_body_from_response(resp)
+        except Exception as exc:
+            return await self._arun_fallbacks(ctx, _plan_after_direct_error(ctx, exc))
+
+        return await self._arun_fallbacks(ctx, _plan_after_direct_response(ctx, body))
+
+    def _dedupe_candidates(self, urls: list[str]) -> list[str]:
         candidates: list[str] = []
         seen: set[str] = set()
         for raw in urls or []:
@@ -431,10 +706,10 @@ def fetch_many(self, urls: list[str]) -> list[FetchedPage]:
                 continue
             seen.add(canonical)
             candidates.append(canonical)
+        return candidates
 
-        if not candidates:
-            return []
-
+    @staticmethod
+    def _concurrency_limits() -> tuple[int, int]:
         try:
             max_workers = max(1, int(getattr(settings, "research_fetch_concurrency", 6) or 6))
         except Exception:
@@ -444,6 +719,14 @@ def fetch_many(self, urls: list[str]) -> list[FetchedPage]:
             per_domain = int(getattr(settings, "research_fetch_concurrency_per_domain", 2) or 2)
         except Exception:
             per_domain = 2
+        return max_workers, per_domain
+
+    def fetch_many(self, urls: list[str]) -> list[FetchedPage]:
+        candidates = self._dedupe_candidates(urls)
+        if not candidates:
+            return []
+
+        max_workers, per_domain = self._concurrency_limits()
 
         if per_domain <= 0:
             from concurrent.futures import ThreadPoolExecutor
@@ -475,3 +758,42 @@ def _fetch_with_domain_limit(target_url: str) -> FetchedPage:
 
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             return list(executor.map(_fetch_with_domain_limit, candidates))
+
+    async def afetch_many(self, urls: list[str]) -> AsyncIterator[FetchedPage]:
+        """
+        Fetch URLs concurrently on the event loop and yield pages in completion order.
+
+        Honors the same global (`research_fetch_concurrency`) and per-domain
+        (`research_fetch_concurrency_per_domain`) limits as `fetch_many`, without
+        a thread per request. Pending fetches are cancelled if the consumer stops early.
+        """
+        candidates = self._dedupe_candidates(urls)
+        if not candidates:
+            return
+
+        max_workers, per_domain = self._concurrency_limits()
+        global_sem = asyncio.Semaphore(max_workers)
+        domain_sems: dict[str, asyncio.Semaphore] = {}
+
+        async def _fetch_limited(target_url: str) -> FetchedPage:
+            if per_domain <= 0:
+                async with global_sem:
+                    return await self.afetch(target_url)
+
+            domain = urlsplit(target_url).netloc.lower()
+            domain_sem = domain_sems.get(domain)
+            if domain_sem is None:
+                domain_sem = asyncio.Semaphore(per_domain)
+                domain_sems[domain] = domain_sem
+            # Take the domain slot first so a busy host doesn't hold a global slot idle.
+            async with domain_sem, global_sem:
+                return await self.afetch(target_url)
+
+        tasks = [asyncio.ensure_future(_fetch_limited(u)) for u in candidates]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
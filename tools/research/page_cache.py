@@ -1,14 +1,21 @@
 from __future__ import annotations
 
+import json
+import logging
+import sqlite3
 import threading
 import time
+import zlib
 from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional
+from pathlib import Path
+from typing import Any, Dict, Optional
 
 from common.config import settings
 from tools.research.models import FetchedPage
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass(frozen=True, slots=True)
 class _CacheEntry:
@@ -86,3 +93,280 @@ def clear_fetched_page_cache() -> None:
             _cache.clear()
         _cache = None
 
+
+@dataclass(slots=True)
+class PersistedPage:
+    page: FetchedPage
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fresh: bool
+
+    @property
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+
+class PersistentPageCache:
+    """
+    SQLite-backed fetched-page cache shared across restarts and uvicorn workers.
+
+    Bodies are stored zlib-compressed with their ETag/Last-Modified validators.
+    Entries older than `ttl_s` are stale: callers revalidate them with a
+    conditional GET and call `mark_revalidated` on 304. The file is kept under
+    `max_bytes` (compressed) by evicting least-recently-accessed entries.
+
+    Methods do blocking SQLite and zlib work; async callers run them in a thread.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS fetched_pages (
+            key TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            payload BLOB NOT NULL,
+            etag TEXT,
+            last_modified TEXT,
+            stored_at REAL NOT NULL,
+            fresh_until REAL NOT NULL,
+            accessed_at REAL NOT NULL,
+            size_bytes INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_fetched_pages_accessed ON fetched_pages(accessed_at);
+    """
+
+    def __init__(self, path: str | Path, *, ttl_s: float, max_bytes: int) -> None:
+        self.path = Path(path)
+        self.ttl_s = float(ttl_s)
+        self.max_bytes = max(1, int(max_bytes))
+        self._lock = threading.RLock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=10.0, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self._SCHEMA)
+            self._conn.commit()
+            # Running size of the stored payloads, so stores never re-scan the table.
+            # Other processes sharing the file are not seen here; eviction re-reads
+            # the true total before deleting anything.
+            self._total_bytes = self._sum_bytes_locked()
+
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.revalidated = 0
+        self.revalidate_modified = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _encode(page: FetchedPage) -> bytes:
+        raw = json.dumps(page.to_dict(), ensure_ascii=False).encode("utf-8")
+        return zlib.compress(raw, 6)
+
+    @staticmethod
+    def _decode(blob: bytes) -> Optional[FetchedPage]:
+        try:
+            payload = json.loads(zlib.decompress(blob).decode("utf-8"))
+            return FetchedPage(**dict(payload))
+        except Exception:
+            return None
+
+    def lookup(self, key: str) -> Optional[PersistedPage]:
+        if not key:
+            return None
+
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, etag, last_modified, fresh_until, size_bytes "
+                "FROM fetched_pages WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            page = self._decode(row[0])
+            if page is None:
+                self._conn.execute("DELETE FROM fetched_pages WHERE key = ?", (key,))
+                self._conn.commit()
+                self._total_bytes = max(0, self._total_bytes - int(row[4]))
+                self.misses += 1
+                return None
+
+            fresh = float(row[3]) > now
+            if fresh:
+                self.hits += 1
+                self._conn.execute(
+                    "UPDATE fetched_pages SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+                self._conn.commit()
+            else:
+                self.stale += 1
+            return PersistedPage(page=page, etag=row[1], last_modified=row[2], fresh=fresh)
+
+    def store(
+        self,
+        key: str,
+        page: FetchedPage,
+        *,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        if not key:
+            return
+
+        blob = self._encode(page)
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT size_bytes FROM fetched_pages WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO fetched_pages
+                    (key, url, payload, etag, last_modified,
+                     stored_at, fresh_until, accessed_at, size_bytes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    key,
+                    page.url or "",
+                    blob,
+                    etag or None,
+                    last_modified or None,
+                    now,
+                    now + max(0.0, self.ttl_s),
+                    now,
+                    len(blob),
+                ),
+            )
+            self.stores += 1
+            self._total_bytes += len(blob) - (int(previous[0]) if previous else 0)
+            self._evict_locked()
+            self._conn.commit()
+
+    def mark_revalidated(self, key: str) -> None:
+        """Record a 304 for `key`: the stored body is fresh again for another TTL."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE fetched_pages SET fresh_until = ?, accessed_at = ? WHERE key = ?",
+                (now + max(0.0, self.ttl_s), now, key),
+            )
+            self._conn.commit()
+            self.revalidated += 1
+
+    def record_revalidate_modified(self) -> None:
+        with self._lock:
+            self.revalidate_modified += 1
+
+    def _sum_bytes_locked(self) -> int:
+        row = self._conn.execute(
+            "SELECT COALESCE(SUM(size_bytes), 0) FROM fetched_pages"
+        ).fetchone()
+        return int(row[0])
+
+    def _evict_locked(self) -> None:
+        if self._total_bytes <= self.max_bytes:
+            return
+        # Over budget by our count: re-read the true total (other workers may have
+        # written or evicted) before deciding what to drop.
+        total = self._sum_bytes_locked()
+        if total <= self.max_bytes:
+            self._total_bytes = total
+            return
+
+        # Evict down to 90% so the next few stores do not immediately evict again.
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute(
+            "SELECT key, size_bytes FROM fetched_pages ORDER BY accessed_at ASC"
+        ).fetchall()
+        doomed = []
+        for key, size in rows:
+            if total <= target:
+                break
+            doomed.append((key,))
+            total -= int(size)
+        self._conn.executemany("DELETE FROM fetched_pages WHERE key = ?", doomed)
+        self.evictions += len(doomed)
+        self._total_bytes = total
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM fetched_pages")
+            self._conn.commit()
+            self._total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.stale = 0
+            self.revalidated = 0
+            self.revalidate_modified = 0
+            self.stores = 0
+            self.evictions = 0
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM fetched_pages"
+            ).fetchone()
+            lookups = self.hits + self.stale + self.misses
+            return {
+                "entries": int(count),
+                "size_bytes": int(size),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "revalidated": self.revalidated,
+                "revalidate_modified": self.revalidate_modified,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "hit_rate": round((self.hits + self.revalidated) / max(lookups, 1), 3),
+            }
+
+
+_disk_cache: Optional[PersistentPageCache] = None
+
+
+def get_persistent_page_cache() -> Optional[PersistentPageCache]:
+    if not bool(getattr(settings, "research_fetch_disk_cache_enabled", False)):
+        return None
+
+    path = str(getattr(settings, "research_fetch_disk_cache_path", "") or "").strip()
+    ttl_s = float(getattr(settings, "research_fetch_disk_cache_ttl_s", 0.0) or 0.0)
+    max_bytes = int(getattr(settings, "research_fetch_disk_cache_max_bytes", 0) or 0)
+    if not path or max_bytes <= 0:
+        return None
+
+    global _disk_cache
+    with _cache_lock:
+        if (
+            _disk_cache is None
+            or str(_disk_cache.path) != str(Path(path))
+            or _disk_cache.ttl_s != ttl_s
+            or _disk_cache.max_bytes != max_bytes
+        ):
+            if _disk_cache is not None:
+                _disk_cache.close()
+            try:
+                _disk_cache = PersistentPageCache(path, ttl_s=ttl_s, max_bytes=max_bytes)
+            except Exception as e:
+                logger.warning(f"[page_cache] persistent cache unavailable at {path}: {e}")
+                _disk_cache = None
+        return _disk_cache
+
+
+def close_persistent_page_cache() -> None:
+    global _disk_cache
+    with _cache_lock:
+        if _disk_cache is not None:
+            _disk_cache.close()
+        _disk_cache = None
@@ -11,6 +11,7 @@
 4. Quality scoring per provider based on historical accuracy
 """
 
+import contextvars
 import copy
 import hashlib
 import importlib.util
@@ -19,15 +20,18 @@
 import re
 import time
 from abc import ABC, abstractmethod
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from difflib import SequenceMatcher
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional
 from urllib.parse import parse_qsl, urlencode, urlparse, urlsplit, urlunsplit
 
 from agent.core.search_cache import get_search_cache
 from common.config import settings
+from common.http_client import get_http_session
+from common.latency_metrics import observe, search_provider_duration_seconds
+from common.near_duplicates import NearDuplicateIndex
 from tools.search.reliability import ProviderReliabilityManager, ReliabilityPolicy
 
 logger = logging.getLogger(__name__)
@@ -87,6 +91,7 @@ class SearchStrategy(str, Enum):
     PARALLEL = "parallel"  # Query all providers in parallel, merge results
     ROUND_ROBIN = "round_robin"  # Distribute queries across providers
     BEST_FIRST = "best_first"  # Use best performing provider first
+    HEDGED = "hedged"  # Best provider first; backup request if it is slower than its p90
 
 
 @dataclass
@@ -129,6 +134,11 @@ def to_dict(self) -> Dict[str, Any]:
         }
 
 
+# Rolling window of per-provider latencies used for hedging decisions.
+LATENCY_HISTORY_SIZE = 200
+LATENCY_MIN_SAMPLES = 5
+
+
 @dataclass
 class ProviderStats:
     """Track provider performance statistics."""
@@ -142,6 +152,9 @@ class ProviderStats:
     last_error_time: Optional[str] = None
     is_healthy: bool = True
     consecutive_failures: int = 0
+    recent_latencies_ms: Deque[float] = field(
+        default_factory=lambda: deque(maxlen=LATENCY_HISTORY_SIZE)
+    )
 
     @property
     def success_rate(self) -> float:
@@ -155,10 +168,23 @@ def avg_latency_ms(self) -> float:
             return 0
         return self.total_latency_ms / self.success_count
 
+    def latency_percentile_ms(self, pct: float) -> Optional[float]:
+        """Latency percentile over recent successes; None until enough samples exist."""
+        samples = sorted(self.recent_latencies_ms)
+        if len(samples) < LATENCY_MIN_SAMPLES:
+            return None
+        idx = min(len(samples) - 1, max(0, math.ceil(pct * len(samples)) - 1))
+        return samples[idx]
+
+    @property
+    def p90_latency_ms(self) -> Optional[float]:
+        return self.latency_percentile_ms(0.9)
+
     def record_success(self, latency_ms: float, quality: float = 0.5) -> None:
         self.total_calls += 1
         self.success_count += 1
         self.total_latency_ms += latency_ms
+        self.recent_latencies_ms.append(float(latency_ms))
         self.avg_result_quality = (self.avg_result_quality * 0.9) + (quality * 0.1)
         self.consecutive_failures = 0
         self.is_healthy = True
@@ -196,6 +222,7 @@ def get_stats(self) -> Dict[str, Any]:
             "name": self.name,
             "success_rate": self.stats.success_rate,
             "avg_latency_ms": self.stats.avg_latency_ms,
+            "p90_latency_ms": self.stats.p90_latency_ms,
             "avg_result_quality": self.stats.avg_result_quality,
             "is_healthy": self.stats.is_healthy,
         }
@@ -297,8 +324,6 @@ def is_available(self) -> bool:
         return bool(self.api_key)
 
     def search(self, query: str, max_results: int = 10) -> List[SearchResult]:
-        import requests
-
         start_time = time.time()
         try:
             headers = {
@@ -309,7 +334,7 @@ def search(self, query: str, max_results: int = 10) -> List[SearchResult]:
                 "q": query,
                 "count": max_results,
             }
-            response = requests.get(
+            response = get_http_session().get(
                 "https://api.search.brave.com/res/v1/web/search",
                 headers=headers,
                 params=params,
@@ -351,8 +376,6 @@ def is_available(self) -> bool:
         return bool(self.api_key)
 
     def search(self, query: str, max_results: int = 10) -> List[SearchResult]:
-        import requests
-
         start_time = time.time()
         try:
             headers = {
@@ -363,7 +386,7 @@ def search(self, query: str, max_results: int = 10) -> List[SearchResult]:
                 "q": query,
                 "num": max_results,
             }
-            response = requests.post(
+            response = get_http_session().post(
                 "https://google.serper.dev/search",
                 headers=headers,
                 json=payload,
@@ -516,6 +539,8 @@ class MultiSearchOrchestrator:
     - PARALLEL: Query all providers in parallel, merge results
     - ROUND_ROBIN: Distribute queries across providers
     - BEST_FIRST: Use best performing provider first
+    - HEDGED: Best provider first, plus a backup request to the next provider if
+      the first has not answered by its observed p90 latency
     """
 
     def __init__(
@@ -552,6 +577,14 @@ def __init__(
         self.parallel_max_workers = max(
             1, int(getattr(settings, "search_parallel_max_workers", 8))
         )
+        self.hedge_default_delay_ms = max(
+            0.0, float(getattr(settings, "search_hedge_default_delay_ms", 1500.0))
+        )
+        self.hedge_min_delay_ms = max(
+            0.0, float(getattr(settings, "search_hedge_min_delay_ms", 100.0))
+        )
+        self.hedge_max_inflight = max(1, int(getattr(settings, "search_hedge_max_inflight", 2)))
+        self.hedge_stats: Dict[str, int] = {"calls": 0, "hedges": 0, "backup_wins": 0}
 
         policy = ReliabilityPolicy(
             max_retries=max(0, int(getattr(settings, "search_reliability_max_retries", 2))),
@@ -618,6 +651,7 @@ def search(
         max_results: int = 10,
         strategy: Optional[SearchStrategy] = None,
         provider_profile: Optional[List[str]] = None,
+        deadline_s: Optional[float] = None,
     ) -> List[SearchResult]:
         """
         Execute a search using the configured strategy.
@@ -626,6 +660,7 @@ def search(
             query: Search query
             max_results: Maximum number of results
             strategy: Override the default strategy
+            deadline_s: Seconds this call may take (HEDGED stops waiting after it)
 
         Returns:
             List of deduplicated search results
@@ -645,22 +680,33 @@ def search(
             logger.info(f"[MultiSearch] cache hit for query='{query[:80]}'")
             return self._from_cached_results(cached)
 
-        results: List[SearchResult]
-        if strategy == SearchStrategy.FALLBACK:
-            results = self._search_fallback(query, max_results, available)
-        elif strategy == SearchStrategy.PARALLEL:
-            results = self._search_parallel(query, max_results, available)
-        elif strategy == SearchStrategy.ROUND_ROBIN:
-            results = self._search_round_robin(query, max_results, available)
-        elif strategy == SearchStrategy.BEST_FIRST:
-            results = self._search_best_first(query, max_results, available)
-        else:
-            results = self._search_fallback(query, max_results, available)
+        def _run() -> List[SearchResult]:
+            # The previous leader for this key may have just populated the cache.
+            filled = cache.peek(cache_key)
+            if filled is not None:
+                return self._from_cached_results(filled)
+
+            results: List[SearchResult]
+            if strategy == SearchStrategy.FALLBACK:
+                results = self._search_fallback(query, max_results, available)
+            elif strategy == SearchStrategy.PARALLEL:
+                results = self._search_parallel(query, max_results, available)
+            elif strategy == SearchStrategy.ROUND_ROBIN:
+                results = self._search_round_robin(query, max_results, available)
+            elif strategy == SearchStrategy.BEST_FIRST:
+                results = self._search_best_first(query, max_results, available)
+            elif strategy == SearchStrategy.HEDGED:
+                results = self._search_hedged(query, max_results, available, deadline_s)
+            else:
+                results = self._search_fallback(query, max_results, available)
 
-        if results:
-            cache.set(cache_key, [r.to_dict() for r in results])
+            if results:
+                cache.set(cache_key, [r.to_dict() for r in results])
+            return results
 
-        return results
+        # Concurrent misses for the same key share one provider round-trip.
+        results, shared = cache.flight.do(cache_key, _run)
+        return copy.deepcopy(results) if shared else results
 
     def _cache_query_key(
         self,
@@ -744,10 +790,25 @@ def call_once() -> List[SearchResult]:
             # Many provider adapters swallow exceptions and return [] while recording
             # error stats. Treat that as a failed attempt so the reliability layer can retry.
             before_errors = int(getattr(provider.stats, "error_count", 0) or 0)
-            results = provider.search(query, max_results)
+            started = time.perf_counter()
+            try:
+                results = provider.search(query, max_results)
+            except Exception:
+                observe(
+                    search_provider_duration_seconds,
+                    [provider.name, "error"],
+                    time.perf_counter() - started,
+                )
+                raise
             after_errors = int(getattr(provider.stats, "error_count", 0) or 0)
+            failed = isinstance(results, list) and not results and after_errors > before_errors
+            observe(
+                search_provider_duration_seconds,
+                [provider.name, "error" if failed else "ok"],
+                time.perf_counter() - started,
+            )
 
-            if isinstance(results, list) and not results and after_errors > before_errors:
+            if failed:
                 msg = provider.stats.last_error or f"{provider.name} returned empty results due to error"
                 raise RuntimeError(msg)
 
@@ -790,7 +851,9 @@ def _search_parallel(
 
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
             futures = {
-                executor.submit(self._call_provider, p, query, max_results): p
+                executor.submit(
+                    contextvars.copy_context().run, self._call_provider, p, query, max_results
+                ): p
                 for p in providers
             }
 
@@ -841,8 +904,11 @@ def _search_best_first(
         providers: List[SearchProvider],
     ) -> List[SearchResult]:
         """Use best performing provider first."""
+        return self._search_fallback(query, max_results, self._rank_providers(providers))
+
+    def _rank_providers(self, providers: List[SearchProvider]) -> List[SearchProvider]:
         # Sort by composite score: success_rate * quality / latency
-        sorted_providers = sorted(
+        return sorted(
             providers,
             key=lambda p: (
                 p.stats.success_rate *
@@ -852,7 +918,113 @@ def _search_best_first(
             reverse=True,
         )
 
-        return self._search_fallback(query, max_results, sorted_providers)
+    def _hedge_delay_s(self, provider: SearchProvider) -> float:
+        """How long to wait on `provider` before firing a backup request."""
+        p90 = provider.stats.p90_latency_ms
+        delay_ms = p90 if p90 is not None else self.hedge_default_delay_ms
+        return max(self.hedge_min_delay_ms, delay_ms) / 1000.0
+
+    def _search_hedged(
+        self,
+        query: str,
+        max_results: int,
+        providers: List[SearchProvider],
+        deadline_s: Optional[float] = None,
+    ) -> List[SearchResult]:
+        """
+        Hedged requests: start with the best provider and fire a backup request to
+        the next one only if the first has not answered by its observed p90 latency.
+
+        A provider that fails or returns nothing hands over to the next immediately
+        (like FALLBACK). The first non-empty answer wins; slower requests keep running
+        in the background so their latency still lands in `ProviderStats`. Nothing
+        is waited on past `deadline_s`; `None` means no deadline, and a budget that
+        is already spent (`<= 0`) returns no results without calling any provider.
+        """
+        import concurrent.futures
+
+        if deadline_s is not None and deadline_s <= 0:
+            return []
+        queue = self._rank_providers(providers)
+        if not queue:
+            return []
+
+        deadline_at = time.monotonic() + deadline_s if deadline_s is not None else None
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(len(queue), self.hedge_max_inflight),
+            thread_name_prefix="search-hedge",
+        )
+        pending: Dict[concurrent.futures.Future, SearchProvider] = {}
+        launched: List[SearchProvider] = []
+        last_launch = 0.0
+        self.hedge_stats["calls"] += 1
+
+        def launch() -> None:
+            nonlocal last_launch
+            provider = queue.pop(0)
+            future = executor.submit(
+                contextvars.copy_context().run, self._call_provider, provider, query, max_results
+            )
+            pending[future] = provider
+            launched.append(provider)
+            last_launch = time.monotonic()
+
+        try:
+            launch()
+            while pending:
+                now = time.monotonic()
+                timeouts: List[float] = []
+                can_hedge = bool(queue) and len(pending) < self.hedge_max_inflight
+                if can_hedge:
+                    timeouts.append(max(0.0, last_launch + self._hedge_delay_s(launched[-1]) - now))
+                if deadline_at is not None:
+                    remaining = deadline_at - now
+                    if remaining <= 0:
+                        logger.warning(
+                            f"[MultiSearch] hedged search hit deadline for '{query[:80]}'"
+                        )
+                        return []
+                    timeouts.append(remaining)
+
+                done, _ = concurrent.futures.wait(
+                    pending,
+                    timeout=min(timeouts) if timeouts else None,
+                    return_when=concurrent.futures.FIRST_COMPLETED,
+                )
+                if not done:
+                    if can_hedge and (deadline_at is None or time.monotonic() < deadline_at):
+                        logger.info(
+                            f"[MultiSearch] {launched[-1].name} slower than p90; "
+                            f"hedging with {queue[0].name}"
+                        )
+                        self.hedge_stats["hedges"] += 1
+                        launch()
+                    continue
+
+                for future in done:
+                    provider = pending.pop(future)
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        logger.error(f"[MultiSearch] {provider.name} failed: {e}")
+                        results = []
+                    if results:
+                        if provider is not launched[0]:
+                            self.hedge_stats["backup_wins"] += 1
+                        logger.info(
+                            f"[MultiSearch] Got {len(results)} results from {provider.name}"
+                        )
+                        return self._deduplicate_and_rank(results, max_results, query=query)
+                    logger.warning(f"[MultiSearch] {provider.name} returned no results")
+
+                if queue and len(pending) < self.hedge_max_inflight:
+                    launch()
+        finally:
+            # Never block on the losing request; it finishes (and records stats) on its own.
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        logger.warning("[MultiSearch] All providers failed")
+        return []
 
     def _deduplicate_and_rank(
         self,
@@ -873,27 +1045,23 @@ def _deduplicate_and_rank(
                 seen_urls.add(r.url_hash)
                 unique.append(r)
 
+        # Rank scores parse dates; compute them once per result, not per comparison.
+        scores = {id(r): self._ranking_score(r, query) for r in unique}
+
         # Content similarity deduplication
         if len(unique) > max_results:
-            final = []
+            index = NearDuplicateIndex(self.similarity_threshold, max_chars=200)
+            final: List[SearchResult] = []
             for r in unique:
-                is_duplicate = False
-                for existing in final:
-                    similarity = SequenceMatcher(
-                        None,
-                        r.snippet[:200].lower(),
-                        existing.snippet[:200].lower(),
-                    ).ratio()
-                    if similarity > self.similarity_threshold:
-                        is_duplicate = True
-                        # Keep higher scored result
-                        if self._ranking_score(r, query) > self._ranking_score(existing, query):
-                            final.remove(existing)
-                            final.append(r)
-                        break
-
-                if not is_duplicate:
+                sig = index.signature(r.snippet)
+                slot = index.find(sig)
+                if slot is None:
+                    index.add(sig)
                     final.append(r)
+                elif scores[id(r)] > scores[id(final[slot])]:
+                    # Keep higher scored result
+                    final[slot] = r
+                    index.replace(slot, sig)
 
                 if len(final) >= max_results:
                     break
@@ -901,7 +1069,7 @@ def _deduplicate_and_rank(
             unique = final
 
         # Rank by blended relevance + freshness score
-        unique.sort(key=lambda r: self._ranking_score(r, query), reverse=True)
+        unique.sort(key=lambda r: scores[id(r)], reverse=True)
 
         return unique[:max_results]
 
@@ -1004,6 +1172,7 @@ def multi_search(
     max_results: int = 10,
     strategy: SearchStrategy = SearchStrategy.FALLBACK,
     provider_profile: Optional[List[str]] = None,
+    deadline_s: Optional[float] = None,
 ) -> List[Dict[str, Any]]:
     """
     Convenience function for multi-provider search.
@@ -1013,6 +1182,7 @@ def multi_search(
         max_results: Maximum number of results
         strategy: Search strategy to use
         provider_profile: Optional ordered list of provider names to prioritize
+        deadline_s: Optional per-call time budget in seconds (used by HEDGED)
 
     Returns:
         List of result dictionaries
@@ -1023,5 +1193,6 @@ def multi_search(
         max_results=max_results,
         strategy=strategy,
         provider_profile=provider_profile,
+        deadline_s=deadline_s,
     )
     return [r.to_dict() for r in results]
@@ -2,7 +2,8 @@
 Multi-provider web search (API-based).
 
 This is adapted from Shannon's `llm_service/tools/builtin/web_search.py`, but implemented
-with Weaver's settings and sync `requests` calls so it can be used inside LangChain tools.
+with Weaver's settings and sync `requests` calls (through the shared pooled session in
+`common.http_client`) so it can be used inside LangChain tools.
 
 Why this exists:
 - Directly opening Google/Bing/DuckDuckGo in Playwright often triggers anti-bot challenges.
@@ -18,6 +19,7 @@
 import requests
 
 from common.config import settings
+from common.http_client import get_http_session
 
 logger = logging.getLogger(__name__)
 
@@ -68,7 +70,7 @@ def serper_search(query: str, max_results: int = 10) -> List[Dict[str, Any]]:
     headers = {"X-API-KEY": api_key, "Content-Type": "application/json"}
     payload = {"q": query, "num": int(max_results or 10)}
 
-    resp = requests.post(url, json=payload, headers=headers, timeout=DEFAULT_TIMEOUT_S)
+    resp = get_http_session().post(url, json=payload, headers=headers, timeout=DEFAULT_TIMEOUT_S)
     if resp.status_code != 200:
         msg = _sanitize_error_message(resp.text)
         raise RuntimeError(f"Serper API error ({resp.status_code}): {msg}")
@@ -123,7 +125,7 @@ def serpapi_search(
         "num": max(1, min(int(max_results or 10), 100)),
     }
 
-    resp = requests.get(url, params=params, timeout=DEFAULT_TIMEOUT_S)
+    resp = get_http_session().get(url, params=params, timeout=DEFAULT_TIMEOUT_S)
     if resp.status_code != 200:
         msg = _sanitize_error_message(resp.text)
         raise RuntimeError(f"SerpAPI error ({resp.status_code}): {msg}")
@@ -183,7 +185,7 @@ def bing_search(query: str, max_results: int = 10) -> List[Dict[str, Any]]:
         "textFormat": "HTML",
     }
 
-    resp = requests.get(url, headers=headers, params=params, timeout=DEFAULT_TIMEOUT_S)
+    resp = get_http_session().get(url, headers=headers, params=params, timeout=DEFAULT_TIMEOUT_S)
     if resp.status_code != 200:
         msg = _sanitize_error_message(resp.text)
         raise RuntimeError(f"Bing Search API error ({resp.status_code}): {msg}")
@@ -225,7 +227,7 @@ def google_cse_search(query: str, max_results: int = 10) -> List[Dict[str, Any]]
         "num": min(max(1, int(max_results or 10)), 10),
     }
 
-    resp = requests.get(url, params=params, timeout=DEFAULT_TIMEOUT_S)
+    resp = get_http_session().get(url, params=params, timeout=DEFAULT_TIMEOUT_S)
     if resp.status_code != 200:
         msg = _sanitize_error_message(resp.text)
         raise RuntimeError(f"Google CSE API error ({resp.status_code}): {msg}")
@@ -295,7 +297,7 @@ def exa_search(
     if category:
         payload["category"] = category
 
-    resp = requests.post(url, json=payload, headers=headers, timeout=DEFAULT_TIMEOUT_S)
+    resp = get_http_session().post(url, json=payload, headers=headers, timeout=DEFAULT_TIMEOUT_S)
     if resp.status_code != 200:
         msg = _sanitize_error_message(resp.text)
         raise RuntimeError(f"Exa API error ({resp.status_code}): {msg}")
@@ -347,7 +349,7 @@ def firecrawl_search(query: str, max_results: int = 10) -> List[Dict[str, Any]]:
         "scrapeOptions": {"formats": ["markdown"], "onlyMainContent": True},
     }
 
-    resp = requests.post(url, json=payload, headers=headers, timeout=DEFAULT_TIMEOUT_S)
+    resp = get_http_session().post(url, json=payload, headers=headers, timeout=DEFAULT_TIMEOUT_S)
     if resp.status_code != 200:
         msg = _sanitize_error_message(resp.text)
         raise RuntimeError(f"Firecrawl API error ({resp.status_code}): {msg}")